@@ -39,6 +39,7 @@ Professional trading interface with real-time monitoring
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
 import threading
+import queue
 import json
 import MetaTrader5 as mt5
 from datetime import datetime, timedelta
@@ -91,29 +92,53 @@ TRANSLATIONS = {
 
 class TextWidgetLogger:
     """Custom logging handler that redirects output to GUI Text widget"""
+    DRAIN_INTERVAL_MS = 100
+    MAX_BATCH = 500  # lines inserted per drain; the rest wait for the next one
+    
     def __init__(self, gui_instance):
         self.gui = gui_instance
+        # Writers (engine/log listener threads) only enqueue; Tk inserts run on the main loop
+        self.pending = queue.SimpleQueue()
         
     def write(self, message):
-        """Write message to GUI logs (with filtering for repetitive system messages)"""
-        if message.strip():
+        """Queue message for the GUI logs tab (never touches Tk from the caller's thread)"""
+        self.pending.put(message)
+    
+    def drain(self):
+        """Move queued messages into the logs tab (call from the Tk main loop)"""
+        for _ in range(self.MAX_BATCH):
             try:
-                # Filter out repetitive system/performance messages
-                if self._should_filter_message(message):
-                    return
-                
-                # Determine log level based on message content
-                level = "INFO"
-                if "ERROR" in message.upper() or "FAILED" in message.upper():
-                    level = "ERROR"
-                elif "WARNING" in message.upper() or "WARN" in message.upper():
-                    level = "WARNING"
-                elif "SUCCESS" in message.upper() or "✓" in message or "✅" in message:
-                    level = "SUCCESS"
+                message = self.pending.get_nowait()
+            except queue.Empty:
+                break
+            if message.strip():
+                try:
+                    # Filter out repetitive system/performance messages
+                    if self._should_filter_message(message):
+                        continue
                     
-                self.gui.log_message(message.strip(), level)
-            except:
-                pass
+                    # Determine log level based on message content
+                    level = "INFO"
+                    if "ERROR" in message.upper() or "FAILED" in message.upper():
+                        level = "ERROR"
+                    elif "WARNING" in message.upper() or "WARN" in message.upper():
+                        level = "WARNING"
+                    elif "SUCCESS" in message.upper() or "✓" in message or "✅" in message:
+                        level = "SUCCESS"
+                        
+                    self.gui.log_message(message.strip(), level)
+                except:
+                    pass
+    
+    def schedule_drain(self, root):
+        """Drain every DRAIN_INTERVAL_MS on the Tk thread"""
+        def tick():
+            self.drain()
+            try:
+                root.after(self.DRAIN_INTERVAL_MS, tick)
+            except tk.TclError:
+                pass  # window closed
+        root.after(self.DRAIN_INTERVAL_MS, tick)
     
     def _should_filter_message(self, message):
         """Check if message should be filtered out (repetitive system updates)"""
@@ -260,7 +285,7 @@ class HFTProGUI:
                 loaded_bots = {}
                 for bot_id, bot_data in session_data.get('bots', {}).items():
                     loaded_bots[bot_id] = {
-                        'config': copy.deepcopy(bot_data['config']),
+                        'config': self.config_manager.migrate_config(copy.deepcopy(bot_data['config'])),
                         'engine': None,
                         'risk_manager': None,
                         'ml_predictor': None,
@@ -327,6 +352,11 @@ class HFTProGUI:
                 for bot_id, bot_data in self.bots.items():
                     if bot_data['is_running'] and bot_data['engine']:
                         bot_data['engine'].stop()
+                if self.bot_supervisor:
+                    self.bot_supervisor.shutdown()
+                # Write out log records still queued by the engines' async logging
+                from async_logging import shutdown_async_logging
+                shutdown_async_logging()
                 self.root.destroy()
             except Exception as e:
                 print(f"Close error: {e}")
@@ -369,7 +399,7 @@ class HFTProGUI:
                     # Restore bots
                     for bot_id, bot_data in session_data.get('bots', {}).items():
                         self.bots[bot_id] = {
-                            'config': bot_data['config'],
+                            'config': self.config_manager.migrate_config(bot_data['config']),
                             'engine': None,
                             'risk_manager': None,
                             'ml_predictor': None,
@@ -421,6 +451,7 @@ class HFTProGUI:
             
             # For backward compatibility
             self.engine = None
+            self.bot_supervisor = None  # created on first process-mode bot
             self.risk_manager = None
             self.ml_predictor = None
             self.config = {}
@@ -567,6 +598,7 @@ class HFTProGUI:
             try:
                 # Create custom logger
                 logger_stream = TextWidgetLogger(self)
+                logger_stream.schedule_drain(self.root)
                 
                 # Redirect stdout and stderr to GUI
                 sys.stdout = logger_stream
@@ -609,6 +641,7 @@ class HFTProGUI:
             self.max_floating_profit_var = tk.StringVar(value="0.5")
             self.mt5_path_var = tk.StringVar(value="C:\\Program Files\\MT5\\terminal64.exe")
             self.enable_ml_var = tk.BooleanVar(value=False)
+            self.engine_process_mode_var = tk.BooleanVar(value=False)
             # Commission Configuration (TAMBAHKAN INI)
             self.commission_var = tk.StringVar(value="0.9")  # Default $0.90 per trade
             
@@ -1053,6 +1086,8 @@ class HFTProGUI:
                 ml_row.pack(fill=tk.X, pady=2)
                 
                 ttk.Checkbutton(ml_row, text="Enable ML Predictions", variable=self.enable_ml_var).pack(side=tk.LEFT, padx=5)
+                ttk.Checkbutton(ml_row, text="Run Engine in Separate Process",
+                                variable=self.engine_process_mode_var).pack(side=tk.LEFT, padx=5)
 
                 # === CONTROL BUTTONS ===
                 button_frame = ttk.Frame(scrollable_frame)
@@ -1158,6 +1193,23 @@ class HFTProGUI:
                 self.create_metric_display(perf_row2, "Avg Exec Time:", self.perf_vars['exec_avg'], width=15)
                 self.create_metric_display(perf_row2, "Max Exec Time:", self.perf_vars['exec_max'], width=15)
 
+                # === STAGE LATENCY PERCENTILES ===
+                latency_frame = ttk.LabelFrame(main_container, text="⏱️ Stage Latency (μs)", padding=10)
+                latency_frame.pack(fill=tk.X, pady=(0, 10))
+
+                columns = ('Stage', 'Count', 'p50', 'p90', 'p99', 'p99.9', 'Max')
+                self.stage_latency_tree = ttk.Treeview(latency_frame, columns=columns, show='headings', height=10)
+                for col in columns:
+                    self.stage_latency_tree.heading(col, text=col)
+                    self.stage_latency_tree.column(col, width=140 if col == 'Stage' else 90,
+                                                   anchor=tk.W if col == 'Stage' else tk.E)
+                self.stage_latency_tree.pack(fill=tk.X)
+
+                latency_controls = ttk.Frame(latency_frame)
+                latency_controls.pack(fill=tk.X, pady=(5, 0))
+                ttk.Button(latency_controls, text="💾 Export Latency JSON",
+                        command=self.export_latency_stats, width=22).pack(side=tk.LEFT, padx=5)
+
                 # === EQUITY CURVE CHART ===
                 chart_frame = ttk.LabelFrame(main_container, text="📈 Equity Curve", padding=10)
                 chart_frame.pack(fill=tk.BOTH, expand=True)
@@ -1372,6 +1424,12 @@ class HFTProGUI:
                         except Exception as e:
                             self.log_message(f"Error updating performance metrics: {e}", "WARNING")
                         
+                        # Update stage latency percentiles
+                        try:
+                            self.update_stage_latency_table(snapshot.get('stage_latency') or {})
+                        except Exception as e:
+                            self.log_message(f"Error updating stage latency: {e}", "WARNING")
+                        
                         # Update chart data with NaN protection
                         try:
                             chart_equity = float(snapshot.get('equity', 0) or 0)
@@ -1425,9 +1483,50 @@ class HFTProGUI:
                 self.perf_vars['exec_avg'].set("0.00 ms")
                 self.perf_vars['exec_max'].set("0.00 ms")
                 self.perf_vars['ticks'].set("0")
+                self.update_stage_latency_table({})
             except Exception as e:
                 self.log_message(f"Error resetting performance display: {e}", "WARNING")
 
+        def update_stage_latency_table(self, stages):
+            """Fill the stage latency table from an engine stage_latency snapshot"""
+            if not hasattr(self, 'stage_latency_tree'):
+                return
+            tree = self.stage_latency_tree
+            tree.delete(*tree.get_children())
+            for stage, s in stages.items():
+                tree.insert('', tk.END, values=(
+                    stage,
+                    s.get('count', 0),
+                    f"{s.get('p50_us', 0):.1f}",
+                    f"{s.get('p90_us', 0):.1f}",
+                    f"{s.get('p99_us', 0):.1f}",
+                    f"{s.get('p99_9_us', 0):.1f}",
+                    f"{s.get('max_us', 0):.1f}",
+                ))
+
+        def export_latency_stats(self):
+            """Dump the active bot's per-stage latency histograms to JSON"""
+            try:
+                bot = self.bots.get(self.active_bot_id) if self.active_bot_id else None
+                if not bot or not bot['engine']:
+                    messagebox.showwarning("Warning", "No running bot selected!")
+                    return
+                
+                filename = filedialog.asksaveasfilename(
+                    defaultextension=".json",
+                    filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+                    title="Export Stage Latency",
+                    initialfile=f"latency_{self.active_bot_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                )
+                
+                if filename:
+                    bot['engine'].dump_latency_stats(filename)
+                    self.log_message(f"✓ Stage latency exported to: {filename}", "SUCCESS")
+                    
+            except Exception as e:
+                self.log_message(f"Export latency error: {e}", "ERROR")
+                messagebox.showerror("Error", f"Export latency error: {e}")
+
         def build_log_tab(self):
             """Build logging tab"""
             try:
@@ -1488,6 +1587,7 @@ class HFTProGUI:
                 self.max_floating_profit_var.set(config.get('max_floating_profit', '0.5'))
                 self.mt5_path_var.set(config.get('mt5_path', 'C:\\Program Files\\MT5\\terminal64.exe'))
                 self.enable_ml_var.set(config.get('use_ml', False))
+                self.engine_process_mode_var.set(config.get('engine_process_mode', False))
                 # ✅ ADD COMMISSION
                 self.commission_var.set(config.get('commission_per_trade', '0.9'))
                 # Indicators
@@ -1540,6 +1640,7 @@ class HFTProGUI:
                     'max_floating_profit': float(self.max_floating_profit_var.get().strip()),
                     'mt5_path': self.mt5_path_var.get().strip(),
                     'enable_ml':  self.enable_ml_var.get(),
+                    'engine_process_mode': self.engine_process_mode_var.get(),
                     # ✅ ADD COMMISSION
                     'commission_per_trade':  float(self.commission_var.get().strip()),
                     
@@ -1579,6 +1680,11 @@ class HFTProGUI:
                         'chat_ids': [cid.strip() for cid in self.telegram_chat_ids_var.get().split(',') if cid.strip()]
                     }
                 }
+                
+                # Settings without a GUI field (MT5 backend, simulator, session timezone and days)
+                # stay as the bot's config has them; the session fields above are WIB by default
+                stored_config = self.bots.get(self.active_bot_id, {}).get('config', {})
+                config.update(self.config_manager.non_gui_settings(stored_config))
                 return config
             except Exception as e:  
                 self.log_message(f"Get config error: {e}", "ERROR")
@@ -1627,6 +1733,7 @@ class HFTProGUI:
                     
                     # ✅ FIX: Apply config ONLY to active bot
                     import copy
+                    config = self.config_manager.migrate_config(config)
                     self.bots[self.active_bot_id]['config'] = copy.deepcopy(config)
                     
                     # Load to GUI
@@ -1636,6 +1743,14 @@ class HFTProGUI:
             except Exception as e:
                 self.log_message(f"Load config error: {e}", "ERROR")
 
+        def get_bot_supervisor(self):
+            """Process-per-bot supervisor (lazy)"""
+            if self.bot_supervisor is None:
+                from bot_supervisor import BotSupervisor
+                self.bot_supervisor = BotSupervisor()
+                self.log_message("✓ Bot supervisor started (process-per-bot mode)", "SUCCESS")
+            return self.bot_supervisor
+
         def start_trading(self):
             """Start trading for active bot"""
             try:
@@ -1663,6 +1778,19 @@ class HFTProGUI:
                 # Get bot's config
                 config = bot['config']
                 
+                # Simulated MT5 (load testing without a terminal) replaces MetaTrader5 for the whole
+                # process, so it only runs inside a bot's own worker process - never next to live bots
+                if config.get('mt5_backend', 'terminal') == 'simulator':
+                    if not config.get('engine_process_mode', False):
+                        self.log_message(f"{self.active_bot_id}: MT5 simulator backend needs "
+                                         f"'Run Engine in Separate Process'", "ERROR")
+                        messagebox.showerror("MT5 Simulator",
+                                             f"{self.active_bot_id} uses the MT5 simulator backend.\n\n"
+                                             f"Enable 'Run Engine in Separate Process' so the simulator "
+                                             f"cannot replace the real terminal of other running bots.")
+                        return
+                    self.log_message(f"⚠️ {self.active_bot_id}: MT5 SIMULATOR backend - no real orders", "WARNING")
+                
                 # Create components for this bot
                 from risk_manager import RiskManager
                 from aventa_hft_core import UltraLowLatencyEngine
@@ -1702,8 +1830,24 @@ class HFTProGUI:
                 else:
                     self.log_message(f"{self.active_bot_id}: ML Prediction DISABLED (Technical signals only)", "INFO")
                 
-                bot['engine'] = UltraLowLatencyEngine(config['symbol'], config, bot['risk_manager'], ml_predictor, 
-                                                telegram_callback=lambda **data: self.send_telegram_signal(bot_id=self.active_bot_id, **data))
+                if config.get('engine_process_mode', False):
+                    # Engine runs in its own worker process (own GIL), ticks via shared memory
+                    worker_config = config
+                    if ml_predictor is not None and ml_predictor.is_trained:
+                        # The worker cannot share this predictor: hand it the trained models on disk
+                        model_dir = os.path.join('ml_models', 'workers', self.active_bot_id.replace(' ', '_'))
+                        if not ml_predictor.save_models(model_dir):
+                            self.log_message(f"{self.active_bot_id}: could not save ML models for the "
+                                             f"engine process", "ERROR")
+                            return
+                        worker_config = dict(config, ml_model_dir=model_dir)
+                    bot['engine'] = self.get_bot_supervisor().engine_proxy(
+                        self.active_bot_id, config['symbol'], worker_config,
+                        telegram_callback=lambda **data: self.send_telegram_signal(bot_id=self.active_bot_id, **data),
+                        risk_manager=bot['risk_manager'])
+                else:
+                    bot['engine'] = UltraLowLatencyEngine(config['symbol'], config, bot['risk_manager'], ml_predictor, 
+                                                    telegram_callback=lambda **data: self.send_telegram_signal(bot_id=self.active_bot_id, **data))
                 
                 # Initialize and start
                 if bot['engine'].initialize():
@@ -2063,6 +2207,7 @@ class HFTProGUI:
                     rm.max_position_size = config['max_position_size']
                     rm.max_positions = config['max_positions']
                     rm.max_drawdown_pct = config['max_drawdown_pct']
+                    self.push_worker_risk_settings(self.bots[bot_id])
                     
                     self.log_message(f"✓ {bot_id} config updated (running bot)", "SUCCESS")
                 else:
@@ -2133,6 +2278,7 @@ class HFTProGUI:
                 self.mt5_path_var.set(config.get('mt5_path', 'C:\\Program Files\\MT5\\terminal64.exe'))
                 
                 self.enable_ml_var.set(config.get('enable_ml', False))
+                self.engine_process_mode_var.set(config.get('engine_process_mode', False))
                 self.commission_var.set(str(config.get('commission_per_trade', 0.9)))
                 
                 # === TRADING SESSIONS ===
@@ -2495,6 +2641,7 @@ class HFTProGUI:
                     bot['risk_manager'].max_position_size = bot['config']['max_position_size']
                     bot['risk_manager'].max_positions = bot['config']['max_positions']
                     bot['risk_manager'].max_drawdown_pct = bot['config']['max_drawdown_pct']
+                    self.push_worker_risk_settings(bot)
                     
                     self.log_message(f"✓ {self.active_bot_id} risk limits updated", "SUCCESS")
                     self.add_risk_event(f"{self.active_bot_id} risk limits updated", "INFO")
@@ -2618,6 +2765,12 @@ class HFTProGUI:
             except Exception as e:
                 pass
 
+        def push_worker_risk_settings(self, bot):
+            """Send risk limit / circuit breaker changes to a bot whose engine runs in a worker process"""
+            engine = bot.get('engine')
+            if bot.get('is_running') and hasattr(engine, 'push_risk_settings'):
+                engine.push_risk_settings()
+
         def reset_circuit_breaker(self):
             """Reset circuit breaker for active bot"""
             try: 
@@ -2630,6 +2783,7 @@ class HFTProGUI:
                 if bot['risk_manager']:
                     bot['risk_manager'].circuit_breaker_triggered = False
                     bot['risk_manager'].trading_enabled = True
+                    self.push_worker_risk_settings(bot)
                     self.log_message(f"✓ {self.active_bot_id} circuit breaker reset", "SUCCESS")
                     self.add_risk_event(f"{self.active_bot_id} circuit breaker reset by user", "INFO")
                 else:
@@ -2649,6 +2803,7 @@ class HFTProGUI:
                 
                 if bot['risk_manager']:
                     bot['risk_manager'].trigger_circuit_breaker(f"Manual trigger by user for {self.active_bot_id}")
+                    self.push_worker_risk_settings(bot)
                     self.log_message(f"🚨 {self.active_bot_id} circuit breaker triggered manually", "WARNING")
                     self.add_risk_event(f"{self.active_bot_id} circuit breaker triggered manually", "CRITICAL")
                 else:
@@ -4893,6 +5048,7 @@ This is a test message from Aventa HFT Pro 2026"""
 
                 if bot['risk_manager']:
                     bot['risk_manager'].circuit_breaker_triggered = False
+                    self.push_worker_risk_settings(bot)
                     self.circuit_breaker_status.set("✅ INACTIVE - Trading Allowed")
                     self.circuit_breaker_reason.set("Manually reset")
                     self.add_risk_event(f"{self.active_bot_id} circuit breaker manually reset", "INFO")
@@ -4913,6 +5069,7 @@ This is a test message from Aventa HFT Pro 2026"""
 
                 if bot['risk_manager']:
                     bot['risk_manager'].circuit_breaker_triggered = True
+                    self.push_worker_risk_settings(bot)
                     self.circuit_breaker_status.set("🚨 ACTIVE - Trading Halted")
                     self.circuit_breaker_reason.set("Manually triggered")
                     self.add_risk_event(f"⚠️ {self.active_bot_id} circuit breaker manually triggered", "WARNING")
@@ -5593,6 +5750,8 @@ if __name__ == "__main__":
     """
     
     import traceback
+    import multiprocessing
+    multiprocessing.freeze_support()  # process-per-bot workers in frozen builds
     
     try:
         # Step 1: MANDATORY License Validation (MUST PASS)
@@ -0,0 +1,244 @@
+"""
+Async Logging for Aventa HFT Pro 2026
+Queue-based logging pipeline and per-key rate sampling for the trading hot path
+"""
+
+import time
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never formats or blocks on the calling thread
+
+    The stock ``prepare()`` renders the message (f-string-equivalent work)
+    before enqueueing; here the record goes on the queue as-is and the
+    listener thread does ``msg % args``. Callers must therefore pass
+    immutable args (numbers, strings) - the normal %-style convention.
+    When the queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener whose stop() waits for room for its sentinel instead of failing on a full queue"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class LogSampler:
+    """
+    Per-key rate sampling for repetitive diagnostics
+
+    ``allow(key, interval)`` lets one message per key through every
+    ``interval`` seconds and counts the ones it swallowed, so the next
+    emitted line can say how many were dropped. Lock-free: a race can at
+    worst let one extra line through.
+    """
+
+    def __init__(self):
+        self._next_allowed: Dict[str, float] = {}
+        self._pending: Dict[str, int] = {}
+        self.suppressed: Dict[str, int] = {}
+        self.emitted: Dict[str, int] = {}
+
+    def allow(self, key: str, interval: float) -> Tuple[bool, int]:
+        """(emit?, messages suppressed for this key since the last emit)"""
+        now = time.monotonic()
+        if now < self._next_allowed.get(key, 0.0):
+            self._pending[key] = self._pending.get(key, 0) + 1
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return False, 0
+        self._next_allowed[key] = now + interval
+        self.emitted[key] = self.emitted.get(key, 0) + 1
+        return True, self._pending.pop(key, 0)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return {key: {'emitted': self.emitted.get(key, 0), 'suppressed': self.suppressed.get(key, 0)}
+                for key in set(self.emitted) | set(self.suppressed)}
+
+
+_sampler = LogSampler()
+
+
+def log_sampled(log: logging.Logger, level: int, key: str, interval: float, msg: str, *args):
+    """
+    ``log.log(level, msg, *args)`` at most once per ``interval`` seconds per key
+
+    Nothing is formatted for suppressed calls; the emitted line carries
+    the number of suppressed ones.
+    """
+    if not log.isEnabledFor(level):
+        return
+    allowed, suppressed = _sampler.allow(key, interval)
+    if not allowed:
+        return
+    if suppressed:
+        msg += " (+%d suppressed)"
+        args += (suppressed,)
+    log.log(level, msg, *args)
+
+
+def get_log_sampler() -> LogSampler:
+    return _sampler
+
+
+class AsyncLogPipeline:
+    """
+    Moves a logger's handlers behind a bounded queue and a listener thread
+
+    Hot-path threads only append a LogRecord to the queue; formatting and
+    file/console/GUI I/O run on the listener thread.
+    """
+
+    def __init__(self, target: logging.Logger = None, max_queue: int = 10000):
+        self.target = target if target is not None else logging.getLogger()
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.listener: Optional[QueueListener] = None
+        self._handlers = ()
+
+    def start(self):
+        if self.listener is not None:
+            return
+        self._handlers = tuple(h for h in self.target.handlers if not isinstance(h, QueueHandler))
+        for h in self._handlers:
+            self.target.removeHandler(h)
+        self.listener = DrainingQueueListener(self.queue, *self._handlers, respect_handler_level=True)
+        self.listener.start()
+        self.target.addHandler(self.handler)
+
+    def add_handler(self, handler: logging.Handler):
+        """Attach another output (e.g. a GUI handler) on the listener side"""
+        self._handlers += (handler,)
+        if self.listener is not None:
+            self.listener.handlers = self._handlers
+
+    def stop(self):
+        """Drain the queue and give the handlers back to the logger"""
+        if self.listener is None:
+            return
+        self.target.removeHandler(self.handler)
+        self.listener.stop()
+        self.listener = None
+        for h in self._handlers:
+            self.target.addHandler(h)
+
+    def get_stats(self) -> Dict:
+        return {
+            'enqueued': self.handler.enqueued,
+            'dropped': self.handler.dropped,
+            'queue_depth': self.queue.qsize(),
+            'sampled': _sampler.get_stats(),
+        }
+
+
+_pipeline: Optional[AsyncLogPipeline] = None
+_pipeline_lock = threading.Lock()
+_atexit_registered = False
+
+
+def install_async_logging(max_queue: int = 10000) -> AsyncLogPipeline:
+    """
+    Route the root logger through one process-wide AsyncLogPipeline (idempotent)
+
+    The listener is a daemon thread, so ``shutdown_async_logging`` is
+    registered with ``atexit`` to write out records still queued when the
+    interpreter exits (including after an unhandled exception).
+    """
+    global _pipeline, _atexit_registered
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = AsyncLogPipeline(max_queue=max_queue)
+            _pipeline.start()
+            if not _atexit_registered:
+                atexit.register(shutdown_async_logging)
+                _atexit_registered = True
+            logger.info(f"Async logging enabled (queue {max_queue})")
+        return _pipeline
+
+
+def get_log_pipeline() -> Optional[AsyncLogPipeline]:
+    return _pipeline
+
+
+def shutdown_async_logging():
+    """Drain queued records and hand the handlers back to the root logger"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is not None:
+            _pipeline.stop()
+            _pipeline = None
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    print("=" * 60)
+    print("ASYNC LOGGING - PERFORMANCE TEST")
+    print("=" * 60)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    bench = logging.getLogger("bench")
+    n = 20000
+    delta, velocity, spread = -21589.0, 0.0059, 0.12
+
+    with tempfile.TemporaryDirectory() as tmp:
+        handler = logging.FileHandler(os.path.join(tmp, "bench.log"), encoding="utf-8")
+        handler.setFormatter(logging.Formatter('%(asctime)s.%(msecs)03d - %(levelname)s - %(message)s'))
+        root.handlers = [handler]
+
+        def per_call(fn):
+            start = time.perf_counter()
+            for i in range(n):
+                fn(i)
+            return (time.perf_counter() - start) / n * 1e6
+
+        sync_fstring = per_call(lambda i: bench.info(
+            f"⏳ [{i}] Spread: {spread:.5f} | Delta: {delta:.0f} | Velocity: {velocity:.6f}"))
+
+        # Hot-thread cost alone: records only enqueued (listener not running yet)
+        root.handlers = [NonBlockingQueueHandler(queue.Queue(maxsize=n * 2))]
+        enqueue_only = per_call(lambda i: bench.info(
+            "⏳ [%d] Spread: %.5f | Delta: %.0f | Velocity: %.6f", i, spread, delta, velocity))
+        root.handlers = [handler]
+
+        pipeline = install_async_logging(max_queue=n * 2)
+        async_lazy = per_call(lambda i: bench.info(
+            "⏳ [%d] Spread: %.5f | Delta: %.0f | Velocity: %.6f", i, spread, delta, velocity))
+        sampled = per_call(lambda i: log_sampled(bench, logging.INFO, "diag", 5.0,
+                                                 "⏳ [%d] Spread: %.5f | Delta: %.0f", i, spread, delta))
+        stats = pipeline.get_stats()
+        shutdown_async_logging()
+
+    print(f"sync FileHandler + f-string:  {sync_fstring:6.2f} us/call")
+    print(f"enqueue only (hot thread):    {enqueue_only:6.2f} us/call")
+    print(f"async incl. listener (1 GIL): {async_lazy:6.2f} us/call")
+    print(f"sampled (suppressed) call:    {sampled:6.2f} us/call")
+    print(f"enqueued {stats['enqueued']} dropped {stats['dropped']} sampled {stats['sampled']}")
+    print("=" * 60)
@@ -9,7 +9,6 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from collections import deque
-from dataclasses import dataclass
 from typing import Dict, List, Tuple, Optional
 import time
 import threading
@@ -17,9 +16,23 @@ import logging
 from queue import Queue, PriorityQueue
 import json
 # Add these imports at the top
-from thread_safety import rate_limit
+from thread_safety import SequenceEvent, CoalescingMailbox
 from account_cache import AccountCache
-from performance_utils import cache_with_ttl
+from deal_ledger import DailyDealLedger
+from symbol_cache import SymbolMetadataCache
+from close_executor import ParallelCloseExecutor
+from ring_buffer import TickRingBuffer, OrderFlowRingBuffer
+from streaming_indicators import StreamingIndicators
+from tick_ingest import BatchTickFetcher
+from position_book import PositionBook
+from latency_histogram import StageLatencies
+from market_data_hub import get_market_data_hub
+from tick_recorder import TickRecorder
+from async_logging import install_async_logging, get_log_pipeline, log_sampled
+from signal_rules import SignalRules, SIGNAL_TYPES, SPREAD_REJECT
+from session_calendar import SessionCalendar
+from hft_records import TickData, OrderFlowData, Signal
+from volume_profile import VolumeProfile
 
 # Configure logging
 logging.basicConfig(
@@ -45,50 +58,23 @@ except ImportError:
     logger.warning("⚠️ Fast indicators not available - using slower pandas methods")
 
 
-@dataclass
-class TickData:
-    """Ultra-fast tick data structure"""
-    timestamp: float
-    bid: float
-    ask: float
-    last: float
-    volume: int
-    spread: float
-    
-    def __post_init__(self):
-        self.mid_price = (self.bid + self.ask) / 2
-
-
-@dataclass
-class OrderFlowData:
-    """Order flow analysis data"""
-    timestamp: float
-    buy_volume: float
-    sell_volume: float
-    delta: float
-    cumulative_delta: float
-    imbalance_ratio: float
-
-
-@dataclass
-class Signal:
-    """Trading signal with priority"""
-    timestamp: float
-    signal_type: str  # 'BUY', 'SELL', 'CLOSE'
-    strength: float
-    price: float
-    stop_loss: float
-    take_profit: float
-    volume: float
-    reason: str
-    
-    def __lt__(self, other):
-        return self.timestamp < other.timestamp
-
-
 class UltraLowLatencyEngine:
     """Core HFT engine with microsecond precision"""
     
+    # Pipeline stages recorded in self.latency, in tick -> order order
+    LATENCY_STAGES = (
+        'tick_fetch',        # symbol_info_tick / copy_ticks_from call
+        'order_flow',        # buffers, streaming indicators and order flow update
+        'tick_to_analysis',  # tick arrival -> analysis start
+        'analysis',          # analyze_microstructure
+        'ml_predict',        # ML feature preparation + predict
+        'tick_to_signal',    # tick arrival -> signal queued
+        'queue_wait',        # signal queued -> execution start
+        'pre_trade',         # open_position checks up to order_send
+        'order_send',        # one order_send round trip
+        'execute',           # whole execute_signal
+    )
+    
     def __init__(self, symbol: str, config:  Dict, risk_manager=None, ml_predictor=None, telegram_callback=None):
         # ========================================
         # STEP 1: Initialize critical dependencies FIRST
@@ -108,9 +94,39 @@ class UltraLowLatencyEngine:
         # ========================================
         # STEP 3: Data structures
         # ========================================
-        self.tick_buffer = deque(maxlen=10000)
-        self.orderflow_buffer = deque(maxlen=5000)
-        self.signal_queue = PriorityQueue(maxsize=1000)
+        # Column-oriented ring buffers (zero-copy NumPy windows, no per-tick objects)
+        self.tick_buffer = TickRingBuffer(capacity=10000)
+        self.orderflow_buffer = OrderFlowRingBuffer(capacity=5000)
+        # Analysis -> execution hand-off: freshest signal per type, stale ones dropped
+        self.signal_mailbox = CoalescingMailbox(ttl=self.config.get('signal_ttl_ms', 500) / 1000.0)
+        
+        # Close-all: bounded concurrent order_send, requotes retried at a fresh terminal quote
+        self.close_executor = ParallelCloseExecutor(
+            mt5_api=mt5,
+            max_workers=self.config.get('close_all_workers', 4),
+            max_retries=self.config.get('close_all_retries', 2),
+            serialize=self.config.get('close_all_serialize', False)
+        )
+        
+        # Today's deals for this bot, fetched incrementally from MT5 history
+        self.deal_ledger = DailyDealLedger(self.config.get('magic_number', 2026002), mt5_api=mt5)
+        
+        # One positions_get snapshot per decision cycle, shared by all position checks
+        self.position_book = PositionBook(
+            symbol,
+            self.config.get('magic_number', 2026002),
+            mt5_api=mt5,
+            max_age=self.config.get('position_snapshot_max_age', 0.25)
+        )
+        
+        # Data thread -> analysis thread new-tick notification
+        # 'event': analyze once per new tick batch | 'sleep': fixed analysis_interval cadence
+        self.tick_event = SequenceEvent()
+        self.analysis_trigger = self.config.get('analysis_trigger', 'event')
+        self.analysis_coalesce = self.config.get('analysis_coalesce_ms', 0.0) / 1000.0
+        max_rate = self.config.get('analysis_max_rate', 200)
+        self.analysis_min_gap = 1.0 / max_rate if max_rate > 0 else 0.0
+        self._last_analysis_time = 0.0
         
         # ========================================
         # STEP 4: Market data
@@ -121,17 +137,64 @@ class UltraLowLatencyEngine:
         self.symbol_point = 0.0
         self.stops_level = 0
         
+        # Contract specs loaded at initialize(), refreshed from the slow position-check loop
+        self.symbol_meta = SymbolMetadataCache(
+            mt5_api=mt5,
+            refresh_interval=self.config.get('symbol_meta_refresh_interval', 300.0)
+        )
+        
+        # 'batch': copy_ticks_from since last time_msc | 'poll': symbol_info_tick every 1ms
+        self.tick_ingest_mode = self.config.get('tick_ingest_mode', 'batch')
+        # Batch mode normally shares one collector per symbol with the other bots in this process
+        self.shared_market_data = self.tick_ingest_mode == 'batch' and self.config.get('shared_market_data', True)
+        self.market_data_hub = None  # tick source for attach_market_data (None = process-wide hub)
+        self._market_data_subscription = None
+        self.tick_fetcher = None
+        if self.tick_ingest_mode == 'batch' and not self.shared_market_data:
+            self.tick_fetcher = BatchTickFetcher(
+                symbol,
+                mt5_api=mt5,
+                max_interval=self.config.get('tick_poll_max_interval', 0.05)
+            )
+        
         # ========================================
         # STEP 5: Order flow tracking
         # ========================================
         self.cumulative_delta = 0.0
-        self.volume_profile = {}
+        # Session volume-at-price profile (bin width set from the symbol point in initialize)
+        self.volume_profile = VolumeProfile.from_config(self.config)
+        
+        # Append-only record of every tick / order flow row this engine ingested
+        self.tick_recorder = None
+        if self.config.get('tick_recording', False):
+            self.tick_recorder = TickRecorder(
+                self.config.get('tick_record_dir', 'tick_data'),
+                symbol,
+                tag=self.config.get('magic_number', 2026002)
+            )
+        
+        # Incremental indicators updated per tick by the data thread (rebuilt by update_config)
+        self.use_streaming_indicators = self.config.get('streaming_indicators', True)
+        self.indicators = StreamingIndicators.from_config(self.config)
+        # Signal thresholds frozen once per config (rebuilt by update_config)
+        self.signal_rules = SignalRules.from_config(self.config)
+        # Trading sessions as a weekly minute bitmap (rebuilt by update_config)
+        self.session_calendar = SessionCalendar.from_config(self.config)
+        self._session_idle = False
+        self._last_session_log_time = 0.0
         
         # ========================================
         # STEP 6: Performance metrics
         # ========================================
         self.latency_samples = deque(maxlen=1000)
         self.execution_times = deque(maxlen=1000)
+        # Per-stage latency histograms (whole session, p50/p90/p99/p99.9)
+        self.latency = StageLatencies(self.LATENCY_STAGES)
+        # Repetitive diagnostics are sampled per key (per bot) instead of every Nth call
+        self.log_sample_interval = self.config.get('log_sample_interval', 5.0)
+        self._log_keys = {name: f"{name}:{symbol}:{self.config.get('magic_number', 2026002)}"
+                          for name in ('analysis_diag', 'analysis_summary', 'weak_signal', 'no_signal',
+                                       'spread_reject')}
         
         # ========================================
         # STEP 7: State
@@ -217,68 +280,57 @@ class UltraLowLatencyEngine:
             logger.warning(f"⚠️ Mode pengisian '{mode_str}' nggak didukung, pakai FOK aja ya.")
         return mode_map.get(mode_upper, mt5.ORDER_FILLING_FOK)
 
+    def _apply_symbol_meta(self):
+        """Copy cached contract specs used on the hot path"""
+        meta = self.symbol_meta.get(self.symbol)
+        if meta is not None:
+            self.symbol_point = meta.point
+            self.stops_level = meta.stops_level
+            if not self.volume_profile.tick_size:
+                self.volume_profile = VolumeProfile.from_config(self.config, point=meta.point)
+
+    def refresh_symbol_meta(self):
+        """Scheduled metadata refresh (slow loop only)"""
+        if self.symbol_meta.refresh_if_due(self.symbol):
+            self._apply_symbol_meta()
+
+    def get_latest_quote(self) -> Tuple[float, float]:
+        """Latest (bid, ask) from the tick buffer; falls back to MT5 before the first tick"""
+        if self.tick_buffer:
+            return self.tick_buffer.latest('bid'), self.tick_buffer.latest('ask')
+        tick = mt5.symbol_info_tick(self.symbol)
+        if tick is None:
+            return 0.0, 0.0
+        return tick.bid, tick.ask
+
     def is_trading_session_allowed(self) -> bool:
         """Check if current time is within allowed trading sessions"""
-        if not self.config.get('trading_sessions_enabled', True):
-            return True  # No restrictions if disabled
-        
-        from datetime import datetime
-        
-        # Get current GMT time
-        now_gmt = datetime.utcnow()
-        current_hour = now_gmt.hour
-        current_minute = now_gmt.minute
-        current_time_minutes = current_hour * 60 + current_minute
-        
-        sessions_allowed = []
-        
-        # Check London Session (08:00-16:30 GMT)
-        if self.config.get('london_session_enabled', True):
-            london_start = self._time_to_minutes(self.config.get('london_start', '08:00'))
-            london_end = self._time_to_minutes(self.config.get('london_end', '16:30'))
-            if london_start <= current_time_minutes <= london_end:
-                sessions_allowed.append('LONDON')
-        
-        # Check NY Session (13:00-21:00 GMT)
-        if self.config.get('ny_session_enabled', True):
-            ny_start = self._time_to_minutes(self.config.get('ny_start', '13:00'))
-            ny_end = self._time_to_minutes(self.config.get('ny_end', '21:00'))
-            if ny_start <= current_time_minutes <= ny_end:
-                sessions_allowed.append('NY')
-        
-        # Check Asia Session (22:00-08:00 GMT next day)
-        if self.config.get('asia_session_enabled', False):
-            asia_start = self._time_to_minutes(self.config.get('asia_start', '22:00'))
-            asia_end = self._time_to_minutes(self.config.get('asia_end', '08:00'))
-            # Asia session crosses midnight
-            if current_time_minutes >= asia_start or current_time_minutes <= asia_end:
-                sessions_allowed.append('ASIA')
-        
-        is_allowed = len(sessions_allowed) > 0
+        # Sessions are precompiled into a weekly minute bitmap (see session_calendar)
+        current_time = time.time()  # via time.time() so a replay clock can drive it
+        is_allowed = self.session_calendar.is_open(current_time)
         
         if not is_allowed:
             # Only log once per hour to avoid spam
-            if not hasattr(self, '_last_session_log_time'):
-                self._last_session_log_time = 0
-            
-            current_time = time.time()
             if current_time - self._last_session_log_time > 3600:  # Log every hour
-                logger.debug(f"⏰ Outside trading sessions at {now_gmt.strftime('%H:%M GMT')}")
+                logger.debug("⏰ Outside trading sessions at %s",
+                             datetime.utcfromtimestamp(current_time).strftime('%H:%M GMT'))
                 self._last_session_log_time = current_time
         
         return is_allowed
     
-    @staticmethod
-    def _time_to_minutes(time_str: str) -> int:
-        """Convert HH:MM string to minutes since midnight"""
-        try:
-            parts = time_str.split(':')
-            hours = int(parts[0])
-            minutes = int(parts[1])
-            return hours * 60 + minutes
-        except:
-            return 0
-        
+    def _wait_for_session(self, now: float):
+        """Idle (no ticks analysed) while outside sessions, up to 1 s per call so stop() stays responsive"""
+        next_open = self.session_calendar.next_open(now)
+        if not self._session_idle:
+            self._session_idle = True
+            if next_open is None:
+                logger.info("⏰ No trading session configured - analysis paused")
+            else:
+                logger.info("⏰ Outside trading sessions - analysis paused until %s GMT",
+                            datetime.utcfromtimestamp(next_open).strftime('%a %H:%M'))
+        remaining = 1.0 if next_open is None else next_open - now
+        time.sleep(min(max(remaining, 0.0), 1.0))
+    
     def initialize(self) -> bool:
         """Initialize MT5 connection"""
         try:
@@ -330,8 +382,13 @@ class UltraLowLatencyEngine:
                 logger.info(f"  Mode TP: Risk:Reward (1:{self.config.get('risk_reward_ratio', 2.0)})")
             
             # Store symbol info
-            self.symbol_point = symbol_info.point
-            self.stops_level = symbol_info.trade_stops_level
+            self.symbol_meta.store(self.symbol, symbol_info)
+            self._apply_symbol_meta()
+            
+            symbol_meta = self.symbol_meta.get(self.symbol)
+            filling_mode_str = self.config.get('filling_mode', 'FOK')
+            if symbol_meta.filling_mode and not symbol_meta.supports_filling(filling_mode_str):
+                logger.warning(f"  ⚠️ Mode pengisian {filling_mode_str} nggak didukung {self.symbol} (flags={symbol_meta.filling_mode})")
 
             # ✅ ADD THIS: Warmup fast indicators (JIT compilation)
             if FAST_INDICATORS_AVAILABLE: 
@@ -418,6 +475,7 @@ class UltraLowLatencyEngine:
             # Reset bot-specific daily stats
             self.bot_trades_today = 0
             self.bot_daily_pnl = 0.0
+            self.volume_profile.reset()
             
             self.last_reset_date = today
             logger.info("✓ Daily stats reset complete for bot")
@@ -434,7 +492,7 @@ class UltraLowLatencyEngine:
                 return None
             
             tick_data = TickData(
-                timestamp=tick.time + tick.time_msc / 1000.0,
+                timestamp=tick.time_msc / 1000.0,
                 bid=tick.bid,
                 ask=tick.ask,
                 last=tick.last,
@@ -445,6 +503,7 @@ class UltraLowLatencyEngine:
             # Track latency
             latency = (time.perf_counter() - start_time) * 1000000  # microseconds
             self.latency_samples.append(latency)
+            self.latency['tick_fetch'].record_us(latency)
             
             return tick_data
             
@@ -484,6 +543,7 @@ class UltraLowLatencyEngine:
                 volume_delta = -tick.volume
         
         self.cumulative_delta += volume_delta
+        self.volume_profile.update(tick.last if tick.last > 0 else tick.mid_price, buy_volume, sell_volume)
         
         # Calculate imbalance
         total_volume = buy_volume + sell_volume
@@ -504,6 +564,52 @@ class UltraLowLatencyEngine:
         self.last_tick = tick
         return orderflow
     
+    def calculate_order_flow_batch(self, timestamps, bid, ask, last, volume):
+        """Vectorized calculate_order_flow for a batch of ticks (appends to orderflow_buffer)"""
+        if len(timestamps) == 0:
+            return
+        
+        if self.last_tick is None:
+            # First tick only seeds the aggressor reference
+            self.last_tick = TickData(
+                timestamp=float(timestamps[0]), bid=float(bid[0]), ask=float(ask[0]),
+                last=float(last[0]), volume=int(volume[0]), spread=float(ask[0] - bid[0])
+            )
+            timestamps, bid, ask, last, volume = timestamps[1:], bid[1:], ask[1:], last[1:], volume[1:]
+            if len(timestamps) == 0:
+                return
+        
+        prev_last = np.empty_like(last)
+        prev_last[0] = self.last_tick.last
+        prev_last[1:] = last[:-1]
+        price_change = last - prev_last
+        mid = (bid + ask) * 0.5
+        
+        # Same aggressor rule as calculate_order_flow
+        is_buy = (price_change > 0) | ((price_change == 0) & (last >= mid))
+        buy_volume = np.where(is_buy, volume, 0.0)
+        sell_volume = volume - buy_volume
+        delta = buy_volume - sell_volume
+        cumulative = self.cumulative_delta + np.cumsum(delta)
+        imbalance = np.where(volume > 0, np.where(is_buy, 1.0, -1.0), 0.0)
+        
+        self.volume_profile.update_batch(np.where(last > 0, last, mid), buy_volume, sell_volume)
+        self.orderflow_buffer.extend(
+            timestamp=timestamps,
+            buy_volume=buy_volume,
+            sell_volume=sell_volume,
+            delta=delta,
+            cumulative_delta=cumulative,
+            imbalance_ratio=imbalance
+        )
+        if self.tick_recorder is not None:
+            self.tick_recorder.record_orderflow(timestamps, buy_volume, sell_volume, delta, cumulative, imbalance)
+        self.cumulative_delta = float(cumulative[-1])
+        self.last_tick = TickData(
+            timestamp=float(timestamps[-1]), bid=float(bid[-1]), ask=float(ask[-1]),
+            last=float(last[-1]), volume=int(volume[-1]), spread=float(ask[-1] - bid[-1])
+        )
+    
     def calculate_tick_range_avg(self, prices, period: int):
         """
         Tick Range Average (TRA)
@@ -519,7 +625,7 @@ class UltraLowLatencyEngine:
         if len(self.tick_buffer) < 100:
             return {}
 
-        recent_ticks = list(self.tick_buffer)[-100:]
+        recent = self.tick_buffer.window(100)
 
         # Get config parameters
         ema_fast_period = self.config.get('ema_fast_period', 7)
@@ -531,20 +637,19 @@ class UltraLowLatencyEngine:
         momentum_period = self.config.get('momentum_period', 5)
 
         # Spread analysis
-        spreads = [t.spread for t in recent_ticks]
-        avg_spread = np.mean(spreads)
-        spread_volatility = np.std(spreads)
+        spreads = recent.spread
+        avg_spread = spreads.mean()
+        spread_volatility = spreads.std()
 
         # Price momentum (ultra-short term)
-        prices = np.array([t.mid_price for t in recent_ticks])
+        prices = recent.mid
         price_change = prices[-1] - prices[0]
         price_velocity = price_change / len(prices)
 
         # Order flow imbalance
         if len(self.orderflow_buffer) > 0:
-            recent_flow = list(self.orderflow_buffer)[-50:]
-            avg_delta = np.mean([f.delta for f in recent_flow])
-            cumul_delta = recent_flow[-1].cumulative_delta if recent_flow else 0
+            avg_delta = self.orderflow_buffer.column('delta', 50).mean()
+            cumul_delta = self.orderflow_buffer.latest('cumulative_delta')
         else:
             avg_delta = 0
             cumul_delta = 0
@@ -554,6 +659,37 @@ class UltraLowLatencyEngine:
         volatility = np.std(returns) if len(returns) > 0 else 0
 
         # === OPTIMIZED INDICATOR CALCULATIONS ===
+        if self.use_streaming_indicators:
+            # O(1): values are maintained tick-by-tick in data_collection_loop
+            ema_fast_current, ema_slow_current, rsi, atr, momentum = self.indicators.current
+        else:
+            ema_fast_current, ema_slow_current, rsi, atr, momentum = self._calculate_indicators_window(
+                prices, ema_fast_period, ema_slow_period, rsi_period, atr_period, momentum_period
+            )
+
+        microstructure = {
+            'avg_spread': avg_spread,
+            'spread_volatility': spread_volatility,
+            'price_velocity': price_velocity,
+            'price_change': price_change,
+            'avg_delta': avg_delta,
+            'cumulative_delta': cumul_delta,
+            'volatility': volatility,
+            'tick_count': len(prices),
+            'ema_fast':  ema_fast_current,
+            'ema_slow': ema_slow_current,
+            'rsi': rsi,
+            'atr': atr,
+            'momentum': momentum,
+        }
+        # POC / value area / delta at the current level (cached, O(1) most cycles)
+        microstructure.update(self.volume_profile.snapshot(prices[-1]))
+        return microstructure
+
+
+    def _calculate_indicators_window(self, prices, ema_fast_period, ema_slow_period,
+                                     rsi_period, atr_period, momentum_period):
+        """Recompute indicators over the whole analysis window (non-streaming mode)"""
         use_fast = FAST_INDICATORS_AVAILABLE and len(prices) >= max(ema_slow_period, rsi_period, atr_period)
         
         if use_fast:
@@ -572,14 +708,9 @@ class UltraLowLatencyEngine:
                 rsi_values = rsi_fast(prices, rsi_period)
                 rsi = float(rsi_values[-1])
                 
-                # ATR (using actual high/low if available, else approximate)
-                if hasattr(recent_ticks[0], 'high') and hasattr(recent_ticks[0], 'low'):
-                    high_prices = np.array([t.high for t in recent_ticks])
-                    low_prices = np.array([t.low for t in recent_ticks])
-                else:
-                    # Approximate from mid_price
-                    high_prices = prices * 1.0001
-                    low_prices = prices * 0.9999
+                # ATR (ticks carry no high/low - approximate from mid_price)
+                high_prices = prices * 1.0001
+                low_prices = prices * 0.9999
                 
                 atr_values = atr_fast(high_prices, low_prices, prices, atr_period)
                 atr = float(atr_values[-1])
@@ -609,22 +740,7 @@ class UltraLowLatencyEngine:
                 prices, ema_fast_period, ema_slow_period, rsi_period, atr_period, momentum_period
             )
 
-        return {
-            'avg_spread': avg_spread,
-            'spread_volatility': spread_volatility,
-            'price_velocity': price_velocity,
-            'price_change': price_change,
-            'avg_delta': avg_delta,
-            'cumulative_delta': cumul_delta,
-            'volatility': volatility,
-            'tick_count': len(recent_ticks),
-            'ema_fast':  ema_fast_current,
-            'ema_slow': ema_slow_current,
-            'rsi': rsi,
-            'atr': atr,
-            'momentum': momentum,
-        }
-
+        return ema_fast_current, ema_slow_current, rsi, atr, momentum
 
     def _calculate_indicators_pandas(self, prices, ema_fast_period, ema_slow_period, 
                                     rsi_period, atr_period, momentum_period):
@@ -673,7 +789,7 @@ class UltraLowLatencyEngine:
         # ============================================
         # CHECK IF ML IS ENABLED AND WARN IF NOT READY
         # ============================================
-        enable_ml = self.config.get('enable_ml', False)
+        enable_ml = self.signal_rules.params.enable_ml
         ml_ready = self.ml_predictor is not None and self.ml_predictor.is_trained
         
         if enable_ml and not ml_ready:
@@ -684,78 +800,14 @@ class UltraLowLatencyEngine:
                 logger.warning(f"    Please train the model first using the ML Training tab.")
                 self._ml_not_ready_logged = True
         
-        # Signal generation parameters
-        min_delta_threshold = self.config.get('min_delta_threshold', 100)
-        min_velocity_threshold = self.config.get('min_velocity_threshold', 0.00001)
-        spread_threshold = self.config.get('max_spread', 0.0001)
-        
-        # Check spread condition with rate-limited logging
-        if microstructure['avg_spread'] > spread_threshold:
-            self.log_spread_reject(microstructure['avg_spread'], spread_threshold)
+        # Rules compiled from the config (see signal_rules); reason text is built only on emit
+        params = self.signal_rules.params
+        code, signal_strength, rule_flags = self.signal_rules.evaluate(microstructure, current_tick.mid_price)
+        if code == SPREAD_REJECT:
+            self.log_spread_reject(microstructure['avg_spread'], params.max_spread)
             return None
-        
-        signal_strength = 0.0
-        signal_type = None
-        reason = []
-        
-        # --- Ambil indikator dari microstructure ---
-        ema_fast = microstructure.get('ema_fast', np.nan)
-        ema_slow = microstructure.get('ema_slow', np.nan)
-        rsi = microstructure.get('rsi', np.nan)
-        atr_val = microstructure.get('atr', np.nan)
-        momentum_val = microstructure.get('momentum', np.nan)
-        price = current_tick.mid_price if current_tick else np.nan
-        rsi_overbought = self.config.get('rsi_overbought', 70)
-        rsi_oversold = self.config.get('rsi_oversold', 30)
-
-        # --- Order flow signal ---
-        if microstructure['cumulative_delta'] > min_delta_threshold:
-            # Tambah filter EMA, RSI, Momentum untuk BUY
-            if (
-                not np.isnan(ema_fast) and not np.isnan(ema_slow) and not np.isnan(rsi) and not np.isnan(momentum_val)
-                and price > ema_fast > ema_slow
-                and rsi < rsi_overbought
-                and momentum_val > 0
-            ):
-                signal_strength += 0.4
-                signal_type = 'BUY'
-                reason.append(f"Delta+ & EMA/RSI/Mom OK: Δ={microstructure['cumulative_delta']:.0f}, EMAf={ema_fast:.2f}, EMAs={ema_slow:.2f}, RSI={rsi:.1f}, Mom={momentum_val:.5f}")
-            else:
-                reason.append(f"Delta+ but filter fail: EMA/RSI/Mom")
-        elif microstructure['cumulative_delta'] < -min_delta_threshold:
-            # Tambah filter EMA, RSI, Momentum untuk SELL
-            if (
-                not np.isnan(ema_fast) and not np.isnan(ema_slow) and not np.isnan(rsi) and not np.isnan(momentum_val)
-                and price < ema_fast < ema_slow
-                and rsi > rsi_oversold
-                and momentum_val < 0
-            ):
-                signal_strength += 0.4
-                signal_type = 'SELL'
-                reason.append(f"Delta- & EMA/RSI/Mom OK: Δ={microstructure['cumulative_delta']:.0f}, EMAf={ema_fast:.2f}, EMAs={ema_slow:.2f}, RSI={rsi:.1f}, Mom={momentum_val:.5f}")
-            else:
-                reason.append(f"Delta- but filter fail: EMA/RSI/Mom")
-
-        # --- Momentum signal (tambahan, tetap pakai price_velocity untuk penguat) ---
-        if microstructure['price_velocity'] > min_velocity_threshold:
-            signal_strength += 0.3
-            if signal_type is None:
-                signal_type = 'BUY'
-            elif signal_type == 'BUY':
-                signal_strength += 0.1
-            reason.append(f"Positive momentum: {microstructure['price_velocity']:.6f}")
-        elif microstructure['price_velocity'] < -min_velocity_threshold:
-            signal_strength += 0.3
-            if signal_type is None:
-                signal_type = 'SELL'
-            elif signal_type == 'SELL':
-                signal_strength += 0.1
-            reason.append(f"Negative momentum: {microstructure['price_velocity']:.6f}")
-        
-        # Volatility check
-        if microstructure['volatility'] > self.config.get('max_volatility', 0.001):
-            signal_strength *= 0.5
-            reason.append("High volatility - reduced confidence")
+        signal_type = SIGNAL_TYPES[code]
+        ml_reason = "ML Prediction DISABLED"
         
         # ============================================
         # ML PREDICTION (MANDATORY IF enable_ml=True)
@@ -766,8 +818,9 @@ class UltraLowLatencyEngine:
                 # Model is trained and ready
                 try:
                     # Prepare features for ML prediction
-                    features = self.ml_predictor.prepare_realtime_features(current_tick, microstructure)
-                    ml_direction_num, ml_confidence = self.ml_predictor.predict(features)
+                    with self.latency.measure('ml_predict'):
+                        features = self.ml_predictor.prepare_realtime_features(current_tick, microstructure)
+                        ml_direction_num, ml_confidence = self.ml_predictor.predict(features)
                     
                     # Convert ML direction: 1 = BUY, 0/-1 = SELL
                     ml_direction = 'BUY' if ml_direction_num == 1 else 'SELL'
@@ -776,35 +829,31 @@ class UltraLowLatencyEngine:
                     if signal_type and ml_direction == signal_type:
                         # ML agrees with technical signal - boost confidence significantly
                         signal_strength = min(1.0, signal_strength + (ml_confidence * 0.4))
-                        reason.append(f"✅ ML AGREED: {ml_direction} confidence {ml_confidence:.2f}")
+                        ml_reason = f"✅ ML AGREED: {ml_direction} confidence {ml_confidence:.2f}"
                     elif signal_type and ml_direction != signal_type:
                         # ML disagrees - reduce confidence significantly
                         signal_strength *= (1.0 - ml_confidence * 0.4)
-                        reason.append(f"⚠️  ML DISAGREED: Technical {signal_type} vs ML {ml_direction} ({ml_confidence:.2f})")
+                        ml_reason = f"⚠️  ML DISAGREED: Technical {signal_type} vs ML {ml_direction} ({ml_confidence:.2f})"
                     elif not signal_type and ml_confidence > 0.6:
                         # No technical signal but strong ML signal - ACCEPT ML signal
                         signal_type = ml_direction
                         signal_strength = ml_confidence * 0.8  # ML-driven signal, use higher confidence
-                        reason.append(f"📊 ML SIGNAL ONLY: {ml_direction} confidence {ml_confidence:.2f}")
+                        ml_reason = f"📊 ML SIGNAL ONLY: {ml_direction} confidence {ml_confidence:.2f}"
                     else:
                         # Weak technical signal or weak ML confidence
-                        reason.append(f"📊 ML analyzed: {ml_direction} ({ml_confidence:.2f}) - no override")
+                        ml_reason = f"📊 ML analyzed: {ml_direction} ({ml_confidence:.2f}) - no override"
                         
                 except Exception as e:
                     logger.error(f"❌ ML prediction ERROR: {e}")
-                    reason.append(f"ML ERROR: {str(e)}")
+                    ml_reason = f"ML ERROR: {str(e)}"
             else:
                 # ML enabled but model not trained - reject signal with warning
-                reason.append("⚠️  ML ENABLED but MODEL NOT TRAINED - signal rejected")
                 # Return None to reject all signals until ML is trained
                 if not hasattr(self, '_ml_training_required_logged'):
                     logger.error(f"🚨 SIGNAL REJECTION: ML enabled but model not trained!")
                     logger.error(f"   Please train ML model first via ML Training tab!")
                     self._ml_training_required_logged = True
                 return None
-        else:
-            # ML is not enabled - use technical signals only
-            reason.append("ML Prediction DISABLED")
         
         # Check if we should close position
         if self.position_type is not None:
@@ -832,14 +881,14 @@ class UltraLowLatencyEngine:
                 )
         
         # Generate new signal
-        min_strength = self.config.get('min_signal_strength', 0.6)
+        min_strength = params.min_strength
         
         if signal_type and signal_strength >= min_strength:
             # Calculate SL/TP with minimum distance based on stops level
             atr = microstructure['volatility'] * 10
             
             # Get SL multiplier from config (default 2.0)
-            sl_multiplier = self.config.get('sl_multiplier', 2.0)
+            sl_multiplier = params.sl_multiplier
             
             # Calculate minimum distance based on stops level
             min_distance = self.stops_level * self.symbol_point if self.stops_level > 0 else 0.5
@@ -852,19 +901,19 @@ class UltraLowLatencyEngine:
             )
             
             # Calculate TP based on mode
-            tp_mode = self.config.get('tp_mode', 'RiskReward')
+            tp_mode = params.tp_mode
             
             if tp_mode == 'FixedDollar':
                 # TP based on dollar amount
-                tp_dollar = self.config.get('tp_dollar_amount', 0.5)
-                volume = self.config.get('default_volume', 0.01)
+                tp_dollar = params.tp_dollar
+                volume = params.volume
                 
-                # Get symbol info for calculation
-                symbol_info = mt5.symbol_info(self.symbol)
-                if symbol_info and symbol_info.trade_contract_size > 0:
+                # Get symbol info for calculation (cached, no MT5 call)
+                symbol_meta = self.symbol_meta.get(self.symbol)
+                if symbol_meta and symbol_meta.contract_size > 0:
                     # For commodities/metals: Profit = price_diff × volume × contract_size
                     # Therefore: price_diff = profit / (volume × contract_size)
-                    contract_size = symbol_info.trade_contract_size
+                    contract_size = symbol_meta.contract_size
                     tp_distance_raw = tp_dollar / (volume * contract_size)
                     
                     # Ensure TP distance meets minimum required distance
@@ -877,11 +926,11 @@ class UltraLowLatencyEngine:
                         logger.debug(f"TP Mode: FixedDollar (${tp_dollar:.2f}) = {tp_distance:.5f} price distance")
                 else:
                     # Fallback to risk:reward if symbol info unavailable
-                    tp_distance = sl_distance * self.config.get('risk_reward_ratio', 2.0)
+                    tp_distance = sl_distance * params.risk_reward
                     logger.warning(f"Failed to get symbol info, using Risk:Reward")
             else:
                 # TP based on Risk:Reward ratio (default)
-                tp_distance = sl_distance * self.config.get('risk_reward_ratio', 2.0)
+                tp_distance = sl_distance * params.risk_reward
             
             if signal_type == 'BUY':
                 price = current_tick.ask
@@ -892,7 +941,7 @@ class UltraLowLatencyEngine:
                 sl = price + sl_distance
                 tp = price - tp_distance
             
-            logger.debug(f"SL/TP: distance={sl_distance:.5f} (min={min_distance:.5f}), TP distance={tp_distance:.5f}")
+            logger.debug("SL/TP: distance=%.5f (min=%.5f), TP distance=%.5f", sl_distance, min_distance, tp_distance)
             
             # Increment signals generated counter
             self.signals_generated += 1
@@ -904,37 +953,30 @@ class UltraLowLatencyEngine:
                 price=price,
                 stop_loss=sl,
                 take_profit=tp,
-                volume=self.config.get('default_volume', 0.01),
-                reason=" | ".join(reason)
+                volume=params.volume,
+                reason=" | ".join(self.signal_rules.describe(rule_flags, microstructure) + [ml_reason])
             )
         elif signal_type:
-            # Signal exists but not strong enough - log occasionally
-            if np.random.random() < 0.1:  # Log 10% of weak signals
-                logger.warning(f"⚠️ WEAK SIGNAL: {signal_type} | Strength: {signal_strength:.2f} < {min_strength:.2f}")
-                logger.warning(f"   Thresholds: Delta={min_delta_threshold} | Velocity={min_velocity_threshold:.6f}")
-                logger.warning(f"   Actuals: Delta={microstructure['cumulative_delta']:.0f} | Velocity={microstructure['price_velocity']:.6f}")
+            # Signal exists but not strong enough - sampled per interval
+            log_sampled(logger, logging.WARNING, self._log_keys['weak_signal'], self.log_sample_interval,
+                        "⚠️ WEAK SIGNAL: %s | Strength: %.2f < %.2f | Thresholds: Delta=%s Velocity=%.6f | "
+                        "Actuals: Delta=%.0f Velocity=%.6f",
+                        signal_type, signal_strength, min_strength, params.min_delta, params.min_velocity,
+                        microstructure['cumulative_delta'], microstructure['price_velocity'])
         else:
-            # No signal type at all - log very occasionally to show thresholds
-            if np.random.random() < 0.01:  # 1% of the time
-                logger.info(f"🔍 No signal criteria met.Need: Delta>{min_delta_threshold} OR Velocity>{min_velocity_threshold:.6f}")
-                logger.info(f"   Current: Delta={microstructure['cumulative_delta']:.0f} | Velocity={microstructure['price_velocity']:.6f}")
+            # No signal type at all - occasionally show thresholds
+            log_sampled(logger, logging.INFO, self._log_keys['no_signal'], self.log_sample_interval * 6,
+                        "🔍 No signal criteria met. Need: Delta>%s OR Velocity>%.6f | Current: Delta=%.0f Velocity=%.6f",
+                        params.min_delta, params.min_velocity,
+                        microstructure['cumulative_delta'], microstructure['price_velocity'])
         
         return None
     
     def verify_position_exists(self) -> bool:
         """Check if position actually exists in MT5"""
         try:
-            positions = mt5.positions_get(symbol=self.symbol)
-            if positions is None:
-                return False
-            
             # Check if any position matches our magic number
-            magic = self.config.get('magic_number', 2026002)
-            for pos in positions:
-                if pos.magic == magic:
-                    return True
-            
-            return False
+            return self.position_book.exists()
             
         except Exception as e:
             logger.error(f"Error checking position: {e}")
@@ -950,6 +992,9 @@ class UltraLowLatencyEngine:
                 logger.debug(f"⏰ Signal blocked: Outside trading sessions - {signal.signal_type}")
                 return False
             
+            # One position snapshot for every check in this decision
+            self.position_book.refresh()
+            
             # For multi-position support, only verify positions exist (don't block new signals)
             if self.position_type and signal.signal_type != 'CLOSE':
                 # Verify positions still exist in MT5
@@ -971,13 +1016,11 @@ class UltraLowLatencyEngine:
             # Track execution time
             exec_time = (time.perf_counter() - start_time) * 1000  # milliseconds
             self.execution_times.append(exec_time)
+            self.latency['execute'].record_us(exec_time * 1000)
             
             if result:
-                logger.info(f"✓ Executed {signal.signal_type} | "
-                          f"Price: {signal.price:.5f} | "
-                          f"Strength: {signal.strength:.2f} | "
-                          f"Time: {exec_time:.2f}ms | "
-                          f"Reason: {signal.reason}")
+                logger.info("✓ Executed %s | Price: %.5f | Strength: %.2f | Time: %.2fms | Reason: %s",
+                            signal.signal_type, signal.price, signal.strength, exec_time, signal.reason)
             
             return result
             
@@ -988,18 +1031,7 @@ class UltraLowLatencyEngine:
     def get_total_floating_loss(self) -> float:
         """Calculate total floating loss from all open positions"""
         try:
-            positions = mt5.positions_get(symbol=self.symbol)
-            if positions is None or len(positions) == 0:
-                return 0.0
-            
-            magic = self.config.get('magic_number', 2026002)
-            total_loss = 0.0
-            
-            for pos in positions:
-                if pos.magic == magic and pos.profit < 0:
-                    total_loss += abs(pos.profit)
-            
-            return total_loss
+            return self.position_book.floating_loss()
             
         except Exception as e:
             logger.error(f"Error calculating floating loss: {e}")
@@ -1013,19 +1045,11 @@ class UltraLowLatencyEngine:
                 float: Net floating profit after deducting commission
             """
             try:
-                positions = mt5.positions_get(symbol=self.symbol)
-                if positions is None or len(positions) == 0:
-                    return 0.0
-                
-                magic = self.config.get('magic_number', 2026002)
-                total_profit = 0.0
-                position_count = 0
-                
                 # Sum up all position profits
-                for pos in positions:
-                    if pos.magic == magic:
-                        total_profit += pos.profit
-                        position_count += 1
+                total_profit = self.position_book.floating_pnl()
+                position_count = self.position_book.count()
+                if position_count == 0:
+                    return 0.0
                 
                 # Deduct commission
                 commission_per_trade = float(self.config.get('commission_per_trade', 0.0))
@@ -1054,44 +1078,41 @@ class UltraLowLatencyEngine:
     def close_all_positions(self, reason:  str = "Target reached") -> int:
         """Close all positions with our magic number"""
         try:
-            magic = self.config.get('magic_number', 2026002)
-            positions = mt5.positions_get(symbol=self.symbol)
+            positions = self.position_book.positions()
             
-            if positions is None or len(positions) == 0:
+            if len(positions) == 0:
                 return 0
             
             closed_count = 0
             total_profit = 0.0
             total_commission = 0.0  # ✅ Tambahkan tracker komisi
             
-            for position in positions:
-                if position.magic != magic:
-                    continue
-                
-                # Send close order for this position
-                close_type = mt5.ORDER_TYPE_SELL if position.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY
-                price = mt5.symbol_info_tick(self.symbol).bid if position.type == mt5.ORDER_TYPE_BUY else mt5.symbol_info_tick(self.symbol).ask
-
-                filling_mode_str = self.config.get('filling_mode', 'FOK')
-                filling_mode = self.get_filling_mode(filling_mode_str)
-
-                request = {
-                    "action": mt5.TRADE_ACTION_DEAL,
-                    "symbol": self.symbol,
-                    "volume": position.volume,
-                    "type": close_type,
-                    "position": position.ticket,
-                    "price": price,
-                    "deviation": self.config.get('slippage', 10),
-                    "magic": self.config.get('magic_number', 2026002),
-                    "comment": "AvHFTPro2026_CLOSE",
-                    "type_time": mt5.ORDER_TIME_GTC,
-                    "type_filling": filling_mode,
-                }
-
-                result = mt5.order_send(request)
-                
-                if result.retcode == mt5.TRADE_RETCODE_DONE:
+            # All close requests from one quote snapshot, sent concurrently
+            bid, ask = self.get_latest_quote()
+            report = self.close_executor.close_all(
+                positions,
+                self.symbol,
+                bid,
+                ask,
+                deviation=self.config.get('slippage', 10),
+                magic=self.config.get('magic_number', 2026002),
+                filling_mode=self.get_filling_mode(self.config.get('filling_mode', 'FOK')),
+                comment="AvHFTPro2026_CLOSE"
+            )
+            self.position_book.invalidate()
+            for close in report.results:
+                self.latency['order_send'].record_us(close.latency_ms * 1000)
+            
+            summary = report.summary()
+            point = self.symbol_point or 1.0
+            logger.info(f"⚡ Close-all: {summary['closed']}/{summary['positions']} in {summary['wall_time_ms']:.1f}ms | "
+                        f"Fill avg {summary['fill_latency_avg_ms']:.1f}ms max {summary['fill_latency_max_ms']:.1f}ms | "
+                        f"Slippage avg {summary['slippage_avg'] / point:.1f} pts | Retries {summary['retries']}")
+            for failed in report.failed:
+                logger.warning(f"❌ Gagal nutup posisi #{failed.ticket}: retcode={failed.retcode} ({failed.attempts}x)")
+            
+            for position, close in zip(positions, report.results):
+                if close.ok:
                     closed_count += 1
                     total_profit += position.profit
                     
@@ -1164,6 +1185,8 @@ class UltraLowLatencyEngine:
     
     def open_position(self, order_type: str, signal: Signal) -> bool:
         """Open new position"""
+        pre_trade_start = time.perf_counter()
+        
         # Check floating loss limit
         max_floating_loss = self.config.get('max_floating_loss', 500)
         current_floating_loss = self.get_total_floating_loss()
@@ -1176,14 +1199,7 @@ class UltraLowLatencyEngine:
         # Check max positions (only count positions with our magic number)
         max_positions = self.config.get('max_positions', 3)
         magic = self.config.get('magic_number', 2026002)
-        positions = mt5.positions_get(symbol=self.symbol)
-        
-        # Count only positions with our magic number
-        our_positions_count = 0
-        if positions:
-            for pos in positions:
-                if pos.magic == magic:
-                    our_positions_count += 1
+        our_positions_count = self.position_book.count()
         
         if our_positions_count >= max_positions:
             logger.warning(f"⚠️ Jumlah posisi udah maksimal: {our_positions_count}/{max_positions} (Magic: {magic})")
@@ -1311,8 +1327,7 @@ class UltraLowLatencyEngine:
 
         # Prepare request
         try:
-            symbol_info = mt5.symbol_info(self.symbol)
-            if symbol_info is None:
+            if self.symbol_meta.get(self.symbol) is None:
                 return False
             
             # Validate TP distance before sending order
@@ -1381,7 +1396,11 @@ class UltraLowLatencyEngine:
             # =============================
             # EXECUTE ORDER
             # =============================
+            send_start = time.perf_counter()
+            self.latency.record('pre_trade', send_start - pre_trade_start)
             result = mt5.order_send(request)
+            self.latency.record('order_send', time.perf_counter() - send_start)
+            self.position_book.invalidate()
 
             if result.retcode == mt5.TRADE_RETCODE_DONE:
                 # ✅ INCREMENT BOT'S TRADE COUNTER
@@ -1460,18 +1479,9 @@ class UltraLowLatencyEngine:
         
         try:
             magic = self.config.get('magic_number', 2026002)
-            positions = mt5.positions_get(symbol=self.symbol)
-            
-            if positions is None or len(positions) == 0:
-                self.position_type = None
-                return False
             
             # Find first position with our magic number
-            position = None
-            for pos in positions:
-                if pos.magic == magic:
-                    position = pos
-                    break
+            position = self.position_book.first()
             
             if position is None:
                 logger.warning(f"Nggak nemu posisi dengan magic number {magic}")
@@ -1480,7 +1490,8 @@ class UltraLowLatencyEngine:
             
             # Prepare close request
             close_type = mt5.ORDER_TYPE_SELL if position.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY
-            price = mt5.symbol_info_tick(self.symbol).bid if position.type == mt5.ORDER_TYPE_BUY else mt5.symbol_info_tick(self.symbol).ask
+            bid, ask = self.get_latest_quote()
+            price = bid if position.type == mt5.ORDER_TYPE_BUY else ask
             
             # Get filling mode from config
             filling_mode_str = self.config.get('filling_mode', 'FOK')
@@ -1500,7 +1511,9 @@ class UltraLowLatencyEngine:
                 "type_filling": filling_mode,
             }
             
-            result = mt5.order_send(request)
+            with self.latency.measure('order_send'):
+                result = mt5.order_send(request)
+            self.position_book.invalidate()
             
             if result.retcode == mt5.TRADE_RETCODE_DONE:
                 profit = position.profit
@@ -1585,99 +1598,196 @@ class UltraLowLatencyEngine:
             logger.error(f"Close position error: {e}")
             return False
     
+    def _ingest_tick(self, tick: TickData):
+        """Append one tick to buffers, indicators and order flow"""
+        start_time = time.perf_counter()
+        self.tick_buffer.append(tick)
+        if self.use_streaming_indicators:
+            self.indicators.update(tick.mid_price)
+        
+        # Calculate order flow
+        orderflow = self.calculate_order_flow(tick)
+        if orderflow:
+            self.orderflow_buffer.append(orderflow)
+        
+        if self.tick_recorder is not None:
+            self.tick_recorder.record_tick(tick)
+            if orderflow:
+                self.tick_recorder.record_orderflow_row(orderflow)
+        
+        self.latency.record('order_flow', time.perf_counter() - start_time)
+        self.tick_event.publish()
+    
+    def _ingest_tick_batch(self, ticks):
+        """Append a copy_ticks_from batch to buffers, indicators and order flow"""
+        start_time = time.perf_counter()
+        timestamps = ticks['time_msc'] / 1000.0
+        bid = ticks['bid'].astype(np.float64)
+        ask = ticks['ask'].astype(np.float64)
+        last = ticks['last'].astype(np.float64)
+        volume = ticks['volume'].astype(np.float64)
+        
+        self.tick_buffer.extend_ticks(timestamps, bid, ask, last, volume)
+        if self.tick_recorder is not None:
+            self.tick_recorder.record_ticks(ticks['time_msc'], bid, ask, last, volume)
+        if self.use_streaming_indicators:
+            self.indicators.update_many((bid + ask) * 0.5)
+        self.calculate_order_flow_batch(timestamps, bid, ask, last, volume)
+        
+        self.latency.record('order_flow', time.perf_counter() - start_time)
+        self.tick_event.publish()
+    
+    def _on_market_data(self, ticks, fetch_latency_us):
+        """Market data hub callback (runs on this subscription's delivery thread)"""
+        if fetch_latency_us is not None:
+            self.latency_samples.append(fetch_latency_us)
+            self.latency['tick_fetch'].record_us(fetch_latency_us)
+        self._ingest_tick_batch(ticks)
+    
+    def attach_market_data(self, hub=None):
+        """Subscribe to the shared per-symbol tick feed instead of polling MT5 here"""
+        if self._market_data_subscription is not None:
+            return
+        if hub is None:
+            hub = self.market_data_hub
+        if hub is None:
+            hub = get_market_data_hub(mt5_api=mt5, max_interval=self.config.get('tick_poll_max_interval', 0.05))
+        self.market_data_hub = hub
+        self._market_data_subscription = hub.subscribe(self.symbol, self._on_market_data)
+    
+    def detach_market_data(self):
+        """Release this engine's reference on the shared feed"""
+        if self._market_data_subscription is None:
+            return
+        self.market_data_hub.unsubscribe(self._market_data_subscription)
+        self._market_data_subscription = None
+    
     def data_collection_loop(self):
         """Ultra-fast data collection thread"""
         logger.info("Thread pengambilan data mulai jalan!")
         
         while self.is_running:
             try:
-                # Get tick data
-                tick = self.get_tick_ultra_fast()
-                if tick:
-                    self.tick_buffer.append(tick)
+                if self.tick_fetcher is not None:
+                    # Batch mode: every tick since the last seen time_msc in one call
+                    start_time = time.perf_counter()
+                    ticks = self.tick_fetcher.fetch()
+                    if ticks is None:
+                        # copy_ticks_from failed - fall back to the current tick
+                        ticks = self.tick_fetcher.poll_latest()
+                    latency = (time.perf_counter() - start_time) * 1000000
+                    self.latency_samples.append(latency)
+                    self.latency['tick_fetch'].record_us(latency)
                     
-                    # Calculate order flow
-                    orderflow = self.calculate_order_flow(tick)
-                    if orderflow:
-                        self.orderflow_buffer.append(orderflow)
-                
-                # Sleep for minimal time (adjust based on broker tick frequency)
-                time.sleep(0.001)  # 1ms
+                    if ticks is not None and len(ticks) > 0:
+                        self._ingest_tick_batch(ticks)
+                    
+                    # Poll interval adapts to the observed tick rate
+                    time.sleep(self.tick_fetcher.next_interval)
+                else:
+                    # Get tick data
+                    tick = self.get_tick_ultra_fast()
+                    if tick:
+                        self._ingest_tick(tick)
+                    
+                    # Sleep for minimal time (adjust based on broker tick frequency)
+                    time.sleep(0.001)  # 1ms
                 
             except Exception as e:
                 logger.error(f"Data collection error: {e}")
                 time.sleep(0.1)
     
+    def check_open_positions(self):
+        """Periodic position sync: floating profit / daily target close-all and state reset"""
+        # Check position status and floating loss (only our magic number)
+        magic = self.config.get('magic_number', 2026002)
+        self.position_book.refresh()
+        self.refresh_symbol_meta()
+
+        # Count only our positions
+        pos_count = self.position_book.count()
+
+        floating_loss = self.get_total_floating_loss()
+        max_floating = self.config.get('max_floating_loss', 500)
+
+        # Check floating profit target (total floating profit - commission)
+        floating_profit = self.get_total_floating_profit()  # ✅ Sudah NET (profit - commission)
+        max_profit_target = self.config.get('max_floating_profit', 0.5)
+
+        # ✅ NEW: Check Daily Target Profit
+        daily_pnl = self.get_today_closed_pnl() + floating_profit  # Include both closed & floating
+        daily_target_profit = self.config.get('daily_target_profit', 0)
+
+        if pos_count > 0:
+            commission_per_trade = self.config.get('commission_per_trade', 0.0)
+            total_commission = commission_per_trade * pos_count
+
+            # ✅ FIXED: Added .2f to max_floating
+            logger.info("📊 Status Posisi: %d posisi kebuka (Magic: %s) | Profit (NET): $%.2f | "
+                        "Daily PnL: $%.2f | Commission: $%.2f | Rugi: $%.2f/$%.2f",
+                        pos_count, magic, floating_profit, daily_pnl, total_commission,
+                        floating_loss, max_floating)
+
+            # ✅ NEW: Check Daily Target Profit FIRST (higher priority)
+            if daily_target_profit > 0 and daily_pnl >= daily_target_profit:
+                logger.warning(f"🎯 DAILY TARGET PROFIT REACHED: ${daily_pnl:.2f} >= ${daily_target_profit:.2f}")
+                logger.warning(f"   Tutup semua posisi - Trading target tercapai!")
+                closed = self.close_all_positions(reason=f"Daily_Target_{daily_pnl:.2f}")
+                if closed > 0:
+                    logger.info(f"✓ Berhasil nutup {closed} posisi - Daily target tercapai!")
+            # ✅ UNIFIED CHECK: Gunakan config max_profit_target (hapus hardcoded $1)
+            elif floating_profit >= max_profit_target:
+                logger.warning(f"🎯 Target profit tercapai: ${floating_profit:.2f} >= ${max_profit_target:.2f} (SETELAH KOMISI)")
+                logger.warning(f"   Total Commission Paid: ${total_commission:.2f}")
+                logger.warning(f"   Tutup semua posisi biar profitnya nggak ilang!")
+                closed = self.close_all_positions(reason=f"Profit_Target_{floating_profit:.2f}_net")
+                if closed > 0:
+                    logger.info(f"✓ Berhasil nutup {closed} posisi")
+            # Reset state if no positions exist
+            if not self.verify_position_exists():
+                logger.info(f"🔄 Semua posisi udah ditutup - Reset ulang state")
+                self.position_type = None
+                self.position_volume = 0.0
+                self.position_price = 0.0
+    
     def analysis_loop(self):
         """Market analysis and signal generation thread"""
         logger.info("Thread analisa jalan, siap mantau market!")
         analysis_count = 0
         last_position_check = time.time()
+        last_sequence = 0
         
         while self.is_running:
             try:
                 # Periodic position sync check (every 5 seconds)
                 current_time = time.time()
                 if current_time - last_position_check > 5.0:
-                    # Check position status and floating loss (only our magic number)
-                    magic = self.config.get('magic_number', 2026002)
-                    positions = mt5.positions_get(symbol=self.symbol)
-                    
-                    # Count only our positions
-                    pos_count = 0
-                    if positions:
-                        for pos in positions:
-                            if pos.magic == magic:
-                                pos_count += 1
-                    
-                    floating_loss = self.get_total_floating_loss()
-                    max_floating = self.config.get('max_floating_loss', 500)
-                    
-                    # Check floating profit target (total floating profit - commission)
-                    floating_profit = self.get_total_floating_profit()  # ✅ Sudah NET (profit - commission)
-                    max_profit_target = self.config.get('max_floating_profit', 0.5)
-                    
-                    # ✅ NEW: Check Daily Target Profit
-                    daily_pnl = self.get_today_closed_pnl() + floating_profit  # Include both closed & floating
-                    daily_target_profit = self.config.get('daily_target_profit', 0)
-
-                    if pos_count > 0:
-                        commission_per_trade = self.config.get('commission_per_trade', 0.0)
-                        total_commission = commission_per_trade * pos_count
-                        
-                        # ✅ FIXED: Added .2f to max_floating
-                        logger.info(f"📊 Status Posisi: {pos_count} posisi kebuka (Magic: {magic}) | "
-                                    f"Profit (NET): ${floating_profit:.2f} | "
-                                    f"Daily PnL: ${daily_pnl:.2f} | "
-                                    f"Commission: ${total_commission:.2f} | "
-                                    f"Rugi: ${floating_loss:.2f}/${max_floating:.2f}")  # ← FIXED!
-                        
-                        # ✅ NEW: Check Daily Target Profit FIRST (higher priority)
-                        if daily_target_profit > 0 and daily_pnl >= daily_target_profit:
-                            logger.warning(f"🎯 DAILY TARGET PROFIT REACHED: ${daily_pnl:.2f} >= ${daily_target_profit:.2f}")
-                            logger.warning(f"   Tutup semua posisi - Trading target tercapai!")
-                            closed = self.close_all_positions(reason=f"Daily_Target_{daily_pnl:.2f}")
-                            if closed > 0:
-                                logger.info(f"✓ Berhasil nutup {closed} posisi - Daily target tercapai!")
-                        # ✅ UNIFIED CHECK: Gunakan config max_profit_target (hapus hardcoded $1)
-                        elif floating_profit >= max_profit_target:
-                            logger.warning(f"🎯 Target profit tercapai: ${floating_profit:.2f} >= ${max_profit_target:.2f} (SETELAH KOMISI)")
-                            logger.warning(f"   Total Commission Paid: ${total_commission:.2f}")
-                            logger.warning(f"   Tutup semua posisi biar profitnya nggak ilang!")
-                            closed = self.close_all_positions(reason=f"Profit_Target_{floating_profit:.2f}_net")
-                            if closed > 0:
-                                logger.info(f"✓ Berhasil nutup {closed} posisi")
-                        # Reset state if no positions exist
-                        if not self.verify_position_exists():
-                            logger.info(f"🔄 Semua posisi udah ditutup - Reset ulang state")
-                            self.position_type = None
-                            self.position_volume = 0.0
-                            self.position_price = 0.0
+                    self.check_open_positions()
                     
                     last_position_check = current_time
                 
+                # Outside sessions with nothing open: no signal could execute, so sleep instead
+                if not self.session_calendar.is_open(current_time) and not self.position_book.exists():
+                    self._wait_for_session(current_time)
+                    continue
+                if self._session_idle:
+                    self._session_idle = False
+                    logger.info("⏰ Trading session open - analysis resumed")
+                
+                # Wait for new ticks (or the fixed cadence in 'sleep' mode)
+                sequence, tick_arrival = self._wait_for_analysis_trigger(last_sequence)
+                if self.analysis_trigger == 'event' and sequence == last_sequence:
+                    continue  # timeout without new ticks - loop back for the position check
+                last_sequence = sequence
+                
+                analysis_start = time.perf_counter()
+                self._last_analysis_time = analysis_start
+                if tick_arrival is not None:
+                    self.latency.record('tick_to_analysis', analysis_start - tick_arrival)
+                
                 # Analyze market microstructure
                 microstructure = self.analyze_microstructure()
+                self.latency.record('analysis', time.perf_counter() - analysis_start)
                 
                 if microstructure:
                     analysis_count += 1
@@ -1686,49 +1796,66 @@ class UltraLowLatencyEngine:
                     signal = self.generate_signal(microstructure)
                     
                     if signal:
-                        # Add to signal queue
-                        if not self.signal_queue.full():
-                            self.signal_queue.put(signal)
-                            logger.info(f"📊 SINYAL DIBUAT: {signal.signal_type} | "
-                                      f"Kekuatan: {signal.strength:.2f} | "
-                                      f"Harga: {signal.price:.5f} | "
-                                      f"Alasan: {signal.reason}")
-                        else:
-                            logger.warning("Antrian sinyal penuh, skip dulu ya")
+                        # Hand off to execution (replaces a pending signal of the same type; CLOSE first)
+                        priority = 0 if signal.signal_type == 'CLOSE' else 1
+                        self.signal_mailbox.put(signal.signal_type, signal, priority)
+                        if tick_arrival is not None:
+                            self.latency.record('tick_to_signal', time.perf_counter() - tick_arrival)
+                        logger.info("📊 SINYAL DIBUAT: %s | Kekuatan: %.2f | Harga: %.5f | Alasan: %s",
+                                    signal.signal_type, signal.strength, signal.price, signal.reason)
                     else:
-                        # Log every 10 analyses with diagnostics
-                        if analysis_count % 10 == 0:
-                            logger.info(f"⏳ [{analysis_count}] Spread: {microstructure['avg_spread']:.5f} | "
-                                      f"Delta: {microstructure['cumulative_delta']:.0f} | "
-                                      f"Velocity: {microstructure['price_velocity']:.6f} | "
-                                      f"Volatility: {microstructure['volatility']:.5f}")
-                        # Log every 50 for summary
-                        if analysis_count % 50 == 0:
-                            logger.info(f"⏳ Analyzing market...({analysis_count} analyses, no strong signal yet)")
+                        # Diagnostics and summary sampled by time, not every Nth analysis
+                        log_sampled(logger, logging.INFO, self._log_keys['analysis_diag'], self.log_sample_interval,
+                                    "⏳ [%d] Spread: %.5f | Delta: %.0f | Velocity: %.6f | Volatility: %.5f",
+                                    analysis_count, microstructure['avg_spread'], microstructure['cumulative_delta'],
+                                    microstructure['price_velocity'], microstructure['volatility'])
+                        log_sampled(logger, logging.INFO, self._log_keys['analysis_summary'],
+                                    self.log_sample_interval * 6,
+                                    "⏳ Analyzing market...(%d analyses, no strong signal yet)", analysis_count)
                 else:
                     logger.debug("Waiting for sufficient tick data...")
                 
-                # Analysis frequency
-                time.sleep(self.config.get('analysis_interval', 0.1))  # 100ms
-                
             except Exception as e:
                 logger.error(f"Analysis error: {e}")
                 time.sleep(1)
     
+    def _wait_for_analysis_trigger(self, last_sequence: int):
+        """
+        Block until the next analysis should run
+        
+        Returns:
+            (tick sequence, perf_counter arrival time of the oldest unanalyzed tick or None)
+        """
+        if self.analysis_trigger != 'event':
+            time.sleep(self.config.get('analysis_interval', 0.1))  # 100ms
+            return self.tick_event.consume()
+        
+        # Bounded wait so the periodic position check still runs on a quiet market
+        sequence = self.tick_event.wait(last_sequence, timeout=0.5)
+        if sequence == last_sequence:
+            return sequence, None
+        
+        # Coalescing window / max-rate cap: let more ticks land before analyzing
+        delay = max(self.analysis_coalesce,
+                    self._last_analysis_time + self.analysis_min_gap - time.perf_counter())
+        if delay > 0:
+            time.sleep(delay)
+        return self.tick_event.consume()
+    
     def execution_loop(self):
         """Signal execution thread"""
         logger.info("Thread eksekusi sinyal udah nyala!")
         
         while self.is_running:
             try:
-                # Get signal from queue
-                if not self.signal_queue.empty():
-                    signal = self.signal_queue.get(timeout=1)
-                    
-                    # Execute signal
-                    self.execute_signal(signal)
-                else:
-                    time.sleep(0.01)  # 10ms
+                # Block until a signal is posted (bounded so stop() is noticed)
+                signal, waited = self.signal_mailbox.get(timeout=0.5)
+                if signal is None:
+                    continue
+                self.latency.record('queue_wait', waited)
+                
+                # Execute signal
+                self.execute_signal(signal)
                     
             except Exception as e:
                 logger.error(f"Execution loop error: {e}")
@@ -1745,19 +1872,27 @@ class UltraLowLatencyEngine:
             return False
         
         self.is_running = True
+        if self.config.get('async_logging', True):
+            install_async_logging(self.config.get('log_queue_size', 10000))
         
-        # Start threads
-        self.data_thread = threading.Thread(target=self.data_collection_loop, daemon=True)
+        # Start threads (ticks come from the shared feed when enabled)
+        if self.shared_market_data:
+            self.attach_market_data()
+        else:
+            self.data_thread = threading.Thread(target=self.data_collection_loop, daemon=True)
+            self.data_thread.start()
         self.analysis_thread = threading.Thread(target=self.analysis_loop, daemon=True)
         self.execution_thread = threading.Thread(target=self.execution_loop, daemon=True)
         
-        self.data_thread.start()
         self.analysis_thread.start()
         self.execution_thread.start()
         
         logger.info("✓ Semua thread udah jalan semua!")
         logger.info(f"  Simbol: {self.symbol}")
-        logger.info(f"  Interval analisa: {self.config.get('analysis_interval', 0.1)} detik")
+        if self.analysis_trigger == 'event':
+            logger.info(f"  Analisa: tiap tick baru (maks {self.config.get('analysis_max_rate', 200)}/detik)")
+        else:
+            logger.info(f"  Interval analisa: {self.config.get('analysis_interval', 0.1)} detik")
         logger.info(f"  Volume default: {self.config.get('default_volume', 0.01)}")
         logger.info(f"  Kekuatan sinyal minimal: {self.config.get('min_signal_strength', 0.6)}")
         logger.info(f"  Risk/Reward: {self.config.get('risk_reward_ratio', 2.0)}")
@@ -1778,6 +1913,7 @@ class UltraLowLatencyEngine:
         """Stop HFT engine (TIDAK MENUTUP POSISI!)"""
         logger.info("🛑 Stopping HFT engine...")
         self.is_running = False
+        self.detach_market_data()
         
         # Wait for threads to finish
         if self.data_thread:
@@ -1795,15 +1931,35 @@ class UltraLowLatencyEngine:
             logger.info(f"   Volume: {self.position_volume} | Entry: {self.position_price:.5f}")
             logger.info(f"   💡 Manage position manually or restart bot to continue")
         
+        self.close_executor.shutdown()
+        if self.tick_recorder is not None:
+            self.tick_recorder.close()
+        
         # Shutdown MT5 connection (posisi tetap di server)
         mt5.shutdown()
         logger.info("✓ Engine stopped (positions remain active)")
     
+    def update_config(self, updates: Dict):
+        """Apply config changes to a running engine (rebuilds signal rules, sessions and indicators)"""
+        periods = [self.config.get(key) for key in StreamingIndicators.CONFIG_KEYS]
+        self.config.update(updates)
+        if periods != [self.config.get(key) for key in StreamingIndicators.CONFIG_KEYS]:
+            # New periods: rebuild and re-seed from the buffered mids, then swap in whole
+            indicators = StreamingIndicators.from_config(self.config)
+            if self.use_streaming_indicators:
+                indicators.update_many(self.tick_buffer.column('mid').copy())
+            self.indicators = indicators
+        self.signal_rules = SignalRules.from_config(self.config)
+        self.session_calendar = SessionCalendar.from_config(self.config)
+    
     def get_performance_stats(self) -> Dict:
         """Get performance statistics"""
         trades, wins, losses, daily_pnl = self.get_today_trade_stats()
         win_rate = (wins / trades * 100) if trades > 0 else 0.0
         pos_type, pos_vol = self.get_current_position_info()
+        tick_to_analysis = self.latency['tick_to_analysis']
+        tick_to_signal = self.latency['tick_to_signal']
+        queue_wait = self.latency['queue_wait']
 
         return {
             "tick_latency_avg_us": np.mean(self.latency_samples) if self.latency_samples else 0,
@@ -1811,15 +1967,36 @@ class UltraLowLatencyEngine:
             "tick_latency_min_us": min(self.latency_samples) if self.latency_samples else 0,
             "execution_time_avg_ms": np.mean(self.execution_times) if self.execution_times else 0,
             "execution_time_max_ms": max(self.execution_times) if self.execution_times else 0,
+            "analysis_trigger": self.analysis_trigger,
+            "market_data_subscribers": (self.market_data_hub.subscriber_count(self.symbol)
+                                        if self._market_data_subscription is not None else 0),
+            "tick_to_analysis_avg_ms": tick_to_analysis.mean_us / 1000,
+            "tick_to_signal_avg_ms": tick_to_signal.mean_us / 1000,
+            "tick_to_signal_max_ms": tick_to_signal.max_us / 1000,
+            "queue_wait_avg_ms": queue_wait.mean_us / 1000,
+            "queue_wait_max_ms": queue_wait.max_us / 1000,
+            "signals_coalesced": self.signal_mailbox.coalesced,
+            "signals_expired": self.signal_mailbox.expired,
             "ticks_processed": len(self.tick_buffer),
             "signals_generated": self.signals_generated,
             "trades_today": trades,
             "daily_pnl": daily_pnl,
             "win_rate": win_rate,
             "current_position": pos_type,
-            "position_volume": pos_vol
+            "position_volume": pos_vol,
+            "stage_latency": self.latency.snapshot(),
+            "logging": get_log_pipeline().get_stats() if get_log_pipeline() is not None else {}
         }
     
+    def dump_latency_stats(self, path: str) -> str:
+        """Write per-stage latency percentiles to a JSON file"""
+        return self.latency.dump_json(path, extra={
+            'symbol': self.symbol,
+            'magic_number': self.config.get('magic_number', 2026002),
+            'tick_ingest_mode': self.tick_ingest_mode,
+            'analysis_trigger': self.analysis_trigger,
+        })
+    
     def get_performance_snapshot(self):
         """Get bot-specific performance snapshot with ACTUAL MT5 floating P&L"""
         
@@ -1829,22 +2006,14 @@ class UltraLowLatencyEngine:
         win_rate = (bot_wins / total_trades * 100) if total_trades > 0 else 0.0
         
         # ✅ GET ONLY THIS BOT'S POSITIONS
-        magic = self.config.get('magic_number', 2026002)
-        positions = mt5.positions_get(symbol=self.symbol)
-        
-        bot_floating = 0.0
-        bot_position_count = 0
+        bot_floating = self.position_book.floating_pnl()  # ✅ ONLY THIS BOT!
         bot_position_type = "None"
         bot_position_volume = 0.0
         
-        if positions:
-            for pos in positions:
-                if pos.magic == magic:  # ✅ ONLY THIS BOT! 
-                    bot_floating += pos.profit
-                    bot_position_count += 1
-                    if bot_position_count == 1:  # First position
-                        bot_position_type = "BUY" if pos.type == mt5.ORDER_TYPE_BUY else "SELL"
-                        bot_position_volume = pos.volume
+        first = self.position_book.first()
+        if first is not None:  # First position
+            bot_position_type = "BUY" if first.type == mt5.ORDER_TYPE_BUY else "SELL"
+            bot_position_volume = first.volume
         
         # ✅ GET GLOBAL ACCOUNT BALANCE (shared)
         account = mt5.account_info()
@@ -1890,92 +2059,37 @@ class UltraLowLatencyEngine:
         }
 
     def get_current_positions_count(self):
-        positions = mt5.positions_get(symbol=self.symbol)
-        if positions is None:
-            return 0
-        return len(positions)
+        return self.position_book.count(magic=None)
 
     def get_floating_pnl(self):
-        positions = mt5.positions_get(symbol=self.symbol)
-        if positions is None:
-            return 0.0
-
-        floating = 0.0
-        for p in positions:
-            floating += p.profit  # profit MT5 sudah termasuk swap & commission
-        return floating
-
-    @cache_with_ttl(ttl_seconds=0.5)  # Cache 500ms
+        # profit MT5 sudah termasuk swap & commission
+        return self.position_book.floating_pnl(magic=None)
+
+    def _server_time(self) -> float:
+        """Current MT5 server time in seconds (latest tick, no API call once ticks flow)"""
+        timestamp = self.tick_buffer.latest('timestamp')
+        if timestamp > 0:
+            return timestamp
+        tick = mt5.symbol_info_tick(self.symbol)
+        if tick is not None:
+            return float(tick.time)
+        return time.time()
+    
+    def _update_deal_ledger(self) -> DailyDealLedger:
+        """Fold new deals into the ledger (rate-limited inside the ledger)"""
+        self.deal_ledger.update(self._server_time())
+        return self.deal_ledger
+    
     def get_today_closed_pnl(self):
-        from datetime import datetime, time, timezone
-        import pytz
-
-        # Ambil timezone server MT5
-        tick_info = mt5.symbol_info_tick(self.symbol)
-        if tick_info is not None and hasattr(tick_info, 'time'):
-            server_time = tick_info.time
-            server_dt = datetime.fromtimestamp(server_time)
-            local_dt = datetime.now()
-            offset = local_dt - server_dt
-            now = datetime.now()
-            day_start = datetime.combine(now.date(), time.min)
-            day_start_server = day_start - offset
-            now_server = now - offset
-            deals = mt5.history_deals_get(day_start_server, now_server)
-        else:
-            # Fallback: gunakan waktu lokal tanpa konversi jika info tick tidak tersedia
-            now = datetime.now()
-            day_start = datetime.combine(now.date(), time.min)
-            deals = mt5.history_deals_get(day_start, now)
-        if deals is None:
-            return 0.0
-
-        pnl = 0.0
-        magic = self.config.get('magic_number', 2026002)
-        for d in deals:
-            # ✅ FILTER BY MAGIC NUMBER - only count this bot's P&L
-            if d.magic == magic:
-                pnl += d.profit  # sudah termasuk commission & swap
-
-        return pnl
+        # ✅ Only this bot's P&L (ledger filters by magic number)
+        return self._update_deal_ledger().realized_pnl
 
-    @cache_with_ttl(ttl_seconds=1.0)  # Cache 1 second
     def get_today_trade_count(self):
-        from datetime import datetime, time, timezone
-        import pytz
-
-        tick_info = mt5.symbol_info_tick(self.symbol)
-        if tick_info is not None and hasattr(tick_info, 'time'):
-            server_time = tick_info.time
-            server_dt = datetime.fromtimestamp(server_time)
-            local_dt = datetime.now()
-            offset = local_dt - server_dt
-            now = datetime.now()
-            day_start = datetime.combine(now.date(), time.min)
-            day_start_server = day_start - offset
-            now_server = now - offset
-            deals = mt5.history_deals_get(day_start_server, now_server)
-        else:
-            # Fallback: gunakan waktu lokal tanpa konversi jika info tick tidak tersedia
-            now = datetime.now()
-            day_start = datetime.combine(now.date(), time.min)
-            deals = mt5.history_deals_get(day_start, now)
-        if deals is None:
-            return 0
-
-        trade_count = 0
-        magic = self.config.get('magic_number', 2026002)
-        for d in deals:
-            # ✅ FILTER BY MAGIC NUMBER - only count this bot's trades
-            if d.magic == magic and d.entry == mt5.DEAL_ENTRY_IN:
-                trade_count += 1
-
-        return trade_count
+        # ✅ Only this bot's entries (DEAL_ENTRY_IN)
+        return self._update_deal_ledger().entries
 
     def get_today_total_volume(self):
         """Get total volume traded today for this bot - uses database fallback"""
-        from datetime import datetime, time
-
         # Try risk_manager's database method first (most reliable)
         if self.risk_manager:
             try:
@@ -1987,21 +2101,7 @@ class UltraLowLatencyEngine:
 
         # Fallback to MT5 history deals
         try:
-            now = datetime.now()
-            day_start = datetime.combine(now.date(), time.min)
-            deals = mt5.history_deals_get(day_start, now)
-
-            if deals is None:
-                return 0.0
-
-            total_volume = 0.0
-            magic = self.config.get('magic_number', 2026002)
-
-            for deal in deals:
-                if deal.magic == magic and deal.entry == mt5.DEAL_ENTRY_IN:
-                    total_volume += deal.volume
-
-            return total_volume
+            return self._update_deal_ledger().entry_volume
         except Exception as e:
             logger.error(f"Failed to get total volume from MT5 deals: {e}")
             return 0.0
@@ -2013,75 +2113,19 @@ class UltraLowLatencyEngine:
         Daily P&L = Realized P&L (closed trades) + Unrealized P&L (floating from open positions)
         This ensures Daily P&L reflects ACTUAL MT5 floating actual, not just accumulated trades
         """
-        from datetime import datetime, time, timezone
-        import pytz
-
-        tick = mt5.symbol_info_tick(self.symbol)
-        if tick is None:
-            # Return default values or raise a warning if tick data is unavailable
-            return 0, 0, 0, 0.0
-        server_time = tick.time
-        server_dt = datetime.fromtimestamp(server_time)
-        local_dt = datetime.now()
-        offset = local_dt - server_dt
-
-        now = datetime.now()
-        day_start = datetime.combine(now.date(), time.min)
-
-        day_start_server = day_start - offset
-        now_server = now - offset
-
-        deals = mt5.history_deals_get(day_start_server, now_server)
-        if not deals:
-            # Still need to calculate floating from open positions even if no closed trades
-            realized_pnl = 0.0
-        else:
-            realized_pnl = 0.0
-
-        trades = 0
-        wins = 0
-        losses = 0
-
-        magic = self.config.get('magic_number', 2026002)
-
-        if deals:
-            for d in deals:
-                # ✅ FILTER BY MAGIC NUMBER - only count this bot's trades
-                if d.magic != magic:
-                    continue
-                    
-                realized_pnl += d.profit
-                if d.entry == mt5.DEAL_ENTRY_IN:
-                    trades += 1
-                if d.profit > 0:
-                    wins += 1
-                elif d.profit < 0:
-                    losses += 1
+        ledger = self._update_deal_ledger()
 
         # ✅ GET CURRENT FLOATING P&L FROM OPEN POSITIONS
         # This ensures Daily P&L reflects ACTUAL floating actual from MT5
-        floating_pnl = 0.0
-        positions = mt5.positions_get(symbol=self.symbol)
-        if positions:
-            for pos in positions:
-                if pos.magic == magic:  # Only this bot's positions
-                    floating_pnl += pos.profit
+        floating_pnl = self.position_book.floating_pnl()  # Only this bot's positions
         
         # ✅ TOTAL DAILY P&L = Realized (closed trades) + Unrealized (floating from open positions)
-        total_daily_pnl = realized_pnl + floating_pnl
+        total_daily_pnl = ledger.realized_pnl + floating_pnl
 
-        return trades, wins, losses, total_daily_pnl
+        return ledger.entries, ledger.wins, ledger.losses, total_daily_pnl
 
     def get_total_position_volume(self):
-        positions = mt5.positions_get(symbol=self.symbol)
-        if positions is None:
-            return 0.0
-
-        total_volume = 0.0
-        for p in positions:
-            total_volume += p.volume
-
-        return total_volume
+        return self.position_book.total_volume(magic=None)
 
     def get_account_equity(self):
         """Get account equity (cached)"""
@@ -2094,17 +2138,16 @@ class UltraLowLatencyEngine:
         return snapshot.balance if snapshot else 0.0
     
     # ✅ ADD rate limiting to logging
-    @rate_limit(seconds=5)
     def log_spread_reject(self, spread, threshold):
         """Rate-limited spread rejection logging"""
-        logger.warning(f"⚠️ SPREAD REJECT: {spread:.5f} > {threshold:.5f}")
+        log_sampled(logger, logging.WARNING, self._log_keys['spread_reject'], 5.0,
+                    "⚠️ SPREAD REJECT: %.5f > %.5f", spread, threshold)
 
     def get_current_position_info(self):
-        positions = mt5.positions_get(symbol=self.symbol)
-        if not positions:
+        p = self.position_book.first(magic=None)
+        if p is None:
             return "None", 0.0
 
-        p = positions[0]
         pos_type = "BUY" if p.type == mt5.ORDER_TYPE_BUY else "SELL"
         return pos_type, p.volume
 
@@ -2125,11 +2168,7 @@ class UltraLowLatencyEngine:
             position_type, position_volume = self.get_current_position_info()
             
             # Calculate floating P&L
-            floating_pnl = 0.0
-            positions = mt5.positions_get(symbol=self.symbol)
-            if positions:
-                for pos in positions:
-                    floating_pnl += pos.profit
+            floating_pnl = self.position_book.floating_pnl(magic=None)
             
             # Calculate latency metrics
             latency_avg = sum(self.latency_samples) / len(self.latency_samples) if self.latency_samples else 0
@@ -2155,7 +2194,8 @@ class UltraLowLatencyEngine:
                 'tick_latency_max': latency_max,
                 'exec_time_avg': exec_avg,
                 'exec_time_max': exec_max,
-                'ticks_processed': len(self.tick_buffer)
+                'ticks_processed': len(self.tick_buffer),
+                'stage_latency': self.latency.snapshot()
             }
         except Exception as e:
             logger.error(f"Error getting performance snapshot: {e}")
@@ -0,0 +1,579 @@
+"""
+Backtest Core for Aventa HFT Pro 2026
+StrategyBacktester's bar loop on NumPy column arrays (optionally Numba-compiled)
+"""
+
+import math
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass, astuple
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Exit reason codes stored in the trade rows
+EXIT_STOP_LOSS = 0
+EXIT_TAKE_PROFIT = 1
+EXIT_MAX_FLOATING_LOSS = 2
+EXIT_TP_TARGET = 3
+EXIT_MAX_DURATION = 4
+EXIT_END_OF_BACKTEST = 5
+EXIT_REASONS = ('Stop Loss', 'Take Profit', 'Max Floating Loss', 'TP Target Reached', 'Max Duration',
+                'End of backtest')
+
+# Signal codes: 0 is the legacy "no signal type" (only reachable with min_signal_strength <= 0)
+SIGNAL_BUY = 1
+SIGNAL_SELL = -1
+SIGNAL_TYPES = {SIGNAL_BUY: 'BUY', SIGNAL_SELL: 'SELL', 0: None}
+
+# Trade row layout (flat float64, TRADE_FIELDS per trade)
+T_ENTRY_BAR, T_EXIT_BAR, T_SIGNAL, T_ENTRY_PRICE, T_EXIT_PRICE, T_PROFIT, T_REASON = range(7)
+TRADE_FIELDS = 7
+
+# Simulator state (flat float64)
+S_BALANCE, S_PEAK, S_MAX_DD, S_HAS_POS, S_SIGNAL, S_ENTRY_PRICE, S_ENTRY_BAR, S_SL, S_TP = range(9)
+STATE_FIELDS = 9
+
+# calculate_sl / calculate_tp modes (the fallbacks are what the legacy code returns after a config error)
+SL_ATR, SL_FALLBACK = 0, 1
+TP_FIXED, TP_RISK_REWARD, TP_FALLBACK = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class BarParams:
+    """StrategyBacktester settings resolved once per run (same defaults as the per-bar config reads)"""
+    pip_size: float
+    pip_value: float
+    slippage: float
+    commission: float
+    min_signal: float
+    rsi_overbought: float
+    rsi_oversold: float
+    max_spread_pct: float
+    max_volatility: float
+    min_volume: float
+    avoid_session_edges: float
+    sl_mode: float
+    sl_multiplier: float
+    min_sl_distance: float
+    tp_mode: float
+    tp_distance: float
+    rr_ratio: float
+    max_floating_loss: float
+    max_floating_profit: float
+    max_duration_hours: float
+
+    @classmethod
+    def from_config(cls, config: Dict, pip_size: float, pip_value: float) -> 'BarParams':
+        sl_multiplier = config.get('sl_multiplier', 50.0)
+        tp_mode, tp_distance = TP_FALLBACK, 0.0
+        rr_ratio = config.get('risk_reward_ratio', 2.0)
+        mode = config.get('tp_mode', 'FixedDollar')
+        if mode == 'FixedDollar':
+            tp_dollar = config.get('tp_dollar_amount', 0.8)
+            if tp_dollar > 0 and pip_value != 0:
+                # Same two operations as calculate_tp, so the distance is bit-identical
+                tp_pips = tp_dollar / pip_value
+                tp_mode, tp_distance = TP_FIXED, tp_pips * pip_size
+        elif mode == 'RiskReward' and rr_ratio > 0:
+            tp_mode = TP_RISK_REWARD
+        return cls(
+            pip_size=pip_size,
+            pip_value=pip_value,
+            slippage=config.get('slippage_pips', 0.0) * pip_size,
+            commission=config.get('commission_per_trade', 0.0),
+            min_signal=config.get('min_signal_strength', 0.45),
+            rsi_overbought=config.get('rsi_overbought', 68),
+            rsi_oversold=config.get('rsi_oversold', 32),
+            max_spread_pct=config.get('max_spread_pct', 0.001),
+            max_volatility=config.get('max_volatility', 0.005),
+            min_volume=config.get('min_volume', 0),
+            avoid_session_edges=1.0 if config.get('avoid_session_edges', False) else 0.0,
+            sl_mode=SL_ATR if sl_multiplier > 0 else SL_FALLBACK,
+            sl_multiplier=sl_multiplier,
+            min_sl_distance=config.get('min_sl_pips', 5) * pip_size,
+            tp_mode=tp_mode,
+            tp_distance=tp_distance,
+            rr_ratio=rr_ratio,
+            max_floating_loss=config.get('max_floating_loss', 5.0),
+            max_floating_profit=config.get('max_floating_profit', 0.5),
+            max_duration_hours=config.get('max_trade_duration_hours', 24),
+        )
+
+    def as_tuple(self):
+        return tuple(float(v) for v in astuple(self))
+
+
+def simulate_bars(close, ema_fast, ema_slow, rsi, momentum, atr, spread, volatility, volume, hour,
+                  time_ns, valid, start, stop, close_at_end, params, state, trades, equity):
+    """
+    check_exit / check_entry / update_equity for bars [start, stop) -> trades written
+
+    Reference form of the loop (and the Numba kernel). Arithmetic follows
+    the StrategyBacktester methods operation for operation so trades and
+    equity are bit-identical; comparisons keep their NaN behaviour by being
+    written exactly as the original ``if ...: return`` guards. Column
+    arguments are indexable sequences (lists in Python, arrays under Numba),
+    ``state``/``trades``/``equity`` are updated in place.
+    """
+    (pip_size, pip_value, slippage, commission, min_signal, rsi_overbought, rsi_oversold,
+     max_spread_pct, max_volatility, min_volume, avoid_session_edges, sl_mode, sl_multiplier,
+     min_sl_distance, tp_mode, tp_distance, rr_ratio, max_floating_loss, max_floating_profit,
+     max_duration_hours) = params
+
+    balance = state[S_BALANCE]
+    peak = state[S_PEAK]
+    max_dd = state[S_MAX_DD]
+    has_pos = state[S_HAS_POS] != 0.0
+    signal = int(state[S_SIGNAL])
+    entry_price = state[S_ENTRY_PRICE]
+    entry_bar = int(state[S_ENTRY_BAR])
+    sl = state[S_SL]
+    tp = state[S_TP]
+    n_trades = 0
+
+    for i in range(start, stop + (1 if close_at_end else 0)):
+        if i == stop:
+            # End of backtest: close on the last bar, no equity update
+            if not has_pos:
+                break
+            i = len(close) - 1
+            reason = EXIT_END_OF_BACKTEST
+        else:
+            if not valid[i]:
+                continue
+            reason = -1
+        price = close[i]
+
+        # --- check_exit
+        if has_pos:
+            if reason < 0:
+                if signal == SIGNAL_BUY:
+                    profit = (price - entry_price) / pip_size * pip_value
+                else:
+                    profit = (entry_price - price) / pip_size * pip_value
+                if commission > 0:
+                    profit -= commission
+
+                if (price <= sl) if signal == SIGNAL_BUY else (price >= sl):
+                    reason = EXIT_STOP_LOSS
+                elif (price >= tp) if signal == SIGNAL_BUY else (price <= tp):
+                    reason = EXIT_TAKE_PROFIT
+                elif profit < -max_floating_loss:
+                    reason = EXIT_MAX_FLOATING_LOSS
+                elif profit >= max_floating_profit:
+                    reason = EXIT_TP_TARGET
+                elif max_duration_hours > 0 and \
+                        (time_ns[i] - time_ns[entry_bar]) / 1000000000 / 3600 >= max_duration_hours:
+                    reason = EXIT_MAX_DURATION
+
+            if reason >= 0:
+                # --- close_position
+                if signal == SIGNAL_BUY:
+                    exit_price = price - slippage
+                    profit = (exit_price - entry_price) / pip_size * pip_value
+                else:
+                    exit_price = price + slippage
+                    profit = (entry_price - exit_price) / pip_size * pip_value
+                if commission > 0:
+                    profit -= commission
+                if commission > 0:
+                    profit -= commission
+                    balance -= commission
+                balance += profit
+
+                row = n_trades * TRADE_FIELDS
+                trades[row + T_ENTRY_BAR] = entry_bar
+                trades[row + T_EXIT_BAR] = i
+                trades[row + T_SIGNAL] = signal
+                trades[row + T_ENTRY_PRICE] = entry_price
+                trades[row + T_EXIT_PRICE] = exit_price
+                trades[row + T_PROFIT] = profit
+                trades[row + T_REASON] = reason
+                n_trades += 1
+                has_pos = False
+            if reason == EXIT_END_OF_BACKTEST:
+                break
+
+        # --- check_entry (calculate_signal, filters, calculate_sl / calculate_tp)
+        if not has_pos:
+            ef = ema_fast[i]
+            es = ema_slow[i]
+            r = rsi[i]
+            m = momentum[i]
+            if ef == ef and es == es and r == r and m == m:
+                strength = 0.0
+                sig = 0
+                if ef > es:
+                    strength += 0.3
+                    sig = SIGNAL_BUY
+                elif ef < es:
+                    strength += 0.3
+                    sig = SIGNAL_SELL
+                if r < rsi_oversold and sig != SIGNAL_SELL:
+                    strength += 0.2
+                    sig = SIGNAL_BUY
+                elif r > rsi_overbought and sig != SIGNAL_BUY:
+                    strength += 0.2
+                    sig = SIGNAL_SELL
+                if m > 0 and sig != SIGNAL_SELL:
+                    strength += 0.1
+                    sig = SIGNAL_BUY
+                elif m < 0 and sig != SIGNAL_BUY:
+                    strength += 0.1
+                    sig = SIGNAL_SELL
+                if sig == SIGNAL_SELL:
+                    strength = -strength
+
+                if (abs(strength) >= min_signal
+                        and not (spread[i] * pip_size > price * max_spread_pct)
+                        and not (volatility[i] > max_volatility)
+                        and not (volume[i] < min_volume)
+                        and not (avoid_session_edges != 0.0 and (hour[i] < 2 or hour[i] > 21))):
+                    buy = sig == SIGNAL_BUY
+                    entry_price = price + slippage if buy else price - slippage
+
+                    if sl_mode == SL_ATR:
+                        sl_distance = atr[i] * sl_multiplier
+                        sl = price - sl_distance if buy else price + sl_distance
+                        if abs(sl - price) < min_sl_distance:
+                            sl = price - min_sl_distance if buy else price + min_sl_distance
+                    else:
+                        sl = price * 0.99 if buy else price * 1.01
+
+                    if tp_mode == TP_FIXED:
+                        tp = price + tp_distance if buy else price - tp_distance
+                    elif tp_mode == TP_RISK_REWARD:
+                        rr_distance = abs(price - sl) * rr_ratio
+                        tp = price + rr_distance if buy else price - rr_distance
+                    else:
+                        tp = price * 1.005 if buy else price * 0.995
+
+                    has_pos = True
+                    signal = sig
+                    entry_bar = i
+
+        # --- update_equity
+        current_equity = balance
+        if has_pos:
+            if signal == SIGNAL_BUY:
+                floating = (price - entry_price) / pip_size * pip_value
+            else:
+                floating = (entry_price - price) / pip_size * pip_value
+            if commission > 0:
+                floating -= commission
+            if not math.isnan(floating) and not math.isinf(floating):
+                current_equity += floating
+        if math.isnan(current_equity) or math.isinf(current_equity):
+            current_equity = balance
+        equity[i] = current_equity
+        if current_equity > peak:
+            peak = current_equity
+        if peak > 0:
+            drawdown = ((peak - current_equity) / peak) * 100
+            if drawdown > 0 and drawdown < 100 and not math.isinf(drawdown):
+                if drawdown > max_dd:
+                    max_dd = drawdown
+
+    state[S_BALANCE] = balance
+    state[S_PEAK] = peak
+    state[S_MAX_DD] = max_dd
+    state[S_HAS_POS] = 1.0 if has_pos else 0.0
+    state[S_SIGNAL] = signal
+    state[S_ENTRY_PRICE] = entry_price
+    state[S_ENTRY_BAR] = entry_bar
+    state[S_SL] = sl
+    state[S_TP] = tp
+    return n_trades
+
+
+if NUMBA_AVAILABLE:
+    simulate_bars_jit = njit(cache=True)(simulate_bars)
+
+    @njit(cache=True)
+    def simulate_batch_jit(close, spread, volume, hour, time_ns, valid, series, series_index, start, stop,
+                           close_at_end, params, state, trades, counts, equity):
+        """
+        simulate_bars for every config of a batch over bars [start, stop)
+
+        Indicator columns are rows of ``series`` picked by ``series_index[c]``
+        (ema_fast, ema_slow, rsi, momentum, atr, volatility); ``params``,
+        ``state``, ``trades`` and ``equity`` hold one row per config and
+        ``counts[c]`` receives the number of trades config c wrote.
+        """
+        for c in range(len(counts)):
+            k = series_index[c]
+            counts[c] = simulate_bars_jit(close, series[k[0]], series[k[1]], series[k[2]], series[k[3]],
+                                          series[k[4]], spread, series[k[5]], volume, hour, time_ns, valid,
+                                          start, stop, close_at_end, params[c], state[c], trades[c], equity[c])
+        return 0
+
+
+COLUMNS = ('close', 'ema_fast', 'ema_slow', 'rsi', 'momentum', 'atr', 'spread', 'volatility', 'volume')
+
+# per-config columns of a BatchSimulator, in series_index order
+SERIES_COLUMNS = ('ema_fast', 'ema_slow', 'rsi', 'momentum', 'atr', 'volatility')
+BAR_COLUMNS = tuple(name for name in COLUMNS if name not in SERIES_COLUMNS)
+
+
+def bar_columns(df, names=COLUMNS) -> Dict[str, np.ndarray]:
+    """
+    Indicator DataFrame -> contiguous column arrays for simulate_bars
+
+    ``valid`` is the per-bar null check on OHLCV; a missing ``spread``
+    column becomes +inf, which rejects every entry just like the KeyError
+    the legacy spread check hit. ``names`` limits the float columns
+    (BAR_COLUMNS: the ones a batch shares).
+    """
+    columns = {}
+    for name in names:
+        if name in df.columns:
+            columns[name] = np.ascontiguousarray(df[name].to_numpy(dtype=np.float64, na_value=np.nan))
+        elif name == 'spread':
+            columns[name] = np.full(len(df), np.inf)
+        else:
+            raise ValueError(f"Missing column for backtest core: {name}")
+    times = df['time']
+    columns['hour'] = np.ascontiguousarray(times.dt.hour.to_numpy(dtype=np.int64))
+    columns['time_ns'] = np.ascontiguousarray(times.to_numpy(dtype='datetime64[ns]').view(np.int64))
+    columns['valid'] = np.ascontiguousarray(~df[['open', 'high', 'low', 'close', 'volume']].isnull().any(axis=1)
+                                            .to_numpy())
+    return columns
+
+
+class EquityCurve(Sequence):
+    """
+    Read-only ``[{'time': Timestamp, 'equity': float}, ...]`` over two arrays
+
+    Same items as the list update_equity() builds, materialized on access:
+    a year of M1 bars is ~370k points and building the dicts up front costs
+    more than the whole simulation. ``values`` gives the equity array directly.
+    """
+
+    __slots__ = ('time_ns', 'values')
+
+    def __init__(self, time_ns: np.ndarray, values: np.ndarray):
+        self.time_ns = time_ns
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return {'time': pd.Timestamp(int(self.time_ns[index])), 'equity': float(self.values[index])}
+
+    def __repr__(self):
+        return f"EquityCurve({len(self)} points)"
+
+
+class BarSimulator:
+    """
+    Runs simulate_bars over a bar range at a time, carrying position and equity state
+
+    ``jit`` uses the Numba kernel (compiled on first use, cached on disk);
+    otherwise the reference function runs on Python lists, which index much
+    faster than NumPy arrays from the interpreter.
+    """
+
+    ARGS = COLUMNS + ('hour', 'time_ns', 'valid')
+
+    def __init__(self, columns: Dict[str, np.ndarray], params: BarParams, balance: float,
+                 peak_equity: Optional[float] = None, max_drawdown: float = 0.0, jit: bool = True):
+        self.jit = jit and NUMBA_AVAILABLE
+        if jit and not NUMBA_AVAILABLE:
+            logger.warning("⚠️ Numba not available - backtest core runs in Python")
+        self.n_bars = len(columns['close'])
+        self.params = params.as_tuple()
+        if self.jit:
+            self._kernel = simulate_bars_jit
+            self._columns = tuple(columns[name] for name in self.ARGS)
+            self.state = np.zeros(STATE_FIELDS)
+            self.equity = np.full(self.n_bars, np.nan)
+        else:
+            self._kernel = simulate_bars
+            self._columns = tuple(columns[name].tolist() for name in self.ARGS)
+            self.state = [0.0] * STATE_FIELDS
+            self.equity = [math.nan] * self.n_bars
+        self.state[S_BALANCE] = balance
+        self.state[S_PEAK] = balance if peak_equity is None else peak_equity
+        self.state[S_MAX_DD] = max_drawdown
+        self._valid = columns['valid']
+        self._trade_rows: List[np.ndarray] = []
+        self.last_bar = -1
+
+    def run(self, start: int, stop: int, close_at_end: bool = False) -> int:
+        """Simulate bars [start, stop); ``close_at_end`` then closes any open position on the last bar"""
+        size = (stop - start + 1) * TRADE_FIELDS
+        trades = np.zeros(size) if self.jit else [0.0] * size
+        count = self._kernel(*self._columns, start, stop, close_at_end, self.params, self.state,
+                             trades, self.equity)
+        if count:
+            self._trade_rows.append(np.asarray(trades[:count * TRADE_FIELDS], dtype=np.float64)
+                                    .reshape(count, TRADE_FIELDS))
+        if stop > start:
+            self.last_bar = stop - 1
+        return count
+
+    @property
+    def balance(self) -> float:
+        return float(self.state[S_BALANCE])
+
+    @property
+    def peak_equity(self) -> float:
+        return float(self.state[S_PEAK])
+
+    @property
+    def max_drawdown(self) -> float:
+        return float(self.state[S_MAX_DD])
+
+    @property
+    def has_position(self) -> bool:
+        return self.state[S_HAS_POS] != 0.0
+
+    def trade_rows(self) -> np.ndarray:
+        if not self._trade_rows:
+            return np.zeros((0, TRADE_FIELDS))
+        return np.concatenate(self._trade_rows)
+
+    def equity_curve(self, start: int, time_ns: np.ndarray) -> EquityCurve:
+        """Equity points of the bars simulated from ``start`` (valid bars only, as update_equity records)"""
+        bars = start + np.flatnonzero(np.asarray(self._valid[start:self.last_bar + 1]))
+        return EquityCurve(time_ns[bars], np.asarray(self.equity, dtype=np.float64)[bars])
+
+
+class BatchMember(BarSimulator):
+    """One config of a BatchSimulator, read like a BarSimulator after its runs"""
+
+    def __init__(self, batch: 'BatchSimulator', index: int):
+        self.n_bars = batch.n_bars
+        self.state = batch.state[index]
+        self.equity = batch.equity[index]
+        self._valid = batch.valid
+        self._trade_rows = batch.trade_rows[index]
+        self.last_bar = batch.last_bar
+
+    def run(self, start: int, stop: int, close_at_end: bool = False) -> int:
+        raise TypeError("batch members are simulated through BatchSimulator.run")
+
+
+class BatchSimulator:
+    """
+    simulate_bars for many parameter sets over the same bars, one bar range at a time
+
+    All configs sweep a bar range before the next range starts, so the shared
+    bar columns of the range stay in cache while per-config state lives in
+    rows of the ``state``/``equity`` arrays. Indicator columns differ per
+    config: ``series`` stacks each distinct series once (series x bars) and
+    ``series_index`` (configs x 6, SERIES_COLUMNS order) selects a config's rows.
+    Without Numba each config runs the reference function on lists.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], series: np.ndarray, series_index: np.ndarray,
+                 params: List[BarParams], balance: float, jit: bool = True):
+        self.jit = jit and NUMBA_AVAILABLE
+        if jit and not NUMBA_AVAILABLE:
+            logger.warning("⚠️ Numba not available - backtest core runs in Python")
+        self.n_configs = len(params)
+        self.n_bars = len(columns['close'])
+        self.valid = columns['valid']
+        self.series_index = np.ascontiguousarray(series_index, dtype=np.int64)
+        self.trade_rows: List[List[np.ndarray]] = [[] for _ in range(self.n_configs)]
+        self.last_bar = -1
+        if self.jit:
+            self.params = np.array([p.as_tuple() for p in params], dtype=np.float64).reshape(self.n_configs, -1)
+            self.series = np.ascontiguousarray(series, dtype=np.float64)
+            self._columns = tuple(columns[name] for name in BAR_COLUMNS + ('hour', 'time_ns', 'valid'))
+            self.state = np.zeros((self.n_configs, STATE_FIELDS))
+            self.state[:, S_BALANCE] = balance
+            self.state[:, S_PEAK] = balance
+            self.equity = np.full((self.n_configs, self.n_bars), np.nan)
+            self._trades = np.zeros((self.n_configs, 0))
+        else:
+            self.params = [p.as_tuple() for p in params]
+            rows = [row.tolist() for row in series]
+            shared = {name: columns[name].tolist() for name in BarSimulator.ARGS if name not in SERIES_COLUMNS}
+            self._columns = []
+            for index in self.series_index:
+                config_rows = dict(zip(SERIES_COLUMNS, (rows[k] for k in index)))
+                self._columns.append(tuple(config_rows.get(name, shared.get(name)) for name in BarSimulator.ARGS))
+            self.state = [[balance, balance] + [0.0] * (STATE_FIELDS - 2) for _ in range(self.n_configs)]
+            self.equity = [[math.nan] * self.n_bars for _ in range(self.n_configs)]
+
+    def run(self, start: int, stop: int, close_at_end: bool = False) -> int:
+        """Simulate bars [start, stop) for every config; returns the trades written"""
+        size = (stop - start + 1) * TRADE_FIELDS  # at most one trade per config and bar
+        counts = np.zeros(self.n_configs, dtype=np.int64)
+        if self.jit:
+            if self._trades.shape[1] < size:
+                self._trades = np.zeros((self.n_configs, size))
+            simulate_batch_jit(*self._columns, self.series, self.series_index, start, stop, close_at_end,
+                               self.params, self.state, self._trades, counts, self.equity)
+            for c in np.flatnonzero(counts):
+                self.trade_rows[c].append(self._trades[c, :counts[c] * TRADE_FIELDS]
+                                          .reshape(-1, TRADE_FIELDS).copy())
+        else:
+            for c in range(self.n_configs):
+                trades = [0.0] * size
+                counts[c] = simulate_bars(*self._columns[c], start, stop, close_at_end, self.params[c],
+                                          self.state[c], trades, self.equity[c])
+                if counts[c]:
+                    self.trade_rows[c].append(np.asarray(trades[:counts[c] * TRADE_FIELDS], dtype=np.float64)
+                                              .reshape(-1, TRADE_FIELDS))
+        if stop > start:
+            self.last_bar = stop - 1
+        return int(counts.sum())
+
+    def member(self, index: int) -> BatchMember:
+        return BatchMember(self, index)
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    import time
+
+    print("=" * 60)
+    print("BACKTEST CORE - PERFORMANCE TEST")
+    print("=" * 60)
+
+    rng = np.random.default_rng(11)
+    n = 370000
+    close = 2600.0 + np.cumsum(rng.normal(0, 0.3, n))
+    df = pd.DataFrame({
+        'time': pd.to_datetime(1700000000 + np.arange(n) * 60, unit='s'),
+        'open': close, 'high': close + 0.2, 'low': close - 0.2, 'close': close,
+        'volume': rng.integers(1, 100, n).astype(float), 'spread': rng.integers(5, 30, n),
+    })
+    df['ema_fast'] = df['close'].ewm(span=7, adjust=False).mean()
+    df['ema_slow'] = df['close'].ewm(span=21, adjust=False).mean()
+    df['rsi'] = 50 + 30 * np.sin(np.arange(n) / 40)
+    df['atr'] = 0.4
+    df['momentum'] = df['close'].diff(5)
+    df['volatility'] = 0.0001
+    params = BarParams.from_config({'tp_dollar_amount': 0.8}, pip_size=0.01, pip_value=0.01)
+
+    start = time.perf_counter()
+    columns = bar_columns(df)
+    prep = time.perf_counter() - start
+    print(f"bar_columns():        {prep * 1000:8.1f} ms")
+    for jit in ([True, True, False] if NUMBA_AVAILABLE else [False]):
+        sim = BarSimulator(columns, params, 10000.0, jit=jit)
+        start = time.perf_counter()
+        for chunk in range(50, n, n // 100):
+            sim.run(chunk, min(chunk + n // 100, n))
+        sim.run(n, n, close_at_end=True)
+        elapsed = time.perf_counter() - start
+        label = 'numba' if sim.jit else 'python'
+        print(f"{label:8s} {n} bars:   {elapsed * 1000:8.1f} ms ({n / elapsed / 1e6:.2f} M bars/s), "
+              f"{len(sim.trade_rows())} trades, balance ${sim.balance:,.2f}")
+    print("=" * 60)
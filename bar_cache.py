@@ -0,0 +1,373 @@
+"""
+Bar Cache for Aventa HFT Pro 2026
+On-disk columnar store of historical bars per symbol/timeframe, filled incrementally from MT5
+"""
+
+import os
+import json
+import time
+import glob
+import calendar
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from mt5_sim.constants import timeframe_seconds
+
+logger = logging.getLogger(__name__)
+
+# copy_rates_* layout; other fields a terminal returns are stored as they come
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8'),
+])
+
+MANIFEST = 'manifest.json'
+
+# fetch(symbol, timeframe, date_from, date_to) -> rates array (None on terminal error)
+FetchFn = Callable[[str, int, datetime, datetime], Optional[np.ndarray]]
+
+
+def to_seconds(value) -> int:
+    """datetime (naive = UTC, as the terminal package treats it) or epoch seconds -> int seconds"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return calendar.timegm(value.timetuple())
+        return int(value.timestamp())
+    return int(value)
+
+
+def to_datetime(seconds: int) -> datetime:
+    """Epoch seconds -> naive UTC datetime for copy_rates_range"""
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+
+
+def merge_intervals(intervals: List[List[int]]) -> List[List[int]]:
+    """Union of inclusive integer intervals (touching ones are joined)"""
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def missing_intervals(covered: List[List[int]], start: int, end: int) -> List[Tuple[int, int]]:
+    """Parts of [start, end] not inside any covered interval"""
+    gaps = []
+    cursor = start
+    for lo, hi in covered:
+        if hi < cursor:
+            continue
+        if lo > end:
+            break
+        if lo > cursor:
+            gaps.append((cursor, lo - 1))
+        cursor = max(cursor, hi + 1)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def last_closed_bar(now: float, bar_seconds: int) -> int:
+    """Open time of the newest bar that has closed by ``now``"""
+    return (int(now) - bar_seconds) // bar_seconds * bar_seconds
+
+
+class BarCache:
+    """
+    Bars of one ``{root}/{symbol}/{timeframe}`` series as one raw file per column
+
+    Columns are plain little-endian arrays (``time.<gen>.bin``,
+    ``close.<gen>.bin`` ...) read back with ``np.memmap``, so loading years
+    of M1 bars costs nothing until the pages are touched. ``manifest.json``
+    holds the field dtypes, the bar count and the time ranges already
+    fetched; it is replaced atomically after the columns are written, so a
+    crash never exposes a partial write.
+
+    ``get_rates()`` only asks the terminal for the parts of a range that
+    were never fetched. Bars are only marked fetched once closed; ranges
+    after the last closed bar of the previous fetch (new bars and the one
+    still forming) are fetched again at most every ``refresh_seconds``. New bars are appended
+    in place; backfilling older history rewrites the columns under a new
+    generation number (mapped files are never truncated or replaced, which
+    Windows refuses). One writer per directory: instances in the same
+    process share a lock, separate processes should not fill the same
+    series concurrently.
+    """
+
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, root: str = 'bar_cache', refresh_seconds: float = 86400.0, fetch_days: float = 30.0,
+                 clock: Callable[[], float] = time.time):
+        self.root = root
+        self.refresh_seconds = refresh_seconds
+        self.fetch_seconds = max(1, int(fetch_days * 86400))
+        self.clock = clock
+
+        # Stats
+        self.hits = 0
+        self.fetches = 0
+        self.bars_fetched = 0
+        self.fetch_errors = 0
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'BarCache':
+        return cls(config.get('bar_cache_dir', 'bar_cache'),
+                   refresh_seconds=config.get('bar_cache_refresh_seconds', 86400),
+                   fetch_days=config.get('bar_cache_fetch_days', 30))
+
+    # ------------------------------------------------------------------ storage
+
+    def series_dir(self, symbol: str, timeframe: int) -> str:
+        return os.path.join(self.root, symbol, str(timeframe))
+
+    def _lock(self, directory: str) -> threading.Lock:
+        key = os.path.abspath(directory)
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _read_manifest(directory: str) -> Dict:
+        try:
+            with open(os.path.join(directory, MANIFEST), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'generation': 0, 'fields': [], 'count': 0, 'covered': [], 'fetched_at': 0.0}
+
+    @staticmethod
+    def _write_manifest(directory: str, manifest: Dict):
+        tmp = os.path.join(directory, MANIFEST + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp, os.path.join(directory, MANIFEST))
+
+    @staticmethod
+    def _column_path(directory: str, name: str, generation: int) -> str:
+        return os.path.join(directory, f"{name}.{generation}.bin")
+
+    def _columns(self, directory: str, manifest: Dict) -> Dict[str, np.ndarray]:
+        """Read-only memory maps of the stored columns"""
+        count = manifest['count']
+        fields = manifest['fields'] or [[name, RATES_DTYPE[name].str] for name in RATES_DTYPE.names]
+        columns = {}
+        for name, dtype in fields:
+            if count == 0:
+                columns[name] = np.zeros(0, dtype=dtype)
+            else:
+                columns[name] = np.memmap(self._column_path(directory, name, manifest['generation']),
+                                          dtype=dtype, mode='r', shape=(count,))
+        return columns
+
+    def _store(self, directory: str, manifest: Dict, rates: np.ndarray):
+        """Add fetched bars: append when they are all newer, otherwise merge and rewrite"""
+        rates = np.sort(rates, order='time') if len(rates) > 1 else rates
+        fields = [[name, rates.dtype[name].str] for name in rates.dtype.names]
+        count, generation = manifest['count'], manifest['generation']
+
+        if count and fields != manifest['fields']:
+            stored = dict(manifest['fields'])
+            if set(stored) != set(rates.dtype.names):
+                logger.warning(f"⚠️ Bar fields changed in {directory} - rebuilding cache")
+                count, manifest['covered'] = 0, []
+            else:
+                fields = manifest['fields']
+        if count == 0:
+            manifest['fields'] = fields
+
+        if count:
+            last_time = self._columns(directory, manifest)['time'][-1]
+        if count == 0 or rates['time'][0] > last_time:
+            for name, dtype in manifest['fields']:
+                path = self._column_path(directory, name, generation)
+                with open(path, 'r+b' if count and os.path.exists(path) else 'wb') as f:
+                    f.seek(count * np.dtype(dtype).itemsize)
+                    f.write(np.ascontiguousarray(rates[name], dtype=dtype).tobytes())
+            manifest['count'] = count + len(rates)
+            return
+
+        # Overlap or backfill: newest copy of each bar wins (a refetched bar may have been forming)
+        old = self._columns(directory, manifest)
+        times = np.concatenate([rates['time'].astype(np.int64), np.asarray(old['time'], dtype=np.int64)])
+        unique_times, first = np.unique(times, return_index=True)
+        generation += 1
+        for name, dtype in manifest['fields']:
+            merged = np.concatenate([np.asarray(rates[name], dtype=dtype), np.asarray(old[name])])[first]
+            with open(self._column_path(directory, name, generation), 'wb') as f:
+                f.write(np.ascontiguousarray(merged).tobytes())
+        del old
+        manifest['generation'] = generation
+        manifest['count'] = len(unique_times)
+
+    @staticmethod
+    def _remove_old_generations(directory: str, generation: int):
+        for path in glob.glob(os.path.join(directory, '*.bin')):
+            if not path.endswith(f".{generation}.bin"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass  # still mapped by a reader (Windows) - removed on a later write
+
+    # ------------------------------------------------------------------ queries
+
+    def get_rates(self, symbol: str, timeframe: int, date_from, date_to,
+                  fetch: FetchFn) -> Dict[str, np.ndarray]:
+        """
+        Bars opening within [date_from, date_to] as column arrays (read-only)
+
+        Missing parts of the range are fetched with ``fetch`` (normally
+        ``mt5.copy_rates_range``) in ``fetch_days`` chunks first.
+        """
+        start, end = to_seconds(date_from), to_seconds(date_to)
+        directory = self.series_dir(symbol, timeframe)
+        with self._lock(directory):
+            manifest = self._read_manifest(directory)
+            self._fill(symbol, timeframe, directory, manifest, start, end, fetch)
+            columns = self._columns(directory, manifest)
+        times = columns['time']
+        lo = int(np.searchsorted(times, start))
+        hi = int(np.searchsorted(times, end, side='right'))
+        return {name: values[lo:hi] for name, values in columns.items()}
+
+    def latest(self, symbol: str, timeframe: int, count: int, fetch: FetchFn,
+               max_extensions: int = 4) -> Dict[str, np.ndarray]:
+        """
+        The last ``count`` bars (the cached equivalent of ``copy_rates_from_pos(.., 0, count)``)
+
+        Starts from ``count`` bar lengths before now and doubles the span
+        while weekends and holidays leave it short.
+        """
+        bar_seconds = timeframe_seconds(timeframe) or 60
+        # Server time runs ahead of UTC: ask a day past now so the newest bars are included
+        end = int(self.clock()) + 86400
+        span = count * bar_seconds
+        for _ in range(max_extensions + 1):
+            rates = self.get_rates(symbol, timeframe, end - span, end, fetch)
+            if len(rates['time']) >= count:
+                break
+            span *= 2
+        return {name: values[-count:] for name, values in rates.items()}
+
+    def _fill(self, symbol: str, timeframe: int, directory: str, manifest: Dict, start: int, end: int,
+              fetch: FetchFn):
+        now = self.clock()
+        bar_seconds = timeframe_seconds(timeframe) or 60
+        fresh = now - manifest['fetched_at'] < self.refresh_seconds
+        # Gaps after the last bar that had closed at the previous fetch are new bars (refresh-limited)
+        last_closed = last_closed_bar(manifest['fetched_at'], bar_seconds)
+        gaps = [(lo, hi) for lo, hi in missing_intervals(manifest['covered'], start, end)
+                if not (fresh and lo > last_closed)]
+        if not gaps:
+            self.hits += 1
+            return
+
+        os.makedirs(directory, exist_ok=True)
+        old_generation = manifest['generation']
+        fetched_any = False
+        for gap_start, gap_end in gaps:
+            for chunk_start in range(gap_start, gap_end + 1, self.fetch_seconds):
+                chunk_end = min(chunk_start + self.fetch_seconds - 1, gap_end)
+                rates = fetch(symbol, timeframe, to_datetime(chunk_start), to_datetime(chunk_end))
+                self.fetches += 1
+                if rates is None:
+                    # Terminal error: leave the range uncovered so the next call retries it
+                    self.fetch_errors += 1
+                    logger.warning(f"⚠️ Bar fetch failed for {symbol} {to_datetime(chunk_start)} - "
+                                   f"{to_datetime(chunk_end)}")
+                    continue
+                if len(rates):
+                    self._store(directory, manifest, rates)
+                    self.bars_fetched += len(rates)
+                # Only closed bars are complete; the forming bar is fetched again on the next refresh
+                covered_end = min(chunk_end, last_closed_bar(now, bar_seconds))
+                if covered_end >= chunk_start:
+                    manifest['covered'] = merge_intervals(manifest['covered'] + [[chunk_start, covered_end]])
+                fetched_any = True
+        if fetched_any:
+            manifest['fetched_at'] = now
+        self._write_manifest(directory, manifest)
+        if manifest['generation'] != old_generation:
+            self._remove_old_generations(directory, manifest['generation'])
+
+    def get_stats(self) -> Dict:
+        return {
+            'root': self.root,
+            'hits': self.hits,
+            'fetches': self.fetches,
+            'bars_fetched': self.bars_fetched,
+            'fetch_errors': self.fetch_errors,
+        }
+
+
+def rates_frame(rates):
+    """Column dict (or rates array) -> DataFrame with datetime ``time``, as the backtests build it"""
+    import pandas as pd
+
+    df = pd.DataFrame({name: np.asarray(values) for name, values in rates.items()}
+                      if isinstance(rates, dict) else rates)
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    return df
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    import tempfile
+
+    print("=" * 60)
+    print("BAR CACHE - PERFORMANCE TEST")
+    print("=" * 60)
+
+    t0 = to_seconds(datetime(2023, 1, 2))
+    years = 3
+    all_times = t0 + np.arange(years * 365 * 1440, dtype=np.int64) * 60
+    all_times = all_times[((all_times // 86400 + 3) % 7) < 5]  # weekdays only
+    history = np.zeros(len(all_times), dtype=RATES_DTYPE)
+    history['time'] = all_times
+    history['close'] = 1800.0 + np.cumsum(np.random.default_rng(1).normal(0, 0.3, len(all_times)))
+    calls = []
+
+    def fetch(symbol, timeframe, date_from, date_to):
+        calls.append((date_from, date_to))
+        time.sleep(0.02)  # a terminal round trip
+        lo = np.searchsorted(history['time'], to_seconds(date_from))
+        hi = np.searchsorted(history['time'], to_seconds(date_to), side='right')
+        return history[lo:hi].copy()
+
+    with tempfile.TemporaryDirectory() as root:
+        cache = BarCache(root, clock=lambda: float(all_times[-1] + 60))
+        first_year = (datetime(2023, 1, 2), datetime(2024, 1, 1))
+        start = time.perf_counter()
+        rates = cache.get_rates('XAUUSD', 1, *first_year, fetch)
+        cold = time.perf_counter() - start
+        cold_calls = len(calls)
+
+        start = time.perf_counter()
+        rates = cache.get_rates('XAUUSD', 1, *first_year, fetch)
+        df = rates_frame(rates)
+        warm = time.perf_counter() - start
+
+        start = time.perf_counter()
+        full = cache.get_rates('XAUUSD', 1, datetime(2023, 1, 2), to_datetime(int(all_times[-1])), fetch)
+        extend = time.perf_counter() - start
+        extend_calls = len(calls) - cold_calls
+
+        start = time.perf_counter()
+        full = cache.get_rates('XAUUSD', 1, datetime(2023, 1, 2), to_datetime(int(all_times[-1])), fetch)
+        mean = float(np.mean(full['close']))
+        warm_full = time.perf_counter() - start
+
+        size = sum(os.path.getsize(p) for p in glob.glob(os.path.join(root, 'XAUUSD', '1', '*.bin')))
+        print(f"1 year cold ({cold_calls} fetches):      {cold * 1000:8.1f} ms, {len(rates['time'])} bars")
+        print(f"1 year warm + DataFrame:         {warm * 1000:8.1f} ms ({len(df)} rows)")
+        print(f"extend to {years} years ({extend_calls} fetches):  {extend * 1000:8.1f} ms")
+        print(f"{years} years warm + mean(close):     {warm_full * 1000:8.1f} ms, {len(full['time'])} bars")
+        print(f"on disk: {size / 1e6:.1f} MB | {cache.get_stats()}")
+        del rates, full, df
+    print("=" * 60)
@@ -0,0 +1,743 @@
+"""
+Process-per-Bot Supervisor for Aventa HFT Pro 2026
+Runs each engine in its own worker process fed from one shared-memory tick ring per symbol
+"""
+
+import os
+import time
+import threading
+import logging
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from market_data_hub import Subscription, get_market_data_hub
+
+logger = logging.getLogger(__name__)
+
+RING_DTYPE = np.dtype([('time_msc', 'f8'), ('bid', 'f8'), ('ask', 'f8'), ('last', 'f8'), ('volume', 'f8')])
+RING_HEADER = 64  # bytes; int64 write counter at offset 0
+
+# Workers are always spawned: forking a process that already runs tick threads is unsafe
+_mp = mp.get_context('spawn')
+
+
+class SharedTickRing:
+    """
+    Single-writer, multi-reader tick ring in shared memory
+
+    The writer fills rows first and bumps the write counter last, so a
+    reader never sees a half-written row. Readers that fall more than
+    ``capacity`` ticks behind skip ahead and count the gap as dropped.
+    """
+
+    def __init__(self, name: Optional[str] = None, capacity: int = 65536, create: bool = True):
+        self.capacity = int(capacity)
+        size = RING_HEADER + self.capacity * RING_DTYPE.itemsize
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self._count = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf)
+        self.data = np.ndarray((self.capacity,), dtype=RING_DTYPE, buffer=self.shm.buf, offset=RING_HEADER)
+        if create:
+            self._count[0] = 0
+
+    @property
+    def count(self) -> int:
+        """Ticks written since creation"""
+        return int(self._count[0])
+
+    def write(self, ticks: np.ndarray):
+        """Append a tick batch (any array with time_msc/bid/ask/last/volume fields)"""
+        n = len(ticks)
+        if n == 0:
+            return
+        if n > self.capacity:
+            ticks = ticks[-self.capacity:]
+        position = int(self._count[0])
+        start = (position + n - len(ticks)) % self.capacity
+        first = min(len(ticks), self.capacity - start)
+        for name in RING_DTYPE.names:
+            column = ticks[name]
+            self.data[name][start:start + first] = column[:first]
+            if first < len(ticks):
+                self.data[name][:len(ticks) - first] = column[first:]
+        self._count[0] = position + n
+
+    def read_since(self, position: int):
+        """
+        Copy ticks written after ``position``
+
+        Returns:
+            (ticks, new_position, dropped)
+        """
+        end = int(self._count[0])
+        if end <= position:
+            return self.data[:0].copy(), position, 0
+        start = max(position, end - self.capacity)
+        idx = np.arange(start, end) % self.capacity
+        ticks = self.data[idx]
+
+        # Rows overwritten while copying are discarded
+        overwritten = int(self._count[0]) - self.capacity - start
+        if overwritten > 0:
+            ticks = ticks[overwritten:]
+            start += overwritten
+        return ticks, end, start - position
+
+    def close(self):
+        self._count = None
+        self.data = None
+        self.shm.close()
+
+    def unlink(self):
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedTickSource:
+    """
+    Worker-side tick source backed by a ``SharedTickRing``
+
+    Duck-types ``MarketDataHub`` (subscribe / unsubscribe / subscriber_count)
+    so an engine attaches to it exactly as it would to the in-process hub.
+    """
+
+    def __init__(self, ring_name: str, capacity: int, poll_interval: float = 0.0005, history: int = 2000):
+        self.ring = SharedTickRing(ring_name, capacity, create=False)
+        self.poll_interval = poll_interval
+        self.history = history
+        self._subscribers: Dict[int, Callable] = {}
+        self._next_id = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Stats
+        self.ticks_read = 0
+        self.dropped = 0
+
+    def subscribe(self, symbol: str, callback) -> Subscription:
+        self._next_id += 1
+        self._subscribers[self._next_id] = callback
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name=f"ring_{symbol}", daemon=True)
+            self._thread.start()
+        return Subscription(symbol, self._next_id)
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.pop(subscription.id, None)
+        if not self._subscribers and self._thread is not None:
+            self._running = False
+            if self._thread is not threading.current_thread():
+                self._thread.join(timeout=2)
+            self._thread = None
+
+    def subscriber_count(self, symbol: str = None) -> int:
+        return len(self._subscribers)
+
+    def _run(self):
+        position = max(0, self.ring.count - self.history)
+        while self._running:
+            ticks, position, dropped = self.ring.read_since(position)
+            if dropped:
+                self.dropped += dropped
+                logger.warning(f"Tick ring overrun: {dropped} ticks skipped")
+            if len(ticks):
+                self.ticks_read += len(ticks)
+                for callback in list(self._subscribers.values()):
+                    try:
+                        callback(ticks, None)
+                    except Exception as e:
+                        logger.error(f"Tick ring subscriber error: {e}")
+            else:
+                time.sleep(self.poll_interval)
+
+    def close(self):
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+        self.ring.close()
+
+
+class _Channel:
+    """Thread-safe sending end of a worker pipe"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._lock = threading.Lock()
+
+    def send(self, kind: str, payload=None):
+        with self._lock:
+            try:
+                self.conn.send((kind, payload))
+            except (BrokenPipeError, EOFError, OSError):
+                pass
+
+
+def run_engine_worker(bot_id: str, symbol: str, config: Dict, ring_name: Optional[str], ring_capacity: int,
+                      conn, status_interval: float = 1.0):
+    """
+    Worker process entry point: one UltraLowLatencyEngine fed from the tick ring
+
+    With ``ring_name=None`` (simulated backend) the engine polls its own
+    terminal for ticks instead. With ``enable_ml`` the predictor loads its
+    models from ``config['ml_model_dir']`` (saved there by the GUI); the
+    worker fails to start if they cannot be loaded.
+
+    Protocol (tuples over ``conn``):
+        parent -> worker: ('stop', None), ('update_config', dict), ('dump_latency', path),
+                          ('risk_settings', RiskManager.get_state(SETTING_FIELDS))
+        worker -> parent: ('started', pid), ('failed', reason), ('status', snapshot),
+                          ('telegram', data), ('stopped', None)
+
+    Each status snapshot carries the worker RiskManager's state under ``'risk'``.
+    """
+    channel = _Channel(conn)
+    source = SharedTickSource(ring_name, ring_capacity) if ring_name else None
+    engine = None
+    try:
+        # A simulated backend must be in place before the engine modules import MetaTrader5
+        # (each worker gets its own simulated account and market)
+        from mt5_sim import install_from_config
+        install_from_config(config)
+
+        from aventa_hft_core import UltraLowLatencyEngine
+        from risk_manager import RiskManager
+
+        ml_predictor = None
+        if config.get('enable_ml', False):
+            from ml_predictor import MLPredictor
+            ml_predictor = MLPredictor(symbol, config)
+            model_dir = config.get('ml_model_dir')
+            if model_dir and not ml_predictor.load_models(model_dir):
+                channel.send('failed', f'could not load ML models from {model_dir}')
+                return
+
+        risk_manager = RiskManager(config)
+        engine = UltraLowLatencyEngine(symbol, config, risk_manager, ml_predictor,
+                                       telegram_callback=lambda **data: channel.send('telegram', data))
+        if source is not None:
+            engine.market_data_hub = source
+        if not engine.initialize() or not engine.start():
+            channel.send('failed', 'engine initialization failed')
+            return
+        channel.send('started', os.getpid())
+
+        while True:
+            if conn.poll(status_interval):
+                command, payload = conn.recv()
+                if command == 'stop':
+                    break
+                if command == 'update_config':
+                    engine.update_config(payload)
+                elif command == 'dump_latency':
+                    engine.dump_latency_stats(payload)
+                elif command == 'risk_settings':
+                    risk_manager.apply_state(payload)
+            status = engine.get_performance_snapshot()
+            status['risk'] = risk_manager.get_state()
+            channel.send('status', status)
+    except (EOFError, OSError):
+        logger.warning(f"{bot_id}: supervisor channel closed - stopping")
+    except Exception as e:
+        logger.error(f"{bot_id}: worker error: {e}")
+        channel.send('failed', str(e))
+    finally:
+        if engine is not None and engine.is_running:
+            engine.stop()
+        if source is not None:
+            source.close()
+        channel.send('stopped', None)
+
+
+class BotWorker:
+    """Parent-side record of one worker process"""
+
+    def __init__(self, bot_id: str, symbol: str, config: Dict, telegram_callback: Callable = None,
+                 risk_manager=None):
+        self.bot_id = bot_id
+        self.symbol = symbol
+        self.config = config
+        self.telegram_callback = telegram_callback
+        self.risk_manager = risk_manager  # parent-side copy, updated from status snapshots
+        self.process = None
+        self.conn = None
+        self.pid: Optional[int] = None
+        self.started = threading.Event()
+        self.failure: Optional[str] = None
+        self.status: Dict = {}
+        self.status_time = 0.0
+        self.stopping = False
+        self.restart_times = deque()
+        self.restarts = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+class BotSupervisor:
+    """
+    Launches, monitors and restarts engine worker processes
+
+    One ``SharedTickRing`` per symbol is filled from the in-process
+    ``MarketDataHub`` (so N bots still cost one MT5 poller; this process
+    connects to MT5 for it on the first ring) and read by every worker on
+    that symbol. A worker that dies without being asked to stop is
+    restarted, at most ``max_restarts`` times per ``restart_window`` seconds.
+    """
+
+    def __init__(self, hub=None, ring_capacity: int = 65536, max_restarts: int = 5,
+                 restart_window: float = 300.0, monitor_interval: float = 0.5,
+                 worker_target: Callable = run_engine_worker):
+        """
+        Args:
+            hub: Tick source for the rings (default: process-wide MarketDataHub)
+            ring_capacity: Ticks kept per symbol ring
+            max_restarts / restart_window: Crash-restart budget per bot
+            monitor_interval: Seconds between liveness checks
+            worker_target: Worker entry point (module-level, same signature as run_engine_worker)
+        """
+        self.hub = hub
+        self.ring_capacity = ring_capacity
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.monitor_interval = monitor_interval
+        self.worker_target = worker_target
+
+        self.workers: Dict[str, BotWorker] = {}
+        self._rings: Dict[str, tuple] = {}  # symbol -> (SharedTickRing, Subscription)
+        self._terminal_connected = False
+        self._lock = threading.RLock()
+        self._running = True
+        self._monitor = threading.Thread(target=self._monitor_loop, name="bot_supervisor", daemon=True)
+        self._monitor.start()
+
+    # ---- tick rings -----------------------------------------------------
+
+    def _connect_terminal(self, hub, config: Dict):
+        """
+        Connect this process to MT5 before its hub starts polling
+
+        Workers connect their own engines; the ring feeds run here, in the
+        supervisor's process, which otherwise never calls ``mt5.initialize()``.
+        Hubs without an MT5 API (test / benchmark stubs) are left alone.
+        """
+        api = getattr(hub, 'mt5', None)
+        if api is None or self._terminal_connected:
+            return
+        mt5_path = config.get('mt5_path')
+        if not (api.initialize(mt5_path) if mt5_path else api.initialize()):
+            raise RuntimeError(f"MT5 initialization failed in the supervisor process: {api.last_error()}")
+        self._terminal_connected = True
+
+    def _acquire_ring(self, symbol: str, config: Dict) -> SharedTickRing:
+        entry = self._rings.get(symbol)
+        if entry is None:
+            hub = self.hub if self.hub is not None else get_market_data_hub()
+            self._connect_terminal(hub, config)
+            ring = SharedTickRing(capacity=self.ring_capacity)
+            subscription = hub.subscribe(symbol, lambda ticks, fetch_us: ring.write(ticks))
+            entry = (ring, subscription)
+            self._rings[symbol] = entry
+        return entry[0]
+
+    def _release_ring(self, symbol: str):
+        if any(w.symbol == symbol for w in self.workers.values()):
+            return
+        entry = self._rings.pop(symbol, None)
+        if entry is None:
+            return
+        ring, subscription = entry
+        hub = self.hub if self.hub is not None else get_market_data_hub()
+        hub.unsubscribe(subscription)
+        ring.close()
+        ring.unlink()
+
+    def ring(self, symbol: str) -> Optional[SharedTickRing]:
+        entry = self._rings.get(symbol)
+        return entry[0] if entry else None
+
+    # ---- lifecycle ------------------------------------------------------
+
+    def _spawn(self, worker: BotWorker):
+        # A simulated worker trades on its own terminal, so it reads that terminal's ticks too
+        if worker.config.get('mt5_backend', 'terminal') == 'simulator':
+            ring = None
+        else:
+            ring = self._acquire_ring(worker.symbol, worker.config)
+        parent_conn, child_conn = _mp.Pipe()
+        worker.conn = parent_conn
+        worker.started.clear()
+        worker.failure = None
+        worker.process = _mp.Process(
+            target=self.worker_target,
+            args=(worker.bot_id, worker.symbol, worker.config, ring.name if ring else None,
+                  ring.capacity if ring else 0, child_conn),
+            name=f"bot_{worker.bot_id}",
+            daemon=True,
+        )
+        worker.process.start()
+        child_conn.close()
+
+    def start_bot(self, bot_id: str, symbol: str, config: Dict,
+                  telegram_callback: Callable = None, wait: float = 0.0, risk_manager=None) -> BotWorker:
+        """
+        Launch a worker process for ``bot_id``
+
+        Args:
+            wait: Seconds to wait for the worker to report 'started' (0 = don't wait)
+            risk_manager: Parent-side RiskManager kept in step with the worker's
+        """
+        with self._lock:
+            if bot_id in self.workers and self.workers[bot_id].alive:
+                raise RuntimeError(f"{bot_id} is already running")
+            worker = BotWorker(bot_id, symbol, dict(config), telegram_callback, risk_manager)
+            self.workers[bot_id] = worker
+            try:
+                self._spawn(worker)
+            except Exception:
+                self.workers.pop(bot_id, None)
+                self._release_ring(symbol)
+                raise
+        logger.info(f"Supervisor: {bot_id} started ({symbol})")
+        if wait > 0:
+            self.wait_started(bot_id, wait)
+        return worker
+
+    def wait_started(self, bot_id: str, timeout: float) -> bool:
+        """True once the worker reported 'started' (False on failure or timeout)"""
+        worker = self.workers[bot_id]
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if worker.started.wait(0.05):
+                return True
+            if worker.failure is not None:
+                return False
+        return False
+
+    def stop_bot(self, bot_id: str, timeout: float = 10.0):
+        """Ask a worker to stop; terminate it if it does not exit in time"""
+        with self._lock:
+            worker = self.workers.get(bot_id)
+            if worker is None:
+                return
+            worker.stopping = True
+        self.send(bot_id, 'stop')
+        if worker.process is not None:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                logger.warning(f"Supervisor: {bot_id} did not stop in {timeout:.0f}s - terminating")
+                worker.process.terminate()
+                worker.process.join(2)
+        with self._lock:
+            self.workers.pop(bot_id, None)
+            self._release_ring(worker.symbol)
+        logger.info(f"Supervisor: {bot_id} stopped")
+
+    def send(self, bot_id: str, command: str, payload=None) -> bool:
+        worker = self.workers.get(bot_id)
+        if worker is None or worker.conn is None:
+            return False
+        try:
+            worker.conn.send((command, payload))
+            return True
+        except (BrokenPipeError, EOFError, OSError):
+            return False
+
+    def get_status(self, bot_id: str) -> Dict:
+        """Latest status snapshot reported by the worker"""
+        worker = self.workers.get(bot_id)
+        return worker.status if worker else {}
+
+    def shutdown(self, timeout: float = 10.0):
+        for bot_id in list(self.workers):
+            self.stop_bot(bot_id, timeout)
+        self._running = False
+        self._monitor.join(timeout=2)
+
+    # ---- monitoring -----------------------------------------------------
+
+    def _drain(self, worker: BotWorker):
+        conn = worker.conn
+        try:
+            while conn is not None and conn.poll():
+                kind, payload = conn.recv()
+                if kind == 'status':
+                    worker.status = payload
+                    worker.status_time = time.time()
+                    if worker.risk_manager is not None and 'risk' in payload:
+                        worker.risk_manager.apply_state(payload['risk'])
+                elif kind == 'started':
+                    worker.pid = payload
+                    worker.started.set()
+                elif kind == 'failed':
+                    worker.failure = payload
+                    logger.error(f"Supervisor: {worker.bot_id} failed: {payload}")
+                elif kind == 'telegram' and worker.telegram_callback is not None:
+                    try:
+                        worker.telegram_callback(**payload)
+                    except Exception as e:
+                        logger.error(f"Supervisor: telegram callback error: {e}")
+        except (EOFError, OSError):
+            pass
+
+    def _maybe_restart(self, worker: BotWorker):
+        now = time.monotonic()
+        while worker.restart_times and now - worker.restart_times[0] > self.restart_window:
+            worker.restart_times.popleft()
+        if len(worker.restart_times) >= self.max_restarts:
+            if worker.failure != 'restart budget exhausted':
+                worker.failure = 'restart budget exhausted'
+                logger.error(f"Supervisor: {worker.bot_id} crashed {self.max_restarts}x in "
+                             f"{self.restart_window:.0f}s - not restarting")
+            return
+        exitcode = worker.process.exitcode
+        worker.restart_times.append(now)
+        worker.restarts += 1
+        logger.warning(f"Supervisor: {worker.bot_id} exited (code {exitcode}) - restarting "
+                       f"({worker.restarts})")
+        self._spawn(worker)
+
+    def _monitor_loop(self):
+        while self._running:
+            with self._lock:
+                for worker in list(self.workers.values()):
+                    self._drain(worker)
+                    if (not worker.stopping and worker.process is not None
+                            and not worker.process.is_alive()):
+                        self._maybe_restart(worker)
+            time.sleep(self.monitor_interval)
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Per-bot process state"""
+        return {
+            bot_id: {
+                'symbol': w.symbol,
+                'pid': w.pid,
+                'alive': w.alive,
+                'restarts': w.restarts,
+                'status_age_s': time.time() - w.status_time if w.status_time else None,
+                'failure': w.failure,
+            }
+            for bot_id, w in list(self.workers.items())
+        }
+
+    def engine_proxy(self, bot_id: str, symbol: str, config: Dict,
+                     telegram_callback: Callable = None, risk_manager=None) -> 'RemoteEngine':
+        return RemoteEngine(self, bot_id, symbol, config, telegram_callback, risk_manager=risk_manager)
+
+
+class RemoteEngine:
+    """
+    Stand-in for UltraLowLatencyEngine when the bot runs in a worker process
+
+    Covers the calls the GUI makes on ``bot['engine']``. ``risk_manager``
+    (the GUI's ``bot['risk_manager']``) mirrors the worker's risk state;
+    changes the GUI makes to it reach the worker via ``push_risk_settings()``.
+    """
+
+    def __init__(self, supervisor: BotSupervisor, bot_id: str, symbol: str, config: Dict,
+                 telegram_callback: Callable = None, start_timeout: float = 30.0, risk_manager=None):
+        self.supervisor = supervisor
+        self.bot_id = bot_id
+        self.symbol = symbol
+        self.config = config
+        self.telegram_callback = telegram_callback
+        self.start_timeout = start_timeout
+        self.risk_manager = risk_manager
+
+    @property
+    def is_running(self) -> bool:
+        worker = self.supervisor.workers.get(self.bot_id)
+        return worker is not None and worker.alive
+
+    def initialize(self) -> bool:
+        """Launch the worker and wait until its engine is connected and running"""
+        try:
+            self.supervisor.start_bot(self.bot_id, self.symbol, self.config, self.telegram_callback,
+                                      risk_manager=self.risk_manager)
+        except RuntimeError as e:
+            logger.error(f"{self.bot_id}: {e}")
+            return False
+        if self.supervisor.wait_started(self.bot_id, self.start_timeout):
+            return True
+        self.supervisor.stop_bot(self.bot_id, timeout=2)
+        return False
+
+    def start(self) -> bool:
+        return self.is_running  # the worker starts its engine during initialize()
+
+    def stop(self):
+        self.supervisor.stop_bot(self.bot_id)
+
+    def get_performance_snapshot(self) -> Dict:
+        return self.supervisor.get_status(self.bot_id)
+
+    def dump_latency_stats(self, path: str) -> str:
+        self.supervisor.send(self.bot_id, 'dump_latency', path)
+        return path
+
+    def push_risk_settings(self) -> bool:
+        """Send the GUI-side risk limits and circuit breaker state to the worker's RiskManager"""
+        if self.risk_manager is None:
+            return False
+        return self.supervisor.send(self.bot_id, 'risk_settings',
+                                    self.risk_manager.get_state(self.risk_manager.SETTING_FIELDS))
+
+
+# === BENCHMARK WORKER ===
+def run_analysis_worker(bot_id: str, symbol: str, config: Dict, ring_name: str, ring_capacity: int,
+                        conn, status_interval: float = 0.25):
+    """
+    CPU-bound stand-in for an engine: re-analyzes the latest tick window in a tight loop
+
+    Used by the scaling benchmark and tests; speaks the same protocol as
+    ``run_engine_worker`` (status payload: {'analyses': n, 'ticks': n}).
+    """
+    from ring_buffer import TickRingBuffer
+    from streaming_indicators import StreamingIndicators
+
+    channel = _Channel(conn)
+    source = SharedTickSource(ring_name, ring_capacity)
+    buffer = TickRingBuffer(capacity=5000)
+    indicators = StreamingIndicators.from_config(config)
+    lock = threading.Lock()
+
+    def on_ticks(ticks, fetch_us):
+        with lock:
+            buffer.extend_ticks(ticks['time_msc'] / 1000.0, ticks['bid'], ticks['ask'], ticks['last'], ticks['volume'])
+            indicators.update_many((ticks['bid'] + ticks['ask']) * 0.5)
+
+    subscription = source.subscribe(symbol, on_ticks)
+    channel.send('started', os.getpid())
+    analyses = 0
+    next_status = time.monotonic() + status_interval
+    try:
+        while True:
+            if len(buffer) >= 100:
+                with lock:
+                    window = buffer.window(100)
+                prices = window.mid
+                returns = np.diff(prices)
+                _ = (window.spread.mean(), window.spread.std(), returns.std(), prices[-1] - prices[0])
+                # Pure-Python work dominates a real analysis cycle (dict building, rules, logging)
+                acc = 0.0
+                for p in prices.tolist():
+                    acc += p * 1e-9
+                analyses += 1
+            if time.monotonic() >= next_status:
+                channel.send('status', {'analyses': analyses, 'ticks': source.ticks_read})
+                next_status += status_interval
+                if conn.poll():
+                    command, payload = conn.recv()
+                    if command == 'stop':
+                        break
+            elif len(buffer) < 100:
+                time.sleep(0.001)
+    except (EOFError, OSError):
+        pass
+    finally:
+        source.unsubscribe(subscription)
+        source.close()
+        channel.send('stopped', None)
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    class _SyntheticHub:
+        """Pushes a synthetic 1000 ticks/s stream straight into subscribers"""
+
+        def __init__(self):
+            self._subscribers = {}
+            self._next_id = 0
+            self._running = True
+            threading.Thread(target=self._run, daemon=True).start()
+
+        def subscribe(self, symbol, callback):
+            self._next_id += 1
+            self._subscribers[self._next_id] = callback
+            return Subscription(symbol, self._next_id)
+
+        def unsubscribe(self, subscription):
+            self._subscribers.pop(subscription.id, None)
+
+        def _run(self):
+            i = 0
+            while self._running:
+                n = 10
+                bid = 2600.0 + np.sin((i + np.arange(n)) / 50.0)
+                ticks = np.zeros(n, dtype=RING_DTYPE)
+                ticks['time_msc'] = time.time() * 1000
+                ticks['bid'], ticks['ask'], ticks['last'], ticks['volume'] = bid, bid + 0.1, bid, 1.0
+                for callback in list(self._subscribers.values()):
+                    callback(ticks, 0.0)
+                i += n
+                time.sleep(0.01)
+
+    def _measure(bots: int, use_processes: bool, seconds: float = 3.0) -> float:
+        hub = _SyntheticHub()
+        totals = {}
+        if use_processes:
+            supervisor = BotSupervisor(hub=hub, worker_target=run_analysis_worker, monitor_interval=0.05)
+            for i in range(bots):
+                supervisor.start_bot(f"bot{i}", "XAUUSD", {}, wait=20)
+            time.sleep(1.0)
+            before = {b: supervisor.get_status(b).get('analyses', 0) for b in supervisor.workers}
+            time.sleep(seconds)
+            after = {b: supervisor.get_status(b).get('analyses', 0) for b in supervisor.workers}
+            supervisor.shutdown()
+            totals = {b: after[b] - before[b] for b in after}
+        else:
+            ring = SharedTickRing(capacity=65536)
+            sub = hub.subscribe("XAUUSD", lambda ticks, us: ring.write(ticks))
+            pipes, threads, latest = [], [], {}
+            for i in range(bots):
+                parent, child = mp.Pipe()
+                t = threading.Thread(target=run_analysis_worker,
+                                     args=(f"bot{i}", "XAUUSD", {}, ring.name, ring.capacity, child), daemon=True)
+                t.start()
+                pipes.append(parent)
+                threads.append(t)
+
+            def drain():
+                for i, p in enumerate(pipes):
+                    while p.poll():
+                        kind, payload = p.recv()
+                        if kind == 'status':
+                            latest[i] = payload['analyses']
+
+            time.sleep(1.0)
+            drain()
+            before = dict(latest)
+            time.sleep(seconds)
+            drain()
+            totals = {i: latest.get(i, 0) - before.get(i, 0) for i in range(bots)}
+            for p in pipes:
+                p.send(('stop', None))
+            for t in threads:
+                t.join(5)
+            hub.unsubscribe(sub)
+            ring.close()
+            ring.unlink()
+        hub._running = False
+        return sum(totals.values()) / seconds
+
+    print("=" * 60)
+    print(f"PROCESS-PER-BOT - ANALYSIS THROUGHPUT ({os.cpu_count()} CPU cores)")
+    print("=" * 60)
+    print(f"{'bots':>5s}{'threads (1 GIL)':>20s}{'processes':>16s}")
+    for bots in (1, 2, 4, 8):
+        threaded = _measure(bots, use_processes=False)
+        processes = _measure(bots, use_processes=True)
+        print(f"{bots:>5d}{threaded:>15.0f} /s{processes:>12.0f} /s")
+    print("=" * 60)
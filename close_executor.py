@@ -0,0 +1,259 @@
+"""
+Parallel Close-All Executor for Aventa HFT Pro 2026
+Closes many positions concurrently from one quote snapshot
+"""
+
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fallback values, used only when the mt5 API does not define the constant
+TRADE_RETCODE_DONE = 10009
+# Retcodes worth retrying at a fresh price
+RETRY_RETCODES = {
+    'TRADE_RETCODE_REQUOTE': 10004,
+    'TRADE_RETCODE_PRICE_CHANGED': 10020,
+    'TRADE_RETCODE_PRICE_OFF': 10021,
+}
+
+
+@dataclass
+class CloseResult:
+    """Outcome of closing one position"""
+    ticket: int
+    volume: float
+    profit: float
+    requested_price: float
+    fill_price: float
+    retcode: int
+    attempts: int
+    latency_ms: float
+    closing_buy: bool  # True when the position being closed is a BUY (closed at bid)
+    ok: bool  # retcode is the API's TRADE_RETCODE_DONE
+
+    @property
+    def slippage(self) -> float:
+        """Adverse slippage in price units (positive = worse than requested)"""
+        if not self.ok or not self.fill_price:
+            return 0.0
+        if self.closing_buy:
+            return self.requested_price - self.fill_price
+        return self.fill_price - self.requested_price
+
+
+@dataclass
+class CloseAllReport:
+    """Aggregated result of one close-all"""
+    results: List[CloseResult] = field(default_factory=list)
+    wall_time_ms: float = 0.0
+
+    @property
+    def closed(self) -> List[CloseResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> List[CloseResult]:
+        return [r for r in self.results if not r.ok]
+
+    def summary(self) -> Dict:
+        closed = self.closed
+        latencies = [r.latency_ms for r in closed]
+        slippages = [r.slippage for r in closed]
+        return {
+            'positions': len(self.results),
+            'closed': len(closed),
+            'failed': len(self.results) - len(closed),
+            'retries': sum(r.attempts - 1 for r in self.results),
+            'wall_time_ms': self.wall_time_ms,
+            'fill_latency_avg_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+            'fill_latency_max_ms': max(latencies) if latencies else 0.0,
+            'slippage_avg': sum(slippages) / len(slippages) if slippages else 0.0,
+            'slippage_max': max(slippages) if slippages else 0.0,
+            'profit': sum(r.profit for r in closed),
+        }
+
+
+class ParallelCloseExecutor:
+    """
+    Sends close orders for many positions through a bounded worker pool
+
+    All requests are built up front from one (bid, ask) snapshot. Requotes and
+    price-changed rejections are retried at a fresh price read from the
+    terminal (``symbol_info_tick``, or ``quote_fn`` if given) - never at the
+    snapshot price that was just rejected.
+    With ``serialize=True`` order_send calls go through a single lock (for
+    terminals that do not accept concurrent requests) while request building
+    and bookkeeping still overlap.
+    """
+
+    def __init__(self, mt5_api=None, max_workers: int = 4, max_retries: int = 2,
+                 serialize: bool = False, quote_fn: Callable[[str], Optional[Tuple[float, float]]] = None):
+        """
+        Args:
+            mt5_api: MetaTrader5 module (or a compatible fake); imported lazily if None
+            max_workers: Max concurrent order_send calls
+            max_retries: Extra attempts after a requote / price change
+            serialize: Funnel order_send through one lock
+            quote_fn: Returns a fresh (bid, ask) for a symbol on retries (None = unavailable);
+                defaults to mt5.symbol_info_tick
+        """
+        if mt5_api is None:
+            import MetaTrader5 as mt5_api
+        self.mt5 = mt5_api
+        self.retcode_done = getattr(mt5_api, 'TRADE_RETCODE_DONE', TRADE_RETCODE_DONE)
+        self.retry_retcodes = frozenset(getattr(mt5_api, name, code) for name, code in RETRY_RETCODES.items())
+        self.max_workers = max(1, int(max_workers))
+        self.max_retries = max(0, int(max_retries))
+        self.quote_fn = quote_fn or self._terminal_quote
+        self._gateway = threading.Lock() if serialize else None
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="close_all")
+        return self._pool
+
+    def build_request(self, position, symbol: str, bid: float, ask: float, deviation: int,
+                      magic: int, filling_mode: int, comment: str) -> Dict:
+        """Market close request for one position"""
+        mt5 = self.mt5
+        closing_buy = position.type == mt5.ORDER_TYPE_BUY
+        return {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": symbol,
+            "volume": position.volume,
+            "type": mt5.ORDER_TYPE_SELL if closing_buy else mt5.ORDER_TYPE_BUY,
+            "position": position.ticket,
+            "price": bid if closing_buy else ask,
+            "deviation": deviation,
+            "magic": magic,
+            "comment": comment,
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": filling_mode,
+        }
+
+    def _terminal_quote(self, symbol: str) -> Optional[Tuple[float, float]]:
+        tick = self.mt5.symbol_info_tick(symbol)
+        if tick is None:
+            return None
+        return tick.bid, tick.ask
+
+    def _order_send(self, request):
+        if self._gateway is None:
+            return self.mt5.order_send(request)
+        with self._gateway:
+            return self.mt5.order_send(request)
+
+    def _close_one(self, position, request: Dict) -> CloseResult:
+        closing_buy = position.type == self.mt5.ORDER_TYPE_BUY
+        requested_price = request["price"]
+        start = time.perf_counter()
+        retcode = -1
+        fill_price = 0.0
+        attempts = 0
+
+        while True:
+            attempts += 1
+            try:
+                result = self._order_send(request)
+            except Exception as e:
+                logger.error(f"order_send error for #{position.ticket}: {e}")
+                result = None
+
+            if result is None:
+                break
+            retcode = result.retcode
+            if retcode == self.retcode_done:
+                fill_price = getattr(result, 'price', 0.0) or requested_price
+                break
+            if retcode not in self.retry_retcodes or attempts > self.max_retries:
+                break
+
+            # Requote: retry at a fresh price
+            try:
+                quote = self.quote_fn(request["symbol"])
+            except Exception as e:
+                logger.error(f"Quote refresh failed for #{position.ticket}: {e}")
+                quote = None
+            if quote is not None:
+                bid, ask = quote
+                request = dict(request, price=bid if closing_buy else ask)
+                requested_price = request["price"]
+
+        return CloseResult(
+            ticket=position.ticket,
+            volume=position.volume,
+            profit=position.profit,
+            requested_price=requested_price,
+            fill_price=fill_price,
+            retcode=retcode,
+            attempts=attempts,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            closing_buy=closing_buy,
+            ok=retcode == self.retcode_done,
+        )
+
+    def close_all(self, positions, symbol: str, bid: float, ask: float, deviation: int = 10,
+                  magic: int = 0, filling_mode: int = 0, comment: str = "") -> CloseAllReport:
+        """
+        Close every position concurrently
+
+        Returns:
+            CloseAllReport with one CloseResult per position (input order)
+        """
+        start = time.perf_counter()
+        requests = [
+            (p, self.build_request(p, symbol, bid, ask, deviation, magic, filling_mode, comment))
+            for p in positions
+        ]
+        if len(requests) <= 1:
+            results = [self._close_one(p, r) for p, r in requests]
+        else:
+            pool = self._executor()
+            futures = [pool.submit(self._close_one, p, r) for p, r in requests]
+            results = [f.result() for f in futures]
+
+        return CloseAllReport(results=results, wall_time_ms=(time.perf_counter() - start) * 1000)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    from types import SimpleNamespace
+
+    class _LatencyMT5:
+        """Fake MT5 whose order_send takes a fixed time"""
+        ORDER_TYPE_BUY, ORDER_TYPE_SELL = 0, 1
+        TRADE_ACTION_DEAL, ORDER_TIME_GTC = 1, 0
+
+        def __init__(self, latency):
+            self.latency = latency
+
+        def order_send(self, request):
+            time.sleep(self.latency)
+            return SimpleNamespace(retcode=TRADE_RETCODE_DONE, price=request["price"])
+
+    print("=" * 60)
+    print("CLOSE-ALL - PERFORMANCE TEST (order_send latency 40 ms)")
+    print("=" * 60)
+    fake = _LatencyMT5(0.040)
+    print(f"{'positions':>10s}{'sequential':>14s}{'parallel(4)':>14s}{'parallel(8)':>14s}")
+    for n in (1, 3, 5, 8):
+        positions = [SimpleNamespace(ticket=i, type=i % 2, volume=0.01, profit=0.0) for i in range(n)]
+        row = []
+        for workers in (1, 4, 8):
+            executor = ParallelCloseExecutor(mt5_api=fake, max_workers=workers)
+            report = executor.close_all(positions, "XAUUSD", 2600.0, 2600.1)
+            row.append(report.wall_time_ms)
+            executor.shutdown()
+        print(f"{n:>10d}{row[0]:>11.1f} ms{row[1]:>11.1f} ms{row[2]:>11.1f} ms")
+    print("=" * 60)
@@ -12,6 +12,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Zone of the session times in a config without 'session_timezone'. The session check before
+# SessionCalendar compared them with UTC, so saved configs keep that meaning.
+LEGACY_SESSION_TIMEZONE = 'GMT'
+
 
 class ConfigManager:
     """Manages bot configurations with deep copy isolation"""
@@ -47,7 +51,8 @@ class ConfigManager:
         'asia_session_enabled': False,
         'asia_start': '05:00',    # WIB (22:00 GMT, next day)
         'asia_end': '15:00',      # WIB (08:00 GMT)
-        'session_timezone': 'WIB',
+        'session_timezone': 'WIB',  # zone of the session times above (LEGACY_SESSION_TIMEZONE if missing)
+        'trading_days': [0, 1, 2, 3, 4, 5, 6],  # session weekdays in session_timezone (Mon=0)
         
         # Indicators
         'ema_fast_period': 7,
@@ -69,8 +74,56 @@ class ConfigManager:
         # Performance
         'tick_buffer_size': 1000,
         'analysis_interval': 0.1,
+        'streaming_indicators': True,
+        'tick_ingest_mode': 'batch',
+        'tick_poll_max_interval': 0.05,
+        'shared_market_data': True,
+        'engine_process_mode': False,
+        'tick_recording': False,
+        'tick_record_dir': 'tick_data',
+        'analysis_trigger': 'event',
+        'analysis_coalesce_ms': 0.0,
+        'analysis_max_rate': 200,
+        'signal_ttl_ms': 500,
+        'position_snapshot_max_age': 0.25,
+        'symbol_meta_refresh_interval': 300.0,
+        'close_all_workers': 4,
+        'close_all_retries': 2,
+        'close_all_serialize': False,
+        'mt5_backend': 'terminal',  # 'simulator': mt5_sim instead of a real terminal (load tests)
+        'sim_balance': 10000.0,
+        'sim_latency_ms': 0.0,
+        'sim_latency_jitter_ms': 0.0,
+        'sim_spread_points': 0,
+        'sim_slippage_points': 0.0,
+        'sim_requote_rate': 0.0,
+        'sim_reject_rate': 0.0,
+        'sim_seed': 0,
+        'sim_tick_dir': '',
+        'signal_rules_jit': False,  # Numba kernel for the signal rules (closure is faster per call)
+        'volume_profile_bin_points': 10,  # profile bin width in symbol points
+        'volume_profile_tick_size': 0.0,  # explicit bin width (overrides bin points)
+        'volume_profile_bins': 1024,
+        'volume_profile_value_area': 0.70,
+        'backtest_fast_core': True,  # strategy tester on column arrays (per-bar loop when False or with ML)
+        'backtest_jit': True,  # Numba kernel for the backtest core
+        'bar_cache_enabled': True,  # keep fetched history bars on disk (backtests, ML training)
+        'bar_cache_dir': 'bar_cache',
+        'bar_cache_refresh_seconds': 86400,  # how often bars newer than the last fetch are requested
+        'bar_cache_fetch_days': 30,  # copy_rates_range request size when filling gaps
+        'optimizer_workers': 0,  # parameter optimizer processes (0 = one per CPU core)
+        'optimizer_batch_size': 64,  # configs simulated together per optimizer task (1 = one at a time)
+        'async_logging': True,  # format/write log records on a background thread
+        'log_queue_size': 10000,
+        'log_sample_interval': 5.0,  # seconds between repeats of a sampled diagnostic
     }
     
+    # Settings with no GUI field: get_config_from_gui() carries them over from the bot's stored config
+    NON_GUI_KEYS = ('mt5_backend', 'session_timezone', 'trading_days')
+    NON_GUI_PREFIXES = ('sim_',)
+    # Value of a key a config does not have, where that differs from DEFAULT_CONFIG (new bots)
+    MISSING_KEY_DEFAULTS = {'session_timezone': LEGACY_SESSION_TIMEZONE}
+    
     def __init__(self, config_dir='configs'):
         self.config_dir = config_dir
         os.makedirs(config_dir, exist_ok=True)
@@ -99,6 +152,39 @@ class ConfigManager:
         logger.info(f"Created isolated config for {bot_id or 'new bot'}: {isolated.get('symbol', 'UNKNOWN')}")
         return isolated
     
+    def non_gui_settings(self, config: Dict) -> Dict:
+        """
+        Deep copy of the settings in ``config`` that no GUI field edits
+        
+        Merged into the config read from the GUI form so that values loaded
+        from a config file survive saving the form. NON_GUI_KEYS missing from
+        ``config`` get the value they are read with elsewhere
+        (MISSING_KEY_DEFAULTS, else DEFAULT_CONFIG), so saving the form never
+        changes how the bot's sessions are interpreted.
+        """
+        settings = {key: self.MISSING_KEY_DEFAULTS.get(key, self.DEFAULT_CONFIG.get(key))
+                    for key in self.NON_GUI_KEYS if key in self.DEFAULT_CONFIG}
+        settings.update(
+            (key, value) for key, value in config.items()
+            if key in self.NON_GUI_KEYS or key.startswith(self.NON_GUI_PREFIXES)
+        )
+        return copy.deepcopy(settings)
+    
+    def migrate_config(self, config: Dict) -> Dict:
+        """
+        Bring a config saved by an older version up to date (in place; returns it)
+        
+        A config saved before ``session_timezone`` existed gets
+        LEGACY_SESSION_TIMEZONE written in: its session times were compared
+        with UTC, and stay that way instead of silently moving to the WIB
+        default of new bots.
+        """
+        if config is not None and 'session_timezone' not in config:
+            config['session_timezone'] = LEGACY_SESSION_TIMEZONE
+            logger.warning(f"Config of {config.get('bot_id', 'bot')} has no session_timezone - session times "
+                           f"kept as {LEGACY_SESSION_TIMEZONE} (set 'WIB' to match the GUI labels)")
+        return config
+    
     def validate_config(self, config: Dict) -> bool:
         """
         Validate configuration
@@ -170,7 +256,7 @@ class ConfigManager:
             config = json.load(f)
         
         # CRITICAL: Deep copy after loading
-        config = copy.deepcopy(config)
+        config = self.migrate_config(copy.deepcopy(config))
         
         logger.info(f"Config loaded from {filepath}")
         return config
@@ -0,0 +1,140 @@
+"""
+Shared pytest fixtures: an in-memory MetaTrader5 stand-in for unit tests
+"""
+
+import sys
+import time
+import types
+import threading
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from mt5_sim import TICK_DTYPE, MT5Constants
+
+
+class FakeMT5(MT5Constants, types.ModuleType):
+    """
+    Minimal MetaTrader5 stand-in with hand-set state
+
+    Serves ticks, positions, deal history and symbol info from plain
+    attributes, counts calls per API function in ``calls``, returns None from
+    any function named in ``failing``, and answers ``order_send`` with
+    injected latency, slippage and scripted retcodes. Use
+    ``mt5_sim.SimulatedTerminal`` when a test needs a working market.
+    """
+
+    def __init__(self, magic: int = 0):
+        super().__init__('MetaTrader5')
+        self.magic = magic  # default magic for add_position / add_deal
+        self.ticks = np.zeros(0, dtype=TICK_DTYPE)
+        self.open_positions = []
+        self.history = []
+        self.info = None  # symbol_info() result
+        self.calls = Counter()
+        self.failing = set()
+        self.deal_queries = []
+
+        # order_send behaviour
+        self.latency = 0.0
+        self.slip = 0.0
+        self.retcodes = {}  # ticket -> list of retcodes to return first
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _call(self, name: str) -> bool:
+        """Count a call; False when the function is scripted to fail"""
+        self.calls[name] += 1
+        return name not in self.failing
+
+    # --- state ---
+    def add_tick(self, time_msc, bid, ask=None, last=None, volume=1):
+        ask = bid + 0.1 if ask is None else ask
+        last = bid if last is None else last
+        row = np.array([(time_msc // 1000, bid, ask, last, volume, time_msc, 0, volume)], dtype=TICK_DTYPE)
+        self.ticks = np.concatenate([self.ticks, row])
+
+    def add_position(self, ticket, magic=None, type=0, volume=0.01, profit=0.0):
+        position = types.SimpleNamespace(ticket=ticket, magic=self.magic if magic is None else magic,
+                                         type=type, volume=volume, profit=profit)
+        self.open_positions.append(position)
+        return position
+
+    def add_deal(self, time, profit=0.0, entry=0, volume=0.01, magic=None):
+        ticket = len(self.history) + 1
+        self.history.append(types.SimpleNamespace(ticket=ticket, time=time, profit=profit, entry=entry,
+                                                  volume=volume, magic=self.magic if magic is None else magic))
+
+    # --- API ---
+    def account_info(self):
+        return None
+
+    def symbol_info(self, symbol):
+        if not self._call('symbol_info'):
+            return None
+        return self.info
+
+    def symbol_info_tick(self, symbol):
+        if not self._call('symbol_info_tick') or len(self.ticks) == 0:
+            return None
+        t = self.ticks[-1]
+        return types.SimpleNamespace(time=int(t['time']), time_msc=int(t['time_msc']), bid=float(t['bid']),
+                                     ask=float(t['ask']), last=float(t['last']), volume=int(t['volume']))
+
+    def copy_ticks_from(self, symbol, date_from, count, flags):
+        if not self._call('copy_ticks_from'):
+            return None
+        return self.ticks[self.ticks['time_msc'] >= date_from * 1000][:count].copy()
+
+    def positions_get(self, symbol=None):
+        if not self._call('positions_get'):
+            return None
+        return tuple(self.open_positions)
+
+    def history_deals_get(self, date_from, date_to):
+        self.deal_queries.append((date_from, date_to))
+        if not self._call('history_deals_get'):
+            return None
+        return tuple(d for d in self.history if date_from <= d.time <= date_to)
+
+    def order_send(self, request):
+        with self._lock:
+            self.calls['order_send'] += 1
+            self.requests.append(dict(request))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+            scripted = self.retcodes.get(request["position"])
+            retcode = scripted.pop(0) if scripted else self.TRADE_RETCODE_DONE
+        # Fill worse than requested by `slip`
+        worse = -self.slip if request["type"] == self.ORDER_TYPE_SELL else self.slip
+        return types.SimpleNamespace(retcode=retcode, price=request["price"] + worse)
+
+
+@pytest.fixture
+def fake_mt5():
+    return FakeMT5()
+
+
+@pytest.fixture
+def core_with_mt5(monkeypatch):
+    """Returns install(api): points aventa_hft_core's module-level ``mt5`` at ``api`` and returns the module"""
+    def install(api):
+        if 'MetaTrader5' not in sys.modules:
+            monkeypatch.setitem(sys.modules, 'MetaTrader5', api)
+        core = pytest.importorskip('aventa_hft_core')
+        monkeypatch.setattr(core, 'mt5', api)
+        monkeypatch.setattr(sys.modules['account_cache'], 'mt5', api)
+        return core
+    return install
+
+
+@pytest.fixture
+def fake_core(fake_mt5, core_with_mt5):
+    """aventa_hft_core running against ``fake_mt5``"""
+    return core_with_mt5(fake_mt5)
@@ -0,0 +1,131 @@
+"""
+Daily Deal Ledger for Aventa HFT Pro 2026
+Incremental per-bot trade statistics from MT5 deal history
+"""
+
+import time
+import threading
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+
+class DailyDealLedger:
+    """
+    Running statistics of one bot's deals for the current server day
+
+    Each ``update()`` asks MT5 only for deals at or after the high-water mark
+    (last deal time) and skips tickets already counted at that second, so the
+    cost per call is proportional to the number of *new* deals rather than the
+    whole day.
+    Statistics reset when the server day changes.
+
+    Times are MT5 server-time seconds (``tick.time`` / ``deal.time``).
+    """
+
+    def __init__(self, magic: int, mt5_api=None, min_interval: float = 0.25):
+        """
+        Args:
+            magic: Bot magic number (deals of other bots are ignored)
+            mt5_api: MetaTrader5 module (or a compatible fake); imported lazily if None
+            min_interval: Minimum seconds between history queries
+        """
+        if mt5_api is None:
+            import MetaTrader5 as mt5_api
+        self.mt5 = mt5_api
+        self.magic = magic
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._last_update = 0.0
+
+        # High-water mark
+        self.day: Optional[int] = None
+        self.last_deal_time = 0
+        self._tickets_at_last_time = set()
+
+        # Running stats (this bot, current server day)
+        self.realized_pnl = 0.0
+        self.deals = 0
+        self.entries = 0
+        self.entry_volume = 0.0
+        self.wins = 0
+        self.losses = 0
+
+        # Stats
+        self.api_calls = 0
+
+    def _reset_day(self, day: int):
+        self.day = day
+        self.last_deal_time = day * SECONDS_PER_DAY
+        self._tickets_at_last_time = set()
+        self.realized_pnl = 0.0
+        self.deals = 0
+        self.entries = 0
+        self.entry_volume = 0.0
+        self.wins = 0
+        self.losses = 0
+
+    def update(self, server_time: float, force: bool = False) -> bool:
+        """
+        Fold in deals that closed since the last update
+
+        Args:
+            server_time: Current MT5 server time (seconds)
+            force: Ignore ``min_interval``
+
+        Returns:
+            False if the history query failed (stats are left unchanged)
+        """
+        with self._lock:
+            now = time.monotonic()
+            day = int(server_time // SECONDS_PER_DAY)
+            if day != self.day:
+                if self.day is not None:
+                    logger.info(f"Deal ledger: new server day, resetting (magic {self.magic})")
+                self._reset_day(day)
+            elif not force and now - self._last_update < self.min_interval:
+                return True
+            self._last_update = now
+
+            self.api_calls += 1
+            deals = self.mt5.history_deals_get(int(self.last_deal_time), int(server_time) + SECONDS_PER_DAY)
+            if deals is None:
+                return False
+
+            entry_in = self.mt5.DEAL_ENTRY_IN
+            for d in sorted(deals, key=lambda deal: deal.time):
+                if d.time < self.last_deal_time or d.ticket in self._tickets_at_last_time:
+                    continue
+                if d.time > self.last_deal_time:
+                    self.last_deal_time = d.time
+                    self._tickets_at_last_time = set()
+                self._tickets_at_last_time.add(d.ticket)
+                # ✅ FILTER BY MAGIC NUMBER - only count this bot's deals
+                if d.magic != self.magic:
+                    continue
+
+                self.deals += 1
+                self.realized_pnl += d.profit
+                if d.entry == entry_in:
+                    self.entries += 1
+                    self.entry_volume += d.volume
+                if d.profit > 0:
+                    self.wins += 1
+                elif d.profit < 0:
+                    self.losses += 1
+            return True
+
+    def get_stats(self) -> dict:
+        """Current day statistics"""
+        return {
+            'realized_pnl': self.realized_pnl,
+            'deals': self.deals,
+            'entries': self.entries,
+            'entry_volume': self.entry_volume,
+            'wins': self.wins,
+            'losses': self.losses,
+            'api_calls': self.api_calls,
+        }
@@ -40,8 +40,8 @@ class FastBacktestOptimizer:
             logger.debug(f"Backtest failed for config: {e}")
             return None
     
-    def optimize(self, start_date, end_date, verbose=True):
-        """Run optimization with grid search"""
+    def optimize(self, start_date, end_date, verbose=True, workers=None, cancel_check=None):
+        """Run optimization with grid search (bars loaded once, configs evaluated in a process pool)"""
         
         # Parameter ranges - smaller for faster testing
         ema_fast_periods = [5, 7, 9]
@@ -59,24 +59,15 @@ class FastBacktestOptimizer:
         logger.info(f"Testing period: {start_date.date()} to {end_date.date()}")
         logger.info(f"Symbol: {self.symbol}")
         
-        count = 0
-        valid_configs = 0
-        
-        # Create combinations
-        combinations = list(product(
+        # Create combinations (skip invalid ones)
+        combinations = [c for c in product(
             ema_fast_periods, ema_slow_periods, rsi_periods, atr_periods,
             take_profit_pips, stop_loss_pips
-        ))
+        ) if c[0] < c[1]]
         
-        for i, (ema_fast, ema_slow, rsi_period, atr_period, tp_pips, sl_pips) in enumerate(combinations):
-            # Skip invalid combinations
-            if ema_fast >= ema_slow:
-                continue
-            
-            count += 1
-            
-            # Create config
-            config = {
+        configs = []
+        for ema_fast, ema_slow, rsi_period, atr_period, tp_pips, sl_pips in combinations:
+            configs.append({
                 'symbol': self.symbol,
                 'magic_number': 12345,
                 'default_volume': 0.01,
@@ -90,16 +81,28 @@ class FastBacktestOptimizer:
                 'max_duration_minutes': 1440,
                 'commission_per_trade': 0.0,
                 'slippage_pips': 0.5
-            }
-            
-            # Run backtest
-            results = self.run_backtest_with_config(config, start_date, end_date)
+            })
+        
+        try:
+            from parallel_optimizer import ParallelOptimizer
+            optimizer = ParallelOptimizer.load(configs[0], start_date, end_date,
+                                               self.initial_balance, workers)
+        except Exception as e:
+            logger.error(f"Failed to load bars for optimization: {e}")
+            return self.results
+        
+        count = 0
+        found = {}
+        
+        # Results arrive in completion order
+        for index, results in optimizer.run(configs, cancel_check):
+            count += 1
             
             if results and results.get('total_trades', 0) >= 10:
-                valid_configs += 1
+                ema_fast, ema_slow, rsi_period, atr_period, tp_pips, sl_pips = combinations[index]
                 
                 # Calculate key metrics
-                metrics = {
+                found[index] = {
                     'rank': 0,  # Will be set later
                     'ema_fast': ema_fast,
                     'ema_slow': ema_slow,
@@ -121,16 +124,17 @@ class FastBacktestOptimizer:
                     'recovery_factor': results.get('recovery_factor', 0),
                     'avg_duration': results.get('avg_duration', 0)
                 }
-                
-                self.results.append(metrics)
             
             # Progress logging
             if verbose and count % 3 == 0:
-                best_pnl = max([r['total_pnl'] for r in self.results]) if self.results else 0
-                logger.info(f"Progress: {count}/{len([c for c in combinations if c[0] < c[1]])} | "
-                          f"Valid: {valid_configs} | Best P&L: ${best_pnl:.2f}")
+                best_pnl = max([r['total_pnl'] for r in found.values()]) if found else 0
+                logger.info(f"Progress: {count}/{len(configs)} | "
+                          f"Valid: {len(found)} | Best P&L: ${best_pnl:.2f}")
+        
+        # Keep grid order regardless of which worker finished first
+        self.results.extend(found[index] for index in sorted(found))
         
-        logger.info(f"Tested {count} combinations, found {valid_configs} valid configs")
+        logger.info(f"Tested {count} combinations, found {len(found)} valid configs")
         return self.results
     
     def get_best_configs(self, top_n=10, metric='total_pnl'):
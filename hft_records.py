@@ -0,0 +1,128 @@
+"""
+HFT Records for Aventa HFT Pro 2026
+Slotted per-tick record types (TickData, OrderFlowData, Signal) shared by the engine and tools
+"""
+
+import sys
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class TickData:
+    """Ultra-fast tick data structure"""
+    timestamp: float
+    bid: float
+    ask: float
+    last: float
+    volume: int
+    spread: float
+
+    @property
+    def mid_price(self) -> float:
+        # Computed on access: storing it cost a slot plus a float object per tick
+        return (self.bid + self.ask) / 2
+
+
+@dataclass(slots=True)
+class OrderFlowData:
+    """Order flow analysis data"""
+    timestamp: float
+    buy_volume: float
+    sell_volume: float
+    delta: float
+    cumulative_delta: float
+    imbalance_ratio: float
+
+
+@dataclass(slots=True)
+class Signal:
+    """Trading signal with priority"""
+    timestamp: float
+    signal_type: str  # 'BUY', 'SELL', 'CLOSE'
+    strength: float
+    price: float
+    stop_loss: float
+    take_profit: float
+    volume: float
+    reason: str
+
+    def __lt__(self, other):
+        return self.timestamp < other.timestamp
+
+
+def buffer_bytes_per_record(factory, count: int) -> float:
+    """Traced bytes per record for a deque(maxlen=count) filled by ``factory(i)``"""
+    import gc
+    import tracemalloc
+    from collections import deque
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        buffer = deque((factory(i) for i in range(count)), maxlen=count)
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del buffer
+    return used / count
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    from dataclasses import dataclass as plain_dataclass
+
+    # The previous record types: plain dataclasses with a per-instance __dict__
+    @plain_dataclass
+    class DictTickData:
+        timestamp: float
+        bid: float
+        ask: float
+        last: float
+        volume: int
+        spread: float
+
+        def __post_init__(self):
+            self.mid_price = (self.bid + self.ask) / 2
+
+    @plain_dataclass
+    class DictOrderFlowData:
+        timestamp: float
+        buy_volume: float
+        sell_volume: float
+        delta: float
+        cumulative_delta: float
+        imbalance_ratio: float
+
+    def tick(cls):
+        return lambda i: cls(1728032400.0 + i * 0.1, 2600.0 + i * 0.01, 2600.1 + i * 0.01,
+                             2600.05 + i * 0.01, 1, 0.1 + i * 1e-9)
+
+    def flow(cls):
+        return lambda i: cls(1728032400.0 + i * 0.1, float(i % 3), float(i % 2), float(i % 3 - i % 2),
+                             float(i), 0.5 + i * 1e-9)
+
+    print("=" * 60)
+    print("HFT RECORDS - MEMORY REPORT")
+    print("=" * 60)
+    print(f"{'':36s}{'before':>10s}{'after':>10s}")
+    rows = (
+        ('TickData x 10,000', 10000, tick(DictTickData), tick(TickData)),
+        ('OrderFlowData x 5,000', 5000, flow(DictOrderFlowData), flow(OrderFlowData)),
+    )
+    total_before = total_after = 0.0
+    for label, count, old, new in rows:
+        old_bytes = buffer_bytes_per_record(old, count)
+        new_bytes = buffer_bytes_per_record(new, count)
+        total_before += old_bytes * count
+        total_after += new_bytes * count
+        print(f"{label + ' (bytes/rec)':36s}{old_bytes:10.0f}{new_bytes:10.0f}")
+    print(f"{'per bot (MB)':36s}{total_before / 1e6:10.2f}{total_after / 1e6:10.2f}")
+    print(f"{'x 20 bots (MB)':36s}{total_before * 20 / 1e6:10.2f}{total_after * 20 / 1e6:10.2f}")
+    # For reference: the engine's own buffers keep no per-tick objects at all
+    from ring_buffer import TickRingBuffer, OrderFlowRingBuffer
+    print(f"{'TickRingBuffer (bytes/tick)':36s}{'':10s}{TickRingBuffer(10000).nbytes / 10000:10.0f}")
+    print(f"{'OrderFlowRingBuffer (bytes/row)':36s}{'':10s}{OrderFlowRingBuffer(5000).nbytes / 5000:10.0f}")
+    print(f"\nInstance size: {sys.getsizeof(tick(DictTickData)(0))} B + __dict__ "
+          f"{sys.getsizeof(tick(DictTickData)(0).__dict__)} B -> {sys.getsizeof(tick(TickData)(0))} B slotted")
+    print("=" * 60)
@@ -0,0 +1,212 @@
+"""
+Indicator Cache for Aventa HFT Pro 2026
+Backtest indicator series memoized per (dataset fingerprint, indicator, period)
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_ATTR = 'indicator_fingerprint'
+FINGERPRINT_COLUMNS = ('time', 'high', 'low', 'close')
+
+VOLATILITY_PERIOD = 20
+
+# (key, period) of one series; the key also names it in shared layouts
+IndicatorKey = Tuple[str, int]
+
+
+def _ema(df: pd.DataFrame, period: int) -> pd.Series:
+    return df['close'].ewm(span=period, adjust=False).mean()
+
+
+def _rsi(df: pd.DataFrame, period: int) -> pd.Series:
+    delta = df['close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi.fillna(50)  # Neutral RSI for initial values
+
+
+def _atr(df: pd.DataFrame, period: int) -> pd.Series:
+    high_low = df['high'] - df['low']
+    high_close = np.abs(df['high'] - df['close'].shift())
+    low_close = np.abs(df['low'] - df['close'].shift())
+    ranges = pd.concat([high_low, high_close, low_close], axis=1)
+    true_range = np.max(ranges, axis=1)
+    atr = true_range.rolling(period).mean()
+    return atr.fillna(atr.mean())
+
+
+def _momentum(df: pd.DataFrame, period: int) -> pd.Series:
+    return df['close'].diff(period)
+
+
+def _volatility(df: pd.DataFrame, period: int) -> pd.Series:
+    volatility = df['close'].rolling(period).std() / df['close'].rolling(period).mean()
+    return volatility.fillna(0)
+
+
+# indicator name -> fn(df, period) -> Series, as StrategyBacktester.calculate_indicators defines them
+INDICATORS: Dict[str, Callable[[pd.DataFrame, int], pd.Series]] = {
+    'ema': _ema,
+    'rsi': _rsi,
+    'atr': _atr,
+    'momentum': _momentum,
+    'volatility': _volatility,
+}
+
+
+def config_indicators(config: Dict) -> List[Tuple[str, str, int]]:
+    """(DataFrame column, indicator, period) a backtest config uses"""
+    return [
+        ('ema_fast', 'ema', config.get('ema_fast_period', 7)),
+        ('ema_slow', 'ema', config.get('ema_slow_period', 21)),
+        ('rsi', 'rsi', config.get('rsi_period', 7)),
+        ('atr', 'atr', config.get('atr_period', 14)),
+        ('momentum', 'momentum', config.get('momentum_period', 5)),
+        ('volatility', 'volatility', VOLATILITY_PERIOD),
+    ]
+
+
+def sweep_indicators(configs: Iterable[Dict]) -> List[IndicatorKey]:
+    """Distinct (indicator, period) series a set of configs needs (invalid periods skipped)"""
+    keys = set()
+    for config in configs:
+        for _, name, period in config_indicators(config):
+            if isinstance(period, (int, np.integer)) and period > 0:
+                keys.add((name, int(period)))
+    return sorted(keys)
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    """
+    Content hash of the price columns indicators read
+
+    Stored in ``df.attrs`` (carried over by ``df.copy()``), so callers that
+    hand out copies of one frame hash it once. Frames are assumed not to be
+    modified in place after fingerprinting.
+    """
+    cached = df.attrs.get(FINGERPRINT_ATTR)
+    if cached is not None:
+        return cached
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(df)).encode())
+    for name in FINGERPRINT_COLUMNS:
+        if name in df.columns:
+            digest.update(name.encode())
+            digest.update(np.ascontiguousarray(df[name].to_numpy()).tobytes())
+    value = digest.hexdigest()
+    df.attrs[FINGERPRINT_ATTR] = value
+    return value
+
+
+class IndicatorCache:
+    """
+    Read-only indicator arrays shared by every backtest of a sweep
+
+    ``get()`` computes a series on first use and returns the same
+    non-writeable array afterwards. ``add()`` installs precomputed arrays
+    (e.g. views on a parent's shared memory in pool workers). Least recently
+    used series are dropped beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._series: 'OrderedDict[Tuple[str, str, int], np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, df: pd.DataFrame, name: str, period: int) -> np.ndarray:
+        key = (fingerprint(df), name, period)
+        with self._lock:
+            values = self._series.get(key)
+            if values is not None:
+                self._series.move_to_end(key)
+                self.hits += 1
+                return values
+            self.misses += 1
+        values = INDICATORS[name](df, period).to_numpy(dtype=np.float64, copy=True)
+        values.setflags(write=False)
+        self.add(key[0], name, period, values)
+        return values
+
+    def add(self, dataset: str, name: str, period: int, values: np.ndarray):
+        if values.flags.writeable:
+            values = values.view()
+            values.setflags(write=False)
+        with self._lock:
+            self._series[(dataset, name, period)] = values
+            self._series.move_to_end((dataset, name, period))
+            while len(self._series) > self.max_entries:
+                self._series.popitem(last=False)
+
+    def warm(self, df: pd.DataFrame, keys: Iterable[IndicatorKey]) -> Dict[IndicatorKey, np.ndarray]:
+        """Compute (or look up) every key for one dataset"""
+        return {(name, period): self.get(df, name, period) for name, period in keys}
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def get_stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'series': len(self._series),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'bytes': sum(v.nbytes for v in self._series.values()),
+        }
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    import time
+    from itertools import product
+
+    print("=" * 60)
+    print("INDICATOR CACHE - PERFORMANCE TEST")
+    print("=" * 60)
+
+    n = 370_000
+    rng = np.random.default_rng(2)
+    close = 2000.0 + np.cumsum(rng.normal(0, 0.3, n))
+    bars = pd.DataFrame({'time': pd.to_datetime(1704067200 + np.arange(n) * 60, unit='s'),
+                         'high': close + 0.2, 'low': close - 0.2, 'close': close})
+    # fast_optimize.py grid
+    configs = [{'ema_fast_period': f, 'ema_slow_period': s, 'rsi_period': r, 'atr_period': a}
+               for f, s, r, a, _, _ in product([5, 7, 9], [15, 21, 28], [7, 14], [10, 14],
+                                              [3.0, 5.0, 8.0], [5.0, 10.0]) if f < s]
+
+    start = time.perf_counter()
+    for config in configs[:12]:
+        for _, name, period in config_indicators(config):
+            INDICATORS[name](bars, period)
+    uncached = (time.perf_counter() - start) / 12 * len(configs)
+
+    cache = IndicatorCache()
+    fingerprint(bars)  # once per sweep, as ParallelOptimizer does
+    start = time.perf_counter()
+    for config in configs:
+        for _, name, period in config_indicators(config):
+            cache.get(bars.copy(deep=False), name, period)
+    cached = time.perf_counter() - start
+
+    print(f"{n} bars, {len(configs)} configs, {len(sweep_indicators(configs))} distinct series")
+    print(f"recompute per config (est.): {uncached:8.2f} s")
+    print(f"memoized:                    {cached:8.2f} s ({uncached / cached:.0f}x)")
+    print(f"stats: {cache.get_stats()}")
+    print("=" * 60)
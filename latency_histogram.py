@@ -0,0 +1,208 @@
+"""
+Latency Histograms for Aventa HFT Pro 2026
+Fixed-bucket (HDR-style) per-stage latency recording with percentile queries
+"""
+
+import json
+import math
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+# 16 linear sub-buckets per power of two -> worst-case relative error ~3%
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+LINEAR_LIMIT = 2 * SUB_BUCKETS          # values below this are recorded exactly
+MAX_SHIFT = 32                          # up to ~2^37 us (~38 hours)
+BUCKET_COUNT = LINEAR_LIMIT + MAX_SHIFT * SUB_BUCKETS
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def _bucket_index(value_us: int) -> int:
+    if value_us < LINEAR_LIMIT:
+        return value_us if value_us > 0 else 0
+    shift = value_us.bit_length() - (SUB_BUCKET_BITS + 1)
+    if shift > MAX_SHIFT:
+        return BUCKET_COUNT - 1
+    return shift * SUB_BUCKETS + (value_us >> shift)
+
+
+def _bucket_value(index: int) -> float:
+    """Representative (mid-point) value of a bucket in microseconds"""
+    if index < LINEAR_LIMIT:
+        return float(index)
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index - shift * SUB_BUCKETS
+    return float((mantissa << shift) + ((1 << shift) >> 1))
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of latencies in microseconds
+
+    Recording is an integer bucket lookup plus a list increment (no allocation,
+    no lock), so it can stay enabled in production. Concurrent writers may very
+    rarely lose a count; percentiles are approximate to the bucket width.
+    """
+
+    __slots__ = ('counts', 'count', 'total_us', 'min_us', 'max_us')
+
+    def __init__(self):
+        self.counts: List[int] = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_us = 0.0
+        self.min_us = float('inf')
+        self.max_us = 0.0
+
+    def record_us(self, value_us: float):
+        """Record one latency in microseconds"""
+        if value_us < 0:
+            value_us = 0.0
+        self.counts[_bucket_index(int(value_us))] += 1
+        self.count += 1
+        self.total_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+        if value_us < self.min_us:
+            self.min_us = value_us
+
+    def record_seconds(self, seconds: float):
+        """Record one latency given in seconds (e.g. a perf_counter difference)"""
+        self.record_us(seconds * 1e6)
+
+    def percentiles(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[float, float]:
+        """Percentile -> microseconds (0.0 when empty)"""
+        wanted = sorted(percentiles)
+        result = {p: 0.0 for p in wanted}
+        total = self.count
+        if total == 0:
+            return result
+
+        targets = [(p, max(1, math.ceil(p / 100.0 * total))) for p in wanted]
+        seen = 0
+        i = 0
+        for index, n in enumerate(self.counts):
+            if not n:
+                continue
+            seen += n
+            while i < len(targets) and seen >= targets[i][1]:
+                result[targets[i][0]] = min(_bucket_value(index), self.max_us)
+                i += 1
+            if i == len(targets):
+                break
+        return result
+
+    @property
+    def mean_us(self) -> float:
+        return self.total_us / self.count if self.count else 0.0
+
+    def reset(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_us = 0.0
+        self.min_us = float('inf')
+        self.max_us = 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, min, max and p50/p90/p99/p99.9 in microseconds"""
+        p = self.percentiles()
+        return {
+            'count': self.count,
+            'mean_us': self.mean_us,
+            'min_us': self.min_us if self.count else 0.0,
+            'max_us': self.max_us,
+            'p50_us': p[50.0],
+            'p90_us': p[90.0],
+            'p99_us': p[99.0],
+            'p99_9_us': p[99.9],
+        }
+
+
+class StageLatencies:
+    """Named histograms for each pipeline stage"""
+
+    def __init__(self, stages: Iterable[str] = ()):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        for stage in stages:
+            self._histograms[stage] = LatencyHistogram()
+        self.started_at = time.time()
+
+    def __getitem__(self, stage: str) -> LatencyHistogram:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            histogram = self._histograms.setdefault(stage, LatencyHistogram())
+        return histogram
+
+    def __contains__(self, stage: str) -> bool:
+        return stage in self._histograms
+
+    @property
+    def stages(self) -> List[str]:
+        return list(self._histograms)
+
+    def record(self, stage: str, seconds: float):
+        """Record a stage duration given in seconds"""
+        self[stage].record_us(seconds * 1e6)
+
+    @contextmanager
+    def measure(self, stage: str):
+        """Time a ``with`` block into ``stage``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self[stage].record_us((time.perf_counter() - start) * 1e6)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage summaries (stages with no samples included with count 0)"""
+        return {stage: h.summary() for stage, h in self._histograms.items()}
+
+    def reset(self):
+        for histogram in self._histograms.values():
+            histogram.reset()
+        self.started_at = time.time()
+
+    def dump_json(self, path: str, extra: Optional[Dict] = None) -> str:
+        """Write the snapshot (plus optional metadata) to a JSON file"""
+        data = {
+            'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'window_seconds': time.time() - self.started_at,
+            'unit': 'us',
+            'stages': self.snapshot(),
+        }
+        if extra:
+            data.update(extra)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+        return path
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    import random
+
+    print("=" * 60)
+    print("LATENCY HISTOGRAM - PERFORMANCE TEST")
+    print("=" * 60)
+
+    samples = [random.lognormvariate(4.0, 1.0) for _ in range(200000)]
+    histogram = LatencyHistogram()
+
+    start = time.perf_counter()
+    for s in samples:
+        histogram.record_us(s)
+    per_record = (time.perf_counter() - start) / len(samples) * 1e9
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        summary = histogram.summary()
+    per_summary = (time.perf_counter() - start) / 1000 * 1e6
+
+    exact = sorted(samples)
+    print(f"record():  {per_record:.0f} ns")
+    print(f"summary(): {per_summary:.1f} us")
+    for p, key in ((50.0, 'p50_us'), (99.0, 'p99_us'), (99.9, 'p99_9_us')):
+        true = exact[int(p / 100.0 * len(exact)) - 1]
+        print(f"p{p:<5} histogram {summary[key]:9.1f} us | exact {true:9.1f} us")
+    print("=" * 60)
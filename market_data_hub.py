@@ -0,0 +1,381 @@
+"""
+Shared Market Data Hub for Aventa HFT Pro 2026
+One tick collector per symbol, fanned out to every engine trading it
+"""
+
+import time
+import threading
+import logging
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from tick_ingest import BatchTickFetcher
+
+logger = logging.getLogger(__name__)
+
+# callback(ticks, fetch_latency_us); fetch_latency_us is None for history replay
+TickCallback = Callable[[np.ndarray, Optional[float]], None]
+
+
+class Subscription:
+    """Handle returned by ``MarketDataHub.subscribe``"""
+
+    __slots__ = ('symbol', 'id')
+
+    def __init__(self, symbol: str, sub_id: int):
+        self.symbol = symbol
+        self.id = sub_id
+
+
+class SubscriberQueue:
+    """
+    Delivery thread for one subscriber
+
+    The feed thread only appends batches here; this subscriber's own thread
+    hands them to the callback in order. A slow engine therefore delays its
+    own ticks but not the feed or the other subscribers on the symbol.
+    """
+
+    def __init__(self, name: str, callback: TickCallback, symbol: str = ''):
+        self.callback = callback
+        self.symbol = symbol
+        self._pending = deque()
+        self._cond = threading.Condition(threading.Lock())
+        self._busy = False
+        self._running = True
+
+        # Stats
+        self.deliveries = 0
+        self.callback_errors = 0
+        self.max_backlog = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, ticks: np.ndarray, fetch_us: Optional[float]):
+        with self._cond:
+            self._pending.append((ticks, fetch_us))
+            self.max_backlog = max(self.max_backlog, len(self._pending))
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                ticks, fetch_us = self._pending.popleft()
+                self._busy = True
+            try:
+                self.callback(ticks, fetch_us)
+                self.deliveries += 1
+            except Exception as e:
+                self.callback_errors += 1
+                logger.error(f"Market data subscriber error ({self.symbol}): {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """Block until every queued batch has been delivered; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def stop(self, timeout: float = 2.0):
+        """Stop delivering (batches still queued are dropped)"""
+        with self._cond:
+            self._running = False
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+
+class SymbolFeed:
+    """
+    Collector thread for one symbol
+
+    Every new batch from ``BatchTickFetcher`` is delivered to all subscribers
+    as the same read-only array (no per-subscriber copy), each through its
+    own ``SubscriberQueue`` so the collector never waits on an engine. The
+    last ``history`` ticks are kept so a bot started mid-session can warm up
+    its buffers immediately instead of waiting for fresh ticks.
+    """
+
+    def __init__(self, symbol: str, mt5_api, max_interval: float = 0.05, history: int = 2000):
+        self.symbol = symbol
+        self.fetcher = BatchTickFetcher(symbol, mt5_api=mt5_api, max_interval=max_interval)
+        self.history = history
+        self._recent = deque()
+        self._recent_ticks = 0
+        self._subscribers: Dict[int, SubscriberQueue] = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Stats
+        self.batches = 0
+        self._removed_deliveries = 0
+        self._removed_errors = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def deliveries(self) -> int:
+        return self._removed_deliveries + sum(q.deliveries for q in list(self._subscribers.values()))
+
+    @property
+    def callback_errors(self) -> int:
+        return self._removed_errors + sum(q.callback_errors for q in list(self._subscribers.values()))
+
+    def add(self, sub_id: int, callback: TickCallback):
+        """Register a subscriber and replay recent history to it"""
+        subscriber = SubscriberQueue(f"md_{self.symbol}_{sub_id}", callback, self.symbol)
+        with self._lock:
+            for batch in self._recent:
+                subscriber.put(batch, None)
+            self._subscribers[sub_id] = subscriber
+
+    def remove(self, sub_id: int) -> int:
+        """Unregister a subscriber; returns the remaining count"""
+        with self._lock:
+            subscriber = self._subscribers.pop(sub_id, None)
+            remaining = len(self._subscribers)
+        if subscriber is not None:
+            subscriber.stop()
+            self._removed_deliveries += subscriber.deliveries
+            self._removed_errors += subscriber.callback_errors
+        return remaining
+
+    def wait_delivered(self, timeout: float = 2.0) -> bool:
+        """Block until every subscriber has handled all queued batches"""
+        deadline = time.monotonic() + timeout
+        return all(q.wait_idle(max(0.0, deadline - time.monotonic()))
+                   for q in list(self._subscribers.values()))
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"md_{self.symbol}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for subscriber in subscribers:
+            subscriber.stop(timeout)
+
+    def _remember(self, ticks: np.ndarray):
+        self._recent.append(ticks)
+        self._recent_ticks += len(ticks)
+        while len(self._recent) > 1 and self._recent_ticks - len(self._recent[0]) >= self.history:
+            self._recent_ticks -= len(self._recent.popleft())
+
+    def poll_once(self) -> int:
+        """One fetch + fan-out (queued to each subscriber); returns the number of new ticks"""
+        start_time = time.perf_counter()
+        ticks = self.fetcher.fetch()
+        if ticks is None:
+            # copy_ticks_from failed - fall back to the current tick
+            ticks = self.fetcher.poll_latest()
+        fetch_us = (time.perf_counter() - start_time) * 1000000
+        if ticks is None or len(ticks) == 0:
+            return 0
+
+        ticks.flags.writeable = False  # shared by every subscriber
+        with self._lock:
+            self.batches += 1
+            self._remember(ticks)
+            for subscriber in self._subscribers.values():
+                subscriber.put(ticks, fetch_us)
+        return len(ticks)
+
+    def _run(self):
+        logger.info(f"Market data feed {self.symbol} started")
+        while self._running:
+            try:
+                self.poll_once()
+                time.sleep(self.fetcher.next_interval)
+            except Exception as e:
+                logger.error(f"Market data feed {self.symbol} error: {e}")
+                time.sleep(0.1)
+        logger.info(f"Market data feed {self.symbol} stopped")
+
+    def get_stats(self) -> dict:
+        stats = self.fetcher.get_stats()
+        stats.update({
+            'subscribers': self.subscriber_count,
+            'batches': self.batches,
+            'deliveries': self.deliveries,
+            'callback_errors': self.callback_errors,
+            'max_backlog': max((q.max_backlog for q in list(self._subscribers.values())), default=0),
+        })
+        return stats
+
+
+class MarketDataHub:
+    """
+    Reference-counted registry of per-symbol feeds
+
+    The first ``subscribe`` for a symbol starts its collector and the last
+    ``unsubscribe`` stops it, so N bots on one symbol cost one MT5 poller.
+    """
+
+    def __init__(self, mt5_api=None, max_interval: float = 0.05, history: int = 2000):
+        """
+        Args:
+            mt5_api: MetaTrader5 module (or a compatible fake); imported lazily if None
+            max_interval: Upper bound of the adaptive poll interval (seconds)
+            history: Ticks replayed to a new subscriber
+        """
+        if mt5_api is None:
+            import MetaTrader5 as mt5_api
+        self.mt5 = mt5_api
+        self.max_interval = max_interval
+        self.history = history
+        self._feeds: Dict[str, SymbolFeed] = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def subscribe(self, symbol: str, callback: TickCallback, start: bool = True) -> Subscription:
+        """
+        Receive every new tick batch of ``symbol``
+
+        Args:
+            callback: Called as ``callback(ticks, fetch_latency_us)`` from this
+                subscription's own delivery thread
+            start: Start the collector thread if this is the first subscriber
+        """
+        with self._lock:
+            self._next_id += 1
+            subscription = Subscription(symbol, self._next_id)
+            feed = self._feeds.get(symbol)
+            created = feed is None
+            if created:
+                feed = SymbolFeed(symbol, self.mt5, self.max_interval, self.history)
+                self._feeds[symbol] = feed
+            feed.add(subscription.id, callback)
+            if created and start:
+                feed.start()
+        logger.info(f"Market data: {symbol} subscribers = {feed.subscriber_count}")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Drop a subscriber; stops the feed when it was the last one"""
+        with self._lock:
+            feed = self._feeds.get(subscription.symbol)
+            if feed is None:
+                return
+            remaining = feed.remove(subscription.id)
+            if remaining == 0:
+                del self._feeds[subscription.symbol]
+        if remaining == 0:
+            feed.stop()
+        logger.info(f"Market data: {subscription.symbol} subscribers = {remaining}")
+
+    def feed(self, symbol: str) -> Optional[SymbolFeed]:
+        return self._feeds.get(symbol)
+
+    def subscriber_count(self, symbol: str) -> int:
+        feed = self._feeds.get(symbol)
+        return feed.subscriber_count if feed else 0
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Per-symbol feed statistics"""
+        return {symbol: feed.get_stats() for symbol, feed in list(self._feeds.items())}
+
+
+_hub: Optional[MarketDataHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_market_data_hub(mt5_api=None, **kwargs) -> MarketDataHub:
+    """Process-wide hub (created on first use; later arguments are ignored)"""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = MarketDataHub(mt5_api=mt5_api, **kwargs)
+        return _hub
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    from types import SimpleNamespace
+
+    class _TickSourceMT5:
+        """Fake MT5 producing ticks at a fixed rate with a fixed API latency"""
+        COPY_TICKS_ALL = -1
+        DTYPE = [('time_msc', 'i8'), ('bid', 'f8'), ('ask', 'f8'), ('last', 'f8'), ('volume', 'f8')]
+
+        def __init__(self, rate=200.0, latency=0.0002):
+            self.rate, self.latency, self.t0 = rate, latency, time.time()
+            self.calls = 0
+            self._lock = threading.Lock()
+
+        def _ticks_until(self, now):
+            n = int((now - self.t0) * self.rate)
+            msc = (self.t0 * 1000 + np.arange(n) * 1000.0 / self.rate).astype(np.int64)
+            bid = 2600.0 + np.sin(np.arange(n) / 50.0)
+            return np.rec.fromarrays([msc, bid, bid + 0.1, bid, np.ones(n)], dtype=self.DTYPE)
+
+        def symbol_info_tick(self, symbol):
+            with self._lock:
+                self.calls += 1
+            time.sleep(self.latency)
+            return SimpleNamespace(time_msc=int(time.time() * 1000), bid=2600.0, ask=2600.1, last=2600.0, volume=1)
+
+        def copy_ticks_from(self, symbol, date_from, count, flags):
+            with self._lock:
+                self.calls += 1
+            time.sleep(self.latency)
+            ticks = self._ticks_until(time.time())
+            return ticks[ticks['time_msc'] >= date_from * 1000][:count]
+
+    def _run(bots, shared, seconds=2.0):
+        fake = _TickSourceMT5()
+        received = [0] * bots
+        lag = []
+
+        def make_callback(i):
+            def callback(ticks, fetch_us):
+                received[i] += len(ticks)
+                if fetch_us is not None:
+                    lag.append(time.time() * 1000 - ticks['time_msc'][-1])
+            return callback
+
+        if shared:
+            hub = MarketDataHub(mt5_api=fake, max_interval=0.005)
+            subs = [hub.subscribe("XAUUSD", make_callback(i)) for i in range(bots)]
+            time.sleep(seconds)
+            for s in subs:
+                hub.unsubscribe(s)
+        else:
+            feeds = []
+            for i in range(bots):
+                feed = SymbolFeed("XAUUSD", fake, max_interval=0.005)
+                feed.add(i, make_callback(i))
+                feed.start()
+                feeds.append(feed)
+            time.sleep(seconds)
+            for feed in feeds:
+                feed.stop()
+        return fake.calls / seconds, float(np.mean(lag)) if lag else 0.0
+
+    print("=" * 60)
+    print("MARKET DATA HUB - PERFORMANCE TEST (200 ticks/s, 0.2 ms API latency)")
+    print("=" * 60)
+    print(f"{'bots':>5s}{'calls/s own':>14s}{'calls/s hub':>14s}{'lag own':>11s}{'lag hub':>11s}")
+    for bots in (1, 2, 4, 8):
+        own_calls, own_lag = _run(bots, shared=False)
+        hub_calls, hub_lag = _run(bots, shared=True)
+        print(f"{bots:>5d}{own_calls:>14.0f}{hub_calls:>14.0f}{own_lag:>8.1f} ms{hub_lag:>8.1f} ms")
+    print("=" * 60)
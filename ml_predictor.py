@@ -17,6 +17,8 @@ import MetaTrader5 as mt5
 import os
 import pickle
 
+from bar_cache import BarCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -76,38 +78,52 @@ class FeatureEngineering:
         return true_range.rolling(window=period).mean()
     
     @staticmethod
-    def calculate_orderflow_features(orderflow_data: List) -> Dict:
-        """Calculate order flow based features"""
+    def calculate_orderflow_features(orderflow_data) -> Dict:
+        """Calculate order flow based features (list of OrderFlowData or OrderFlowRingBuffer)"""
         if len(orderflow_data) < 10:
             return {}
         
-        deltas = [d.delta for d in orderflow_data[-100:]]
-        cumul_deltas = [d.cumulative_delta for d in orderflow_data[-100:]]
-        imbalances = [d.imbalance_ratio for d in orderflow_data[-100:]]
+        if hasattr(orderflow_data, 'window'):
+            # Column ring buffer - zero-copy views
+            recent = orderflow_data.window(100)
+            deltas = recent.delta
+            cumul_deltas = recent.cumulative_delta
+            imbalances = recent.imbalance_ratio
+        else:
+            deltas = np.array([d.delta for d in orderflow_data[-100:]])
+            cumul_deltas = np.array([d.cumulative_delta for d in orderflow_data[-100:]])
+            imbalances = np.array([d.imbalance_ratio for d in orderflow_data[-100:]])
         
         features = {
             'delta_mean': np.mean(deltas),
             'delta_std': np.std(deltas),
             'delta_sum': np.sum(deltas),
-            'cumul_delta_last': cumul_deltas[-1] if cumul_deltas else 0,
+            'cumul_delta_last': cumul_deltas[-1] if len(cumul_deltas) else 0,
             'cumul_delta_change': cumul_deltas[-1] - cumul_deltas[0] if len(cumul_deltas) > 1 else 0,
             'imbalance_mean': np.mean(imbalances),
             'imbalance_std': np.std(imbalances),
-            'positive_delta_count': sum(1 for d in deltas if d > 0),
-            'negative_delta_count': sum(1 for d in deltas if d < 0),
+            'positive_delta_count': int(np.count_nonzero(deltas > 0)),
+            'negative_delta_count': int(np.count_nonzero(deltas < 0)),
         }
         
         return features
     
     @staticmethod
-    def calculate_microstructure_features(tick_data: List) -> Dict:
-        """Calculate market microstructure features"""
+    def calculate_microstructure_features(tick_data) -> Dict:
+        """Calculate market microstructure features (list of TickData or TickRingBuffer)"""
         if len(tick_data) < 10:
             return {}
         
-        spreads = [t.spread for t in tick_data[-100:]]
-        mid_prices = [t.mid_price for t in tick_data[-100:]]
-        volumes = [t.volume for t in tick_data[-100:]]
+        if hasattr(tick_data, 'window'):
+            # Column ring buffer - zero-copy views
+            recent = tick_data.window(100)
+            spreads = recent.spread
+            mid_prices = recent.mid
+            volumes = recent.volume
+        else:
+            spreads = np.array([t.spread for t in tick_data[-100:]])
+            mid_prices = np.array([t.mid_price for t in tick_data[-100:]])
+            volumes = np.array([t.volume for t in tick_data[-100:]])
         
         # Price impact
         price_changes = np.diff(mid_prices)
@@ -118,7 +134,7 @@ class FeatureEngineering:
             'spread_min': np.min(spreads),
             'spread_max': np.max(spreads),
             'price_volatility': np.std(price_changes) if len(price_changes) > 0 else 0,
-            'price_range': max(mid_prices) - min(mid_prices),
+            'price_range': np.max(mid_prices) - np.min(mid_prices),
             'volume_mean': np.mean(volumes),
             'volume_std': np.std(volumes),
             'tick_frequency': len(tick_data) / 60.0,  # ticks per minute
@@ -183,15 +199,20 @@ class MLPredictor:
             logger.info(f"Collecting {days} days of historical data for {self.symbol}...")
             
             try:
-                # Get historical data
-                rates = mt5.copy_rates_from_pos(
-                    self.symbol,
-                    mt5.TIMEFRAME_M1,
-                    0,
-                    days * 24 * 60
-                )
+                # Get historical data (bar cache: only bars never fetched before hit MT5)
+                if self.config.get('bar_cache_enabled', True):
+                    bar_cache = BarCache.from_config(self.config)
+                    rates = bar_cache.latest(self.symbol, mt5.TIMEFRAME_M1, days * 24 * 60,
+                                             mt5.copy_rates_range)
+                else:
+                    rates = mt5.copy_rates_from_pos(
+                        self.symbol,
+                        mt5.TIMEFRAME_M1,
+                        0,
+                        days * 24 * 60
+                    )
                 
-                if rates is None or len(rates) == 0:
+                if rates is None or len(rates['time']) == 0:
                     logger.error("Failed to collect historical data")
                     return None
                 
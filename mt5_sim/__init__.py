@@ -0,0 +1,100 @@
+"""
+MT5 Simulator for Aventa HFT Pro 2026
+Pure-Python drop-in for the MetaTrader5 package (load tests, CI, replay)
+
+Usage:
+    import mt5_sim as mt5          # module-level API backed by a default terminal
+    mt5_sim.install(terminal)      # make `import MetaTrader5` resolve to the simulator
+
+Selected by config with ``mt5_backend: 'simulator'`` (see ``install_from_config``).
+"""
+
+import sys
+import logging
+from typing import Dict, Optional
+
+from .constants import MT5Constants, CONSTANTS, timeframe_seconds
+from .feeds import TICK_DTYPE, RATES_DTYPE, TickFeed, SyntheticFeed, as_mt5_ticks, ticks_to_rates
+from .terminal import SimulatedTerminal, SymbolSpec
+
+logger = logging.getLogger(__name__)
+
+globals().update(CONSTANTS)
+
+_terminal: Optional[SimulatedTerminal] = None
+_replaced = None  # the real MetaTrader5 module swapped out by install()
+
+
+def get_terminal() -> SimulatedTerminal:
+    """Process-wide default terminal (XAUUSD random walk until configured)"""
+    global _terminal
+    if _terminal is None:
+        _terminal = SimulatedTerminal.from_config({})
+    return _terminal
+
+
+def set_terminal(terminal: SimulatedTerminal) -> SimulatedTerminal:
+    global _terminal
+    _terminal = terminal
+    return terminal
+
+
+def __getattr__(name):
+    # mt5_sim.order_send(...) etc. go to the default terminal
+    if name.startswith('__'):
+        raise AttributeError(name)
+    return getattr(get_terminal(), name)
+
+
+def install(terminal: Optional[SimulatedTerminal] = None) -> SimulatedTerminal:
+    """
+    Route MetaTrader5 to a simulated terminal for this process
+
+    Future ``import MetaTrader5`` statements get the terminal, and modules
+    that already imported the real package as ``mt5`` are rebound.
+    Objects that captured the module earlier (``mt5_api=`` arguments) are
+    not, so install before creating engines. Every engine in the process
+    then trades on the simulator: use it only in a process of its own (a
+    test run, a replay, or a ``BotSupervisor`` worker).
+    """
+    global _replaced
+    terminal = set_terminal(terminal) if terminal is not None else get_terminal()
+    previous = sys.modules.get('MetaTrader5')
+    if previous is not terminal:
+        if not isinstance(previous, SimulatedTerminal):
+            _replaced = previous
+        sys.modules['MetaTrader5'] = terminal
+        for module in list(sys.modules.values()):
+            if previous is not None and getattr(module, 'mt5', None) is previous:
+                module.mt5 = terminal
+    logger.warning("⚠️ MetaTrader5 is SIMULATED in this process - no orders reach a broker")
+    return terminal
+
+
+def uninstall():
+    """Put the real MetaTrader5 back (if one was imported before install())"""
+    global _replaced
+    current = sys.modules.get('MetaTrader5')
+    if not isinstance(current, SimulatedTerminal):
+        return
+    if _replaced is None:
+        del sys.modules['MetaTrader5']
+    else:
+        sys.modules['MetaTrader5'] = _replaced
+    for module in list(sys.modules.values()):
+        if getattr(module, 'mt5', None) is current and _replaced is not None:
+            module.mt5 = _replaced
+    _replaced = None
+
+
+def install_from_config(config: Dict) -> Optional[SimulatedTerminal]:
+    """install() a terminal built from ``sim_*`` keys when ``mt5_backend`` is 'simulator'"""
+    if config.get('mt5_backend', 'terminal') != 'simulator':
+        return None
+    current = sys.modules.get('MetaTrader5')
+    if isinstance(current, SimulatedTerminal):
+        if config.get('symbol') and config['symbol'] not in current.specs:
+            current.add_symbol(config['symbol'], tick_dir=config.get('sim_tick_dir', ''))
+        return current
+    return install(SimulatedTerminal.from_config(config))
+
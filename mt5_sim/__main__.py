@@ -0,0 +1,40 @@
+"""
+MT5 simulator benchmark: python -m mt5_sim
+"""
+
+import time
+
+from .terminal import SimulatedTerminal
+
+# === PERFORMANCE TEST ===
+print("=" * 60)
+print("MT5 SIMULATOR - PERFORMANCE TEST")
+print("=" * 60)
+
+terminal = SimulatedTerminal.from_config({'symbol': 'XAUUSD'})
+terminal.initialize()
+n = 20000
+
+for name, call in (
+    ('symbol_info_tick', lambda: terminal.symbol_info_tick('XAUUSD')),
+    ('positions_get', lambda: terminal.positions_get(symbol='XAUUSD')),
+    ('account_info', terminal.account_info),
+):
+    start = time.perf_counter()
+    for _ in range(n):
+        call()
+    print(f"{name:<18} {(time.perf_counter() - start) / n * 1e6:8.2f} us/call")
+
+tick = terminal.symbol_info_tick('XAUUSD')
+start = time.perf_counter()
+for _ in range(2000):
+    result = terminal.order_send({'action': terminal.TRADE_ACTION_DEAL, 'symbol': 'XAUUSD', 'volume': 0.01,
+                                  'type': terminal.ORDER_TYPE_BUY, 'price': tick.ask})
+    terminal.order_send({'action': terminal.TRADE_ACTION_DEAL, 'position': result.order, 'volume': 0.01,
+                         'type': terminal.ORDER_TYPE_SELL})
+print(f"{'open + close':<18} {(time.perf_counter() - start) / 2000 * 1e6:8.2f} us/round trip")
+
+start = time.perf_counter()
+rates = terminal.copy_rates_from_pos('XAUUSD', terminal.TIMEFRAME_M1, 0, 1440)
+print(f"copy_rates 1440 M1 {(time.perf_counter() - start) * 1000:8.2f} ms ({len(rates)} bars)")
+print("=" * 60)
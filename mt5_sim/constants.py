@@ -0,0 +1,92 @@
+"""
+MetaTrader5 constants used by Aventa HFT Pro 2026 (values match the terminal package)
+"""
+
+
+class MT5Constants:
+    """Constant namespace shared by the simulated terminal and the mt5_sim module"""
+
+    ORDER_TYPE_BUY = 0
+    ORDER_TYPE_SELL = 1
+
+    TRADE_ACTION_DEAL = 1
+    TRADE_ACTION_PENDING = 5
+    TRADE_ACTION_SLTP = 6
+
+    ORDER_TIME_GTC = 0
+    ORDER_FILLING_FOK = 0
+    ORDER_FILLING_IOC = 1
+    ORDER_FILLING_RETURN = 2
+
+    SYMBOL_FILLING_FOK = 1
+    SYMBOL_FILLING_IOC = 2
+
+    DEAL_TYPE_BUY = 0
+    DEAL_TYPE_SELL = 1
+    DEAL_ENTRY_IN = 0
+    DEAL_ENTRY_OUT = 1
+
+    DEAL_REASON_CLIENT = 0
+    DEAL_REASON_EXPERT = 3
+    DEAL_REASON_SL = 4
+    DEAL_REASON_TP = 5
+
+    POSITION_TYPE_BUY = 0
+    POSITION_TYPE_SELL = 1
+
+    TRADE_RETCODE_REQUOTE = 10004
+    TRADE_RETCODE_REJECT = 10006
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_INVALID = 10013
+    TRADE_RETCODE_INVALID_VOLUME = 10014
+    TRADE_RETCODE_INVALID_STOPS = 10016
+    TRADE_RETCODE_MARKET_CLOSED = 10018
+    TRADE_RETCODE_NO_MONEY = 10019
+    TRADE_RETCODE_PRICE_CHANGED = 10020
+    TRADE_RETCODE_PRICE_OFF = 10021
+    TRADE_RETCODE_POSITION_CLOSED = 10036
+
+    COPY_TICKS_ALL = -1
+    COPY_TICKS_INFO = 1
+    COPY_TICKS_TRADE = 2
+
+    TIMEFRAME_M1 = 1
+    TIMEFRAME_M2 = 2
+    TIMEFRAME_M3 = 3
+    TIMEFRAME_M4 = 4
+    TIMEFRAME_M5 = 5
+    TIMEFRAME_M6 = 6
+    TIMEFRAME_M10 = 10
+    TIMEFRAME_M12 = 12
+    TIMEFRAME_M15 = 15
+    TIMEFRAME_M20 = 20
+    TIMEFRAME_M30 = 30
+    TIMEFRAME_H1 = 16385
+    TIMEFRAME_H2 = 16386
+    TIMEFRAME_H3 = 16387
+    TIMEFRAME_H4 = 16388
+    TIMEFRAME_H6 = 16390
+    TIMEFRAME_H8 = 16392
+    TIMEFRAME_H12 = 16396
+    TIMEFRAME_D1 = 16408
+    TIMEFRAME_W1 = 32769
+
+    RES_S_OK = 1
+    RES_E_FAIL = -1
+    RES_E_NOT_FOUND = -4
+
+
+CONSTANTS = {name: value for name, value in vars(MT5Constants).items() if name.isupper()}
+
+
+def timeframe_seconds(timeframe: int):
+    """Bar length in seconds for a TIMEFRAME_* value (None if unsupported)"""
+    if timeframe < 16385:
+        return timeframe * 60
+    if timeframe < 16408:
+        return (timeframe - 16384) * 3600
+    if timeframe == 16408:
+        return 86400
+    if timeframe == 32769:
+        return 7 * 86400
+    return None
@@ -0,0 +1,139 @@
+"""
+Tick feeds for the MT5 simulator: recorded/array ticks and a seeded random walk
+"""
+
+import numpy as np
+
+# Same layout as MetaTrader5.copy_ticks_from()
+TICK_DTYPE = np.dtype([
+    ('time', 'i8'), ('bid', 'f8'), ('ask', 'f8'), ('last', 'f8'),
+    ('volume', 'u8'), ('time_msc', 'i8'), ('flags', 'u4'), ('volume_real', 'f8'),
+])
+# Same layout as MetaTrader5.copy_rates_range()
+RATES_DTYPE = np.dtype([
+    ('time', 'i8'), ('open', 'f8'), ('high', 'f8'), ('low', 'f8'), ('close', 'f8'),
+    ('tick_volume', 'u8'), ('spread', 'i4'), ('real_volume', 'u8'),
+])
+
+
+def as_mt5_ticks(ticks: np.ndarray) -> np.ndarray:
+    """Convert any array with time_msc/bid/ask/last/volume fields (e.g. a TickRecorder segment) to TICK_DTYPE"""
+    if ticks.dtype == TICK_DTYPE:
+        return ticks
+    out = np.zeros(len(ticks), dtype=TICK_DTYPE)
+    out['time_msc'] = ticks['time_msc']
+    out['time'] = out['time_msc'] // 1000
+    out['bid'] = ticks['bid']
+    out['ask'] = ticks['ask']
+    out['last'] = ticks['last']
+    out['volume'] = ticks['volume']
+    out['volume_real'] = ticks['volume']
+    return out
+
+
+def ticks_to_rates(ticks: np.ndarray, seconds: int, point: float) -> np.ndarray:
+    """Aggregate ticks into bid OHLC bars of ``seconds`` length"""
+    if len(ticks) == 0:
+        return np.zeros(0, dtype=RATES_DTYPE)
+    bucket = ticks['time'] // seconds * seconds
+    starts = np.r_[0, np.flatnonzero(np.diff(bucket)) + 1]
+    ends = np.r_[starts[1:], len(ticks)]
+    bid = ticks['bid']
+
+    rates = np.zeros(len(starts), dtype=RATES_DTYPE)
+    rates['time'] = bucket[starts]
+    rates['open'] = bid[starts]
+    rates['high'] = np.maximum.reduceat(bid, starts)
+    rates['low'] = np.minimum.reduceat(bid, starts)
+    rates['close'] = bid[ends - 1]
+    rates['tick_volume'] = ends - starts
+    rates['spread'] = np.maximum.reduceat(np.rint((ticks['ask'] - bid) / point), starts)
+    rates['real_volume'] = np.add.reduceat(ticks['volume'], starts)
+    return rates
+
+
+class TickFeed:
+    """
+    Fixed tick array revealed up to a cursor
+
+    ``advance_to(time_msc)`` (wall/virtual clock) or ``seek(count)``
+    (replay by index) moves the cursor; only ``ticks[:cursor]`` is visible
+    to the terminal, so nothing can look ahead.
+    """
+
+    def __init__(self, ticks: np.ndarray, shift_to_msc: int = None):
+        ticks = as_mt5_ticks(ticks)
+        if shift_to_msc is not None and len(ticks):
+            # Replay recorded ticks as if they started now
+            ticks = ticks.copy()
+            ticks['time_msc'] += shift_to_msc - ticks['time_msc'][0]
+            ticks['time'] = ticks['time_msc'] // 1000
+        self.ticks = ticks
+        self.cursor = 0
+
+    def ensure(self, time_msc: int):
+        """Make sure ticks up to ``time_msc`` exist (generators extend here)"""
+
+    def advance_to(self, time_msc: int):
+        """Reveal every tick at or before ``time_msc``; returns the (start, end) of the new ticks"""
+        self.ensure(time_msc)
+        start = self.cursor
+        end = int(np.searchsorted(self.ticks['time_msc'][start:], time_msc, side='right')) + start
+        self.cursor = end
+        return start, end
+
+    def seek(self, count: int):
+        start = self.cursor
+        self.cursor = min(count, len(self.ticks))
+        return start, self.cursor
+
+    def visible(self) -> np.ndarray:
+        return self.ticks[:self.cursor]
+
+    def latest(self):
+        return self.ticks[self.cursor - 1] if self.cursor else None
+
+
+class SyntheticFeed(TickFeed):
+    """
+    Seeded random walk, generated lazily in fixed-size chunks
+
+    Inter-arrival times are exponential; the sequence depends only on the
+    seed (chunks are always generated whole), so runs are repeatable.
+    """
+
+    CHUNK = 4096
+
+    def __init__(self, start_msc: int, price: float = 2600.0, volatility: float = 0.05,
+                 spread: float = 0.12, mean_interval_ms: float = 200.0, digits: int = 2, seed: int = 0):
+        super().__init__(np.zeros(0, dtype=TICK_DTYPE))
+        self.rng = np.random.default_rng(seed)
+        self.price = price
+        self.volatility = volatility
+        self.spread = spread
+        self.mean_interval_ms = mean_interval_ms
+        self.digits = digits
+        self._next_msc = int(start_msc)
+
+    def _generate(self):
+        n = self.CHUNK
+        gaps = np.maximum(1, self.rng.exponential(self.mean_interval_ms, n).astype(np.int64))
+        time_msc = self._next_msc + np.cumsum(gaps) - gaps[0]
+        bid = np.round(self.price + np.cumsum(self.rng.normal(0.0, self.volatility, n)), self.digits)
+        volume = self.rng.integers(1, 10, n)
+
+        chunk = np.zeros(n, dtype=TICK_DTYPE)
+        chunk['time_msc'] = time_msc
+        chunk['time'] = time_msc // 1000
+        chunk['bid'] = bid
+        chunk['ask'] = np.round(bid + self.spread, self.digits)
+        chunk['last'] = bid
+        chunk['volume'] = volume
+        chunk['volume_real'] = volume
+        self.ticks = np.concatenate([self.ticks, chunk])
+        self.price = float(bid[-1])
+        self._next_msc = int(time_msc[-1]) + gaps[0]
+
+    def ensure(self, time_msc: int):
+        while self._next_msc <= time_msc:
+            self._generate()
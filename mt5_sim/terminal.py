@@ -0,0 +1,565 @@
+"""
+Simulated MetaTrader5 terminal: market data, account, positions, deals and order execution
+"""
+
+import time
+import random
+import calendar
+import threading
+import logging
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import datetime
+from types import ModuleType
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .constants import MT5Constants, timeframe_seconds
+from .feeds import TickFeed, SyntheticFeed, ticks_to_rates
+
+logger = logging.getLogger(__name__)
+
+# Result structures (namedtuples, like the terminal package's)
+Tick = namedtuple('Tick', 'time bid ask last volume time_msc flags volume_real')
+SymbolInfo = namedtuple('SymbolInfo', 'name description visible select digits spread point bid ask '
+                                      'trade_contract_size trade_tick_size trade_tick_value trade_stops_level '
+                                      'trade_freeze_level filling_mode volume_min volume_max volume_step '
+                                      'currency_profit')
+AccountInfo = namedtuple('AccountInfo', 'login trade_mode leverage balance credit profit equity margin '
+                                        'margin_free margin_level currency server name company')
+TerminalInfo = namedtuple('TerminalInfo', 'connected trade_allowed name company path build')
+TradePosition = namedtuple('TradePosition', 'ticket time time_msc time_update time_update_msc type magic '
+                                            'identifier reason volume price_open sl tp price_current swap '
+                                            'profit symbol comment external_id')
+TradeDeal = namedtuple('TradeDeal', 'ticket order time time_msc type entry magic position_id reason volume '
+                                    'price commission swap profit fee symbol comment external_id')
+OrderSendResult = namedtuple('OrderSendResult', 'retcode deal order volume price bid ask comment request_id request')
+
+
+@dataclass(frozen=True)
+class SymbolSpec:
+    """Contract specification of a simulated symbol (defaults: XAUUSD-like)"""
+    name: str
+    point: float = 0.01
+    digits: int = 2
+    contract_size: float = 100.0
+    stops_level: int = 0
+    freeze_level: int = 0
+    volume_min: float = 0.01
+    volume_max: float = 100.0
+    volume_step: float = 0.01
+    filling_mode: int = MT5Constants.SYMBOL_FILLING_FOK | MT5Constants.SYMBOL_FILLING_IOC
+    currency_profit: str = 'USD'
+
+
+class _Position:
+    __slots__ = ('ticket', 'symbol', 'type', 'magic', 'volume', 'price_open', 'sl', 'tp', 'time_msc', 'comment')
+
+    def __init__(self, ticket, symbol, type, magic, volume, price_open, sl, tp, time_msc, comment):
+        self.ticket = ticket
+        self.symbol = symbol
+        self.type = type
+        self.magic = magic
+        self.volume = volume
+        self.price_open = price_open
+        self.sl = sl
+        self.tp = tp
+        self.time_msc = time_msc
+        self.comment = comment
+
+
+def _to_seconds(value) -> float:
+    """datetime (naive = UTC, as the terminal package treats it) or epoch seconds"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return calendar.timegm(value.timetuple()) + value.microsecond / 1e6
+        return value.timestamp()
+    return float(value)
+
+
+class SimulatedTerminal(MT5Constants, ModuleType):
+    """
+    Pure-Python stand-in for the MetaTrader5 package
+
+    Implements the calls the project makes (initialize, symbol_info(_tick),
+    copy_rates_*, copy_ticks_*, positions_get, history_deals_get,
+    order_send, account_info, ...) on top of one TickFeed per symbol.
+
+    Time: with a ``clock`` (default ``time.time``) every call first reveals
+    the ticks up to ``clock()``; with ``clock=None`` the market only moves
+    through ``step_to()`` (deterministic replay). Positions are checked
+    against every revealed tick, so SL/TP fire at the tick that crossed
+    them even if nobody was polling.
+
+    Execution is market execution: fills at the current bid/ask plus
+    optional adverse slippage, after ``latency_ms`` (+ uniform jitter).
+    ``requote_rate`` / ``reject_rate`` inject TRADE_RETCODE_REQUOTE /
+    TRADE_RETCODE_REJECT; ``spread_points`` forces a fixed spread.
+    Profit is price difference x volume x contract size in account currency.
+    Thread-safe; the latency sleep happens outside the lock so concurrent
+    requests overlap as they do against a real server.
+    """
+
+    def __init__(self, clock: Optional[Callable[[], float]] = time.time, sleep: Callable[[float], None] = time.sleep,
+                 balance: float = 10000.0, leverage: int = 100, latency_ms: float = 0.0,
+                 latency_jitter_ms: float = 0.0, data_latency_ms: float = 0.0, spread_points: int = 0,
+                 slippage_points: float = 0.0, requote_rate: float = 0.0, reject_rate: float = 0.0,
+                 commission_per_lot: float = 0.0, seed: int = 0, login: int = 1):
+        ModuleType.__init__(self, 'MetaTrader5')
+        self.clock = clock
+        self.sleep = sleep
+        self.balance = float(balance)
+        self.leverage = leverage
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.data_latency_ms = data_latency_ms
+        self.spread_points = spread_points
+        self.slippage_points = slippage_points
+        self.requote_rate = requote_rate
+        self.reject_rate = reject_rate
+        self.commission_per_lot = commission_per_lot
+        self.account_login = login
+
+        self.specs: Dict[str, SymbolSpec] = {}
+        self.feeds: Dict[str, TickFeed] = {}
+        self.positions: Dict[int, _Position] = {}
+        self.deals: List[TradeDeal] = []
+        self._next_ticket = 1
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._last_error = (self.RES_S_OK, 'Success')
+        self.connected = False
+
+        # Stats
+        self.orders_sent = 0
+        self.requotes = 0
+        self.rejects = 0
+        self.sl_hits = 0
+        self.tp_hits = 0
+        self.api_calls = 0
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'SimulatedTerminal':
+        """Terminal for the bot config's symbol, tuned by the ``sim_*`` keys"""
+        terminal = cls(
+            balance=config.get('sim_balance', 10000.0),
+            latency_ms=config.get('sim_latency_ms', 0.0),
+            latency_jitter_ms=config.get('sim_latency_jitter_ms', 0.0),
+            spread_points=config.get('sim_spread_points', 0),
+            slippage_points=config.get('sim_slippage_points', 0.0),
+            requote_rate=config.get('sim_requote_rate', 0.0),
+            reject_rate=config.get('sim_reject_rate', 0.0),
+            seed=config.get('sim_seed', 0),
+        )
+        terminal.add_symbol(config.get('symbol', 'XAUUSD'), tick_dir=config.get('sim_tick_dir', ''))
+        return terminal
+
+    # --- Setup / replay control ---
+
+    def add_symbol(self, name: str, feed: Optional[TickFeed] = None, tick_dir: str = '', **spec):
+        """
+        Register a symbol; without a feed, ticks come from ``tick_dir``
+        (TickRecorder segments, time-shifted to start now) or a random walk
+        """
+        spec = SymbolSpec(name, **spec)
+        if feed is None:
+            now_msc = int(self.clock() * 1000) if self.clock else 0
+            if tick_dir:
+                from tick_replay import load_recorded_ticks
+                feed = TickFeed(load_recorded_ticks(tick_dir, name), shift_to_msc=now_msc)
+            else:
+                # A day of history so copy_rates_* / copy_ticks_* have something to return
+                feed = SyntheticFeed(now_msc - 86400 * 1000, digits=spec.digits,
+                                     seed=self._rng.randrange(2 ** 32))
+        with self._lock:
+            self.specs[name] = spec
+            self.feeds[name] = feed
+        return feed
+
+    def step_to(self, symbol: str, count: int):
+        """Reveal the first ``count`` ticks of a symbol (clock=None replay) and fire SL/TP"""
+        with self._lock:
+            start, end = self.feeds[symbol].seek(count)
+            if end > start:
+                self._check_stops(symbol, start, end)
+
+    def _sync(self):
+        if self.clock is None:
+            return
+        now_msc = int(self.clock() * 1000)
+        for symbol, feed in self.feeds.items():
+            start, end = feed.advance_to(now_msc)
+            if end > start and self.positions:
+                self._check_stops(symbol, start, end)
+
+    def _call(self):
+        self.api_calls += 1
+        if self.data_latency_ms > 0:
+            self.sleep(self.data_latency_ms / 1000.0)
+
+    def _delay(self):
+        delay = self.latency_ms
+        if self.latency_jitter_ms > 0:
+            delay += self._rng.uniform(0.0, self.latency_jitter_ms)
+        if delay > 0:
+            self.sleep(delay / 1000.0)
+
+    def _quotes(self, symbol: str, ticks: np.ndarray):
+        bid = ticks['bid']
+        if self.spread_points:
+            return bid, bid + self.spread_points * self.specs[symbol].point
+        return bid, ticks['ask']
+
+    def _quote(self, symbol: str):
+        tick = self.feeds[symbol].latest()
+        if tick is None:
+            return None
+        bid = float(tick['bid'])
+        if self.spread_points:
+            return bid, bid + self.spread_points * self.specs[symbol].point
+        return bid, float(tick['ask'])
+
+    def _profit(self, p: _Position, bid: float, ask: float) -> float:
+        contract_size = self.specs[p.symbol].contract_size
+        if p.type == self.ORDER_TYPE_BUY:
+            return (bid - p.price_open) * p.volume * contract_size
+        return (p.price_open - ask) * p.volume * contract_size
+
+    def _check_stops(self, symbol: str, start: int, end: int):
+        """Close positions whose SL/TP was crossed by ticks[start:end] (first crossing wins)"""
+        ticks = self.feeds[symbol].ticks[start:end]
+        bid, ask = self._quotes(symbol, ticks)
+        for p in [p for p in self.positions.values() if p.symbol == symbol]:
+            if p.type == self.ORDER_TYPE_BUY:
+                price = bid
+                hit_sl = price <= p.sl if p.sl > 0 else np.zeros(len(price), bool)
+                hit_tp = price >= p.tp if p.tp > 0 else np.zeros(len(price), bool)
+            else:
+                price = ask
+                hit_sl = price >= p.sl if p.sl > 0 else np.zeros(len(price), bool)
+                hit_tp = price <= p.tp if p.tp > 0 else np.zeros(len(price), bool)
+            hit = hit_sl | hit_tp
+            if not hit.any():
+                continue
+            i = int(np.argmax(hit))
+            if hit_sl[i]:
+                self.sl_hits += 1
+                reason, comment = self.DEAL_REASON_SL, f"[sl {p.sl:.{self.specs[symbol].digits}f}]"
+            else:
+                self.tp_hits += 1
+                reason, comment = self.DEAL_REASON_TP, f"[tp {p.tp:.{self.specs[symbol].digits}f}]"
+            self._close(p.ticket, float(price[i]), comment, int(ticks['time_msc'][i]), reason)
+
+    def _now_msc(self, symbol: str) -> int:
+        tick = self.feeds[symbol].latest()
+        return int(tick['time_msc']) if tick is not None else 0
+
+    def _deal(self, symbol: str, position_id: int, deal_type: int, entry: int, magic: int, volume: float,
+              price: float, profit: float, commission: float, comment: str, time_msc: int,
+              reason: int = MT5Constants.DEAL_REASON_EXPERT) -> TradeDeal:
+        deal = TradeDeal(
+            ticket=self._next_ticket, order=self._next_ticket, time=time_msc // 1000, time_msc=time_msc,
+            type=deal_type, entry=entry, magic=magic, position_id=position_id, reason=reason, volume=volume,
+            price=price, commission=commission, swap=0.0, profit=profit, fee=0.0, symbol=symbol,
+            comment=comment, external_id='',
+        )
+        self._next_ticket += 1
+        self.deals.append(deal)
+        self.balance += profit + commission
+        return deal
+
+    def _close(self, ticket: int, price: float, comment: str, time_msc: int,
+               reason: int = MT5Constants.DEAL_REASON_EXPERT) -> TradeDeal:
+        p = self.positions.pop(ticket)
+        profit = self._profit(p, price, price)
+        closing_type = self.ORDER_TYPE_SELL if p.type == self.ORDER_TYPE_BUY else self.ORDER_TYPE_BUY
+        commission = -self.commission_per_lot * p.volume / 2
+        return self._deal(p.symbol, ticket, closing_type, self.DEAL_ENTRY_OUT, p.magic, p.volume,
+                          price, profit, commission, comment, time_msc, reason)
+
+    def _exposure(self):
+        """(floating profit, used margin) of all open positions"""
+        floating = margin = 0.0
+        for p in self.positions.values():
+            bid, ask = self._quote(p.symbol)
+            floating += self._profit(p, bid, ask)
+            margin += p.volume * self.specs[p.symbol].contract_size * p.price_open / self.leverage
+        return floating, margin
+
+    def _fail(self, code: int, message: str):
+        self._last_error = (code, message)
+        return None
+
+    # --- Connection ---
+
+    def initialize(self, path=None, **kwargs) -> bool:
+        self.connected = True
+        self._last_error = (self.RES_S_OK, 'Success')
+        with self._lock:
+            self._sync()
+        return True
+
+    def login(self, login=None, password=None, server=None, timeout=None) -> bool:
+        return True
+
+    def shutdown(self):
+        self.connected = False
+
+    def last_error(self):
+        return self._last_error
+
+    def version(self):
+        return (500, 4000, 'simulated')
+
+    def terminal_info(self):
+        if not self.connected:
+            return None
+        return TerminalInfo(connected=True, trade_allowed=True, name='Aventa MT5 Simulator',
+                            company='Simulated', path='', build=4000)
+
+    def account_info(self):
+        self._call()
+        with self._lock:
+            self._sync()
+            floating, margin = self._exposure()
+            equity = self.balance + floating
+            return AccountInfo(
+                login=self.account_login, trade_mode=0, leverage=self.leverage, balance=self.balance, credit=0.0,
+                profit=floating, equity=equity, margin=margin, margin_free=equity - margin,
+                margin_level=equity / margin * 100 if margin > 0 else 0.0, currency='USD',
+                server='Simulator', name='Simulated account', company='Simulated',
+            )
+
+    # --- Symbols and market data ---
+
+    def symbols_total(self) -> int:
+        return len(self.specs)
+
+    def symbols_get(self, group=None):
+        return tuple(self.symbol_info(name) for name in self.specs)
+
+    def symbol_select(self, symbol, enable=True) -> bool:
+        return symbol in self.specs
+
+    def symbol_info(self, symbol):
+        self._call()
+        spec = self.specs.get(symbol)
+        if spec is None:
+            return self._fail(self.RES_E_NOT_FOUND, f'Symbol {symbol} not found')
+        with self._lock:
+            self._sync()
+            bid, ask = self._quote(symbol) or (0.0, 0.0)
+        return SymbolInfo(
+            name=symbol, description=f'{symbol} (simulated)', visible=True, select=True, digits=spec.digits,
+            spread=int(round((ask - bid) / spec.point)), point=spec.point, bid=bid, ask=ask,
+            trade_contract_size=spec.contract_size, trade_tick_size=spec.point,
+            trade_tick_value=spec.point * spec.contract_size, trade_stops_level=spec.stops_level,
+            trade_freeze_level=spec.freeze_level, filling_mode=spec.filling_mode, volume_min=spec.volume_min,
+            volume_max=spec.volume_max, volume_step=spec.volume_step, currency_profit=spec.currency_profit,
+        )
+
+    def symbol_info_tick(self, symbol):
+        self._call()
+        if symbol not in self.feeds:
+            return self._fail(self.RES_E_NOT_FOUND, f'Symbol {symbol} not found')
+        with self._lock:
+            self._sync()
+            tick = self.feeds[symbol].latest()
+            if tick is None:
+                return None
+            bid, ask = self._quote(symbol)
+        return Tick(time=int(tick['time']), bid=bid, ask=ask, last=float(tick['last']), volume=int(tick['volume']),
+                    time_msc=int(tick['time_msc']), flags=int(tick['flags']), volume_real=float(tick['volume_real']))
+
+    def _visible_ticks(self, symbol: str) -> Optional[np.ndarray]:
+        if symbol not in self.feeds:
+            return self._fail(self.RES_E_NOT_FOUND, f'Symbol {symbol} not found')
+        with self._lock:
+            self._sync()
+            ticks = self.feeds[symbol].visible()
+        if self.spread_points:
+            ticks = ticks.copy()
+            ticks['ask'] = ticks['bid'] + self.spread_points * self.specs[symbol].point
+        return ticks
+
+    def copy_ticks_from(self, symbol, date_from, count, flags=MT5Constants.COPY_TICKS_ALL):
+        """Up to ``count`` ticks at or after ``date_from`` that have already happened"""
+        self._call()
+        ticks = self._visible_ticks(symbol)
+        if ticks is None:
+            return None
+        start = np.searchsorted(ticks['time_msc'], int(_to_seconds(date_from) * 1000))
+        return ticks[start:start + int(count)].copy()
+
+    def copy_ticks_range(self, symbol, date_from, date_to, flags=MT5Constants.COPY_TICKS_ALL):
+        self._call()
+        ticks = self._visible_ticks(symbol)
+        if ticks is None:
+            return None
+        msc = ticks['time_msc']
+        start = np.searchsorted(msc, int(_to_seconds(date_from) * 1000))
+        end = np.searchsorted(msc, int(_to_seconds(date_to) * 1000), side='right')
+        return ticks[start:end].copy()
+
+    def _rates(self, symbol: str, timeframe: int):
+        seconds = timeframe_seconds(timeframe)
+        if seconds is None:
+            return self._fail(self.RES_E_FAIL, f'Unsupported timeframe {timeframe}')
+        ticks = self._visible_ticks(symbol)
+        if ticks is None:
+            return None
+        return ticks_to_rates(ticks, seconds, self.specs[symbol].point)
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        """Bid OHLC bars (built from the feed's ticks) opening within [date_from, date_to]"""
+        self._call()
+        rates = self._rates(symbol, timeframe)
+        if rates is None:
+            return None
+        start = np.searchsorted(rates['time'], _to_seconds(date_from))
+        end = np.searchsorted(rates['time'], _to_seconds(date_to), side='right')
+        return rates[start:end]
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        """``count`` bars ending ``start_pos`` bars before the current one"""
+        self._call()
+        rates = self._rates(symbol, timeframe)
+        if rates is None:
+            return None
+        end = len(rates) - int(start_pos)
+        return rates[max(0, end - int(count)):max(0, end)]
+
+    # --- Positions and history ---
+
+    def positions_total(self) -> int:
+        return len(self.positions)
+
+    def positions_get(self, symbol=None, ticket=None, group=None):
+        self._call()
+        with self._lock:
+            self._sync()
+            result = []
+            for p in self.positions.values():
+                if (symbol is not None and p.symbol != symbol) or (ticket is not None and p.ticket != ticket):
+                    continue
+                bid, ask = self._quote(p.symbol)
+                current = bid if p.type == self.ORDER_TYPE_BUY else ask
+                result.append(TradePosition(
+                    ticket=p.ticket, time=p.time_msc // 1000, time_msc=p.time_msc, time_update=p.time_msc // 1000,
+                    time_update_msc=p.time_msc, type=p.type, magic=p.magic, identifier=p.ticket, reason=3,
+                    volume=p.volume, price_open=p.price_open, sl=p.sl, tp=p.tp, price_current=current, swap=0.0,
+                    profit=self._profit(p, bid, ask), symbol=p.symbol, comment=p.comment, external_id='',
+                ))
+            return tuple(result)
+
+    def orders_get(self, symbol=None, ticket=None, group=None):
+        return ()
+
+    def orders_total(self) -> int:
+        return 0
+
+    def history_deals_get(self, date_from=None, date_to=None, group=None, ticket=None, position=None):
+        self._call()
+        with self._lock:
+            self._sync()
+            deals = list(self.deals)
+        if position is not None:
+            return tuple(d for d in deals if d.position_id == position)
+        if ticket is not None:
+            return tuple(d for d in deals if d.ticket == ticket)
+        date_from, date_to = _to_seconds(date_from), _to_seconds(date_to)
+        return tuple(d for d in deals if date_from <= d.time <= date_to)
+
+    def history_deals_total(self, date_from, date_to) -> int:
+        return len(self.history_deals_get(date_from, date_to))
+
+    # --- Trading ---
+
+    def _result(self, retcode: int, comment: str, request: dict, price: float = 0.0, bid: float = 0.0,
+                ask: float = 0.0, deal: int = 0, order: int = 0, volume: float = 0.0) -> OrderSendResult:
+        return OrderSendResult(retcode=retcode, deal=deal, order=order, volume=volume, price=price, bid=bid,
+                               ask=ask, comment=comment, request_id=self.orders_sent, request=request)
+
+    def order_send(self, request: dict):
+        """Market execution of a TRADE_ACTION_DEAL open or close (``position`` set)"""
+        self.api_calls += 1
+        self._delay()
+        with self._lock:
+            self.orders_sent += 1
+            self._sync()
+            if request.get('action', self.TRADE_ACTION_DEAL) != self.TRADE_ACTION_DEAL:
+                return self._result(self.TRADE_RETCODE_INVALID, 'Unsupported action', request)
+
+            ticket = request.get('position')
+            position = self.positions.get(ticket) if ticket else None
+            if ticket and position is None:
+                return self._result(self.TRADE_RETCODE_POSITION_CLOSED, 'Position not found', request)
+            symbol = position.symbol if position is not None else request.get('symbol')
+            spec = self.specs.get(symbol)
+            quote = self._quote(symbol) if spec is not None else None
+            if quote is None:
+                return self._result(self.TRADE_RETCODE_MARKET_CLOSED, 'Market closed', request)
+            bid, ask = quote
+
+            if self.reject_rate and self._rng.random() < self.reject_rate:
+                self.rejects += 1
+                return self._result(self.TRADE_RETCODE_REJECT, 'Request rejected', request, bid=bid, ask=ask)
+            if self.requote_rate and self._rng.random() < self.requote_rate:
+                self.requotes += 1
+                return self._result(self.TRADE_RETCODE_REQUOTE, 'Requote', request, bid=bid, ask=ask)
+
+            buying = (position.type != self.ORDER_TYPE_BUY) if position is not None \
+                else request['type'] == self.ORDER_TYPE_BUY
+            price = ask if buying else bid
+            if self.slippage_points:
+                slip = self._rng.uniform(0.0, self.slippage_points) * spec.point
+                price = round(price + slip if buying else price - slip, spec.digits)
+            now_msc = self._now_msc(symbol)
+            comment = request.get('comment', '')
+
+            if position is not None:
+                deal = self._close(ticket, price, comment, now_msc)
+                return self._result(self.TRADE_RETCODE_DONE, 'Request executed', request, price, bid, ask,
+                                    deal.ticket, deal.order, deal.volume)
+
+            volume = float(request['volume'])
+            steps = volume / spec.volume_step
+            if volume < spec.volume_min or volume > spec.volume_max or abs(steps - round(steps)) > 1e-6:
+                return self._result(self.TRADE_RETCODE_INVALID_VOLUME, 'Invalid volume', request, bid=bid, ask=ask)
+
+            sl, tp = request.get('sl', 0.0) or 0.0, request.get('tp', 0.0) or 0.0
+            min_distance = spec.stops_level * spec.point
+            if buying:
+                bad_stops = (sl and sl > bid - min_distance) or (tp and tp < bid + min_distance)
+            else:
+                bad_stops = (sl and sl < ask + min_distance) or (tp and tp > ask - min_distance)
+            if bad_stops:
+                return self._result(self.TRADE_RETCODE_INVALID_STOPS, 'Invalid stops', request, bid=bid, ask=ask)
+
+            floating, margin = self._exposure()
+            if volume * spec.contract_size * price / self.leverage > self.balance + floating - margin:
+                return self._result(self.TRADE_RETCODE_NO_MONEY, 'No money', request, bid=bid, ask=ask)
+
+            ticket = self._next_ticket
+            magic = request.get('magic', 0)
+            order_type = self.ORDER_TYPE_BUY if buying else self.ORDER_TYPE_SELL
+            self.positions[ticket] = _Position(ticket, symbol, order_type, magic, volume, price, sl, tp,
+                                               now_msc, comment)
+            deal = self._deal(symbol, ticket, order_type, self.DEAL_ENTRY_IN, magic, volume, price, 0.0,
+                              -self.commission_per_lot * volume / 2, comment, now_msc)
+            return self._result(self.TRADE_RETCODE_DONE, 'Request executed', request, price, bid, ask,
+                                deal.ticket, ticket, volume)
+
+    def get_stats(self) -> dict:
+        return {
+            'api_calls': self.api_calls,
+            'orders_sent': self.orders_sent,
+            'requotes': self.requotes,
+            'rejects': self.rejects,
+            'sl_hits': self.sl_hits,
+            'tp_hits': self.tp_hits,
+            'open_positions': len(self.positions),
+            'deals': len(self.deals),
+            'balance': self.balance,
+        }
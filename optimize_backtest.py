@@ -35,8 +35,8 @@ class BacktestOptimizer:
             logger.error(f"Backtest error: {e}")
             return None
     
-    def optimize(self, start_date, end_date):
-        """Run optimization with grid search"""
+    def optimize(self, start_date, end_date, workers=None, cancel_check=None):
+        """Run optimization with grid search (bars loaded once, configs evaluated in a process pool)"""
         
         # Parameter ranges to test
         ema_fast_periods = [5, 7, 9, 12]
@@ -53,21 +53,19 @@ class BacktestOptimizer:
         logger.info(f"Total combinations to test: {total_combinations}")
         logger.info(f"Testing period: {start_date.date()} to {end_date.date()}")
         
-        count = 0
         # Create combinations
         combinations = list(product(
             ema_fast_periods, ema_slow_periods, rsi_periods, atr_periods,
             take_profit_pips, stop_loss_pips
         ))
         
-        for i, (ema_fast, ema_slow, rsi_period, atr_period, tp_pips, sl_pips) in enumerate(combinations):
+        configs = []
+        for ema_fast, ema_slow, rsi_period, atr_period, tp_pips, sl_pips in combinations:
             if ema_fast >= ema_slow:  # Skip invalid combinations
                 continue
             
-            count += 1
-            
             # Create config
-            config = {
+            configs.append({
                 'symbol': 'XAUUSD',
                 'magic_number': 12345,
                 'default_volume': 0.01,
@@ -81,15 +79,26 @@ class BacktestOptimizer:
                 'max_duration_minutes': 1440,
                 'commission_per_trade': 0.0,
                 'slippage_pips': 0.5
-            }
-            
-            # Run backtest
-            results = self.run_single_backtest(config, start_date, end_date)
+            })
+        
+        try:
+            from parallel_optimizer import ParallelOptimizer
+            optimizer = ParallelOptimizer.load(configs[0], start_date, end_date, workers=workers)
+        except Exception as e:
+            logger.error(f"Backtest error: {e}")
+            return self.results
+        
+        count = 0
+        found = {}
+        
+        # Results arrive in completion order
+        for index, results in optimizer.run(configs, cancel_check):
+            count += 1
             
             if results and results.get('total_trades', 0) > 0:
                 # Calculate metrics
-                metrics = {
-                    'config': config,
+                found[index] = {
+                    'config': configs[index],
                     'total_trades': results.get('total_trades', 0),
                     'wins': results.get('wins', 0),
                     'losses': results.get('losses', 0),
@@ -105,12 +114,13 @@ class BacktestOptimizer:
                     'avg_duration': results.get('avg_duration', 0)
                 }
                 
-                self.results.append(metrics)
-                
                 # Progress
-                progress = (count / len([c for c in combinations if c[0] < c[1]])) * 100
                 if count % 5 == 0:
-                    logger.info(f"Progress: {count} tested | Best P&L: ${max([r['total_pnl'] for r in self.results]):.2f}")
+                    logger.info(f"Progress: {count}/{len(configs)} tested | "
+                                f"Best P&L: ${max([r['total_pnl'] for r in found.values()]):.2f}")
+        
+        # Keep grid order regardless of which worker finished first
+        self.results.extend(found[index] for index in sorted(found))
         
         return self.results
     
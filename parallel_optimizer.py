@@ -0,0 +1,368 @@
+"""
+Parallel Optimizer for Aventa HFT Pro 2026
+Evaluates strategy configurations over one set of bars in a process pool (bars in shared memory)
+"""
+
+import os
+import time
+import types
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import backtest_core
+import strategy_backtester
+from indicator_cache import FINGERPRINT_ATTR, IndicatorCache, config_indicators, fingerprint, sweep_indicators
+from strategy_backtester import WARMUP_BARS, StrategyBacktester
+
+logger = logging.getLogger(__name__)
+
+# per-trade lists stay in the worker; optimizers rank on the summary metrics
+DROPPED_RESULT_KEYS = ('trades', 'equity_curve')
+
+# bars one BatchSimulator.run() call covers for every config of a batch (keeps them in cache)
+BATCH_CHUNK_BARS = 1024
+# cap on a batch's equity rows (configs x bars float64)
+BATCH_EQUITY_BYTES = 256 * 1024 * 1024
+# columns calculate_indicators() rejects when they contain NaN
+CHECKED_INDICATORS = ('ema_fast', 'ema_slow', 'rsi', 'atr')
+
+# (column, dtype str, byte offset) of each array inside the shared block
+Layout = List[Tuple[str, str, int]]
+
+# shared block entries holding precomputed indicator series: 'indicator:<name>:<period>'
+INDICATOR_PREFIX = 'indicator:'
+
+# set by _init_worker in each pool process
+_worker_bars: Optional[pd.DataFrame] = None
+_worker_cache: Optional[IndicatorCache] = None
+_worker_shm: Optional[SharedMemory] = None
+
+
+def _shared_arrays(bars: pd.DataFrame, indicators: Dict[Tuple[str, int], np.ndarray]) -> Dict[str, np.ndarray]:
+    arrays = {}
+    for name in bars.columns:
+        values = bars[name].to_numpy()
+        if name == 'time':
+            values = values.astype('datetime64[ns]').view('<i8')
+        if values.dtype.kind in 'iufb':  # only numeric columns reach the backtester
+            arrays[name] = values
+    for (name, period), values in indicators.items():
+        arrays[f"{INDICATOR_PREFIX}{name}:{period}"] = values
+    return arrays
+
+
+def _layout(arrays: Dict[str, np.ndarray]) -> Tuple[Layout, int]:
+    layout, offset = [], 0
+    for name, values in arrays.items():
+        offset = -(-offset // 8) * 8
+        layout.append((name, values.dtype.str, offset))
+        offset += values.nbytes
+    return layout, max(offset, 1)
+
+
+def _init_worker(shm_name: str, layout: Layout, length: int, dataset: str):
+    global _worker_bars, _worker_cache, _worker_shm
+    _worker_shm = SharedMemory(name=shm_name)
+    columns = {}
+    _worker_cache = IndicatorCache() if any(n.startswith(INDICATOR_PREFIX) for n, _, _ in layout) else None
+    for name, dtype, offset in layout:
+        values = np.ndarray(length, dtype=dtype, buffer=_worker_shm.buf, offset=offset)
+        if name.startswith(INDICATOR_PREFIX):
+            indicator, period = name[len(INDICATOR_PREFIX):].split(':')
+            _worker_cache.add(dataset, indicator, int(period), values)
+        else:
+            columns[name] = pd.to_datetime(values, unit='ns') if name == 'time' else values
+    _worker_bars = pd.DataFrame(columns, copy=False)
+    _worker_bars.attrs[FINGERPRINT_ATTR] = dataset
+
+
+def _symbol_info(symbol_ask: Optional[float]):
+    """symbol_info() stand-in from the loader's ask; None (fallback pip value, as run_backtest uses) without one"""
+    return None if symbol_ask is None else types.SimpleNamespace(ask=symbol_ask)
+
+
+def evaluate_config(bars: pd.DataFrame, index: int, config: Dict, initial_balance: float,
+                    symbol_ask: Optional[float] = None,
+                    indicator_cache: Optional[IndicatorCache] = None) -> Tuple[int, Optional[Dict]]:
+    """One backtest over preloaded bars -> (index, summary results or None on failure)"""
+    try:
+        backtester = StrategyBacktester(config, initial_balance=initial_balance, indicator_cache=indicator_cache)
+        backtester._apply_symbol_info(_symbol_info(symbol_ask))
+        results = backtester.run_on_bars(bars.copy())
+    except Exception as e:
+        logger.debug(f"Backtest failed for config {index}: {e}")
+        return index, None
+    if results:
+        for key in DROPPED_RESULT_KEYS:
+            results.pop(key, None)
+    return index, results
+
+
+def evaluate_batch(bars: pd.DataFrame, indices: List[int], configs: List[Dict], initial_balance: float,
+                   symbol_ask: Optional[float] = None, indicator_cache: Optional[IndicatorCache] = None,
+                   cancel_check: Optional[Callable[[], bool]] = None) -> Optional[List[Tuple[int, Optional[Dict]]]]:
+    """
+    Configs simulated together by one BatchSimulator -> [(index, summary results or None)]
+
+    Same results as evaluate_config() per config: each config still goes
+    through StrategyBacktester's config and indicator checks and
+    calculate_results(); only the bar simulation is shared. None if cancelled.
+    """
+    cache = indicator_cache if indicator_cache is not None else IndicatorCache()
+    fingerprint(bars)
+    info = _symbol_info(symbol_ask)
+    has_nan = {}  # (indicator, period) -> series contains NaN
+    items, members = [], []
+    for index, config in zip(indices, configs):
+        try:
+            backtester = StrategyBacktester(config, initial_balance=initial_balance, indicator_cache=cache)
+            backtester._apply_symbol_info(info)
+            # calculate_indicators() checks, without building each config's DataFrame
+            backtester._indicator_periods()
+            for column, name, period in config_indicators(backtester.config):
+                if (name, period) not in has_nan:
+                    has_nan[(name, period)] = bool(np.isnan(cache.get(bars, name, period)).any())
+                if column in CHECKED_INDICATORS and has_nan[(name, period)]:
+                    raise ValueError("Indicator calculation produced NaN values")
+        except Exception as e:
+            logger.debug(f"Backtest failed for config {index}: {e}")
+            items.append((index, None))
+            continue
+        members.append((index, backtester))
+    if not members:
+        return items
+
+    try:
+        keys = sorted({(name, period) for _, b in members for _, name, period in config_indicators(b.config)})
+        rows = {key: row for row, key in enumerate(keys)}
+        series = np.stack([cache.get(bars, name, period) for name, period in keys])
+        series_index = []
+        for _, b in members:
+            by_column = {column: rows[(name, period)] for column, name, period in config_indicators(b.config)}
+            series_index.append([by_column[column] for column in backtest_core.SERIES_COLUMNS])
+        columns = backtest_core.bar_columns(bars, names=backtest_core.BAR_COLUMNS)
+        params = [backtest_core.BarParams.from_config(b.config, b.pip_size, b.pip_value) for _, b in members]
+        simulator = backtest_core.BatchSimulator(
+            columns, series, np.array(series_index), params, float(initial_balance),
+            jit=all(b.config.get('backtest_jit', True) for _, b in members))
+
+        total_bars = len(bars)
+        for start in range(WARMUP_BARS, total_bars, BATCH_CHUNK_BARS):
+            if cancel_check and cancel_check():
+                return None
+            simulator.run(start, min(start + BATCH_CHUNK_BARS, total_bars))
+        simulator.run(total_bars, total_bars, close_at_end=True)
+    except Exception as e:
+        logger.warning(f"Batch simulation failed ({e}), evaluating {len(members)} configs one by one")
+        return items + [evaluate_config(bars, index, b.config, initial_balance, symbol_ask, indicator_cache)
+                        for index, b in members]
+
+    for member in range(len(members)):
+        index, backtester = members[member]
+        members[member] = None  # trade dicts of finished configs are released right away
+        try:
+            backtester._apply_simulation(simulator.member(member), columns, bars, trade_times=False)
+            results = backtester.calculate_results()
+        except Exception as e:
+            logger.debug(f"Backtest failed for config {index}: {e}")
+            items.append((index, None))
+            continue
+        for key in DROPPED_RESULT_KEYS:
+            results.pop(key, None)
+        items.append((index, results))
+    return items
+
+
+def evaluate_group(bars: pd.DataFrame, indices: List[int], configs: List[Dict], initial_balance: float,
+                   symbol_ask: Optional[float] = None, indicator_cache: Optional[IndicatorCache] = None,
+                   cancel_check: Optional[Callable[[], bool]] = None) -> Optional[List[Tuple[int, Optional[Dict]]]]:
+    if len(indices) > 1:
+        return evaluate_batch(bars, indices, configs, initial_balance, symbol_ask, indicator_cache, cancel_check)
+    return [evaluate_config(bars, index, config, initial_balance, symbol_ask, indicator_cache)
+            for index, config in zip(indices, configs)]
+
+
+def _run_group(indices: List[int], configs: List[Dict], initial_balance: float,
+               symbol_ask: Optional[float]) -> List[Tuple[int, Optional[Dict]]]:
+    return evaluate_group(_worker_bars, indices, configs, initial_balance, symbol_ask, _worker_cache)
+
+
+class ParallelOptimizer:
+    """
+    Runs StrategyBacktester.run_on_bars() for many configs over bars loaded once
+
+    Pool workers attach the bar columns from one shared memory block at start-up
+    instead of each re-initializing MT5 and downloading history. Results are
+    streamed in completion order by run(); workers=1 evaluates in-process.
+
+    With cache_indicators, every distinct (indicator, period) of the sweep is
+    computed once in this process and shared read-only with all configs (and
+    placed in the shared block for the workers).
+
+    batch_size > 1 simulates up to that many configs per task in one
+    BatchSimulator pass (evaluate_batch); results are the same as per-config runs.
+    """
+
+    def __init__(self, bars: pd.DataFrame, initial_balance: float = 500,
+                 symbol_ask: Optional[float] = None, workers: Optional[int] = None,
+                 cache_indicators: bool = True, batch_size: int = 64):
+        self.bars = bars
+        self.dataset = fingerprint(bars)
+        self.indicator_cache = IndicatorCache() if cache_indicators else None
+        self.initial_balance = float(initial_balance)
+        self.symbol_ask = symbol_ask  # symbol_info().ask at load time, for the pip value (None: no symbol info)
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.batch_size = max(1, int(batch_size or 1))
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = False
+
+    @classmethod
+    def load(cls, config: Dict, start_date, end_date, initial_balance: float = 500,
+             workers: Optional[int] = None) -> 'ParallelOptimizer':
+        """Bars for config['symbol'] from MT5 / the bar cache, fetched once for every config"""
+        loader = StrategyBacktester(config, initial_balance=initial_balance)
+        try:
+            bars = loader.load_bars(start_date, end_date)
+        finally:
+            strategy_backtester.mt5.shutdown()
+        symbol_ask = getattr(loader.symbol_info, 'ask', None)
+        if workers is None:
+            workers = config.get('optimizer_workers', 0)
+        logger.info(f"Optimizer bars: {len(bars)} for {config['symbol']}")
+        return cls(bars, initial_balance, symbol_ask, workers,
+                   batch_size=config.get('optimizer_batch_size', 64))
+
+    def _share(self, configs: List[Dict]) -> Tuple[SharedMemory, Layout]:
+        indicators = {}
+        if self.indicator_cache is not None:
+            indicators = self.indicator_cache.warm(self.bars, sweep_indicators(configs))
+        arrays = _shared_arrays(self.bars, indicators)
+        layout, size = _layout(arrays)
+        shm = SharedMemory(create=True, size=size)
+        for name, dtype, offset in layout:
+            target = np.ndarray(len(self.bars), dtype=dtype, buffer=shm.buf, offset=offset)
+            target[:] = arrays[name]
+            del target  # no exported views may outlive shm.close()
+        return shm, layout
+
+    def run(self, configs: Iterable[Dict],
+            cancel_check: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[int, Optional[Dict]]]:
+        """Yield (config index, results) as each backtest finishes; stops early when cancel_check() is True"""
+        configs = list(configs)
+        self.completed = self.failed = 0
+        self.cancelled = False
+        groups = self._groups(len(configs))
+        if self.workers == 1 or len(groups) <= 1:
+            for group in groups:
+                items = None
+                if not (cancel_check and cancel_check()):
+                    items = evaluate_group(self.bars, group, [configs[i] for i in group], self.initial_balance,
+                                           self.symbol_ask, self.indicator_cache, cancel_check)
+                if items is None:
+                    self.cancelled = True
+                    logger.info(f"Optimization cancelled after {self.completed}/{len(configs)} configs")
+                    return
+                for item in items:
+                    yield self._count(item)
+            return
+
+        shm, layout = self._share(configs)
+        pool = ProcessPoolExecutor(min(self.workers, len(groups)), initializer=_init_worker,
+                                   initargs=(shm.name, layout, len(self.bars), self.dataset))
+        try:
+            pending = {pool.submit(_run_group, group, [configs[i] for i in group], self.initial_balance,
+                                   self.symbol_ask)
+                       for group in groups}
+            while pending:
+                if cancel_check and cancel_check():
+                    self.cancelled = True
+                    logger.info(f"Optimization cancelled after {self.completed}/{len(configs)} configs")
+                    return
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for item in future.result():
+                        yield self._count(item)
+        finally:
+            # queued configs are dropped; the ones already running finish first
+            pool.shutdown(wait=True, cancel_futures=True)
+            shm.close()
+            shm.unlink()
+
+    def _groups(self, count: int) -> List[List[int]]:
+        """Config indices per task: batches small enough to spread over the workers and fit in memory"""
+        size = min(self.batch_size, max(1, BATCH_EQUITY_BYTES // (8 * max(1, len(self.bars)))))
+        if self.workers > 1:
+            size = min(size, -(-count // self.workers))
+        size = max(1, size)
+        return [list(range(start, min(start + size, count))) for start in range(0, count, size)]
+
+    def _count(self, item: Tuple[int, Optional[Dict]]) -> Tuple[int, Optional[Dict]]:
+        self.completed += 1
+        if item[1] is None:
+            self.failed += 1
+        return item
+
+    def run_all(self, configs: Iterable[Dict],
+                cancel_check: Optional[Callable[[], bool]] = None) -> List[Optional[Dict]]:
+        """Results in config order (None for failed or cancelled configs)"""
+        configs = list(configs)
+        results: List[Optional[Dict]] = [None] * len(configs)
+        for index, result in self.run(configs, cancel_check):
+            results[index] = result
+        return results
+
+
+def scaling_report(bars: pd.DataFrame, configs: List[Dict], max_workers: Optional[int] = None,
+                   initial_balance: float = 500, batch_size: int = 64) -> List[Dict]:
+    """configs/second for 1..max_workers processes over the same configs"""
+    report = []
+    for workers in range(1, (max_workers or os.cpu_count() or 1) + 1):
+        optimizer = ParallelOptimizer(bars, initial_balance, workers=workers, batch_size=batch_size)
+        start = time.perf_counter()
+        for _ in optimizer.run(configs):
+            pass
+        elapsed = time.perf_counter() - start
+        report.append({'workers': workers, 'batch_size': batch_size, 'configs': len(configs), 'seconds': elapsed,
+                       'configs_per_sec': len(configs) / elapsed if elapsed > 0 else 0.0})
+    return report
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    import sys
+    from itertools import product
+
+    print("=" * 60)
+    print("PARALLEL OPTIMIZER - PERFORMANCE TEST")
+    print("=" * 60)
+
+    n = 40_000  # about one month of M1 bars, the fast_optimize.py range
+    rng = np.random.default_rng(3)
+    close = 2000.0 + np.cumsum(rng.normal(0, 0.3, n))
+    bars = pd.DataFrame({
+        'time': pd.to_datetime(1704067200 + np.arange(n) * 60, unit='s'),
+        'open': close, 'high': close + 0.2, 'low': close - 0.2, 'close': close,
+        'volume': rng.integers(1, 50, n).astype(float), 'spread': rng.integers(0, 30, n),
+    })
+    # fast_optimize.py grid
+    configs = [{'symbol': 'XAUUSD', 'magic_number': 12345, 'default_volume': 0.01,
+                'ema_fast_period': fast, 'ema_slow_period': slow, 'rsi_period': rsi, 'atr_period': atr,
+                'take_profit_pips': tp, 'stop_loss_pips': sl, 'slippage_pips': 0.5}
+               for fast, slow, rsi, atr, tp, sl in product([5, 7, 9], [15, 21, 28], [7, 14], [10, 14],
+                                                        [3.0, 5.0, 8.0], [5.0, 10.0]) if fast < slow]
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    logging.disable(logging.INFO)
+    ParallelOptimizer(bars, workers=1).run_all(configs[:2])  # Numba kernels loaded before timing
+
+    print(f"{n} bars, {len(configs)} configs, {os.cpu_count()} CPU(s)")
+    for batch_size in (1, 64):
+        for row in scaling_report(bars, configs, max_workers, batch_size=batch_size):
+            print(f"batch={row['batch_size']:3d} workers={row['workers']:2d}: {row['seconds']:7.2f} s, "
+                  f"{row['configs_per_sec']:6.1f} configs/s")
+    print("=" * 60)
@@ -0,0 +1,126 @@
+"""
+Position Book for Aventa HFT Pro 2026
+One positions_get snapshot per decision cycle, queried from memory
+"""
+
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PositionSnapshot:
+    """Immutable view of open positions at one point in time"""
+
+    __slots__ = ('positions', 'by_ticket', 'by_magic', 'taken_at', 'ok')
+
+    def __init__(self, positions: Tuple = (), taken_at: float = 0.0, ok: bool = True):
+        self.positions = tuple(positions)
+        self.by_ticket = {p.ticket: p for p in self.positions}
+        self.by_magic: Dict[int, List] = {}
+        for p in self.positions:
+            self.by_magic.setdefault(p.magic, []).append(p)
+        self.taken_at = taken_at
+        self.ok = ok
+
+
+class PositionBook:
+    """
+    Open positions of one symbol, indexed by ticket and magic number
+
+    ``refresh()`` makes exactly one ``positions_get`` call and atomically swaps
+    the snapshot, so every check inside one decision sees the same positions.
+    Queries take ``magic`` (default: the bot's own magic; ``None`` = all).
+    """
+
+    _OWN = object()
+
+    def __init__(self, symbol: str, magic: int, mt5_api=None, max_age: float = 0.25):
+        """
+        Args:
+            symbol: Symbol to track
+            magic: This bot's magic number
+            mt5_api: MetaTrader5 module (or a compatible fake); imported lazily if None
+            max_age: Seconds a snapshot is reused by ``current()`` before re-fetching
+        """
+        if mt5_api is None:
+            import MetaTrader5 as mt5_api
+        self.mt5 = mt5_api
+        self.symbol = symbol
+        self.magic = magic
+        self.max_age = max_age
+        self._snapshot: Optional[PositionSnapshot] = None
+
+        # Stats
+        self.api_calls = 0
+
+    def refresh(self) -> PositionSnapshot:
+        """Take a new snapshot (one MT5 round trip)"""
+        self.api_calls += 1
+        try:
+            positions = self.mt5.positions_get(symbol=self.symbol)
+        except Exception as e:
+            logger.error(f"positions_get failed: {e}")
+            positions = None
+
+        snapshot = PositionSnapshot(positions or (), time.monotonic(), ok=positions is not None)
+        self._snapshot = snapshot
+        return snapshot
+
+    def current(self) -> PositionSnapshot:
+        """Current snapshot, re-fetched only if older than ``max_age`` or invalidated"""
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() - snapshot.taken_at > self.max_age:
+            snapshot = self.refresh()
+        return snapshot
+
+    def invalidate(self):
+        """Force the next read to re-fetch (call after sending an order)"""
+        self._snapshot = None
+
+    # ---- queries --------------------------------------------------------
+
+    def _select(self, magic) -> List:
+        snapshot = self.current()
+        if magic is self._OWN:
+            magic = self.magic
+        if magic is None:
+            return list(snapshot.positions)
+        return snapshot.by_magic.get(magic, [])
+
+    def positions(self, magic=_OWN) -> List:
+        """Open positions (oldest first, as returned by MT5)"""
+        return self._select(magic)
+
+    def get(self, ticket: int):
+        """Position by ticket or None"""
+        return self.current().by_ticket.get(ticket)
+
+    def first(self, magic=_OWN):
+        """First open position or None"""
+        positions = self._select(magic)
+        return positions[0] if positions else None
+
+    def count(self, magic=_OWN) -> int:
+        return len(self._select(magic))
+
+    def exists(self, magic=_OWN) -> bool:
+        return bool(self._select(magic))
+
+    def floating_pnl(self, magic=_OWN) -> float:
+        """Sum of position profit (MT5 profit already includes swap)"""
+        return sum(p.profit for p in self._select(magic))
+
+    def floating_loss(self, magic=_OWN) -> float:
+        """Sum of losing positions as a positive number"""
+        return sum(-p.profit for p in self._select(magic) if p.profit < 0)
+
+    def total_volume(self, magic=_OWN) -> float:
+        """Gross open volume in lots"""
+        return sum(p.volume for p in self._select(magic))
+
+    def net_exposure(self, magic=_OWN) -> float:
+        """Signed open volume in lots (BUY positive, SELL negative)"""
+        buy = self.mt5.ORDER_TYPE_BUY
+        return sum(p.volume if p.type == buy else -p.volume for p in self._select(magic))
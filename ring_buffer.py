@@ -0,0 +1,226 @@
+"""
+Column Ring Buffers for Aventa HFT Pro 2026
+Preallocated struct-of-arrays storage for the live tick / order flow stream
+"""
+
+import numpy as np
+from collections import namedtuple
+from typing import Dict, Tuple
+
+
+class ColumnRingBuffer:
+    """
+    Fixed-capacity ring buffer storing each field as a contiguous float64 array
+
+    Every row is written twice (at ``i`` and ``i + capacity``) so the most recent
+    ``n`` rows are always one contiguous slice. ``window()`` therefore returns
+    NumPy views without copying or allocating per-tick Python objects.
+
+    Views stay valid until ``capacity - n`` further rows are appended; callers
+    that need to keep a window longer than that should ``.copy()`` it.
+    """
+
+    FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self, capacity: int = 10000, fields: Tuple[str, ...] = None):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+
+        self.capacity = int(capacity)
+        self.fields = tuple(fields or self.FIELDS)
+        if not self.fields:
+            raise ValueError("At least one field is required")
+
+        # One contiguous row per field; columns are stored back to back
+        self._data = np.zeros((len(self.fields), 2 * self.capacity), dtype=np.float64)
+        self._columns: Dict[str, np.ndarray] = {
+            name: self._data[i] for i, name in enumerate(self.fields)
+        }
+        self._window_type = namedtuple(f"{type(self).__name__}Window", self.fields)
+
+        # Total rows ever appended (monotonic, used as a sequence number)
+        self.total_appended = 0
+
+    def __len__(self) -> int:
+        return min(self.total_appended, self.capacity)
+
+    def __bool__(self) -> bool:
+        return self.total_appended > 0
+
+    def append_row(self, *values):
+        """Append one row given positionally in ``fields`` order"""
+        slot = self.total_appended % self.capacity
+        self._data[:, slot] = values
+        self._data[:, slot + self.capacity] = values
+        # Publish only after the row is fully written
+        self.total_appended += 1
+
+    def extend(self, **columns):
+        """
+        Append a batch of rows from equal-length arrays (one per field)
+
+        Missing fields are written as 0.0.
+        """
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("All columns must have the same length")
+        count = lengths.pop()
+        if count == 0:
+            return
+
+        # Only the last `capacity` rows can survive the write
+        skip = max(0, count - self.capacity)
+        start = self.total_appended + skip
+        kept = count - skip
+
+        slot = start % self.capacity
+        first = min(kept, self.capacity - slot)
+        for name, column in self._columns.items():
+            values = columns.get(name)
+            if values is None:
+                values = np.zeros(count, dtype=np.float64)
+            values = np.asarray(values, dtype=np.float64)[skip:]
+
+            column[slot:slot + first] = values[:first]
+            column[slot + self.capacity:slot + self.capacity + first] = values[:first]
+            if kept > first:
+                rest = kept - first
+                column[:rest] = values[first:]
+                column[self.capacity:self.capacity + rest] = values[first:]
+
+        self.total_appended += count
+
+    def _bounds(self, n: int) -> Tuple[int, int]:
+        n = min(int(n), len(self))
+        end = (self.total_appended % self.capacity) + self.capacity
+        return end - n, end
+
+    def column(self, name: str, n: int = None) -> np.ndarray:
+        """Zero-copy view of the last ``n`` values of one field (oldest first)"""
+        start, end = self._bounds(len(self) if n is None else n)
+        return self._columns[name][start:end]
+
+    def window(self, n: int = None):
+        """Zero-copy views of the last ``n`` rows for every field, as a namedtuple"""
+        start, end = self._bounds(len(self) if n is None else n)
+        return self._window_type(*(column[start:end] for column in self._columns.values()))
+
+    def latest(self, name: str) -> float:
+        """Most recent value of one field (0.0 if empty)"""
+        if not self.total_appended:
+            return 0.0
+        slot = (self.total_appended - 1) % self.capacity
+        return float(self._columns[name][slot])
+
+    def clear(self):
+        """Drop all rows (storage is kept)"""
+        self.total_appended = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of preallocated column storage"""
+        return self._data.nbytes
+
+
+class TickRingBuffer(ColumnRingBuffer):
+    """Tick stream buffer with derived spread and mid price columns"""
+
+    FIELDS = ('timestamp', 'bid', 'ask', 'last', 'volume', 'spread', 'mid')
+
+    def __init__(self, capacity: int = 10000):
+        super().__init__(capacity)
+
+    def push(self, timestamp: float, bid: float, ask: float, last: float, volume: float):
+        """Append one raw tick, deriving spread and mid price"""
+        self.append_row(timestamp, bid, ask, last, volume, ask - bid, (bid + ask) * 0.5)
+
+    def append(self, tick):
+        """Append a TickData-like object (kept for deque-compatible callers)"""
+        self.push(tick.timestamp, tick.bid, tick.ask, tick.last, tick.volume)
+
+    def extend_ticks(self, timestamp, bid, ask, last, volume):
+        """Append a batch of raw ticks, deriving spread and mid price"""
+        bid = np.asarray(bid, dtype=np.float64)
+        ask = np.asarray(ask, dtype=np.float64)
+        self.extend(
+            timestamp=timestamp,
+            bid=bid,
+            ask=ask,
+            last=last,
+            volume=volume,
+            spread=ask - bid,
+            mid=(bid + ask) * 0.5,
+        )
+
+
+class OrderFlowRingBuffer(ColumnRingBuffer):
+    """Order flow buffer mirroring the OrderFlowData fields"""
+
+    FIELDS = ('timestamp', 'buy_volume', 'sell_volume', 'delta', 'cumulative_delta', 'imbalance_ratio')
+
+    def __init__(self, capacity: int = 5000):
+        super().__init__(capacity)
+
+    def append(self, flow):
+        """Append an OrderFlowData-like object"""
+        self.append_row(
+            flow.timestamp,
+            flow.buy_volume,
+            flow.sell_volume,
+            flow.delta,
+            flow.cumulative_delta,
+            flow.imbalance_ratio,
+        )
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    import time
+    from collections import deque
+
+    print("=" * 60)
+    print("RING BUFFER - PERFORMANCE TEST")
+    print("=" * 60)
+
+    n_ticks = 100000
+    prices = (2600.0 + np.cumsum(np.random.randn(n_ticks) * 0.05)).tolist()
+
+    # deque of per-tick objects (old approach)
+    class _Tick:
+        def __init__(self, bid, ask):
+            self.bid = bid
+            self.ask = ask
+            self.spread = ask - bid
+            self.mid_price = (bid + ask) / 2
+
+    old = deque(maxlen=10000)
+    start = time.perf_counter()
+    for p in prices:
+        old.append(_Tick(p, p + 0.1))
+    old_append = (time.perf_counter() - start) / n_ticks * 1e6
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        recent = list(old)[-100:]
+        _ = np.array([t.mid_price for t in recent])
+        _ = np.array([t.spread for t in recent])
+    old_window = (time.perf_counter() - start) / 1000 * 1e6
+
+    buf = TickRingBuffer(10000)
+    start = time.perf_counter()
+    for i, p in enumerate(prices):
+        buf.push(float(i), p, p + 0.1, p, 1.0)
+    new_append = (time.perf_counter() - start) / n_ticks * 1e6
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        window = buf.window(100)
+        _ = window.mid
+        _ = window.spread
+    new_window = (time.perf_counter() - start) / 1000 * 1e6
+
+    print(f"{'':22s}{'append/tick':>14s}{'100-tick window':>18s}")
+    print(f"{'deque of objects':22s}{old_append:11.2f} us{old_window:15.1f} us")
+    print(f"{'TickRingBuffer':22s}{new_append:11.2f} us{new_window:15.1f} us")
+    print(f"\nStorage: {buf.nbytes / 1024:.0f} KB preallocated, no per-tick objects retained")
+    print("=" * 60)
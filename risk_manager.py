@@ -50,6 +50,15 @@ class TradeRecord:
 class RiskManager:
     """Advanced risk management for HFT"""
     
+    # Counters and flags a worker-process engine reports back to the GUI's RiskManager
+    STATE_FIELDS = ('daily_pnl', 'daily_trades', 'daily_volume', 'peak_balance', 'current_drawdown',
+                    'max_drawdown_today', 'trading_enabled', 'circuit_breaker_triggered', 'last_circuit_reason',
+                    'target_profit_reached', 'wins', 'losses', 'total_profit', 'total_loss')
+    # Limits and circuit breaker the GUI changes on a running bot (sent to its worker process)
+    SETTING_FIELDS = ('max_daily_loss', 'max_daily_trades', 'max_daily_volume', 'max_position_size',
+                      'max_positions', 'max_drawdown_pct', 'daily_target_profit', 'trading_enabled',
+                      'circuit_breaker_triggered', 'last_circuit_reason')
+    
     def __init__(self, config: Dict):
         self.config = config
         
@@ -176,6 +185,16 @@ class RiskManager:
         self.trading_enabled = False
         self.last_circuit_reason = reason
     
+    def get_state(self, fields: Tuple[str, ...] = STATE_FIELDS) -> Dict:
+        """Picklable copy of ``fields`` (for the worker-process status channel)"""
+        return {name: getattr(self, name) for name in fields}
+    
+    def apply_state(self, state: Dict):
+        """Overwrite attributes from a ``get_state()`` dict; unknown keys are ignored"""
+        for name, value in state.items():
+            if name in self.STATE_FIELDS or name in self.SETTING_FIELDS:
+                setattr(self, name, value)
+    
     # ✅ NEW: Target Profit Methods
     def check_daily_target_profit(self) -> Tuple[bool, str]:
         """
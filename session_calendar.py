@@ -0,0 +1,182 @@
+"""
+Session Calendar for Aventa HFT Pro 2026
+Trading sessions compiled into a 7x1440 minute-of-week bitmap (UTC)
+"""
+
+import re
+import time
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config_manager import LEGACY_SESSION_TIMEZONE
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 1440
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+# 1970-01-01 was a Thursday: shift so that row 0 of the bitmap is Monday
+_EPOCH_WEEKDAY = 3
+
+# Session bits stored per minute
+SESSION_BITS = {'LONDON': 1, 'NY': 2, 'ASIA': 4}
+
+# (name, config prefix, default start, default end, enabled by default) - defaults are GMT
+SESSION_DEFAULTS = (
+    ('LONDON', 'london', '08:00', '16:30', True),
+    ('NY', 'ny', '13:00', '21:00', True),
+    ('ASIA', 'asia', '22:00', '08:00', False),
+)
+
+TIMEZONE_OFFSETS = {'GMT': 0.0, 'UTC': 0.0, 'WIB': 7.0, 'WITA': 8.0, 'WIT': 9.0}
+
+
+def time_to_minutes(time_str: str) -> int:
+    """Convert HH:MM string to minutes since midnight (0 if malformed)"""
+    try:
+        hours, minutes = time_str.split(':')[:2]
+        return int(hours) * 60 + int(minutes)
+    except (ValueError, AttributeError):
+        return 0
+
+
+def timezone_offset_hours(name) -> float:
+    """'WIB' / 'UTC+7' / 'GMT-3:30' / 7 -> hours east of UTC"""
+    if isinstance(name, (int, float)):
+        return float(name)
+    name = str(name or 'GMT').strip().upper()
+    if name in TIMEZONE_OFFSETS:
+        return TIMEZONE_OFFSETS[name]
+    match = re.fullmatch(r'(?:UTC|GMT)?\s*([+-])(\d{1,2})(?::?(\d{2}))?', name)
+    if not match:
+        logger.warning(f"⚠️ Unknown session timezone '{name}' - using GMT")
+        return 0.0
+    hours = int(match.group(2)) + int(match.group(3) or 0) / 60.0
+    return hours if match.group(1) == '+' else -hours
+
+
+def minute_of_week(timestamp: float) -> int:
+    """UTC epoch seconds -> minute index into the bitmap (Monday 00:00 = 0)"""
+    return int((timestamp // 60 + _EPOCH_WEEKDAY * MINUTES_PER_DAY) % MINUTES_PER_WEEK)
+
+
+class SessionCalendar:
+    """
+    Weekly session bitmap: ``is_open(ts)`` is one byte lookup
+
+    Sessions are given in local time (``utc_offset_hours`` east of UTC) on
+    the listed local weekdays (Monday = 0); both ends are inclusive and a
+    session whose end is before its start runs past midnight. Everything is
+    shifted to UTC when the bitmap is built, so lookups take ``time.time()``
+    directly.
+    """
+
+    def __init__(self, sessions: Sequence[Tuple[str, int, int]] = (), utc_offset_hours: float = 0.0,
+                 weekdays: Sequence[int] = range(7), enabled: bool = True):
+        self.enabled = enabled
+        self.utc_offset_hours = utc_offset_hours
+        self.sessions = tuple(sessions)
+        offset = int(round(utc_offset_hours * 60))
+
+        local = np.zeros(MINUTES_PER_WEEK, dtype=np.uint8)
+        for name, start, end in self.sessions:
+            bit = SESSION_BITS.get(name, 8)
+            for day in weekdays:
+                base = day * MINUTES_PER_DAY
+                if start <= end:
+                    minutes = np.arange(base + start, base + end + 1)
+                else:
+                    minutes = np.arange(base + start, base + MINUTES_PER_DAY + end + 1)
+                local[minutes % MINUTES_PER_WEEK] |= bit
+
+        # local minute m is UTC minute m - offset
+        self.bitmap = np.roll(local, -offset).reshape(7, MINUTES_PER_DAY)
+        flat = self.bitmap.ravel()
+        self._open = bytes(flat)
+        self._open_minutes = np.flatnonzero(flat)
+        self._closed_minutes = np.flatnonzero(flat == 0)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'SessionCalendar':
+        """Sessions from config keys; times are in ``session_timezone`` (LEGACY_SESSION_TIMEZONE if unset)"""
+        sessions = []
+        for name, prefix, default_start, default_end, default_enabled in SESSION_DEFAULTS:
+            if config.get(f'{prefix}_session_enabled', default_enabled):
+                sessions.append((name, time_to_minutes(config.get(f'{prefix}_start', default_start)),
+                                 time_to_minutes(config.get(f'{prefix}_end', default_end))))
+        return cls(
+            sessions,
+            utc_offset_hours=timezone_offset_hours(config.get('session_timezone', LEGACY_SESSION_TIMEZONE)),
+            weekdays=config.get('trading_days', range(7)),
+            enabled=config.get('trading_sessions_enabled', True),
+        )
+
+    def is_open(self, timestamp: Optional[float] = None) -> bool:
+        if not self.enabled:
+            return True
+        if timestamp is None:
+            timestamp = time.time()
+        return self._open[minute_of_week(timestamp)] != 0
+
+    def sessions_at(self, timestamp: float) -> List[str]:
+        bits = self._open[minute_of_week(timestamp)]
+        return [name for name, bit in SESSION_BITS.items() if bits & bit]
+
+    def _next(self, minutes: np.ndarray, timestamp: float) -> Optional[float]:
+        if len(minutes) == 0:
+            return None
+        now = minute_of_week(timestamp)
+        i = int(np.searchsorted(minutes, now))
+        ahead = (int(minutes[i]) - now) if i < len(minutes) else (int(minutes[0]) + MINUTES_PER_WEEK - now)
+        if ahead == 0:
+            return timestamp
+        return (timestamp // 60 + ahead) * 60.0
+
+    def next_open(self, timestamp: Optional[float] = None) -> Optional[float]:
+        """Epoch seconds of the next open minute (``timestamp`` if open now, None if never)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        if not self.enabled:
+            return timestamp
+        return self._next(self._open_minutes, timestamp)
+
+    def next_close(self, timestamp: Optional[float] = None) -> Optional[float]:
+        """Epoch seconds of the next closed minute (``timestamp`` if closed now, None if always open)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        if not self.enabled:
+            return None
+        return self._next(self._closed_minutes, timestamp)
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    from datetime import datetime
+
+    print("=" * 60)
+    print("SESSION CALENDAR - PERFORMANCE TEST")
+    print("=" * 60)
+
+    config = {'london_start': '15:00', 'london_end': '23:30', 'ny_start': '20:00', 'ny_end': '04:00',
+              'session_timezone': 'WIB', 'trading_days': [0, 1, 2, 3, 4]}
+    calendar = SessionCalendar.from_config(config)
+    n = 200000
+    now = time.time()
+
+    start = time.perf_counter()
+    for _ in range(n):
+        calendar.is_open(now)
+    lookup = (time.perf_counter() - start) / n * 1e6
+
+    start = time.perf_counter()
+    for _ in range(n // 10):
+        SessionCalendar.from_config(config).is_open(now)
+    rebuild = (time.perf_counter() - start) / (n // 10) * 1e6
+
+    print(f"is_open():              {lookup:7.3f} us/call")
+    print(f"compile + is_open():    {rebuild:7.1f} us/call")
+    print(f"open minutes per week:  {len(calendar._open_minutes)}")
+    state = 'OPEN' if calendar.is_open(now) else 'CLOSED'
+    print(f"now {datetime.utcfromtimestamp(now):%a %H:%M} UTC: {state} {calendar.sessions_at(now)}")
+    for label, ts in (('next open', calendar.next_open(now)), ('next close', calendar.next_close(now))):
+        print(f"{label:11s} {datetime.utcfromtimestamp(ts):%a %H:%M} UTC")
+    print("=" * 60)
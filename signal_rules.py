@@ -0,0 +1,270 @@
+"""
+Signal Rules for Aventa HFT Pro 2026
+Order-flow signal rules compiled once per config into frozen parameters and a flat evaluator
+"""
+
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+NAN = float('nan')
+
+# Result codes returned by evaluate()
+NO_SIGNAL = 0
+SIGNAL_BUY = 1
+SIGNAL_SELL = 2
+SPREAD_REJECT = 3
+SIGNAL_TYPES = (None, 'BUY', 'SELL', None)
+
+# Rule flags (which rules fired) - turned into the human-readable reason on emit only
+DELTA_BUY = 1
+DELTA_BUY_FILTERED = 2
+DELTA_SELL = 4
+DELTA_SELL_FILTERED = 8
+MOMENTUM_UP = 16
+MOMENTUM_DOWN = 32
+HIGH_VOLATILITY = 64
+
+
+def evaluate_rules(spread, delta, velocity, volatility, price, ema_fast, ema_slow, rsi, momentum,
+                   max_spread, min_delta, min_velocity, rsi_overbought, rsi_oversold, max_volatility):
+    """
+    Delta/EMA/RSI/momentum rules on plain floats -> (code, strength, flags)
+
+    Reference form of the rules (and the Numba kernel). Same arithmetic, in
+    the same order, as the original generate_signal so strengths are
+    bit-identical. NaN checks use ``x == x``.
+    """
+    if spread > max_spread:
+        return SPREAD_REJECT, 0.0, 0
+
+    strength = 0.0
+    code = NO_SIGNAL
+    flags = 0
+
+    if delta > min_delta:
+        if (ema_fast == ema_fast and ema_slow == ema_slow and rsi == rsi and momentum == momentum
+                and price > ema_fast > ema_slow and rsi < rsi_overbought and momentum > 0):
+            strength += 0.4
+            code = SIGNAL_BUY
+            flags |= DELTA_BUY
+        else:
+            flags |= DELTA_BUY_FILTERED
+    elif delta < -min_delta:
+        if (ema_fast == ema_fast and ema_slow == ema_slow and rsi == rsi and momentum == momentum
+                and price < ema_fast < ema_slow and rsi > rsi_oversold and momentum < 0):
+            strength += 0.4
+            code = SIGNAL_SELL
+            flags |= DELTA_SELL
+        else:
+            flags |= DELTA_SELL_FILTERED
+
+    if velocity > min_velocity:
+        strength += 0.3
+        if code == NO_SIGNAL:
+            code = SIGNAL_BUY
+        elif code == SIGNAL_BUY:
+            strength += 0.1
+        flags |= MOMENTUM_UP
+    elif velocity < -min_velocity:
+        strength += 0.3
+        if code == NO_SIGNAL:
+            code = SIGNAL_SELL
+        elif code == SIGNAL_SELL:
+            strength += 0.1
+        flags |= MOMENTUM_DOWN
+
+    if volatility > max_volatility:
+        strength *= 0.5
+        flags |= HIGH_VOLATILITY
+
+    return code, strength, flags
+
+
+if NUMBA_AVAILABLE:
+    evaluate_rules_jit = njit(cache=True)(evaluate_rules)
+else:
+    evaluate_rules_jit = None
+
+
+def compile_rules(max_spread, min_delta, min_velocity, rsi_overbought, rsi_oversold, max_volatility):
+    """
+    Bind thresholds into a closure ``evaluate(microstructure, price)``
+
+    Unpacks the microstructure dict and calls evaluate_rules, so the rules
+    live in one place for the closure, the Numba kernel and the tests.
+    """
+    def evaluate(ms, price):
+        get = ms.get
+        return evaluate_rules(ms['avg_spread'], ms['cumulative_delta'], ms['price_velocity'], ms['volatility'],
+                              price, get('ema_fast', NAN), get('ema_slow', NAN), get('rsi', NAN),
+                              get('momentum', NAN), max_spread, min_delta, min_velocity, rsi_overbought,
+                              rsi_oversold, max_volatility)
+
+    return evaluate
+
+
+@dataclass(frozen=True)
+class SignalParams:
+    """Signal/SL/TP parameters read from the bot config once (defaults match the engine's)"""
+    max_spread: float = 0.0001
+    min_delta: float = 100
+    min_velocity: float = 0.00001
+    rsi_overbought: float = 70
+    rsi_oversold: float = 30
+    max_volatility: float = 0.001
+    min_strength: float = 0.6
+    enable_ml: bool = False
+    sl_multiplier: float = 2.0
+    tp_mode: str = 'RiskReward'
+    tp_dollar: float = 0.5
+    volume: float = 0.01
+    risk_reward: float = 2.0
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'SignalParams':
+        return cls(
+            max_spread=config.get('max_spread', 0.0001),
+            min_delta=config.get('min_delta_threshold', 100),
+            min_velocity=config.get('min_velocity_threshold', 0.00001),
+            rsi_overbought=config.get('rsi_overbought', 70),
+            rsi_oversold=config.get('rsi_oversold', 30),
+            max_volatility=config.get('max_volatility', 0.001),
+            min_strength=config.get('min_signal_strength', 0.6),
+            enable_ml=config.get('enable_ml', False),
+            sl_multiplier=config.get('sl_multiplier', 2.0),
+            tp_mode=config.get('tp_mode', 'RiskReward'),
+            tp_dollar=config.get('tp_dollar_amount', 0.5),
+            volume=config.get('default_volume', 0.01),
+            risk_reward=config.get('risk_reward_ratio', 2.0),
+        )
+
+
+class SignalRules:
+    """
+    Compiled signal rules for one config
+
+    ``evaluate(microstructure, price)`` is a closure over the frozen
+    thresholds (or, with ``signal_rules_jit``, the Numba kernel - its
+    dispatch cost makes it slower than the closure for a single scalar
+    call). ``describe()`` rebuilds the reason text from the flags when a
+    signal is actually emitted. Rebuild via ``from_config`` when the config
+    changes.
+    """
+
+    __slots__ = ('params', 'thresholds', 'jit', 'evaluate')
+
+    def __init__(self, params: SignalParams, jit: bool = False):
+        self.params = params
+        self.thresholds = (float(params.max_spread), float(params.min_delta), float(params.min_velocity),
+                           float(params.rsi_overbought), float(params.rsi_oversold),
+                           float(params.max_volatility))
+        self.jit = jit and NUMBA_AVAILABLE
+        if jit and not NUMBA_AVAILABLE:
+            logger.warning("⚠️ Numba not available - signal rules run in pure Python")
+        self.evaluate = self._evaluate_jit if self.jit else compile_rules(*self.thresholds)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'SignalRules':
+        return cls(SignalParams.from_config(config), jit=config.get('signal_rules_jit', False))
+
+    def _evaluate_jit(self, microstructure: Dict, price: float) -> Tuple[int, float, int]:
+        get = microstructure.get
+        return evaluate_rules_jit(
+            microstructure['avg_spread'], microstructure['cumulative_delta'], microstructure['price_velocity'],
+            microstructure['volatility'], price, get('ema_fast', NAN), get('ema_slow', NAN), get('rsi', NAN),
+            get('momentum', NAN), *self.thresholds)
+
+    @staticmethod
+    def describe(flags: int, microstructure: Dict) -> List[str]:
+        """Reason fragments for the rules that fired (same wording as before compilation)"""
+        reason = []
+        if flags & (DELTA_BUY | DELTA_SELL):
+            side = '+' if flags & DELTA_BUY else '-'
+            reason.append(f"Delta{side} & EMA/RSI/Mom OK: Δ={microstructure['cumulative_delta']:.0f}, "
+                          f"EMAf={microstructure.get('ema_fast', NAN):.2f}, "
+                          f"EMAs={microstructure.get('ema_slow', NAN):.2f}, "
+                          f"RSI={microstructure.get('rsi', NAN):.1f}, Mom={microstructure.get('momentum', NAN):.5f}")
+        elif flags & DELTA_BUY_FILTERED:
+            reason.append("Delta+ but filter fail: EMA/RSI/Mom")
+        elif flags & DELTA_SELL_FILTERED:
+            reason.append("Delta- but filter fail: EMA/RSI/Mom")
+        if flags & MOMENTUM_UP:
+            reason.append(f"Positive momentum: {microstructure['price_velocity']:.6f}")
+        elif flags & MOMENTUM_DOWN:
+            reason.append(f"Negative momentum: {microstructure['price_velocity']:.6f}")
+        if flags & HIGH_VOLATILITY:
+            reason.append("High volatility - reduced confidence")
+        return reason
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    import numpy as np
+
+    print("=" * 60)
+    print("SIGNAL RULES - PERFORMANCE TEST")
+    print("=" * 60)
+
+    config = {'max_spread': 0.5, 'min_delta_threshold': 20, 'min_velocity_threshold': 0.001,
+              'max_volatility': 1.0, 'min_signal_strength': 0.6}
+    microstructure = {'avg_spread': 0.12, 'cumulative_delta': 35.0, 'price_velocity': 0.0004,
+                      'volatility': 0.08, 'ema_fast': 2600.4, 'ema_slow': 2600.9, 'rsi': 48.0, 'momentum': 0.2}
+    price = 2600.5
+    n = 100000
+
+    def previous_rules(microstructure, price):
+        # Per-call work of generate_signal before compilation (config lookups, np.isnan, reason strings)
+        min_delta_threshold = config.get('min_delta_threshold', 100)
+        min_velocity_threshold = config.get('min_velocity_threshold', 0.00001)
+        if microstructure['avg_spread'] > config.get('max_spread', 0.0001):
+            return None
+        signal_strength, signal_type, reason = 0.0, None, []
+        ema_fast = microstructure.get('ema_fast', np.nan)
+        ema_slow = microstructure.get('ema_slow', np.nan)
+        rsi = microstructure.get('rsi', np.nan)
+        momentum_val = microstructure.get('momentum', np.nan)
+        rsi_overbought = config.get('rsi_overbought', 70)
+        if microstructure['cumulative_delta'] > min_delta_threshold:
+            if (not np.isnan(ema_fast) and not np.isnan(ema_slow) and not np.isnan(rsi)
+                    and not np.isnan(momentum_val) and price > ema_fast > ema_slow
+                    and rsi < rsi_overbought and momentum_val > 0):
+                signal_strength += 0.4
+                signal_type = 'BUY'
+            else:
+                reason.append(f"Delta+ but filter fail: EMA/RSI/Mom")
+        if microstructure['price_velocity'] > min_velocity_threshold:
+            reason.append(f"Positive momentum: {microstructure['price_velocity']:.6f}")
+        if microstructure['volatility'] > config.get('max_volatility', 0.001):
+            signal_strength *= 0.5
+        reason.append("ML Prediction DISABLED")
+        if signal_type and signal_strength >= config.get('min_signal_strength', 0.6):
+            return " | ".join(reason)
+        return None
+
+    def per_call(fn, *args):
+        fn(*args)
+        start = time.perf_counter()
+        for _ in range(n):
+            fn(*args)
+        return (time.perf_counter() - start) / n * 1e6
+
+    previous = per_call(previous_rules, microstructure, price)
+    python_rules = SignalRules.from_config(config)
+    compiled = per_call(python_rules.evaluate, microstructure, price)
+    print(f"previous (dict lookups + isnan + reason): {previous:6.3f} us/call")
+    print(f"compiled rules (pure Python):             {compiled:6.3f} us/call  ({previous / compiled:.1f}x)")
+    if NUMBA_AVAILABLE:
+        jit_rules = SignalRules.from_config({**config, 'signal_rules_jit': True})
+        jitted = per_call(jit_rules.evaluate, microstructure, price)
+        print(f"compiled rules (Numba):                   {jitted:6.3f} us/call  ({previous / jitted:.1f}x)")
+    print("=" * 60)
@@ -10,14 +10,21 @@ from datetime import datetime, timedelta
 import time
 import logging
 
+import backtest_core
+from bar_cache import BarCache
+from indicator_cache import INDICATORS, config_indicators
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Bars skipped at the start of the data while the indicators warm up
+WARMUP_BARS = 50
+
 
 class StrategyBacktester:
 
-    def __init__(self, config, initial_balance=10000, ml_predictor=None):
+    def __init__(self, config, initial_balance=10000, ml_predictor=None, indicator_cache=None):
         """Initialize backtester with ISOLATED config and balance"""
         import copy
 
@@ -28,6 +35,9 @@ class StrategyBacktester:
         self.ml_predictor = ml_predictor
         self.use_ml = ml_predictor is not None and hasattr(ml_predictor, 'is_trained') and ml_predictor.is_trained
 
+        # Shared IndicatorCache (optimizer sweeps); None computes indicators per run
+        self.indicator_cache = indicator_cache
+
         # ✅ CRITICAL: Use GUI initial_balance (NEVER use account balance!)
         self.initial_balance = float(initial_balance)
         self.balance = float(initial_balance)
@@ -87,9 +97,17 @@ class StrategyBacktester:
 
     def _get_symbol_info(self):
         """Get symbol information from MT5"""
+        try:
+            info = mt5.symbol_info(self.config['symbol'])
+        except Exception as e:
+            logger.error(f"Failed to get symbol info: {e}")
+            info = None
+        self._apply_symbol_info(info)
+
+    def _apply_symbol_info(self, info):
+        """Pip size / pip value from a symbol_info() result (fallback values when None)"""
         try:
             symbol = self.config['symbol']
-            info = mt5.symbol_info(symbol)
             if info is None:
                 raise ValueError(f"Symbol {symbol} not found in MT5")
 
@@ -172,153 +190,285 @@ class StrategyBacktester:
     def run_backtest(self, start_date, end_date, progress_callback=None, cancel_check=None):
         """Run backtest on historical data with ISOLATED MT5 connection"""
         try:
-            # ✅ VALIDATE DATES
-            if start_date >= end_date:
-                raise ValueError("Start date must be before end date")
-
-            days_diff = (end_date - start_date).days
-            if days_diff < 1:
-                raise ValueError("Date range must be at least 1 day")
-            if days_diff > 365:
-                raise ValueError("Date range cannot exceed 1 year for performance")
-
-            # ✅ ISOLATED MT5 INITIALIZATION (independent for each bot)
-            # Check if MT5 is already initialized
-            if mt5.terminal_info() is None:
-                # MT5 not initialized yet, initialize it
-                if not mt5.initialize():
-                    raise Exception("MT5 initialization failed - Check Terminal connection")
-                logger.info("✓ MT5 initialized for Strategy Tester")
-            else:
-                logger.info("✓ Using existing MT5 connection for Strategy Tester")
+            df = self.load_bars(start_date, end_date, progress_callback)
+            return self.run_on_bars(df, progress_callback, cancel_check)
 
-            # ✅ GET SYMBOL INFO FIRST
-            self._get_symbol_info()
-
-            requested_symbol = self.config['symbol']
+        except Exception as e:
+            logger.error(f"Backtest error: {e}")
+            raise Exception(f"Backtest failed: {e}")
+        finally:
+            mt5.shutdown()
 
-            # ✅ IMPROVED SYMBOL VALIDATION - Find symbol with case-insensitive matching
-            symbol = self.find_symbol_in_mt5(requested_symbol)
-            
-            if not symbol:
-                # Symbol not found even with fuzzy matching
-                available = self.get_available_symbols()
-                available_sample = ', '.join(available[:20]) if available else "None"
-                raise Exception(
-                    f"Symbol '{requested_symbol}' not found in MT5. "
-                    f"Available (first 20): {available_sample}"
-                )
-            
-            logger.info(f"Using symbol from MT5: {symbol}")
+    def load_bars(self, start_date, end_date, progress_callback=None):
+        """
+        Validated M1 bars for the date range as a DataFrame (MT5 / bar cache)
 
-            if progress_callback:
-                progress_callback(5, "Validating data availability...")
+        Also sets the symbol's pip size and value. Leaves MT5 connected;
+        run_backtest() shuts it down.
+        """
+        # ✅ VALIDATE DATES
+        if start_date >= end_date:
+            raise ValueError("Start date must be before end date")
+
+        days_diff = (end_date - start_date).days
+        if days_diff < 1:
+            raise ValueError("Date range must be at least 1 day")
+        use_bar_cache = self.config.get('bar_cache_enabled', True)
+        if days_diff > 365 and not use_bar_cache:
+            raise ValueError("Date range cannot exceed 1 year for performance")
+
+        # ✅ ISOLATED MT5 INITIALIZATION (independent for each bot)
+        # Check if MT5 is already initialized
+        if mt5.terminal_info() is None:
+            # MT5 not initialized yet, initialize it
+            if not mt5.initialize():
+                raise Exception("MT5 initialization failed - Check Terminal connection")
+            logger.info("✓ MT5 initialized for Strategy Tester")
+        else:
+            logger.info("✓ Using existing MT5 connection for Strategy Tester")
+
+        # ✅ GET SYMBOL INFO FIRST
+        self._get_symbol_info()
+
+        requested_symbol = self.config['symbol']
+
+        # ✅ IMPROVED SYMBOL VALIDATION - Find symbol with case-insensitive matching
+        symbol = self.find_symbol_in_mt5(requested_symbol)
 
-            # Get historical data with validation
+        if not symbol:
+            # Symbol not found even with fuzzy matching
+            available = self.get_available_symbols()
+            available_sample = ', '.join(available[:20]) if available else "None"
+            raise Exception(
+                f"Symbol '{requested_symbol}' not found in MT5. "
+                f"Available (first 20): {available_sample}"
+            )
+
+        logger.info(f"Using symbol from MT5: {symbol}")
+
+        if progress_callback:
+            progress_callback(5, "Validating data availability...")
+
+        # Get historical data with validation (bar cache: only never-fetched ranges hit MT5)
+        if use_bar_cache:
+            bar_cache = BarCache.from_config(self.config)
+            rates = bar_cache.get_rates(symbol, mt5.TIMEFRAME_M1, start_date, end_date, mt5.copy_rates_range)
+            logger.info(f"Bar cache: {bar_cache.get_stats()}")
+        else:
             rates = mt5.copy_rates_range(symbol, mt5.TIMEFRAME_M1, start_date, end_date)
 
-            if rates is None or len(rates) == 0:
-                raise Exception(f"No historical data for {symbol} in date range")
-
-            if len(rates) < 100:  # Minimum data requirement
-                raise Exception(f"Insufficient data: {len(rates)} bars (minimum 100 required)")
+        if rates is None or len(rates['time']) == 0:
+            raise Exception(f"No historical data for {symbol} in date range")
+
+        if len(rates['time']) < 100:  # Minimum data requirement
+            raise Exception(f"Insufficient data: {len(rates['time'])} bars (minimum 100 required)")
+
+        df = pd.DataFrame(rates)
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+
+        # ✅ ADD VOLUME COLUMN (MT5 returns tick_volume, real_volume - we'll use tick_volume as volume)
+        if 'tick_volume' in df.columns and 'volume' not in df.columns:
+            df['volume'] = df['tick_volume']
+        elif 'real_volume' in df.columns and 'volume' not in df.columns:
+            df['volume'] = df['real_volume']
+        elif 'volume' not in df.columns:
+            # Fallback: create synthetic volume if neither exists
+            logger.warning("Neither tick_volume nor real_volume found. Creating synthetic volume.")
+            df['volume'] = 1.0  # Minimum volume for all bars
+
+        # ✅ DATA QUALITY CHECKS
+        if df.isnull().any().any():
+            raise Exception("Historical data contains null values")
+
+        # Check for data gaps (more than 1 hour gaps)
+        time_diffs = df['time'].diff().dt.total_seconds() / 3600
+        max_gap = time_diffs.max()
+        if max_gap > 2:  # More than 2 hours gap
+            logger.warning(f"Data gap detected: {max_gap:.1f} hours")
+
+        if progress_callback:
+            progress_callback(15, f"Loaded {len(df)} bars, calculating indicators...")
+
+        return df
+
+    def run_on_bars(self, df, progress_callback=None, cancel_check=None):
+        """Indicators, simulation and results on bars from load_bars() (None if cancelled)"""
+        # Calculate indicators
+        df = self.calculate_indicators(df)
+
+        # ✅ VALIDATE INDICATORS
+        required_indicators = ['ema_fast', 'ema_slow', 'rsi', 'atr']
+        for indicator in required_indicators:
+            if indicator not in df.columns:
+                raise Exception(f"Indicator {indicator} not calculated")
+
+        if progress_callback:
+            progress_callback(30, "Running simulation...")
+
+        if self.use_ml or not self.config.get('backtest_fast_core', True):
+            # ML filtering calls the predictor per candidate bar: keep the per-bar loop
+            completed = self._run_bar_loop(df, progress_callback, cancel_check)
+        else:
+            completed = self._run_array_core(df, progress_callback, cancel_check)
+        if not completed:
+            logger.info("Backtest cancelled by user")
+            return None
 
-            df = pd.DataFrame(rates)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
+        # Calculate results
+        if progress_callback:
+            progress_callback(95, "Calculating results...")
 
-            # ✅ ADD VOLUME COLUMN (MT5 returns tick_volume, real_volume - we'll use tick_volume as volume)
-            if 'tick_volume' in df.columns and 'volume' not in df.columns:
-                df['volume'] = df['tick_volume']
-            elif 'real_volume' in df.columns and 'volume' not in df.columns:
-                df['volume'] = df['real_volume']
-            elif 'volume' not in df.columns:
-                # Fallback: create synthetic volume if neither exists
-                logger.warning("Neither tick_volume nor real_volume found. Creating synthetic volume.")
-                df['volume'] = 1.0  # Minimum volume for all bars
+        results = self.calculate_results()
 
-            # ✅ DATA QUALITY CHECKS
-            if df.isnull().any().any():
-                raise Exception("Historical data contains null values")
+        if progress_callback:
+            progress_callback(100, "Complete!")
 
-            # Check for data gaps (more than 1 hour gaps)
-            time_diffs = df['time'].diff().dt.total_seconds() / 3600
-            max_gap = time_diffs.max()
-            if max_gap > 2:  # More than 2 hours gap
-                logger.warning(f"Data gap detected: {max_gap:.1f} hours")
+        logger.info(f"Backtest completed: {len(self.trades)} trades, P&L: ${results.get('total_pnl', 0):.2f}")
 
-            if progress_callback:
-                progress_callback(15, f"Loaded {len(df)} bars, calculating indicators...")
+        return results
 
-            # Calculate indicators
-            df = self.calculate_indicators(df)
+    def _run_bar_loop(self, df, progress_callback=None, cancel_check=None):
+        """Reference simulation: check_exit / check_entry / update_equity per DataFrame row"""
+        total_bars = len(df)
 
-            # ✅ VALIDATE INDICATORS
-            required_indicators = ['ema_fast', 'ema_slow', 'rsi', 'atr']
-            for indicator in required_indicators:
-                if indicator not in df.columns:
-                    raise Exception(f"Indicator {indicator} not calculated")
+        # ✅ ADAPTIVE PROGRESS REPORTING
+        progress_interval = max(1, total_bars // 100)  # Update every 1% progress
 
-            if progress_callback:
-                progress_callback(30, "Running simulation...")
+        for i in range(WARMUP_BARS, total_bars):  # Start after indicator warmup
+            # Check cancel
+            if cancel_check and cancel_check():
+                return False
 
-            total_bars = len(df)
+            # Progress update
+            if i % progress_interval == 0:
+                progress_pct = 30 + (i / total_bars * 65)
+                if progress_callback:
+                    progress_callback(progress_pct, f"Processing bar {i}/{total_bars}")
 
-            # ✅ ADAPTIVE PROGRESS REPORTING
-            progress_interval = max(1, total_bars // 100)  # Update every 1% progress
+            current_bar = df.iloc[i]
 
-            for i in range(50, total_bars):  # Start after indicator warmup
-                # Check cancel
-                if cancel_check and cancel_check():
-                    logger.info("Backtest cancelled by user")
-                    return None
-
-                # Progress update
-                if i % progress_interval == 0:
-                    progress_pct = 30 + (i / total_bars * 65)
-                    if progress_callback:
-                        progress_callback(progress_pct, f"Processing bar {i}/{total_bars}")
+            # ✅ VALIDATE CURRENT BAR
+            if pd.isnull(current_bar[['open', 'high', 'low', 'close', 'volume']]).any():
+                continue  # Skip invalid bars
 
-                current_bar = df.iloc[i]
+            # Check for exit signal
+            if self.open_position:
+                self.check_exit(current_bar, i, df)
 
-                # ✅ VALIDATE CURRENT BAR
-                if pd.isnull(current_bar[['open', 'high', 'low', 'close', 'volume']]).any():
-                    continue  # Skip invalid bars
+            # Check for entry signal
+            if not self.open_position:
+                self.check_entry(current_bar, i, df)
 
-                # Check for exit signal
-                if self.open_position:
-                    self.check_exit(current_bar, i, df)
+            # Update equity curve
+            self.update_equity(current_bar)
 
-                # Check for entry signal
-                if not self.open_position:
-                    self.check_entry(current_bar, i, df)
+        # Close any open position at end
+        if self.open_position:
+            final_bar = df.iloc[-1]
+            self.close_position(final_bar, "End of backtest")
 
-                # Update equity curve
-                self.update_equity(current_bar)
+        return True
 
-            # Close any open position at end
-            if self.open_position:
-                final_bar = df.iloc[-1]
-                self.close_position(final_bar, "End of backtest")
+    def _run_array_core(self, df, progress_callback=None, cancel_check=None):
+        """
+        Same simulation as _run_bar_loop on column arrays (backtest_core)
 
-            # Calculate results
+        Trades, balance, drawdown and the equity curve come out identical;
+        the bars are simulated in 1% chunks so progress and cancellation
+        still work.
+        """
+        total_bars = len(df)
+        columns = backtest_core.bar_columns(df)
+        params = backtest_core.BarParams.from_config(self.config, self.pip_size, self.pip_value)
+        simulator = backtest_core.BarSimulator(columns, params, self.balance, peak_equity=self.peak_equity,
+                                               max_drawdown=self.max_drawdown,
+                                               jit=self.config.get('backtest_jit', True))
+
+        progress_interval = max(1, total_bars // 100)
+        for start in range(WARMUP_BARS, total_bars, progress_interval):
+            if cancel_check and cancel_check():
+                return False
             if progress_callback:
-                progress_callback(95, "Calculating results...")
+                progress_callback(30 + (start / total_bars * 65), f"Processing bar {start}/{total_bars}")
+            simulator.run(start, min(start + progress_interval, total_bars))
+        simulator.run(total_bars, total_bars, close_at_end=True)
+        self._apply_simulation(simulator, columns, df)
+        return True
 
-            results = self.calculate_results()
-
-            if progress_callback:
-                progress_callback(100, "Complete!")
+    def _apply_simulation(self, simulator, columns, df, trade_times=True):
+        """
+        Trades, equity curve and balance of a finished BarSimulator (or batch member)
 
-            logger.info(f"Backtest completed: {len(self.trades)} trades, P&L: ${results.get('total_pnl', 0):.2f}")
+        trade_times=False leaves entry_time / exit_time as None (optimizer
+        sweeps that only keep calculate_results() metrics).
+        """
+        # Trade dicts exactly as close_position() records them
+        rows = simulator.trade_rows()
+        entry_bars = rows[:, backtest_core.T_ENTRY_BAR].astype(np.int64)
+        exit_bars = rows[:, backtest_core.T_EXIT_BAR].astype(np.int64)
+        time_ns = columns['time_ns']
+        # Timedelta.total_seconds() / 60, truncated like int()
+        durations = ((time_ns[exit_bars] - time_ns[entry_bars]) / 1e9 / 60).astype(np.int64).tolist()
+        if trade_times:
+            entry_times = df['time'].iloc[entry_bars].tolist()
+            exit_times = df['time'].iloc[exit_bars].tolist()
+        else:
+            entry_times = exit_times = [None] * len(rows)
+        volume = self.config.get('default_volume', 0.01)
+        symbol = self.config.get('symbol', 'UNKNOWN')
+        for row, entry_time, exit_time, duration_min in zip(rows.tolist(), entry_times, exit_times, durations):
+            self.trades.append({
+                'entry_time': entry_time,
+                'exit_time': exit_time,
+                'type': backtest_core.SIGNAL_TYPES[int(row[backtest_core.T_SIGNAL])],
+                'entry_price': row[backtest_core.T_ENTRY_PRICE],
+                'exit_price': row[backtest_core.T_EXIT_PRICE],
+                'profit': row[backtest_core.T_PROFIT],
+                'duration': f"{duration_min} min",
+                'reason': backtest_core.EXIT_REASONS[int(row[backtest_core.T_REASON])],
+                'volume': volume,
+                'commission': self.commission_per_trade * 2,
+                'symbol': symbol,
+                'ml_prediction': '',
+                'ml_confidence': 0.0
+            })
 
-            return results
+        curve = simulator.equity_curve(WARMUP_BARS, columns['time_ns'])
+        if len(curve):
+            self.equity = float(curve.values[-1])
+        self.equity_curve = curve if not self.equity_curve else list(self.equity_curve) + list(curve)
+        self.balance = simulator.balance
+        self.peak_equity = simulator.peak_equity
+        self.max_drawdown = simulator.max_drawdown
+
+    def _indicator_periods(self):
+        """Validated (ema_fast, ema_slow, rsi, atr) periods of the config (ValueError if invalid)"""
+        # EMA
+        ema_fast = self.config.get('ema_fast_period', 7)
+        ema_slow = self.config.get('ema_slow_period', 21)
+
+        if ema_fast <= 0 or ema_slow <= 0:
+            raise ValueError("EMA periods must be positive")
+        if ema_fast >= ema_slow:
+            raise ValueError("Fast EMA period must be less than slow EMA period")
+
+        # RSI
+        rsi_period = self.config.get('rsi_period', 7)
+        if rsi_period <= 0:
+            raise ValueError("RSI period must be positive")
+
+        # ATR
+        atr_period = self.config.get('atr_period', 14)
+        if atr_period <= 0:
+            raise ValueError("ATR period must be positive")
+
+        # Momentum
+        momentum_period = self.config.get('momentum_period', 5)
+        if momentum_period <= 0:
+            raise ValueError("Momentum period must be positive")
+
+        return ema_fast, ema_slow, rsi_period, atr_period
 
-        except Exception as e:
-            logger.error(f"Backtest error: {e}")
-            raise Exception(f"Backtest failed: {e}")
-        finally:
-            mt5.shutdown()
-    
     def calculate_indicators(self, df):
         """Calculate technical indicators with validation"""
         try:
@@ -328,57 +478,14 @@ class StrategyBacktester:
                 if col not in df.columns:
                     raise ValueError(f"Missing required column: {col}")
 
-            # EMA
-            ema_fast = self.config.get('ema_fast_period', 7)
-            ema_slow = self.config.get('ema_slow_period', 21)
-
-            if ema_fast <= 0 or ema_slow <= 0:
-                raise ValueError("EMA periods must be positive")
-            if ema_fast >= ema_slow:
-                raise ValueError("Fast EMA period must be less than slow EMA period")
-
-            df['ema_fast'] = df['close'].ewm(span=ema_fast, adjust=False).mean()
-            df['ema_slow'] = df['close'].ewm(span=ema_slow, adjust=False).mean()
-
-            # RSI
-            rsi_period = self.config.get('rsi_period', 7)
-            if rsi_period <= 0:
-                raise ValueError("RSI period must be positive")
-
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
-            rs = gain / loss
-            df['rsi'] = 100 - (100 / (1 + rs))
+            ema_fast, ema_slow, rsi_period, atr_period = self._indicator_periods()
 
-            # Handle RSI NaN values
-            df['rsi'] = df['rsi'].fillna(50)  # Neutral RSI for initial values
-
-            # ATR
-            atr_period = self.config.get('atr_period', 14)
-            if atr_period <= 0:
-                raise ValueError("ATR period must be positive")
-
-            high_low = df['high'] - df['low']
-            high_close = np.abs(df['high'] - df['close'].shift())
-            low_close = np.abs(df['low'] - df['close'].shift())
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = np.max(ranges, axis=1)
-            df['atr'] = true_range.rolling(atr_period).mean()
-
-            # Handle ATR NaN values
-            df['atr'] = df['atr'].fillna(df['atr'].mean())
-
-            # Momentum
-            momentum_period = self.config.get('momentum_period', 5)
-            if momentum_period <= 0:
-                raise ValueError("Momentum period must be positive")
-
-            df['momentum'] = df['close'].diff(momentum_period)
-
-            # Volatility (20-period standard deviation)
-            df['volatility'] = df['close'].rolling(20).std() / df['close'].rolling(20).mean()
-            df['volatility'] = df['volatility'].fillna(0)
+            # EMA / RSI / ATR / momentum / volatility series (memoized across a sweep when cached)
+            for column, name, period in config_indicators(self.config):
+                if self.indicator_cache is not None:
+                    df[column] = self.indicator_cache.get(df, name, period)
+                else:
+                    df[column] = INDICATORS[name](df, period)
 
             # ✅ VALIDATE INDICATORS
             if df[['ema_fast', 'ema_slow', 'rsi', 'atr']].isnull().any().any():
@@ -885,9 +992,12 @@ class StrategyBacktester:
 
         # Sharpe ratio (annualized) with safe division
         sharpe_ratio = 0
+        equity_values = getattr(self.equity_curve, 'values', None)
+        if equity_values is None:
+            equity_values = [e['equity'] for e in self.equity_curve]
         if len(self.equity_curve) > 1:
             try:
-                equity_returns = np.diff([e['equity'] for e in self.equity_curve])
+                equity_returns = np.diff(equity_values)
                 equity_returns = equity_returns[~np.isnan(equity_returns)]  # Remove NaN
                 equity_returns = equity_returns[~np.isinf(equity_returns)]  # Remove inf
 
@@ -906,7 +1016,7 @@ class StrategyBacktester:
         sortino_ratio = 0
         if len(self.equity_curve) > 1:
             try:
-                equity_returns = np.diff([e['equity'] for e in self.equity_curve])
+                equity_returns = np.diff(equity_values)
                 equity_returns = equity_returns[~np.isnan(equity_returns)]
                 equity_returns = equity_returns[~np.isinf(equity_returns)]
 
@@ -0,0 +1,140 @@
+"""
+Symbol Metadata Cache for Aventa HFT Pro 2026
+Contract specs loaded once and refreshed on a slow schedule
+"""
+
+import time
+import threading
+import logging
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# SymbolInfo.filling_mode flags (SYMBOL_FILLING_FOK / SYMBOL_FILLING_IOC)
+SYMBOL_FILLING_FOK = 1
+SYMBOL_FILLING_IOC = 2
+
+
+@dataclass(frozen=True)
+class SymbolMeta:
+    """Static contract specification of one symbol"""
+    symbol: str
+    point: float
+    digits: int
+    contract_size: float
+    tick_size: float
+    tick_value: float
+    stops_level: int
+    freeze_level: int
+    filling_mode: int
+    volume_min: float
+    volume_max: float
+    volume_step: float
+
+    @classmethod
+    def from_symbol_info(cls, symbol: str, info) -> 'SymbolMeta':
+        return cls(
+            symbol=symbol,
+            point=float(info.point),
+            digits=int(getattr(info, 'digits', 0)),
+            contract_size=float(getattr(info, 'trade_contract_size', 0.0)),
+            tick_size=float(getattr(info, 'trade_tick_size', 0.0)),
+            tick_value=float(getattr(info, 'trade_tick_value', 0.0)),
+            stops_level=int(getattr(info, 'trade_stops_level', 0)),
+            freeze_level=int(getattr(info, 'trade_freeze_level', 0)),
+            filling_mode=int(getattr(info, 'filling_mode', 0)),
+            volume_min=float(getattr(info, 'volume_min', 0.0)),
+            volume_max=float(getattr(info, 'volume_max', 0.0)),
+            volume_step=float(getattr(info, 'volume_step', 0.0)),
+        )
+
+    @property
+    def min_stop_distance(self) -> float:
+        """Minimum SL/TP distance in price units"""
+        return self.stops_level * self.point
+
+    def supports_filling(self, mode_str: str) -> bool:
+        """True if the symbol accepts the given filling mode ('FOK', 'IOC', 'RETURN')"""
+        mode = mode_str.upper()
+        if mode == 'FOK':
+            return bool(self.filling_mode & SYMBOL_FILLING_FOK)
+        if mode == 'IOC':
+            return bool(self.filling_mode & SYMBOL_FILLING_IOC)
+        return True  # RETURN is accepted for market/exchange execution
+
+
+class SymbolMetadataCache:
+    """
+    Symbol metadata served from memory
+
+    ``get()`` never touches MT5. ``refresh()`` makes one ``symbol_info`` call and
+    reports which fields changed (brokers do change stops level, contract size
+    or filling modes intraday); ``refresh_if_due()`` is meant for slow loops.
+    """
+
+    def __init__(self, mt5_api=None, refresh_interval: float = 300.0):
+        """
+        Args:
+            mt5_api: MetaTrader5 module (or a compatible fake); imported lazily if None
+            refresh_interval: Seconds between scheduled refreshes
+        """
+        self._mt5 = mt5_api
+        self.refresh_interval = refresh_interval
+        self._meta: Dict[str, SymbolMeta] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        # Stats
+        self.api_calls = 0
+        self.changes = 0
+
+    @property
+    def mt5(self):
+        if self._mt5 is None:
+            import MetaTrader5
+            self._mt5 = MetaTrader5
+        return self._mt5
+
+    def get(self, symbol: str) -> Optional[SymbolMeta]:
+        """Cached metadata or None if never loaded"""
+        return self._meta.get(symbol)
+
+    def store(self, symbol: str, info) -> Tuple[str, ...]:
+        """
+        Cache a ``symbol_info`` result
+
+        Returns:
+            Names of fields that differ from the previously cached value
+        """
+        meta = SymbolMeta.from_symbol_info(symbol, info)
+        with self._lock:
+            previous = self._meta.get(symbol)
+            self._meta[symbol] = meta
+            self._loaded_at[symbol] = time.monotonic()
+
+        if previous is None or previous == meta:
+            return ()
+
+        changed = tuple(f.name for f in fields(SymbolMeta)
+                        if getattr(previous, f.name) != getattr(meta, f.name))
+        self.changes += 1
+        for name in changed:
+            logger.warning(f"⚠️ {symbol} {name} changed: {getattr(previous, name)} -> {getattr(meta, name)}")
+        return changed
+
+    def refresh(self, symbol: str) -> Tuple[str, ...]:
+        """Reload from MT5 (one symbol_info call); returns changed field names"""
+        self.api_calls += 1
+        info = self.mt5.symbol_info(symbol)
+        if info is None:
+            logger.warning(f"symbol_info({symbol}) returned None - keeping cached metadata")
+            return ()
+        return self.store(symbol, info)
+
+    def refresh_if_due(self, symbol: str) -> Tuple[str, ...]:
+        """Reload if older than ``refresh_interval``"""
+        loaded_at = self._loaded_at.get(symbol)
+        if loaded_at is not None and time.monotonic() - loaded_at < self.refresh_interval:
+            return ()
+        return self.refresh(symbol)
@@ -0,0 +1,131 @@
+"""
+Unit tests for the async, sampled logging pipeline
+"""
+
+import sys
+import queue
+import logging
+import threading
+import subprocess
+import textwrap
+
+import pytest
+
+import async_logging
+from async_logging import AsyncLogPipeline, LogSampler, NonBlockingQueueHandler, log_sampled
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+        self.threads.add(threading.current_thread().name)
+
+
+@pytest.fixture
+def target():
+    log = logging.getLogger('test_async_logging.target')
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    handler = ListHandler()
+    log.handlers = [handler]
+    yield log, handler
+    log.handlers = []
+
+
+class TestLogSampler:
+    def test_one_per_interval_with_suppressed_count(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(async_logging.time, 'monotonic', lambda: now[0])
+        sampler = LogSampler()
+
+        assert sampler.allow('diag', 5.0) == (True, 0)
+        assert sampler.allow('diag', 5.0) == (False, 0)
+        assert sampler.allow('other', 5.0) == (True, 0)  # keys are independent
+        assert sampler.allow('diag', 5.0) == (False, 0)
+        now[0] += 5.0
+        assert sampler.allow('diag', 5.0) == (True, 2)
+        assert sampler.get_stats()['diag'] == {'emitted': 2, 'suppressed': 2}
+
+    def test_log_sampled_appends_suppressed(self, target, monkeypatch):
+        log, handler = target
+        now = [0.0]
+        monkeypatch.setattr(async_logging.time, 'monotonic', lambda: now[0])
+        monkeypatch.setattr(async_logging, '_sampler', LogSampler())
+
+        for i in range(4):
+            log_sampled(log, logging.INFO, 'k', 1.0, "tick %d", i)
+        now[0] += 1.0
+        log_sampled(log, logging.INFO, 'k', 1.0, "tick %d", 4)
+        log_sampled(log, logging.DEBUG, 'k', 0.0, "below level")  # disabled level is not sampled
+        assert handler.lines == ['tick 0', 'tick 4 (+3 suppressed)']
+
+
+class TestAsyncLogPipeline:
+    def test_formatting_happens_on_listener(self, target):
+        log, handler = target
+        before = list(log.handlers)
+        pipeline = AsyncLogPipeline(log)
+        pipeline.start()
+        assert log.handlers == [pipeline.handler]
+
+        log.info("delta %.0f velocity %.6f", -215.0, 0.0059)
+        pipeline.stop()
+
+        assert handler.lines == ['delta -215 velocity 0.005900']
+        assert threading.current_thread().name not in handler.threads
+        assert log.handlers == before  # handlers given back
+
+    def test_full_queue_drops_and_counts(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+        record = logging.LogRecord('x', logging.INFO, __file__, 1, "msg %d", (1,), None)
+        for _ in range(5):
+            handler.handle(record)
+        assert (handler.enqueued, handler.dropped) == (2, 3)
+        queued = handler.queue.get_nowait()
+        assert (queued.msg, queued.args) == ("msg %d", (1,))  # not formatted by the caller
+
+    def test_install_is_idempotent(self):
+        root = logging.getLogger()
+        before = list(root.handlers)
+        try:
+            pipeline = async_logging.install_async_logging(100)
+            assert async_logging.install_async_logging(5) is pipeline
+            assert async_logging.get_log_pipeline() is pipeline
+        finally:
+            async_logging.shutdown_async_logging()
+        assert async_logging.get_log_pipeline() is None
+        assert root.handlers == before
+
+    def test_stop_with_full_queue_drains(self, target):
+        log, handler = target
+        before = list(log.handlers)
+        pipeline = AsyncLogPipeline(log, max_queue=4)
+        pipeline.start()
+        for i in range(50):
+            log.info("line %d", i)
+        pipeline.stop()  # sentinel waits for room instead of raising queue.Full
+
+        assert len(handler.lines) == pipeline.handler.enqueued
+        assert log.handlers == before
+
+    def test_queued_records_written_at_exit(self, tmp_path):
+        path = tmp_path / "exit.log"
+        script = textwrap.dedent(f"""
+            import logging, sys
+            sys.path.insert(0, {str(async_logging.__file__).rsplit('/', 1)[0]!r})
+            from async_logging import install_async_logging
+            logging.basicConfig(filename={str(path)!r}, level=logging.INFO, format='%(message)s')
+            install_async_logging(100000)
+            for i in range(20000):
+                logging.info("line %d", i)
+            raise SystemExit("crash")  # no shutdown_async_logging() call
+        """)
+        subprocess.run([sys.executable, "-c", script], capture_output=True, timeout=60)
+
+        lines = path.read_text().splitlines()
+        assert lines[-1] == "line 19999"
@@ -0,0 +1,145 @@
+"""
+Unit tests for the column-array backtest core (same trades as the per-bar loop)
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest_core
+
+BASE = {'symbol': 'EURUSD', 'magic_number': 1, 'default_volume': 0.01}
+
+
+@pytest.fixture(scope='module')
+def backtester_cls():
+    mt5_sim = pytest.importorskip('mt5_sim')
+    patched = 'MetaTrader5' not in sys.modules
+    if patched:
+        sys.modules['MetaTrader5'] = mt5_sim.SimulatedTerminal.from_config({'symbol': 'XAUUSD'})
+    try:
+        yield pytest.importorskip('strategy_backtester').StrategyBacktester
+    finally:
+        if patched:
+            sys.modules.pop('MetaTrader5', None)
+
+
+def bars(n=1500, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0004, n))
+    return pd.DataFrame({
+        'time': pd.to_datetime(1704067200 + np.arange(n) * 60 + (np.arange(n) // 500) * 7200, unit='s'),
+        'open': close, 'high': close + 0.0003, 'low': close - 0.0003, 'close': close,
+        'volume': rng.integers(0, 50, n).astype(float),
+        'spread': rng.integers(0, 200, n),
+    })
+
+
+def run_both(cls, config, df, jit=True):
+    config = {**BASE, **config, 'backtest_jit': jit}
+    legacy, fast = cls(config, initial_balance=1000), cls(config, initial_balance=1000)
+    assert legacy._run_bar_loop(legacy.calculate_indicators(df.copy()))
+    assert fast._run_array_core(fast.calculate_indicators(df.copy()))
+    return legacy, fast
+
+
+CONFIGS = [
+    {},
+    {'max_floating_profit': 50.0, 'max_floating_loss': 50.0, 'sl_multiplier': 3.0, 'min_sl_pips': 20,
+     'max_trade_duration_hours': 0.5, 'commission_per_trade': 0.05, 'slippage_pips': 2},
+    {'max_floating_profit': 80.0, 'max_floating_loss': 80.0, 'tp_mode': 'RiskReward', 'sl_multiplier': 2.0,
+     'risk_reward_ratio': 1.5, 'min_volume': 10, 'avoid_session_edges': True, 'max_volatility': 0.001},
+    {'max_floating_profit': 3.0, 'max_floating_loss': 3.0, 'sl_multiplier': -1, 'tp_mode': 'Other',
+     'min_signal_strength': 0.0, 'rsi_overbought': 55, 'rsi_oversold': 45},
+]
+
+
+class TestBacktestCore:
+    @pytest.mark.parametrize('jit', [True, False])
+    @pytest.mark.parametrize('config', CONFIGS)
+    def test_matches_bar_loop(self, backtester_cls, config, jit):
+        legacy, fast = run_both(backtester_cls, config, bars(), jit=jit)
+        assert len(legacy.trades) > 5
+        assert fast.trades == legacy.trades
+        assert fast.balance == legacy.balance
+        assert fast.max_drawdown == legacy.max_drawdown
+        assert fast.peak_equity == legacy.peak_equity
+        assert fast.equity == legacy.equity
+        assert list(fast.equity_curve) == legacy.equity_curve
+
+        expected, actual = legacy.calculate_results(), fast.calculate_results()
+        for key in ('equity_curve', 'trades'):
+            expected.pop(key), actual.pop(key)
+        assert actual == expected
+
+    def test_exit_reasons_covered(self, backtester_cls):
+        reasons = set()
+        for config in CONFIGS:
+            _, fast = run_both(backtester_cls, config, bars())
+            reasons |= {t['reason'] for t in fast.trades}
+        assert reasons == set(backtest_core.EXIT_REASONS)
+
+    def test_untyped_signal_with_zero_threshold(self, backtester_cls):
+        # strength 0 passes min_signal_strength 0: the legacy loop opens a position of type None
+        df = bars(300)
+        df['close'] = df['open'] = df['high'] = df['low'] = 1.1
+        legacy, fast = run_both(backtester_cls, {'min_signal_strength': 0.0, 'max_trade_duration_hours': 1}, df)
+        assert {t['type'] for t in legacy.trades} == {None}
+        assert fast.trades == legacy.trades
+
+    def test_chunked_runs_match_single_pass(self):
+        df = bars(800)
+        df['ema_fast'] = df['close'].ewm(span=5, adjust=False).mean()
+        df['ema_slow'] = df['close'].ewm(span=20, adjust=False).mean()
+        df['rsi'], df['atr'], df['volatility'] = 50.0, 0.001, 0.0
+        df['momentum'] = df['close'].diff(3)
+        columns = backtest_core.bar_columns(df)
+        params = backtest_core.BarParams.from_config({'max_floating_profit': 5.0}, 0.00001, 0.01)
+        whole = backtest_core.BarSimulator(columns, params, 1000.0, jit=False)
+        whole.run(50, 800, close_at_end=True)
+        chunked = backtest_core.BarSimulator(columns, params, 1000.0, jit=False)
+        for start in range(50, 800, 37):
+            chunked.run(start, min(start + 37, 800))
+        chunked.run(800, 800, close_at_end=True)
+        assert np.array_equal(whole.trade_rows(), chunked.trade_rows())
+        assert whole.balance == chunked.balance and not chunked.has_position
+        assert len(whole.equity_curve(50, columns['time_ns'])) == 750
+
+    def test_missing_spread_blocks_entries(self):
+        df = bars(200).drop(columns='spread')
+        df['ema_fast'], df['ema_slow'], df['rsi'], df['atr'] = 2.0, 1.0, 20.0, 0.001
+        df['momentum'], df['volatility'] = 1.0, 0.0
+        columns = backtest_core.bar_columns(df)
+        simulator = backtest_core.BarSimulator(columns, backtest_core.BarParams.from_config({}, 0.00001, 0.01),
+                                               1000.0, jit=False)
+        simulator.run(50, 200, close_at_end=True)
+        assert len(simulator.trade_rows()) == 0
+
+    @pytest.mark.parametrize('jit', [True, False])
+    def test_batch_matches_single_config_runs(self, jit):
+        df = bars(1200)
+        rsi = 50 + 30 * np.sin(np.arange(len(df)) / 15)
+        series = np.stack([df['close'].ewm(span=span, adjust=False).mean().to_numpy() for span in (4, 9, 20)]
+                          + [rsi, df['close'].diff(3).to_numpy(), np.full(len(df), 0.0004), np.zeros(len(df))])
+        series_index = np.array([[0, 1, 3, 4, 5, 6], [0, 2, 3, 4, 5, 6], [1, 2, 3, 4, 5, 6]])
+        configs = [{**CONFIGS[1], 'max_floating_profit': 5.0}, {'max_floating_profit': 2.0}, CONFIGS[2]]
+        params = [backtest_core.BarParams.from_config(c, 0.00001, 0.01) for c in configs]
+        columns = backtest_core.bar_columns(df, names=backtest_core.BAR_COLUMNS)
+        batch = backtest_core.BatchSimulator(columns, series, series_index, params, 1000.0, jit=jit)
+        for start in range(50, 1200, 128):
+            batch.run(start, min(start + 128, 1200))
+        batch.run(1200, 1200, close_at_end=True)
+
+        for c, config_params in enumerate(params):
+            single_columns = {**columns, **dict(zip(backtest_core.SERIES_COLUMNS, series[series_index[c]]))}
+            single = backtest_core.BarSimulator(single_columns, config_params, 1000.0, jit=jit)
+            single.run(50, 1200, close_at_end=True)
+            member = batch.member(c)
+            assert len(single.trade_rows()) > 3
+            assert np.array_equal(member.trade_rows(), single.trade_rows())
+            assert (member.balance, member.peak_equity, member.max_drawdown) == \
+                (single.balance, single.peak_equity, single.max_drawdown)
+            assert np.array_equal(member.equity_curve(50, columns['time_ns']).values,
+                                  single.equity_curve(50, columns['time_ns']).values)
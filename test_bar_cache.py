@@ -0,0 +1,170 @@
+"""
+Unit tests for the on-disk historical bar cache
+"""
+
+import os
+import sys
+import glob
+import types
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bar_cache import BarCache, RATES_DTYPE, merge_intervals, missing_intervals, to_seconds
+
+T0 = to_seconds(datetime(2024, 1, 1))
+DAY = 86400
+
+
+def history(days=10, start=T0):
+    times = start + np.arange(days * 1440, dtype=np.int64) * 60
+    rates = np.zeros(len(times), dtype=RATES_DTYPE)
+    rates['time'] = times
+    close = 2000.0 + np.cumsum(np.random.default_rng(days).normal(0, 0.3, len(times)))
+    rates['open'], rates['high'], rates['low'], rates['close'] = close, close + 0.2, close - 0.2, close
+    rates['tick_volume'] = 5
+    rates['spread'] = 12
+    return rates
+
+
+class Terminal:
+    """copy_rates_range over a fixed history, counting calls"""
+
+    def __init__(self, rates):
+        self.rates = rates
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, symbol, timeframe, date_from, date_to):
+        self.calls.append((to_seconds(date_from), to_seconds(date_to)))
+        if self.fail:
+            return None
+        times = self.rates['time']
+        lo = np.searchsorted(times, to_seconds(date_from))
+        hi = np.searchsorted(times, to_seconds(date_to), side='right')
+        return self.rates[lo:hi].copy()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    clock = types.SimpleNamespace(now=float(T0 + 30 * DAY))
+    cache = BarCache(str(tmp_path), fetch_days=2, clock=lambda: clock.now)
+    cache.test_clock = clock
+    return cache
+
+
+class TestIntervals:
+    def test_merge_and_gaps(self):
+        assert merge_intervals([[10, 20], [0, 5], [6, 8], [19, 30]]) == [[0, 8], [10, 30]]
+        assert missing_intervals([[0, 8], [10, 30]], 5, 40) == [(9, 9), (31, 40)]
+        assert missing_intervals([], 1, 2) == [(1, 2)]
+        assert missing_intervals([[0, 100]], 10, 20) == []
+
+
+class TestBarCache:
+    def test_fetches_once_then_serves_from_disk(self, cache):
+        terminal = Terminal(history())
+        first = cache.get_rates('XAUUSD', 1, datetime(2024, 1, 2), datetime(2024, 1, 6), terminal)
+        assert len(terminal.calls) == 3  # 4 days in 2-day chunks, inclusive end
+        assert len(first['time']) == 4 * 1440 + 1
+        again = BarCache(cache.root, clock=cache.clock).get_rates('XAUUSD', 1, datetime(2024, 1, 2),
+                                                                  datetime(2024, 1, 6), terminal)
+        assert len(terminal.calls) == 3
+        assert isinstance(again['close'], np.memmap)
+        assert np.array_equal(again['close'], first['close'])
+        assert pd.DataFrame(again)['spread'].tolist()[:2] == [12, 12]
+
+    def test_only_missing_ranges_are_fetched(self, cache):
+        terminal = Terminal(history())
+        cache.get_rates('XAUUSD', 1, datetime(2024, 1, 4), datetime(2024, 1, 5), terminal)
+        terminal.calls.clear()
+        rates = cache.get_rates('XAUUSD', 1, datetime(2024, 1, 2), datetime(2024, 1, 8), terminal)
+        assert terminal.calls == [(T0 + DAY, T0 + 3 * DAY - 1), (T0 + 4 * DAY + 1, T0 + 6 * DAY),
+                                  (T0 + 6 * DAY + 1, T0 + 7 * DAY)]
+        expected = history()[(history()['time'] >= T0 + DAY) & (history()['time'] <= T0 + 7 * DAY)]
+        assert np.array_equal(rates['time'], expected['time'])  # backfill merged in order
+        assert np.array_equal(rates['close'], expected['close'])
+        # the backfill rewrote the columns; the old generation is gone
+        assert len(glob.glob(os.path.join(cache.series_dir('XAUUSD', 1), 'time.*.bin'))) == 1
+
+    def test_new_bars_refetched_at_most_every_refresh(self, cache):
+        rates = history(days=10)
+        cache.test_clock.now = float(T0 + 5 * DAY)  # only 5 days exist yet
+        terminal = Terminal(rates[rates['time'] <= T0 + 5 * DAY])
+        cache.get_rates('XAUUSD', 1, datetime(2024, 1, 1), datetime(2024, 1, 8), terminal)
+        calls = len(terminal.calls)
+
+        terminal.rates = rates
+        cache.test_clock.now += 3600
+        same_day = cache.get_rates('XAUUSD', 1, datetime(2024, 1, 1), datetime(2024, 1, 8), terminal)
+        assert len(terminal.calls) == calls and same_day['time'][-1] == T0 + 5 * DAY
+
+        cache.test_clock.now += DAY
+        next_day = cache.get_rates('XAUUSD', 1, datetime(2024, 1, 1), datetime(2024, 1, 8), terminal)
+        assert len(terminal.calls) > calls
+        assert next_day['time'][-1] == T0 + 7 * DAY
+        assert np.all(np.diff(next_day['time']) == 60)  # refetched boundary bar not duplicated
+
+    def test_forming_bar_not_cached_as_final(self, cache):
+        rates = history(days=2)
+        forming = T0 + DAY  # bar opened at "now": still forming when first fetched
+        cache.test_clock.now = float(forming + 30)
+        terminal = Terminal(rates[rates['time'] <= forming])
+        terminal.rates['close'][-1] = 1.0
+        first = cache.get_rates('XAUUSD', 1, T0, forming, terminal)
+        assert first['close'][-1] == 1.0
+        manifest = cache._read_manifest(cache.series_dir('XAUUSD', 1))
+        assert manifest['covered'][-1][1] == forming - 60  # last closed bar
+
+        terminal.rates = rates[rates['time'] <= forming].copy()
+        terminal.rates['close'][-1] = 2.0
+        cache.test_clock.now += cache.refresh_seconds
+        final = cache.get_rates('XAUUSD', 1, T0, forming, terminal)
+        assert final['close'][-1] == 2.0
+        assert len(final['time']) == 1441
+
+    def test_failed_fetch_is_retried(self, cache):
+        terminal = Terminal(history())
+        terminal.fail = True
+        assert len(cache.get_rates('XAUUSD', 1, T0, T0 + DAY, terminal)['time']) == 0
+        assert cache.fetch_errors == 1
+        terminal.fail = False
+        assert len(cache.get_rates('XAUUSD', 1, T0, T0 + DAY, terminal)['time']) == 1441
+
+    def test_latest_extends_over_gaps(self, cache):
+        rates = history(days=20)
+        weekdays = rates[((rates['time'] // DAY + 3) % 7) < 5]
+        cache.test_clock.now = float(weekdays['time'][-1] + 60)
+        terminal = Terminal(weekdays)
+        last = cache.latest('XAUUSD', 1, 5 * 1440, terminal)
+        assert len(last['time']) == 5 * 1440
+        assert last['time'][-1] == weekdays['time'][-1]
+        assert np.array_equal(last['time'], weekdays['time'][-5 * 1440:])
+
+
+class TestBacktesterUsesCache:
+    def test_second_run_skips_terminal_download(self, tmp_path, monkeypatch):
+        mt5_sim = pytest.importorskip('mt5_sim')
+        if 'MetaTrader5' not in sys.modules:
+            monkeypatch.setitem(sys.modules, 'MetaTrader5',
+                                mt5_sim.SimulatedTerminal.from_config({'symbol': 'XAUUSD'}))
+        strategy_backtester = pytest.importorskip('strategy_backtester')
+        terminal = Terminal(history(days=400, start=T0 - 399 * DAY))
+        fake = types.SimpleNamespace(
+            terminal_info=lambda: True, initialize=lambda: True, shutdown=lambda: None, TIMEFRAME_M1=1,
+            symbol_info=lambda s: types.SimpleNamespace(ask=2000.0),
+            symbols_get=lambda: [types.SimpleNamespace(name='XAUUSD')], copy_rates_range=terminal)
+        monkeypatch.setattr(strategy_backtester, 'mt5', fake)
+        config = {'symbol': 'XAUUSD', 'magic_number': 1, 'default_volume': 0.01,
+                  'bar_cache_dir': str(tmp_path), 'bar_cache_fetch_days': 60}
+
+        results = []
+        for _ in range(2):
+            backtester = strategy_backtester.StrategyBacktester(config)
+            # more than a year: allowed with the cache
+            results.append(backtester.run_backtest(datetime(2023, 1, 1), datetime(2024, 1, 31)))
+        assert len(terminal.calls) == 7
+        assert results[0]['total_trades'] > 0
+        assert results[0]['total_pnl'] == results[1]['total_pnl']
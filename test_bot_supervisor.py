@@ -0,0 +1,278 @@
+"""
+Unit tests for the process-per-bot supervisor and shared-memory tick ring
+"""
+
+import time
+import types
+import pytest
+import numpy as np
+from market_data_hub import Subscription
+from bot_supervisor import (SharedTickRing, SharedTickSource, BotSupervisor, RemoteEngine,
+                            run_analysis_worker, run_engine_worker, RING_DTYPE)
+
+
+def make_ticks(start, n):
+    ticks = np.zeros(n, dtype=RING_DTYPE)
+    ticks['time_msc'] = np.arange(start, start + n)
+    ticks['bid'] = 2600.0 + np.arange(n) * 0.01
+    ticks['ask'] = ticks['bid'] + 0.1
+    ticks['last'] = ticks['bid']
+    ticks['volume'] = 1.0
+    return ticks
+
+
+def wait_for(predicate, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+class ManualHub:
+    """MarketDataHub stand-in; the test pushes ticks explicitly"""
+
+    def __init__(self):
+        self.subscribers = {}
+        self._next_id = 0
+
+    def subscribe(self, symbol, callback):
+        self._next_id += 1
+        self.subscribers[self._next_id] = callback
+        return Subscription(symbol, self._next_id)
+
+    def unsubscribe(self, subscription):
+        self.subscribers.pop(subscription.id, None)
+
+    def push(self, ticks):
+        for callback in list(self.subscribers.values()):
+            callback(ticks, 0.0)
+
+
+@pytest.fixture
+def ring():
+    ring = SharedTickRing(capacity=8)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+class TestSharedTickRing:
+    """Single-writer ring in shared memory"""
+
+    def test_read_since(self, ring):
+        ring.write(make_ticks(0, 3))
+        ticks, position, dropped = ring.read_since(0)
+        assert ticks['time_msc'].tolist() == [0, 1, 2]
+        assert (position, dropped) == (3, 0)
+
+        assert len(ring.read_since(position)[0]) == 0
+
+    def test_wraparound_and_overrun(self, ring):
+        ring.write(make_ticks(0, 6))
+        ring.write(make_ticks(6, 6))
+        ticks, position, dropped = ring.read_since(6)
+        assert ticks['time_msc'].tolist() == [6, 7, 8, 9, 10, 11]
+
+        ticks, position, dropped = ring.read_since(0)
+        assert ticks['time_msc'].tolist() == list(range(4, 12))
+        assert dropped == 4
+
+    def test_oversized_batch_keeps_newest(self, ring):
+        ring.write(make_ticks(0, 3))
+        ring.write(make_ticks(3, 20))
+        ticks, position, dropped = ring.read_since(3)
+        assert ticks['time_msc'].tolist() == list(range(15, 23))
+        assert position == 23
+
+    def test_visible_through_second_mapping(self, ring):
+        reader = SharedTickRing(ring.name, ring.capacity, create=False)
+        ring.write(make_ticks(100, 2))
+        assert reader.read_since(0)[0]['time_msc'].tolist() == [100, 101]
+        reader.close()
+
+    def test_source_delivers_to_subscribers(self, ring):
+        ring.write(make_ticks(0, 2))
+        source = SharedTickSource(ring.name, ring.capacity)
+        received = []
+        sub = source.subscribe('XAUUSD', lambda ticks, fetch_us: received.extend(ticks['time_msc'].tolist()))
+        ring.write(make_ticks(2, 3))
+        assert wait_for(lambda: len(received) == 5, timeout=2)
+        assert received == [0, 1, 2, 3, 4]
+        source.unsubscribe(sub)
+        source.close()
+
+
+class TestBotSupervisor:
+    """Worker processes, status channel and crash restart"""
+
+    @pytest.fixture
+    def supervisor(self):
+        hub = ManualHub()
+        supervisor = BotSupervisor(hub=hub, worker_target=run_analysis_worker, monitor_interval=0.05)
+        supervisor.hub_stub = hub
+        yield supervisor
+        supervisor.shutdown(timeout=5)
+
+    def test_status_and_stop(self, supervisor):
+        supervisor.start_bot('bot1', 'XAUUSD', {}, wait=30)
+        supervisor.hub_stub.push(make_ticks(0, 200))
+
+        assert wait_for(lambda: supervisor.get_status('bot1').get('analyses', 0) > 0)
+        assert supervisor.get_status('bot1')['ticks'] == 200
+        ring_name = supervisor.ring('XAUUSD').name
+
+        supervisor.stop_bot('bot1', timeout=5)
+        assert 'bot1' not in supervisor.workers
+        assert supervisor.ring('XAUUSD') is None
+        assert not supervisor.hub_stub.subscribers
+        with pytest.raises(FileNotFoundError):
+            SharedTickRing(ring_name, 8, create=False)
+
+    def test_bots_share_one_ring(self, supervisor):
+        supervisor.start_bot('bot1', 'XAUUSD', {}, wait=30)
+        supervisor.start_bot('bot2', 'XAUUSD', {}, wait=30)
+        assert len(supervisor.hub_stub.subscribers) == 1
+
+        supervisor.stop_bot('bot1', timeout=5)
+        assert supervisor.ring('XAUUSD') is not None
+
+    def test_crash_restart(self, supervisor):
+        worker = supervisor.start_bot('bot1', 'XAUUSD', {}, wait=30)
+        first_pid = worker.pid
+
+        worker.process.kill()
+        assert wait_for(lambda: worker.restarts == 1 and worker.started.is_set() and worker.pid != first_pid)
+        assert supervisor.get_stats()['bot1']['alive']
+
+    def test_restart_budget(self, supervisor):
+        supervisor.max_restarts = 0
+        worker = supervisor.start_bot('bot1', 'XAUUSD', {}, wait=30)
+
+        worker.process.kill()
+        assert wait_for(lambda: worker.failure == 'restart budget exhausted')
+        assert worker.restarts == 0
+
+    def test_remote_engine(self, supervisor):
+        engine = supervisor.engine_proxy('bot1', 'XAUUSD', {})
+        assert isinstance(engine, RemoteEngine)
+        assert engine.initialize()
+        assert engine.start()
+
+        supervisor.hub_stub.push(make_ticks(0, 150))
+        assert wait_for(lambda: engine.get_performance_snapshot().get('ticks') == 150)
+
+        engine.stop()
+        assert not engine.is_running
+
+    def test_connects_hub_terminal_once(self):
+        calls = []
+        hub = ManualHub()
+        hub.mt5 = types.SimpleNamespace(initialize=lambda *args: calls.append(args) or True, last_error=lambda: None)
+        supervisor = BotSupervisor(hub=hub, worker_target=run_analysis_worker, monitor_interval=0.05)
+        try:
+            supervisor.start_bot('bot1', 'XAUUSD', {'mt5_path': 'terminal64.exe'}, wait=30)
+            supervisor.start_bot('bot2', 'EURUSD', {'mt5_path': 'terminal64.exe'}, wait=30)
+            assert calls == [('terminal64.exe',)]
+        finally:
+            supervisor.shutdown(timeout=5)
+
+    def test_terminal_failure_fails_start(self):
+        hub = ManualHub()
+        hub.mt5 = types.SimpleNamespace(initialize=lambda *args: False, last_error=lambda: (-6, 'Authorization failed'))
+        supervisor = BotSupervisor(hub=hub, worker_target=run_analysis_worker, monitor_interval=0.05)
+        try:
+            engine = supervisor.engine_proxy('bot1', 'XAUUSD', {})
+            assert not engine.initialize()
+            assert 'bot1' not in supervisor.workers
+            assert supervisor.ring('XAUUSD') is None
+            assert not hub.subscribers
+        finally:
+            supervisor.shutdown(timeout=5)
+
+
+def run_engine_worker_on_sim(bot_id, symbol, config, ring_name, ring_capacity, conn):
+    """run_engine_worker with a simulated terminal standing in for the real one (ticks still via the ring)"""
+    import mt5_sim
+    mt5_sim.install(mt5_sim.SimulatedTerminal.from_config(config))
+    run_engine_worker(bot_id, symbol, config, ring_name, ring_capacity, conn)
+
+
+class TestEngineWorker:
+    """run_engine_worker with the real UltraLowLatencyEngine"""
+
+    def test_engine_on_simulator_reads_own_ticks(self):
+        pytest.importorskip('mt5_sim')
+        hub = ManualHub()
+        supervisor = BotSupervisor(hub=hub, worker_target=run_engine_worker, monitor_interval=0.05)
+        config = {'symbol': 'XAUUSD', 'magic_number': 4242, 'mt5_backend': 'simulator', 'sim_balance': 5000.0,
+                  'trading_sessions_enabled': False, 'async_logging': False}
+        try:
+            engine = supervisor.engine_proxy('bot1', 'XAUUSD', config)
+            assert engine.initialize(), supervisor.workers['bot1'].failure
+            assert supervisor.ring('XAUUSD') is None  # the GUI's real feed is not used
+            assert not hub.subscribers
+
+            # Ticks come from the worker's simulated terminal (random walk, ~5 ticks/s)
+            assert wait_for(lambda: engine.get_performance_snapshot().get('ticks_processed', 0) >= 5)
+            assert engine.get_performance_snapshot()['balance'] == pytest.approx(5000.0)
+            engine.stop()
+            assert not engine.is_running
+        finally:
+            supervisor.shutdown(timeout=5)
+
+    def test_risk_manager_mirrors_worker(self, tmp_path):
+        pytest.importorskip('mt5_sim')
+        from risk_manager import RiskManager
+        supervisor = BotSupervisor(hub=ManualHub(), worker_target=run_engine_worker, monitor_interval=0.05)
+        config = {'symbol': 'XAUUSD', 'magic_number': 4242, 'mt5_backend': 'simulator',
+                  'trading_sessions_enabled': False, 'async_logging': False, 'db_path': str(tmp_path / 'trades.db')}
+        gui_risk = RiskManager(config)
+        try:
+            engine = supervisor.engine_proxy('bot1', 'XAUUSD', config, risk_manager=gui_risk)
+            assert engine.initialize(), supervisor.workers['bot1'].failure
+            assert wait_for(lambda: 'risk' in engine.get_performance_snapshot())
+
+            # GUI trips the breaker: the worker's RiskManager enforces it and reports it back
+            gui_risk.trigger_circuit_breaker('manual')
+            assert engine.push_risk_settings()
+            assert wait_for(lambda: engine.get_performance_snapshot()['risk']['circuit_breaker_triggered'])
+            assert engine.get_performance_snapshot()['risk']['last_circuit_reason'] == 'manual'
+
+            # Worker-side state overwrites the GUI copy
+            gui_risk.circuit_breaker_triggered = False
+            assert wait_for(lambda: gui_risk.circuit_breaker_triggered)
+            engine.stop()
+        finally:
+            supervisor.shutdown(timeout=5)
+
+    def test_ml_models_missing_fails_start(self, tmp_path):
+        pytest.importorskip('mt5_sim')
+        pytest.importorskip('ml_predictor')
+        supervisor = BotSupervisor(hub=ManualHub(), worker_target=run_engine_worker, monitor_interval=0.05)
+        config = {'symbol': 'XAUUSD', 'magic_number': 4242, 'mt5_backend': 'simulator', 'enable_ml': True,
+                  'ml_model_dir': str(tmp_path / 'missing'), 'async_logging': False}
+        try:
+            engine = supervisor.engine_proxy('bot1', 'XAUUSD', config)
+            assert not engine.initialize()
+        finally:
+            supervisor.shutdown(timeout=5)
+
+    def test_engine_reads_ring(self):
+        pytest.importorskip('mt5_sim')
+        hub = ManualHub()
+        supervisor = BotSupervisor(hub=hub, worker_target=run_engine_worker_on_sim, monitor_interval=0.05)
+        config = {'symbol': 'XAUUSD', 'magic_number': 4242, 'trading_sessions_enabled': False,
+                  'async_logging': False}
+        try:
+            engine = supervisor.engine_proxy('bot1', 'XAUUSD', config)
+            assert engine.initialize(), supervisor.workers['bot1'].failure
+            ticks = make_ticks(0, 300)
+            ticks['time_msc'] += time.time() * 1000
+            hub.push(ticks)
+
+            assert wait_for(lambda: engine.get_performance_snapshot().get('ticks_processed', 0) >= 300)
+            engine.stop()
+        finally:
+            supervisor.shutdown(timeout=5)
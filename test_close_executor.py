@@ -0,0 +1,111 @@
+"""
+Unit tests for the parallel close-all executor (runs against the conftest FakeMT5)
+"""
+
+import types
+import pytest
+from close_executor import ParallelCloseExecutor
+
+REQUOTE = 10004
+
+
+def make_positions(n):
+    return [types.SimpleNamespace(ticket=i + 1, type=i % 2, volume=0.01, profit=0.5) for i in range(n)]
+
+
+class TestParallelCloseExecutor:
+    """Concurrency, retries and aggregation"""
+
+    def test_bounded_concurrency(self, fake_mt5):
+        fake_mt5.latency = 0.05
+        executor = ParallelCloseExecutor(mt5_api=fake_mt5, max_workers=3)
+        report = executor.close_all(make_positions(6), 'XAUUSD', 2600.0, 2600.1)
+        executor.shutdown()
+
+        assert len(report.closed) == 6
+        assert fake_mt5.max_in_flight == 3
+        assert report.wall_time_ms < 6 * 50 * 0.6  # two waves instead of six sequential sends
+
+    def test_requests_from_one_snapshot(self, fake_mt5):
+        executor = ParallelCloseExecutor(mt5_api=fake_mt5)
+        executor.close_all(make_positions(4), 'XAUUSD', 2600.0, 2600.1, magic=7, comment='X')
+        executor.shutdown()
+
+        by_ticket = {r["position"]: r for r in fake_mt5.requests}
+        assert by_ticket[1]["price"] == 2600.0 and by_ticket[1]["type"] == fake_mt5.ORDER_TYPE_SELL  # BUY closed at bid
+        assert by_ticket[2]["price"] == 2600.1 and by_ticket[2]["type"] == fake_mt5.ORDER_TYPE_BUY   # SELL closed at ask
+        assert all(r["magic"] == 7 for r in fake_mt5.requests)
+
+    def test_requote_retried_at_fresh_price(self, fake_mt5):
+        fake_mt5.retcodes[1] = [REQUOTE]
+        executor = ParallelCloseExecutor(mt5_api=fake_mt5, quote_fn=lambda symbol: (2599.5, 2599.6))
+        report = executor.close_all(make_positions(1), 'XAUUSD', 2600.0, 2600.1)
+
+        result = report.results[0]
+        assert result.ok and result.attempts == 2
+        assert fake_mt5.requests[-1]["price"] == 2599.5
+        assert report.summary()['retries'] == 1
+
+    def test_requote_reads_terminal_tick(self, fake_mt5):
+        fake_mt5.add_tick(1_000_000, 2599.4, ask=2599.5)
+        fake_mt5.retcodes[2] = [REQUOTE]
+        executor = ParallelCloseExecutor(mt5_api=fake_mt5)
+        report = executor.close_all(make_positions(2)[1:], 'XAUUSD', 2600.0, 2600.1)
+
+        assert report.results[0].ok
+        assert [r["price"] for r in fake_mt5.requests] == [2600.1, 2599.5]  # SELL closed at the new ask
+        assert fake_mt5.calls['symbol_info_tick'] == 1
+
+    def test_requote_without_quote_keeps_price(self, fake_mt5):
+        fake_mt5.retcodes[1] = [REQUOTE]
+        executor = ParallelCloseExecutor(mt5_api=fake_mt5)  # no ticks: symbol_info_tick returns None
+        report = executor.close_all(make_positions(1), 'XAUUSD', 2600.0, 2600.1)
+
+        assert report.results[0].ok and report.results[0].attempts == 2
+        assert fake_mt5.requests[-1]["price"] == 2600.0
+
+    def test_gives_up_after_max_retries(self, fake_mt5):
+        fake_mt5.retcodes[1] = [REQUOTE] * 5
+        executor = ParallelCloseExecutor(mt5_api=fake_mt5, max_retries=2)
+        report = executor.close_all(make_positions(1), 'XAUUSD', 2600.0, 2600.1)
+
+        assert not report.results[0].ok
+        assert report.results[0].attempts == 3
+        assert report.summary()['failed'] == 1
+
+    def test_retcodes_read_from_api(self, fake_mt5):
+        fake_mt5.TRADE_RETCODE_DONE = 1
+        fake_mt5.TRADE_RETCODE_PRICE_CHANGED = 20020
+        fake_mt5.retcodes[1] = [20020]
+        fake_mt5.retcodes[2] = [10020]  # not PRICE_CHANGED for this API: no retry
+        executor = ParallelCloseExecutor(mt5_api=fake_mt5)
+        report = executor.close_all(make_positions(2), 'XAUUSD', 2600.0, 2600.1)
+        executor.shutdown()
+
+        first, second = report.results
+        assert first.ok and first.retcode == 1 and first.attempts == 2
+        assert not second.ok and second.attempts == 1
+
+    def test_slippage_and_summary(self, fake_mt5):
+        fake_mt5.slip = 0.02
+        executor = ParallelCloseExecutor(mt5_api=fake_mt5)
+        report = executor.close_all(make_positions(2), 'XAUUSD', 2600.0, 2600.1)
+        executor.shutdown()
+
+        summary = report.summary()
+        assert summary['closed'] == 2
+        assert summary['slippage_avg'] == pytest.approx(0.02)
+        assert summary['profit'] == pytest.approx(1.0)
+
+    def test_serialized_gateway(self, fake_mt5):
+        fake_mt5.latency = 0.01
+        executor = ParallelCloseExecutor(mt5_api=fake_mt5, max_workers=4, serialize=True)
+        report = executor.close_all(make_positions(4), 'XAUUSD', 2600.0, 2600.1)
+        executor.shutdown()
+
+        assert len(report.closed) == 4
+        assert fake_mt5.max_in_flight == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,59 @@
+"""
+Unit tests for ConfigManager settings the GUI form does not edit
+"""
+
+import pytest
+from config_manager import ConfigManager
+
+
+class TestNonGuiSettings:
+    """Settings loaded from a config file survive a GUI save"""
+
+    def test_simulator_settings_kept(self, tmp_path):
+        manager = ConfigManager(config_dir=str(tmp_path))
+        stored = dict(ConfigManager.DEFAULT_CONFIG, mt5_backend='simulator', sim_latency_ms=3.0,
+                      sim_tick_dir='ticks', symbol='XAUUSD')
+
+        kept = manager.non_gui_settings(stored)
+        assert kept['mt5_backend'] == 'simulator'
+        assert kept['sim_latency_ms'] == 3.0
+        assert kept['sim_tick_dir'] == 'ticks'
+        assert 'symbol' not in kept  # has a GUI field
+
+    def test_deep_copied(self, tmp_path):
+        manager = ConfigManager(config_dir=str(tmp_path))
+        stored = {'sim_extra': [1, 2]}
+        kept = manager.non_gui_settings(stored)
+        kept['sim_extra'].append(3)
+        assert stored['sim_extra'] == [1, 2]
+
+    def test_session_timezone_kept_as_interpreted(self, tmp_path):
+        manager = ConfigManager(config_dir=str(tmp_path))
+        kept = manager.non_gui_settings(manager.create_isolated_config(bot_id='Bot 1'))
+        assert kept['session_timezone'] == 'WIB'  # new bots: the GUI's zone
+        assert kept['trading_days'] == [0, 1, 2, 3, 4, 5, 6]
+
+        kept = manager.non_gui_settings({'symbol': 'XAUUSD'})
+        assert kept['session_timezone'] == 'GMT'  # saved before the key existed
+        assert kept['mt5_backend'] == 'terminal'
+
+        kept = manager.non_gui_settings({'session_timezone': 'UTC+3', 'trading_days': [0, 1, 2, 3, 4]})
+        assert (kept['session_timezone'], kept['trading_days']) == ('UTC+3', [0, 1, 2, 3, 4])
+
+
+class TestMigrateConfig:
+    """Configs saved by older versions"""
+
+    def test_legacy_config_keeps_gmt_sessions(self, tmp_path):
+        manager = ConfigManager(config_dir=str(tmp_path))
+        legacy = {'symbol': 'XAUUSD', 'magic_number': 1, 'london_start': '15:00'}
+        manager.save_config(legacy, 'legacy.json')
+        assert manager.load_config('legacy.json')['session_timezone'] == 'GMT'
+
+        current = manager.create_isolated_config()
+        manager.save_config(current, 'current.json')
+        assert manager.load_config('current.json')['session_timezone'] == 'WIB'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+"""
+Unit tests for the incremental daily deal ledger (runs against the conftest FakeMT5)
+"""
+
+import pytest
+from deal_ledger import DailyDealLedger, SECONDS_PER_DAY
+
+MAGIC = 2026002
+DAY = 20000 * SECONDS_PER_DAY  # some server day, 00:00
+
+
+@pytest.fixture
+def fake(fake_mt5):
+    fake_mt5.magic = MAGIC
+    return fake_mt5
+
+
+class TestDailyDealLedger:
+    """Running stats must equal a full-day scan"""
+
+    def test_running_stats(self, fake):
+        ledger = DailyDealLedger(MAGIC, mt5_api=fake, min_interval=0)
+        fake.add_deal(DAY + 10, entry=0, volume=0.02)
+        fake.add_deal(DAY + 20, profit=1.5, entry=1)
+        fake.add_deal(DAY + 30, profit=-3.0, magic=999)  # other bot
+        ledger.update(DAY + 60)
+
+        fake.add_deal(DAY + 70, entry=0, volume=0.01)
+        fake.add_deal(DAY + 80, profit=-0.5, entry=1)
+        ledger.update(DAY + 90)
+
+        assert ledger.realized_pnl == pytest.approx(1.0)
+        assert ledger.entries == 2
+        assert ledger.entry_volume == pytest.approx(0.03)
+        assert (ledger.wins, ledger.losses) == (1, 1)
+
+    def test_queries_start_at_high_water_mark(self, fake):
+        ledger = DailyDealLedger(MAGIC, mt5_api=fake, min_interval=0)
+        ledger.update(DAY + 5)
+        assert fake.deal_queries[-1][0] == DAY
+
+        fake.add_deal(DAY + 100, profit=1.0)
+        ledger.update(DAY + 120)
+        ledger.update(DAY + 130)
+        assert fake.deal_queries[-1][0] == DAY + 100
+        assert ledger.deals == 1
+
+    def test_same_second_deals_counted_once(self, fake):
+        ledger = DailyDealLedger(MAGIC, mt5_api=fake, min_interval=0)
+        fake.add_deal(DAY + 50, profit=1.0)
+        ledger.update(DAY + 50)
+        fake.add_deal(DAY + 50, profit=2.0)  # lands in the same second after our read
+        ledger.update(DAY + 51)
+        ledger.update(DAY + 52)
+
+        assert ledger.deals == 2
+        assert ledger.realized_pnl == pytest.approx(3.0)
+
+    def test_resets_on_new_server_day(self, fake):
+        ledger = DailyDealLedger(MAGIC, mt5_api=fake, min_interval=0)
+        fake.add_deal(DAY + 100, profit=5.0)
+        ledger.update(DAY + 200)
+        assert ledger.realized_pnl == pytest.approx(5.0)
+
+        ledger.update(DAY + SECONDS_PER_DAY + 1)
+        assert ledger.realized_pnl == 0.0
+        assert fake.deal_queries[-1][0] == DAY + SECONDS_PER_DAY
+
+    def test_min_interval_limits_queries(self, fake):
+        ledger = DailyDealLedger(MAGIC, mt5_api=fake, min_interval=60)
+        for _ in range(5):
+            ledger.update(DAY + 10)
+        assert ledger.api_calls == 1
+        ledger.update(DAY + 10, force=True)
+        assert ledger.api_calls == 2
+
+    def test_history_failure_keeps_stats(self, fake):
+        ledger = DailyDealLedger(MAGIC, mt5_api=fake, min_interval=0)
+        fake.add_deal(DAY + 10, profit=1.0)
+        ledger.update(DAY + 20)
+        fake.failing.add('history_deals_get')
+        assert not ledger.update(DAY + 30)
+        assert ledger.realized_pnl == pytest.approx(1.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
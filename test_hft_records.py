@@ -0,0 +1,42 @@
+"""
+Unit tests for the slotted tick / order flow / signal records
+"""
+
+import pickle
+
+import pytest
+
+from hft_records import TickData, OrderFlowData, Signal, buffer_bytes_per_record
+
+
+class TestRecords:
+    def test_tick_fields_and_mid_price(self):
+        tick = TickData(timestamp=1.5, bid=2600.0, ask=2600.2, last=2600.1, volume=3, spread=0.2)
+        assert (tick.bid, tick.ask, tick.volume) == (2600.0, 2600.2, 3)
+        assert tick.mid_price == pytest.approx(2600.1)
+        tick.bid = 2601.0  # mid follows the quote
+        assert tick.mid_price == pytest.approx(2600.6)
+        assert tick == TickData(1.5, 2601.0, 2600.2, 2600.1, 3, 0.2)
+
+    def test_no_instance_dict(self):
+        flow = OrderFlowData(1.0, 2.0, 0.0, 2.0, 10.0, 1.0)
+        assert not hasattr(flow, '__dict__')
+        with pytest.raises(AttributeError):
+            flow.extra = 1
+
+    def test_signal_ordering_and_pickle(self):
+        early = Signal(1.0, 'BUY', 0.7, 2600.0, 2599.0, 2602.0, 0.01, 'test')
+        late = Signal(2.0, 'SELL', 0.8, 2600.0, 2601.0, 2598.0, 0.01, 'test')
+        assert sorted([late, early]) == [early, late]
+        assert pickle.loads(pickle.dumps(early)) == early
+
+    def test_slotted_records_are_smaller(self):
+        class DictTick:
+            def __init__(self, i):
+                self.timestamp, self.bid, self.ask = i * 0.1, 2600.0 + i, 2600.1 + i
+                self.last, self.volume, self.spread = 2600.05 + i, 1, 0.1 + i * 1e-9
+                self.mid_price = (self.bid + self.ask) / 2
+
+        slotted = buffer_bytes_per_record(lambda i: TickData(i * 0.1, 2600.0 + i, 2600.1 + i, 2600.05 + i, 1,
+                                                             0.1 + i * 1e-9), 2000)
+        assert slotted < buffer_bytes_per_record(DictTick, 2000)
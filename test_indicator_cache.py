@@ -0,0 +1,81 @@
+"""
+Unit tests for the sweep-wide indicator cache
+"""
+
+import sys
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicator_cache import IndicatorCache, config_indicators, fingerprint, sweep_indicators
+
+
+def bars(n=2000, seed=4):
+    rng = np.random.default_rng(seed)
+    close = 2000.0 + np.cumsum(rng.normal(0, 0.3, n))
+    return pd.DataFrame({
+        'time': pd.to_datetime(1704067200 + np.arange(n) * 60, unit='s'),
+        'open': close, 'high': close + 0.2, 'low': close - 0.2, 'close': close,
+        'volume': np.ones(n),
+    })
+
+
+@pytest.fixture(scope='module')
+def backtester_cls():
+    mt5_sim = pytest.importorskip('mt5_sim')
+    patched = 'MetaTrader5' not in sys.modules
+    if patched:
+        sys.modules['MetaTrader5'] = mt5_sim.SimulatedTerminal.from_config({'symbol': 'XAUUSD'})
+    try:
+        yield pytest.importorskip('strategy_backtester').StrategyBacktester
+    finally:
+        if patched:
+            sys.modules.pop('MetaTrader5', None)
+
+
+class TestIndicatorCache:
+    def test_fingerprint_follows_content(self):
+        data = bars()
+        key = fingerprint(data)
+        assert fingerprint(data.copy()) == key  # carried in attrs
+        assert fingerprint(bars()) == key
+        changed = bars()
+        changed.loc[10, 'close'] += 0.01
+        assert fingerprint(changed) != key
+
+    def test_series_computed_once_and_read_only(self):
+        cache, data = IndicatorCache(), bars()
+        first = cache.get(data, 'rsi', 7)
+        again = cache.get(data.copy(), 'rsi', 7)
+        assert again is first and not first.flags.writeable
+        assert cache.get_stats()['hits'] == 1 and cache.get_stats()['misses'] == 1
+        assert cache.get(bars(seed=5), 'rsi', 7) is not first  # other dataset, own entry
+
+    def test_lru_bound(self):
+        cache, data = IndicatorCache(max_entries=2), bars()
+        ema5 = cache.get(data, 'ema', 5)
+        cache.get(data, 'ema', 7)
+        cache.get(data, 'ema', 5)
+        cache.get(data, 'ema', 9)  # evicts ema 7
+        assert len(cache) == 2 and cache.get(data, 'ema', 5) is ema5
+        assert cache.misses == 3
+
+    def test_fast_optimize_grid_needs_few_series(self):
+        grid = [{'ema_fast_period': f, 'ema_slow_period': s, 'rsi_period': r, 'atr_period': a}
+                for f, s, r, a in product([5, 7, 9], [15, 21, 28], [7, 14], [10, 14])]
+        keys = sweep_indicators(grid + [{'rsi_period': 0}])
+        assert len(keys) == 12  # 6 EMAs, 2 RSI, 2 ATR, momentum 5, volatility 20
+        assert ('rsi', 0) not in keys and ('volatility', 20) in keys
+        assert [c for c, _, _ in config_indicators({})] == ['ema_fast', 'ema_slow', 'rsi', 'atr',
+                                                            'momentum', 'volatility']
+
+    def test_backtester_indicators_unchanged(self, backtester_cls):
+        config = {'symbol': 'EURUSD', 'magic_number': 1, 'default_volume': 0.01, 'ema_fast_period': 5, 'rsi_period': 14}
+        cache = IndicatorCache()
+        expected = backtester_cls(config).calculate_indicators(bars())
+        for _ in range(2):
+            actual = backtester_cls(config, indicator_cache=cache).calculate_indicators(bars())
+            pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+        assert cache.hits == 6
@@ -0,0 +1,95 @@
+"""
+Unit tests for the per-stage latency histograms
+"""
+
+import json
+import random
+import time
+import pytest
+from latency_histogram import LatencyHistogram, StageLatencies
+
+
+class TestLatencyHistogram:
+    """Test bucket recording and percentile queries"""
+
+    def test_small_values_exact(self):
+        h = LatencyHistogram()
+        for v in range(1, 11):
+            h.record_us(v)
+
+        p = h.percentiles((50.0, 90.0, 100.0))
+        assert p[50.0] == 5.0
+        assert p[90.0] == 9.0
+        assert p[100.0] == 10.0
+        assert h.count == 10
+        assert h.mean_us == pytest.approx(5.5)
+
+    def test_percentiles_close_to_exact(self):
+        rng = random.Random(7)
+        samples = [rng.lognormvariate(5.0, 1.2) for _ in range(50000)]
+        h = LatencyHistogram()
+        for s in samples:
+            h.record_us(s)
+
+        exact = sorted(samples)
+        summary = h.summary()
+        for p, key in ((50.0, 'p50_us'), (90.0, 'p90_us'), (99.0, 'p99_us'), (99.9, 'p99_9_us')):
+            true = exact[int(p / 100.0 * len(exact)) - 1]
+            assert summary[key] == pytest.approx(true, rel=0.07)
+        assert summary['max_us'] == max(samples)
+        assert summary['min_us'] == min(samples)
+
+    def test_percentile_never_exceeds_max(self):
+        h = LatencyHistogram()
+        h.record_us(1000.4)
+        assert h.percentiles()[99.9] == pytest.approx(1000.4)
+
+    def test_empty_and_reset(self):
+        h = LatencyHistogram()
+        assert h.summary()['p99_us'] == 0.0
+        assert h.summary()['min_us'] == 0.0
+
+        h.record_seconds(0.002)
+        assert h.summary()['p50_us'] == pytest.approx(2000, rel=0.05)
+        h.reset()
+        assert h.count == 0
+        assert h.summary()['max_us'] == 0.0
+
+    def test_huge_values_clamped(self):
+        h = LatencyHistogram()
+        h.record_us(1e15)
+        h.record_us(-5)
+        assert h.count == 2
+        assert h.summary()['max_us'] == 1e15
+
+
+class TestStageLatencies:
+    """Test named stage recording and JSON dump"""
+
+    def test_declared_stages_reported_when_empty(self):
+        stages = StageLatencies(('fetch', 'send'))
+        snapshot = stages.snapshot()
+        assert list(snapshot) == ['fetch', 'send']
+        assert snapshot['fetch']['count'] == 0
+
+    def test_record_and_measure(self):
+        stages = StageLatencies()
+        stages.record('fetch', 0.000150)
+        with stages.measure('sleep'):
+            time.sleep(0.002)
+
+        snapshot = stages.snapshot()
+        assert 'fetch' in stages and 'sleep' in stages
+        assert snapshot['fetch']['p50_us'] == pytest.approx(150, rel=0.05)
+        assert snapshot['sleep']['max_us'] >= 2000
+
+    def test_dump_json(self, tmp_path):
+        stages = StageLatencies(('fetch',))
+        stages.record('fetch', 0.0001)
+        path = stages.dump_json(str(tmp_path / 'latency.json'), extra={'symbol': 'XAUUSD'})
+
+        with open(path) as f:
+            data = json.load(f)
+        assert data['symbol'] == 'XAUUSD'
+        assert data['unit'] == 'us'
+        assert data['stages']['fetch']['count'] == 1
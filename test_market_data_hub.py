@@ -0,0 +1,154 @@
+"""
+Unit tests for the shared market data hub (runs against the conftest FakeMT5)
+"""
+
+import threading
+
+import pytest
+from market_data_hub import MarketDataHub
+
+
+@pytest.fixture
+def fake(fake_mt5):
+    fake_mt5.add_tick(1_000_000, 2600.0)
+    return fake_mt5
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, ticks, fetch_us):
+        self.batches.append((ticks, fetch_us))
+
+
+class TestMarketDataHub:
+    """One collector per symbol, fanned out to every subscriber"""
+
+    def test_one_fetch_feeds_every_subscriber(self, fake):
+        hub = MarketDataHub(mt5_api=fake)
+        a, b = Recorder(), Recorder()
+        hub.subscribe('XAUUSD', a, start=False)
+        hub.subscribe('XAUUSD', b, start=False)
+        feed = hub.feed('XAUUSD')
+
+        feed.poll_once()
+        fake.add_tick(1_000_010, 2600.5)
+        fake.add_tick(1_000_020, 2600.7)
+        fake.calls.clear()
+        assert feed.poll_once() == 2
+        assert feed.wait_delivered()
+
+        assert fake.calls == {'copy_ticks_from': 1}
+        assert a.batches[-1][0] is b.batches[-1][0]
+        assert not a.batches[-1][0].flags.writeable
+        assert a.batches[-1][1] is not None
+
+    def test_reference_counting(self, fake):
+        hub = MarketDataHub(mt5_api=fake, max_interval=0.01)
+        first = hub.subscribe('XAUUSD', Recorder())
+        second = hub.subscribe('XAUUSD', Recorder())
+        feed = hub.feed('XAUUSD')
+        assert hub.subscriber_count('XAUUSD') == 2
+
+        hub.unsubscribe(first)
+        assert hub.feed('XAUUSD') is feed
+        assert feed._thread is not None
+
+        hub.unsubscribe(second)
+        assert hub.feed('XAUUSD') is None
+        assert feed._thread is None
+        assert hub.subscriber_count('XAUUSD') == 0
+
+    def test_late_subscriber_gets_history(self, fake):
+        hub = MarketDataHub(mt5_api=fake, history=2)
+        hub.subscribe('XAUUSD', Recorder(), start=False)
+        feed = hub.feed('XAUUSD')
+        feed.poll_once()
+        for i in range(1, 4):
+            fake.add_tick(1_000_000 + i * 10, 2600.0 + i)
+            feed.poll_once()
+
+        late = Recorder()
+        hub.subscribe('XAUUSD', late, start=False)
+        assert feed.wait_delivered()
+        replayed = [int(t['time_msc'][0]) for t, _ in late.batches]
+        assert replayed == [1_000_020, 1_000_030]
+        assert all(fetch_us is None for _, fetch_us in late.batches)
+
+    def test_failing_subscriber_isolated(self, fake):
+        hub = MarketDataHub(mt5_api=fake)
+
+        def broken(ticks, fetch_us):
+            raise RuntimeError("boom")
+
+        good = Recorder()
+        hub.subscribe('XAUUSD', broken, start=False)
+        hub.subscribe('XAUUSD', good, start=False)
+        hub.feed('XAUUSD').poll_once()
+        assert hub.feed('XAUUSD').wait_delivered()
+
+        assert len(good.batches) == 1
+        assert hub.get_stats()['XAUUSD']['callback_errors'] == 1
+
+    def test_fallback_to_current_tick(self, fake):
+        hub = MarketDataHub(mt5_api=fake)
+        recorder = Recorder()
+        hub.subscribe('XAUUSD', recorder, start=False)
+        feed = hub.feed('XAUUSD')
+        feed.poll_once()
+
+        fake.failing.add('copy_ticks_from')
+        fake.add_tick(1_000_010, 2600.5)
+        assert feed.poll_once() == 1
+        assert feed.wait_delivered()
+        assert recorder.batches[-1][0]['time_msc'].tolist() == [1_000_010]
+        assert feed.get_stats()['fallback_polls'] == 1
+
+    def test_slow_subscriber_does_not_delay_others(self, fake):
+        hub = MarketDataHub(mt5_api=fake)
+        release = threading.Event()
+        fast = Recorder()
+        hub.subscribe('XAUUSD', lambda ticks, fetch_us: release.wait(5), start=False)
+        hub.subscribe('XAUUSD', fast, start=False)
+        feed = hub.feed('XAUUSD')
+
+        for i in range(3):
+            fake.add_tick(1_000_000 + (i + 1) * 10, 2600.0 + i)
+            feed.poll_once()  # returns while the slow subscriber is still blocked
+        assert not feed.wait_delivered(timeout=0.2)
+        assert len(fast.batches) == 3
+
+        release.set()
+        assert feed.wait_delivered()
+        assert feed.get_stats()['deliveries'] == 6
+
+
+class TestEngineSharedFeed:
+    """Engines on one symbol ingest from the same feed"""
+
+    def test_engines_share_one_collector(self, fake_core, fake):
+        hub = MarketDataHub(mt5_api=fake)
+        keeper = hub.subscribe('XAUUSD', Recorder(), start=False)
+        engines = [fake_core.UltraLowLatencyEngine('XAUUSD', {'magic_number': 100 + i}) for i in range(3)]
+        assert all(e.tick_fetcher is None for e in engines)
+        for e in engines:
+            e.attach_market_data(hub)
+
+        feed = hub.feed('XAUUSD')
+        feed.poll_once()
+        for i in range(1, 6):
+            fake.add_tick(1_000_000 + i * 10, 2600.0 + i)
+        fake.calls.clear()
+        feed.poll_once()
+        assert feed.wait_delivered()
+
+        assert fake.calls == {'copy_ticks_from': 1}
+        for e in engines:
+            assert len(e.tick_buffer) == 6
+            assert e.latency['tick_fetch'].count == 2
+
+        for e in engines:
+            e.detach_market_data()
+        assert hub.subscriber_count('XAUUSD') == 1
+        hub.unsubscribe(keeper)
@@ -0,0 +1,183 @@
+"""
+Unit tests for the pure-Python MetaTrader5 simulator
+"""
+
+import sys
+import types
+from datetime import datetime
+
+import pytest
+import numpy as np
+
+import mt5_sim
+from mt5_sim import SimulatedTerminal, TickFeed, TICK_DTYPE
+
+T0 = 1728032400  # 2024-10-04 09:00 UTC
+
+
+class Clock:
+    def __init__(self, now=T0):
+        self.now = float(now)
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def make_ticks(bids, step_ms=1000, spread=0.1):
+    ticks = np.zeros(len(bids), dtype=TICK_DTYPE)
+    ticks['time_msc'] = T0 * 1000 + np.arange(len(bids)) * step_ms
+    ticks['time'] = ticks['time_msc'] // 1000
+    ticks['bid'] = bids
+    ticks['ask'] = np.asarray(bids) + spread
+    ticks['last'] = bids
+    ticks['volume'] = 1
+    return ticks
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def terminal_with(clock, bids, **kwargs):
+    terminal = SimulatedTerminal(clock=clock, sleep=clock.sleep, **kwargs)
+    terminal.add_symbol('XAUUSD', TickFeed(make_ticks(bids)))
+    terminal.initialize()
+    return terminal
+
+
+def buy(terminal, volume=0.01, sl=0.0, tp=0.0, magic=1):
+    return terminal.order_send({'action': terminal.TRADE_ACTION_DEAL, 'symbol': 'XAUUSD', 'volume': volume,
+                                'type': terminal.ORDER_TYPE_BUY, 'sl': sl, 'tp': tp, 'magic': magic})
+
+
+class TestMarketData:
+    """Ticks and bars only up to the clock"""
+
+    def test_clock_reveals_ticks(self, clock):
+        terminal = terminal_with(clock, [2600.0, 2601.0, 2602.0, 2603.0])
+        assert terminal.symbol_info_tick('XAUUSD').bid == 2600.0
+
+        clock.now += 2
+        ticks = terminal.copy_ticks_from('XAUUSD', T0, 100, terminal.COPY_TICKS_ALL)
+        assert ticks['bid'].tolist() == [2600.0, 2601.0, 2602.0]
+        assert ticks.dtype == TICK_DTYPE
+        assert terminal.symbol_info_tick('XAUUSD').time_msc == (T0 + 2) * 1000
+
+    def test_rates_from_ticks(self, clock):
+        terminal = terminal_with(clock, [2600.0, 2605.0, 2598.0, 2601.0] * 30)  # 2 minutes of 1 s ticks
+        clock.now += 119
+        rates = terminal.copy_rates_range('XAUUSD', terminal.TIMEFRAME_M1, datetime.utcfromtimestamp(T0),
+                                          datetime.utcfromtimestamp(T0 + 3600))
+        assert rates['time'].tolist() == [T0, T0 + 60]
+        assert rates['open'][0] == 2600.0 and rates['high'][0] == 2605.0 and rates['low'][0] == 2598.0
+        assert rates['tick_volume'].tolist() == [60, 60]
+        assert len(terminal.copy_rates_from_pos('XAUUSD', terminal.TIMEFRAME_M1, 0, 1)) == 1
+
+    def test_fixed_spread_and_unknown_symbol(self, clock):
+        terminal = terminal_with(clock, [2600.0], spread_points=25)
+        assert terminal.symbol_info_tick('XAUUSD').ask == pytest.approx(2600.25)
+        assert terminal.symbol_info('XAUUSD').spread == 25
+        assert terminal.symbol_info('EURUSD') is None
+        assert terminal.last_error()[0] == terminal.RES_E_NOT_FOUND
+
+    def test_synthetic_feed_is_seeded(self, clock):
+        a = SimulatedTerminal.from_config({'symbol': 'XAUUSD', 'sim_seed': 4})
+        b = SimulatedTerminal.from_config({'symbol': 'XAUUSD', 'sim_seed': 4})
+        a.initialize(), b.initialize()
+        assert len(a.feeds['XAUUSD'].visible()) > 1000  # a day of history
+        n = min(a.feeds['XAUUSD'].cursor, b.feeds['XAUUSD'].cursor)
+        assert np.array_equal(a.feeds['XAUUSD'].ticks['bid'][:n], b.feeds['XAUUSD'].ticks['bid'][:n])
+
+
+class TestExecution:
+    """Fills, SL/TP, latency and injected failures"""
+
+    def test_sl_fires_at_crossing_tick_without_polling(self, clock):
+        terminal = terminal_with(clock, [2600.0, 2599.0, 2594.0, 2610.0])
+        result = buy(terminal, sl=2595.0, tp=2620.0)
+        assert result.retcode == terminal.TRADE_RETCODE_DONE and result.price == pytest.approx(2600.1)
+
+        clock.now += 3  # both the SL tick and the later rally happen before the next call
+        assert terminal.positions_get() == ()
+        deal = terminal.history_deals_get(T0, T0 + 10)[-1]
+        assert (deal.reason, deal.price, deal.time) == (terminal.DEAL_REASON_SL, 2594.0, T0 + 2)
+        assert deal.profit == pytest.approx((2594.0 - 2600.1) * 0.01 * 100)
+        assert terminal.account_info().balance == pytest.approx(10000.0 + deal.profit)
+
+    def test_latency_moves_the_market(self, clock):
+        terminal = terminal_with(clock, [2600.0, 2601.0, 2602.0], latency_ms=1000)
+        result = buy(terminal)
+        assert clock.slept == [1.0]
+        assert result.price == pytest.approx(2601.1)  # filled at the quote after the delay
+
+    def test_requote_and_reject(self, clock):
+        terminal = terminal_with(clock, [2600.0], requote_rate=1.0)
+        result = buy(terminal)
+        assert result.retcode == terminal.TRADE_RETCODE_REQUOTE and result.bid == 2600.0
+        terminal.requote_rate, terminal.reject_rate = 0.0, 1.0
+        assert buy(terminal).retcode == terminal.TRADE_RETCODE_REJECT
+        assert not terminal.positions
+
+    def test_order_validation(self, clock):
+        terminal = terminal_with(clock, [2600.0], balance=100.0)
+        assert buy(terminal, volume=0.015).retcode == terminal.TRADE_RETCODE_INVALID_VOLUME
+        assert buy(terminal, sl=2601.0).retcode == terminal.TRADE_RETCODE_INVALID_STOPS
+        assert buy(terminal, volume=1.0).retcode == terminal.TRADE_RETCODE_NO_MONEY
+        result = terminal.order_send({'action': terminal.TRADE_ACTION_DEAL, 'position': 999, 'volume': 0.01})
+        assert result.retcode == terminal.TRADE_RETCODE_POSITION_CLOSED
+
+
+class TestInstall:
+    """Config-selected backend swapped in for `import MetaTrader5`"""
+
+    def test_install_rebinds_and_uninstall_restores(self, monkeypatch):
+        real = types.ModuleType('MetaTrader5')
+        client = types.ModuleType('mt5_client')
+        client.mt5 = real
+        monkeypatch.setitem(sys.modules, 'MetaTrader5', real)
+        monkeypatch.setitem(sys.modules, 'mt5_client', client)
+
+        terminal = mt5_sim.install_from_config({'mt5_backend': 'simulator', 'symbol': 'GOLD.ls'})
+        assert sys.modules['MetaTrader5'] is terminal and client.mt5 is terminal
+        assert 'GOLD.ls' in terminal.specs
+        assert mt5_sim.install_from_config({'mt5_backend': 'simulator', 'symbol': 'XAUUSD'}) is terminal
+        assert set(terminal.specs) == {'GOLD.ls', 'XAUUSD'}
+
+        mt5_sim.uninstall()
+        assert sys.modules['MetaTrader5'] is real and client.mt5 is real
+        assert mt5_sim.install_from_config({'mt5_backend': 'terminal'}) is None
+
+
+class TestEngineOnSimulator:
+    """UltraLowLatencyEngine running against the simulator"""
+
+    @pytest.fixture
+    def engine(self, clock, monkeypatch):
+        terminal = terminal_with(clock, [2600.0, 2601.0, 2602.0], requote_rate=0.3, seed=1)
+        if 'MetaTrader5' not in sys.modules:
+            monkeypatch.setitem(sys.modules, 'MetaTrader5', terminal)
+        core = pytest.importorskip('aventa_hft_core')
+        monkeypatch.setattr(core, 'mt5', terminal)
+        monkeypatch.setattr(sys.modules['account_cache'], 'mt5', terminal)
+        engine = core.UltraLowLatencyEngine('XAUUSD', {'magic_number': 77, 'close_all_retries': 5})
+        assert engine.initialize()
+        yield engine, terminal
+        engine.close_executor.shutdown()
+
+    def test_close_all_through_requotes(self, engine):
+        engine, terminal = engine
+        terminal.requote_rate = 0.0
+        for _ in range(5):
+            assert buy(terminal, magic=77).retcode == terminal.TRADE_RETCODE_DONE
+        buy(terminal, magic=78)  # another bot's position stays open
+        terminal.requote_rate = 0.3
+
+        assert engine.close_all_positions("test") == 5
+        assert [p.magic for p in terminal.positions_get()] == [78]
+        assert terminal.requotes > 0
@@ -0,0 +1,137 @@
+"""
+Unit tests for the process-pool parameter optimizer
+"""
+
+import sys
+import types
+from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(scope='module')
+def modules():
+    mt5_sim = pytest.importorskip('mt5_sim')
+    patched = 'MetaTrader5' not in sys.modules
+    if patched:
+        sys.modules['MetaTrader5'] = mt5_sim.SimulatedTerminal.from_config({'symbol': 'XAUUSD'})
+    try:
+        yield pytest.importorskip('parallel_optimizer'), pytest.importorskip('strategy_backtester')
+    finally:
+        if patched:
+            sys.modules.pop('MetaTrader5', None)
+
+
+def bars(n=3000, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 2000.0 + np.cumsum(rng.normal(0, 0.3, n))
+    return pd.DataFrame({
+        'time': pd.to_datetime(1704067200 + np.arange(n) * 60, unit='s'),
+        'open': close, 'high': close + 0.2, 'low': close - 0.2, 'close': close,
+        'tick_volume': rng.integers(1, 50, n).astype(np.uint64), 'spread': rng.integers(0, 30, n).astype(np.int32),
+        'volume': rng.integers(1, 50, n).astype(float),
+    })
+
+
+def configs(count=6):
+    periods = [(5, 15), (7, 21), (9, 28), (5, 28), (7, 15), (9, 21)][:count]
+    return [{'symbol': 'XAUUSD', 'magic_number': 1, 'default_volume': 0.01, 'ema_fast_period': fast,
+             'ema_slow_period': slow, 'max_floating_profit': 2.0, 'max_floating_loss': 2.0}
+            for fast, slow in periods]
+
+
+class TestParallelOptimizer:
+    def test_pool_matches_in_process_and_direct_backtest(self, modules):
+        parallel_optimizer, strategy_backtester = modules
+        data = bars()
+        sequential = parallel_optimizer.ParallelOptimizer(data, 1000, symbol_ask=2000.0, workers=1,
+                                                          cache_indicators=False, batch_size=1)
+        pooled = parallel_optimizer.ParallelOptimizer(data, 1000, symbol_ask=2000.0, workers=2)
+        expected = sequential.run_all(configs())
+        assert pooled.run_all(configs()) == expected
+        cached = parallel_optimizer.ParallelOptimizer(data, 1000, symbol_ask=2000.0, workers=1, batch_size=1)
+        assert cached.run_all(configs()) == expected
+        assert cached.indicator_cache.get_stats()['misses'] == 10  # 6 EMAs + RSI, ATR, momentum, volatility
+        assert all(r and r['total_trades'] > 0 for r in expected)
+        assert 'trades' not in expected[0] and 'equity_curve' not in expected[0]
+
+        direct = strategy_backtester.StrategyBacktester(configs()[2], initial_balance=1000)
+        direct._apply_symbol_info(types.SimpleNamespace(ask=2000.0))
+        results = direct.run_on_bars(data.copy())
+        assert {k: v for k, v in results.items() if k not in ('trades', 'equity_curve')} == expected[2]
+
+    @pytest.mark.parametrize('jit', [True, False])
+    def test_batch_matches_per_config(self, modules, jit):
+        parallel_optimizer, _ = modules
+        data = bars(2500, seed=3)
+        sweep = [{**config, 'backtest_jit': jit, 'tp_mode': mode, 'sl_multiplier': sl, 'commission_per_trade': fee}
+                 for config in configs(3) for mode, sl, fee in (('FixedDollar', 50.0, 0.0), ('RiskReward', 2.0, 0.05))]
+        sweep.insert(2, {**sweep[0], 'ema_fast_period': 30})  # fast >= slow: rejected like run_on_bars does
+        single = parallel_optimizer.ParallelOptimizer(data, 800, symbol_ask=2000.0, workers=1, batch_size=1)
+        batched = parallel_optimizer.ParallelOptimizer(data, 800, symbol_ask=2000.0, workers=1, batch_size=4)
+        expected = single.run_all(sweep)
+        assert expected[2] is None and sum(r is not None for r in expected) == 6
+        assert batched.run_all(sweep) == expected
+        assert parallel_optimizer.ParallelOptimizer(data, 800, symbol_ask=2000.0, workers=2).run_all(sweep) == expected
+
+    def test_streams_every_index_once(self, modules):
+        parallel_optimizer, _ = modules
+        optimizer = parallel_optimizer.ParallelOptimizer(bars(1000), workers=2)
+        broken = configs(3) + [{'symbol': 'XAUUSD'}]  # no magic_number: config validation fails
+        seen = [index for index, _ in optimizer.run(broken)]
+        assert sorted(seen) == [0, 1, 2, 3]
+        assert optimizer.completed == 4 and optimizer.failed == 1
+
+    def test_cancel_stops_and_releases_shared_memory(self, modules, monkeypatch):
+        parallel_optimizer, _ = modules
+        names = []
+        original = parallel_optimizer.ParallelOptimizer._share
+
+        def share(self, configs):
+            shm, layout = original(self, configs)
+            names.append(shm.name)
+            return shm, layout
+
+        monkeypatch.setattr(parallel_optimizer.ParallelOptimizer, '_share', share)
+        optimizer = parallel_optimizer.ParallelOptimizer(bars(1000), workers=2)
+        received = []
+        for item in optimizer.run(configs() * 4, cancel_check=lambda: len(received) >= 1):
+            received.append(item)
+        assert optimizer.cancelled and 1 <= len(received) < 24
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=names[0])
+
+    @pytest.mark.parametrize('info', [types.SimpleNamespace(ask=2000.0), None])
+    def test_load_fetches_bars_once(self, modules, monkeypatch, tmp_path, info):
+        parallel_optimizer, strategy_backtester = modules
+        data = bars(5000)
+        rates = np.zeros(len(data), dtype=[('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                                           ('close', '<f8'), ('tick_volume', '<u8'), ('spread', '<i4')])
+        for name in rates.dtype.names:
+            rates[name] = data['time'].astype('int64') // 10**9 if name == 'time' else data[name]
+        calls = []
+
+        def copy_rates_range(symbol, timeframe, date_from, date_to):
+            calls.append(symbol)
+            return rates
+
+        fake = types.SimpleNamespace(
+            terminal_info=lambda: True, initialize=lambda: True, shutdown=lambda: None, TIMEFRAME_M1=1,
+            symbol_info=lambda s: info,
+            symbols_get=lambda: [types.SimpleNamespace(name='XAUUSD')], copy_rates_range=copy_rates_range)
+        monkeypatch.setattr(strategy_backtester, 'mt5', fake)
+        config = {**configs()[0], 'bar_cache_enabled': False, 'optimizer_workers': 2}
+        optimizer = parallel_optimizer.ParallelOptimizer.load(config, datetime(2024, 1, 1), datetime(2024, 1, 5),
+                                                              initial_balance=1000)
+        assert optimizer.workers == 2 and optimizer.symbol_ask == getattr(info, 'ask', None)
+        results = optimizer.run_all(configs())
+        assert calls == ['XAUUSD']
+
+        backtester = strategy_backtester.StrategyBacktester({**configs()[1], 'bar_cache_enabled': False},
+                                                            initial_balance=1000)
+        expected = backtester.run_backtest(datetime(2024, 1, 1), datetime(2024, 1, 5))
+        assert expected['total_pnl'] == results[1]['total_pnl']  # same pip value, with or without symbol info
+        assert expected['total_trades'] == results[1]['total_trades']
@@ -0,0 +1,85 @@
+"""
+Unit tests for the per-cycle position book (runs against the conftest FakeMT5)
+"""
+
+import pytest
+from position_book import PositionBook
+
+MAGIC = 2026002
+
+
+@pytest.fixture
+def fake(fake_mt5):
+    fake_mt5.magic = MAGIC
+    fake_mt5.add_position(1, profit=1.5, volume=0.02)
+    fake_mt5.add_position(2, type=1, profit=-0.7, volume=0.01)
+    fake_mt5.add_position(3, magic=999, profit=-2.0, volume=0.05)
+    return fake_mt5
+
+
+class TestPositionBook:
+    """Snapshot queries are served from memory"""
+
+    def test_queries_share_one_snapshot(self, fake):
+        book = PositionBook('XAUUSD', MAGIC, mt5_api=fake, max_age=60)
+        book.refresh()
+
+        assert book.count() == 2
+        assert book.count(magic=None) == 3
+        assert book.exists()
+        assert book.floating_pnl() == pytest.approx(0.8)
+        assert book.floating_loss() == pytest.approx(0.7)
+        assert book.floating_pnl(magic=None) == pytest.approx(-1.2)
+        assert book.total_volume() == pytest.approx(0.03)
+        assert book.net_exposure() == pytest.approx(0.01)
+        assert book.get(3).magic == 999
+        assert book.first().ticket == 1
+        assert fake.calls['positions_get'] == 1
+
+    def test_invalidate_refetches(self, fake):
+        book = PositionBook('XAUUSD', MAGIC, mt5_api=fake, max_age=60)
+        assert book.count() == 2
+        fake.open_positions.pop(0)
+        assert book.count() == 2  # still the cached snapshot
+
+        book.invalidate()
+        assert book.count() == 1
+        assert fake.calls['positions_get'] == 2
+
+    def test_stale_snapshot_refetched(self, fake):
+        book = PositionBook('XAUUSD', MAGIC, mt5_api=fake, max_age=0.0)
+        book.count()
+        book.count()
+        assert fake.calls['positions_get'] == 2
+
+    def test_api_failure_reads_as_empty(self, fake):
+        fake.failing.add('positions_get')
+        book = PositionBook('XAUUSD', MAGIC, mt5_api=fake)
+        assert not book.refresh().ok
+        assert not book.exists()
+        assert book.floating_pnl() == 0.0
+
+
+class TestEnginePositionChecks:
+    """Engine position helpers make one positions_get per cycle"""
+
+    @pytest.fixture
+    def engine(self, fake_core, fake):
+        return fake_core.UltraLowLatencyEngine('XAUUSD', {'magic_number': MAGIC, 'commission_per_trade': 0.1})
+
+    def test_one_round_trip_per_cycle(self, engine, fake):
+        engine.position_book.refresh()
+        fake.calls.clear()
+
+        assert engine.verify_position_exists()
+        assert engine.get_total_floating_loss() == pytest.approx(0.7)
+        assert engine.get_total_floating_profit() == pytest.approx(0.6)
+        assert engine.get_floating_pnl() == pytest.approx(-1.2)
+        assert engine.get_current_positions_count() == 3
+        assert engine.get_total_position_volume() == pytest.approx(0.08)
+        assert engine.get_current_position_info() == ("BUY", 0.02)
+        assert fake.calls['positions_get'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
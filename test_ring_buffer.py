@@ -0,0 +1,84 @@
+"""
+Unit tests for column ring buffers
+"""
+
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from ring_buffer import ColumnRingBuffer, TickRingBuffer, OrderFlowRingBuffer
+
+
+class TestTickRingBuffer:
+    """Test tick storage and windows"""
+
+    def test_push_derives_spread_and_mid(self):
+        buf = TickRingBuffer(capacity=8)
+        buf.push(1.0, 100.0, 100.2, 100.1, 5)
+
+        assert len(buf) == 1
+        assert buf.latest('spread') == pytest.approx(0.2)
+        assert buf.latest('mid') == pytest.approx(100.1)
+
+    def test_window_matches_last_n_after_wraparound(self):
+        buf = TickRingBuffer(capacity=10)
+        for i in range(27):
+            buf.push(float(i), float(i), float(i) + 1.0, float(i), 1)
+
+        assert len(buf) == 10
+        window = buf.window(5)
+        np.testing.assert_array_equal(window.timestamp, [22, 23, 24, 25, 26])
+        np.testing.assert_array_equal(buf.column('bid'), np.arange(17, 27))
+
+    def test_window_is_zero_copy_view(self):
+        buf = TickRingBuffer(capacity=16)
+        for i in range(20):
+            buf.push(float(i), 1.0, 2.0, 1.5, 1)
+
+        window = buf.window(4)
+        assert window.mid.base is not None
+        assert not window.mid.flags['OWNDATA']
+
+    def test_append_accepts_tick_objects(self):
+        buf = TickRingBuffer(capacity=4)
+        buf.append(SimpleNamespace(timestamp=1.0, bid=10.0, ask=10.5, last=10.2, volume=3))
+
+        assert buf.latest('ask') == 10.5
+        assert buf.latest('volume') == 3
+
+    def test_extend_ticks_batch_wraps(self):
+        buf = TickRingBuffer(capacity=6)
+        buf.push(0.0, 1.0, 1.0, 1.0, 1)
+        ts = np.arange(1, 9, dtype=float)
+        buf.extend_ticks(ts, ts, ts + 0.5, ts, np.ones(8))
+
+        assert buf.total_appended == 9
+        np.testing.assert_array_equal(buf.column('timestamp'), [3, 4, 5, 6, 7, 8])
+        np.testing.assert_allclose(buf.column('mid', 2), [7.25, 8.25])
+
+    def test_window_shorter_than_requested(self):
+        buf = TickRingBuffer(capacity=100)
+        buf.push(1.0, 1.0, 1.0, 1.0, 1)
+
+        assert len(buf.window(50).bid) == 1
+
+
+class TestOrderFlowRingBuffer:
+    """Test order flow storage"""
+
+    def test_append_flow_objects(self):
+        buf = OrderFlowRingBuffer(capacity=3)
+        for i in range(5):
+            buf.append(SimpleNamespace(timestamp=i, buy_volume=1, sell_volume=0,
+                                       delta=i, cumulative_delta=i * 2, imbalance_ratio=1.0))
+
+        np.testing.assert_array_equal(buf.column('delta'), [2, 3, 4])
+        assert buf.latest('cumulative_delta') == 8
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        ColumnRingBuffer(0, fields=('a',))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,136 @@
+"""
+Unit tests for the weekly trading-session bitmap
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from config_manager import ConfigManager
+from session_calendar import SessionCalendar, timezone_offset_hours, minute_of_week, time_to_minutes
+
+
+def utc(day, hour, minute=0):
+    """Epoch seconds for 2024-10-<day> (the 7th is a Monday)"""
+    return datetime(2024, 10, day, hour, minute, tzinfo=timezone.utc).timestamp()
+
+
+def legacy_allowed(config, minutes):
+    # Pre-bitmap is_trading_session_allowed: GMT, inclusive ends, only Asia wraps midnight
+    allowed = False
+    if config.get('london_session_enabled', True):
+        allowed |= time_to_minutes(config.get('london_start', '08:00')) <= minutes <= \
+            time_to_minutes(config.get('london_end', '16:30'))
+    if config.get('ny_session_enabled', True):
+        allowed |= time_to_minutes(config.get('ny_start', '13:00')) <= minutes <= \
+            time_to_minutes(config.get('ny_end', '21:00'))
+    if config.get('asia_session_enabled', False):
+        allowed |= minutes >= time_to_minutes(config.get('asia_start', '22:00')) or \
+            minutes <= time_to_minutes(config.get('asia_end', '08:00'))
+    return allowed
+
+
+class TestSessionCalendar:
+    @pytest.mark.parametrize('config', [{}, {'asia_session_enabled': True, 'ny_session_enabled': False}])
+    def test_gmt_defaults_match_previous_check(self, config):
+        calendar = SessionCalendar.from_config(config)
+        for day in range(7, 14):
+            for minutes in range(1440):
+                ts = utc(day, minutes // 60, minutes % 60) + 59
+                assert calendar.is_open(ts) == legacy_allowed(config, minutes), (day, minutes)
+
+    def test_timezone_offset_and_midnight_wrap(self):
+        calendar = SessionCalendar.from_config({'session_timezone': 'WIB', 'london_session_enabled': False,
+                                                'ny_start': '20:00', 'ny_end': '04:00'})
+        assert calendar.bitmap.shape == (7, 1440)
+        assert not calendar.is_open(utc(7, 12, 59))   # 19:59 WIB
+        assert calendar.is_open(utc(7, 13, 0))        # 20:00 WIB
+        assert calendar.is_open(utc(7, 21, 0))        # 04:00 WIB next day (inclusive)
+        assert not calendar.is_open(utc(7, 21, 1))
+        assert calendar.sessions_at(utc(7, 18)) == ['NY']
+
+    @staticmethod
+    def gui_config(stored):
+        """Session keys as get_config_from_gui() emits them for a bot with ``stored`` config"""
+        config = {'symbol': 'XAUUSD', 'trading_sessions_enabled': True,
+                  'london_session_enabled': True, 'london_start': '15:00', 'london_end': '23:30',
+                  'ny_session_enabled': True, 'ny_start': '20:00', 'ny_end': '04:00',
+                  'asia_session_enabled': False, 'asia_start': '05:00', 'asia_end': '15:00'}
+        config.update(ConfigManager.non_gui_settings(ConfigManager, stored))
+        return config
+
+    def test_gui_config_sessions_are_wib(self, tmp_path):
+        stored = ConfigManager(config_dir=str(tmp_path)).create_isolated_config(bot_id='Bot 1')
+        calendar = SessionCalendar.from_config(self.gui_config(stored))
+        assert not calendar.is_open(utc(7, 7, 59))  # 14:59 WIB
+        assert calendar.is_open(utc(7, 8, 0))       # London 15:00 WIB = 08:00 GMT
+        assert calendar.is_open(utc(7, 21, 0))      # NY 04:00 WIB = 21:00 GMT
+        assert not calendar.is_open(utc(7, 21, 30))  # open until 04:00 if read as GMT
+        assert not calendar.is_open(utc(8, 2, 0))   # 09:00 WIB
+
+    def test_missing_timezone_same_on_every_path(self, tmp_path):
+        # A config saved without session_timezone: engine, GUI save and file load all read it as GMT
+        manager = ConfigManager(config_dir=str(tmp_path))
+        legacy = {'london_start': '15:00', 'london_end': '23:30', 'ny_start': '20:00', 'ny_end': '04:00'}
+        direct = SessionCalendar.from_config(legacy)
+        via_gui = SessionCalendar.from_config(self.gui_config(legacy))
+        manager.save_config(legacy, 'legacy.json')
+        via_file = SessionCalendar.from_config(manager.load_config('legacy.json'))
+        assert direct.utc_offset_hours == via_gui.utc_offset_hours == via_file.utc_offset_hours == 0.0
+        assert np.array_equal(direct.bitmap, via_gui.bitmap)
+        assert np.array_equal(direct.bitmap, via_file.bitmap)
+
+    def test_weekdays_are_local(self):
+        # Asia opens Monday 05:00 WIB = Sunday 22:00 UTC; nothing on the weekend itself
+        calendar = SessionCalendar.from_config({'session_timezone': 'UTC+7', 'trading_days': [0, 1, 2, 3, 4],
+                                                'london_session_enabled': False, 'ny_session_enabled': False,
+                                                'asia_session_enabled': True, 'asia_start': '05:00',
+                                                'asia_end': '15:00'})
+        assert calendar.is_open(utc(6, 22, 0))
+        assert not calendar.is_open(utc(6, 21, 59))
+        assert not calendar.is_open(utc(12, 12, 0))  # Saturday
+
+    def test_next_open_and_close(self):
+        calendar = SessionCalendar.from_config({'ny_session_enabled': False, 'trading_days': [0, 1, 2, 3, 4]})
+        assert calendar.next_open(utc(7, 7, 30) + 12) == utc(7, 8, 0)
+        assert calendar.next_open(utc(7, 9, 0) + 5) == utc(7, 9, 0) + 5  # already open
+        assert calendar.next_close(utc(7, 9, 0)) == utc(7, 16, 31)
+        assert calendar.next_open(utc(11, 17, 0)) == utc(14, 8, 0)  # Friday evening -> Monday
+
+    def test_disabled_and_empty(self):
+        assert SessionCalendar.from_config({'trading_sessions_enabled': False}).is_open(utc(12, 3))
+        assert SessionCalendar.from_config({'trading_sessions_enabled': False}).next_close(utc(12, 3)) is None
+        empty = SessionCalendar.from_config({'london_session_enabled': False, 'ny_session_enabled': False})
+        assert not empty.is_open(utc(7, 10)) and empty.next_open(utc(7, 10)) is None
+
+    def test_helpers(self):
+        assert timezone_offset_hours('WIB') == 7.0
+        assert timezone_offset_hours('GMT-3:30') == -3.5
+        assert minute_of_week(utc(7, 0, 1)) == 1  # Monday 00:01
+        assert time_to_minutes('bad') == 0
+
+
+class TestEngineSessionIdle:
+    """Analysis thread sleeps while outside sessions with no positions"""
+
+    def test_analysis_loop_idles(self, core_with_mt5, monkeypatch):
+        mt5_sim = pytest.importorskip('mt5_sim')
+        core = core_with_mt5(mt5_sim.SimulatedTerminal.from_config({'symbol': 'XAUUSD'}))
+        engine = core.UltraLowLatencyEngine('XAUUSD', {'london_session_enabled': False,
+                                                       'ny_session_enabled': False})
+        assert engine.initialize()
+
+        waits = []
+
+        def wait(now):
+            waits.append(now)
+            if len(waits) == 3:
+                engine.is_running = False
+
+        monkeypatch.setattr(engine, '_wait_for_session', wait)
+        monkeypatch.setattr(engine, 'analyze_microstructure', lambda: pytest.fail("analysed outside sessions"))
+        engine.is_running = True
+        engine.analysis_loop()
+        engine.close_executor.shutdown()
+        assert len(waits) == 3
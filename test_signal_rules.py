@@ -0,0 +1,80 @@
+"""
+Unit tests for the compiled signal-rule evaluator
+"""
+
+import itertools
+
+import pytest
+
+from signal_rules import (SignalRules, SignalParams, compile_rules, evaluate_rules, NUMBA_AVAILABLE,
+                          NO_SIGNAL, SIGNAL_BUY, SIGNAL_SELL, SPREAD_REJECT, DELTA_BUY_FILTERED,
+                          MOMENTUM_UP, HIGH_VOLATILITY)
+
+NAN = float('nan')
+CONFIG = {'max_spread': 0.5, 'min_delta_threshold': 20, 'min_velocity_threshold': 0.001, 'max_volatility': 1.0}
+
+
+def snapshots():
+    """Grid over every branch: spread, delta side, filters (incl. NaN), momentum, volatility"""
+    for spread, delta, velocity, volatility, (ema_fast, ema_slow), rsi, momentum in itertools.product(
+            (0.1, 0.9), (-50.0, 0.0, 50.0), (-0.01, 0.0, 0.01), (0.5, 2.0),
+            ((2600.4, 2600.2), (2600.6, 2600.8), (NAN, 2600.0)), (20.0, 50.0, 80.0), (-0.2, 0.2)):
+        yield {'avg_spread': spread, 'cumulative_delta': delta, 'price_velocity': velocity,
+               'volatility': volatility, 'ema_fast': ema_fast, 'ema_slow': ema_slow, 'rsi': rsi,
+               'momentum': momentum}
+
+
+def reference(ms, price, thresholds):
+    return evaluate_rules(ms['avg_spread'], ms['cumulative_delta'], ms['price_velocity'], ms['volatility'],
+                          price, ms['ema_fast'], ms['ema_slow'], ms['rsi'], ms['momentum'], *thresholds)
+
+
+class TestSignalRules:
+    def test_closure_matches_reference_rules(self):
+        rules = SignalRules.from_config(CONFIG)
+        results = set()
+        for ms in snapshots():
+            result = rules.evaluate(ms, 2600.5)
+            assert result == reference(ms, 2600.5, rules.thresholds)
+            results.add(result[0])
+        assert results == {NO_SIGNAL, SIGNAL_BUY, SIGNAL_SELL, SPREAD_REJECT}
+
+    def test_strength_and_flags(self):
+        evaluate = compile_rules(0.5, 20.0, 0.001, 70.0, 30.0, 1.0)
+        ms = {'avg_spread': 0.1, 'cumulative_delta': 50.0, 'price_velocity': 0.01, 'volatility': 0.1,
+              'ema_fast': 2600.4, 'ema_slow': 2600.2, 'rsi': 50.0, 'momentum': 0.2}
+        assert evaluate(ms, 2600.5)[:2] == (SIGNAL_BUY, 0.4 + 0.3 + 0.1)
+
+        ms.update(ema_fast=NAN, volatility=2.0)  # filter fails, momentum alone, halved
+        code, strength, flags = evaluate(ms, 2600.5)
+        assert (code, strength) == (SIGNAL_BUY, 0.3 * 0.5)
+        assert flags == DELTA_BUY_FILTERED | MOMENTUM_UP | HIGH_VOLATILITY
+
+    def test_missing_indicators_fail_the_filter(self):
+        rules = SignalRules.from_config(CONFIG)
+        ms = {'avg_spread': 0.1, 'cumulative_delta': 50.0, 'price_velocity': 0.0, 'volatility': 0.1}
+        assert rules.evaluate(ms, 2600.5) == (NO_SIGNAL, 0.0, DELTA_BUY_FILTERED)
+
+    def test_describe_only_fired_rules(self):
+        ms = {'cumulative_delta': -35.0, 'price_velocity': -0.002, 'ema_fast': 2600.4, 'ema_slow': 2600.9,
+              'rsi': 48.0, 'momentum': -0.2}
+        rules = SignalRules.from_config(CONFIG)
+        code, _, flags = rules.evaluate({**ms, 'avg_spread': 0.1, 'volatility': 0.1}, 2600.2)
+        assert code == SIGNAL_SELL
+        assert SignalRules.describe(flags, ms) == [
+            "Delta- & EMA/RSI/Mom OK: Δ=-35, EMAf=2600.40, EMAs=2600.90, RSI=48.0, Mom=-0.20000",
+            "Negative momentum: -0.002000",
+        ]
+
+    def test_params_defaults_match_engine(self):
+        params = SignalParams.from_config({})
+        assert (params.max_spread, params.min_delta, params.min_strength, params.tp_mode) == \
+            (0.0001, 100, 0.6, 'RiskReward')
+
+    @pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+    def test_jit_matches_closure(self):
+        python_rules = SignalRules.from_config(CONFIG)
+        jit_rules = SignalRules.from_config({**CONFIG, 'signal_rules_jit': True})
+        assert jit_rules.jit
+        for ms in snapshots():
+            assert jit_rules.evaluate(ms, 2600.5) == python_rules.evaluate(ms, 2600.5)
@@ -0,0 +1,111 @@
+"""
+Unit tests for streaming indicators
+"""
+
+import math
+import pytest
+import numpy as np
+from streaming_indicators import (
+    StreamingEMA, StreamingRSI, StreamingATR, StreamingMomentum, StreamingIndicators
+)
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(7)
+    return 2600.0 + np.cumsum(rng.normal(0, 0.05, 500))
+
+
+def reference_rsi(data, period):
+    """Plain Wilder RSI: SMA seed over the first `period` changes, then smoothing"""
+    changes = np.diff(data)
+    gains = np.clip(changes, 0, None)
+    losses = np.clip(-changes, 0, None)
+    avg_gain = gains[:period].mean()
+    avg_loss = losses[:period].mean()
+    for g, l in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + g) / period
+        avg_loss = (avg_loss * (period - 1) + l) / period
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+class TestStreamingIndicators:
+    """Streaming values must match batch calculations over the same series"""
+
+    def test_ema_matches_batch(self, prices):
+        ema = StreamingEMA(21)
+        for p in prices:
+            ema.update(p)
+        expected = prices[0]
+        alpha = 2.0 / 22.0
+        for p in prices[1:]:
+            expected = alpha * p + (1 - alpha) * expected
+        assert ema.value == pytest.approx(expected, rel=1e-12)
+
+    def test_rsi_matches_wilder(self, prices):
+        rsi = StreamingRSI(7)
+        for p in prices:
+            rsi.update(p)
+        assert rsi.value == pytest.approx(reference_rsi(prices, 7), rel=1e-9)
+
+    def test_rsi_not_ready_before_period(self):
+        rsi = StreamingRSI(5)
+        for p in [1.0, 2.0, 3.0]:
+            rsi.update(p)
+        assert not rsi.ready
+        assert math.isnan(rsi.value)
+
+    def test_atr_matches_fast_indicators(self, prices):
+        fast = pytest.importorskip("fast_indicators")
+        high, low = prices * 1.0001, prices * 0.9999
+        atr = StreamingATR(14)
+        for h, l, c in zip(high, low, prices):
+            atr.update(h, l, c)
+        expected = fast.atr_fast(high, low, prices, 14)[-1]
+        assert atr.value == pytest.approx(expected, rel=1e-9)
+
+    def test_momentum(self, prices):
+        mom = StreamingMomentum(5)
+        for p in prices:
+            mom.update(p)
+        assert mom.value == pytest.approx(prices[-1] - prices[-6])
+
+    def test_indicator_set_snapshot(self, prices):
+        indicators = StreamingIndicators.from_config({'ema_fast_period': 5, 'ema_slow_period': 15})
+        indicators.update_many(prices[:10])
+        assert not indicators.ready
+        indicators.update_many(prices[10:])
+        assert indicators.ready
+
+        values = indicators.values()
+        assert values['ema_fast'] == indicators.current[0]
+        assert set(values) == {'ema_fast', 'ema_slow', 'rsi', 'atr', 'momentum'}
+
+    def test_invalid_period(self):
+        with pytest.raises(ValueError):
+            StreamingEMA(0)
+
+
+class TestEngineIndicators:
+    """update_config keeps the engine's streaming indicators in step with the config"""
+
+    def test_period_change_rebuilds_and_reseeds(self, fake_core, prices):
+        engine = fake_core.UltraLowLatencyEngine('XAUUSD', {'magic_number': 1})
+        for i, p in enumerate(prices):
+            engine.tick_buffer.push(1_000.0 + i, p - 0.1, p + 0.1, p, 1.0)
+            engine.indicators.update(p)
+        old = engine.indicators
+
+        engine.update_config({'max_spread': 0.5})
+        assert engine.indicators is old  # periods unchanged
+
+        engine.update_config({'ema_fast_period': 3, 'rsi_period': 14})
+        expected = StreamingIndicators(ema_fast_period=3, rsi_period=14)
+        expected.update_many(prices)
+        assert engine.indicators is not old
+        assert engine.indicators.ema_fast.period == 3
+        assert engine.indicators.current == pytest.approx(expected.current, rel=1e-12)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,86 @@
+"""
+Unit tests for the symbol metadata cache (runs against the conftest FakeMT5)
+"""
+
+import types
+import pytest
+from symbol_cache import SymbolMetadataCache, SymbolMeta
+
+
+def make_info(**overrides):
+    info = dict(point=0.01, digits=2, trade_contract_size=100.0, trade_tick_size=0.01, trade_tick_value=1.0,
+                trade_stops_level=10, trade_freeze_level=0, filling_mode=1, volume_min=0.01,
+                volume_max=100.0, volume_step=0.01, spread=12, visible=True)
+    info.update(overrides)
+    return types.SimpleNamespace(**info)
+
+
+@pytest.fixture
+def fake(fake_mt5):
+    fake_mt5.info = make_info()
+    return fake_mt5
+
+
+class TestSymbolMetadataCache:
+    """Metadata reads never reach MT5"""
+
+    def test_get_is_memory_only(self, fake):
+        cache = SymbolMetadataCache(mt5_api=fake)
+        assert cache.get('XAUUSD') is None
+        cache.refresh('XAUUSD')
+        for _ in range(100):
+            meta = cache.get('XAUUSD')
+        assert meta.contract_size == 100.0
+        assert meta.min_stop_distance == pytest.approx(0.1)
+        assert fake.calls['symbol_info'] == 1
+
+    def test_change_detection(self, fake):
+        cache = SymbolMetadataCache(mt5_api=fake)
+        assert cache.refresh('XAUUSD') == ()
+        fake.info = make_info(trade_stops_level=25)
+        assert cache.refresh('XAUUSD') == ('stops_level',)
+        assert cache.get('XAUUSD').stops_level == 25
+        assert cache.changes == 1
+
+    def test_refresh_if_due(self, fake):
+        cache = SymbolMetadataCache(mt5_api=fake, refresh_interval=60)
+        cache.refresh_if_due('XAUUSD')
+        cache.refresh_if_due('XAUUSD')
+        assert fake.calls['symbol_info'] == 1
+
+    def test_failed_refresh_keeps_cache(self, fake):
+        cache = SymbolMetadataCache(mt5_api=fake)
+        cache.refresh('XAUUSD')
+        fake.info = None
+        cache.refresh('XAUUSD')
+        assert cache.get('XAUUSD').point == 0.01
+
+    def test_filling_support(self):
+        meta = SymbolMeta.from_symbol_info('XAUUSD', make_info(filling_mode=2))
+        assert meta.supports_filling('ioc')
+        assert not meta.supports_filling('FOK')
+        assert meta.supports_filling('RETURN')
+
+
+class TestEngineHotPath:
+    """Signal generation / close pricing use cached metadata and buffered quotes"""
+
+    @pytest.fixture
+    def engine(self, fake_core, fake):
+        engine = fake_core.UltraLowLatencyEngine('XAUUSD', {})
+        engine.symbol_meta.store('XAUUSD', make_info())
+        engine._apply_symbol_meta()
+        return engine
+
+    def test_latest_quote_from_tick_buffer(self, engine, fake):
+        engine.tick_buffer.push(1.0, 2601.0, 2601.2, 2601.0, 1.0)
+        assert engine.get_latest_quote() == (2601.0, 2601.2)
+        assert fake.calls['symbol_info_tick'] == 0
+
+    def test_meta_applied(self, engine):
+        assert engine.symbol_point == 0.01
+        assert engine.stops_level == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
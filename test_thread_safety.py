@@ -0,0 +1,99 @@
+"""
+Unit tests for the thread hand-off primitives in thread_safety
+"""
+
+import time
+import threading
+import pytest
+from thread_safety import SequenceEvent, CoalescingMailbox
+
+
+class TestSequenceEvent:
+    """Test new-tick notification"""
+    
+    def test_wait_times_out_without_publish(self):
+        event = SequenceEvent()
+        start = time.perf_counter()
+        assert event.wait(0, timeout=0.05) == 0
+        assert time.perf_counter() - start >= 0.04
+    
+    def test_publish_wakes_waiter(self):
+        event = SequenceEvent()
+        woke = []
+        
+        def waiter():
+            event.wait(0, timeout=2.0)
+            woke.append(time.perf_counter())
+        
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.05)
+        published = time.perf_counter()
+        event.publish()
+        thread.join(timeout=2.0)
+        
+        assert woke and woke[0] - published < 0.02
+    
+    def test_consume_coalesces_publishes(self):
+        event = SequenceEvent()
+        event.publish()
+        first = time.perf_counter()
+        event.publish()
+        event.publish()
+        
+        sequence, pending_since = event.consume()
+        assert sequence == 3
+        assert pending_since <= first
+        assert event.consume() == (3, None)
+
+
+class TestCoalescingMailbox:
+    """Test signal hand-off"""
+    
+    def test_freshest_item_per_key(self):
+        mailbox = CoalescingMailbox()
+        mailbox.put('BUY', 'buy-1')
+        mailbox.put('BUY', 'buy-2')
+        
+        item, waited = mailbox.get(timeout=0.1)
+        assert item == 'buy-2'
+        assert waited >= 0
+        assert mailbox.coalesced == 1
+        assert mailbox.get(timeout=0.01) == (None, 0.0)
+    
+    def test_priority_then_arrival(self):
+        mailbox = CoalescingMailbox()
+        mailbox.put('BUY', 'buy', priority=1)
+        mailbox.put('SELL', 'sell', priority=1)
+        mailbox.put('CLOSE', 'close', priority=0)
+        
+        assert [mailbox.get(timeout=0.1)[0] for _ in range(3)] == ['close', 'buy', 'sell']
+    
+    def test_stale_items_dropped(self):
+        mailbox = CoalescingMailbox(ttl=0.02)
+        mailbox.put('BUY', 'buy')
+        time.sleep(0.05)
+        
+        assert mailbox.get(timeout=0.01) == (None, 0.0)
+        assert mailbox.expired == 1
+    
+    def test_blocking_get_wakes_on_put(self):
+        mailbox = CoalescingMailbox()
+        received = []
+        
+        def consumer():
+            received.append(mailbox.get(timeout=2.0))
+        
+        thread = threading.Thread(target=consumer)
+        thread.start()
+        time.sleep(0.05)
+        mailbox.put('SELL', 'sell')
+        thread.join(timeout=2.0)
+        
+        item, waited = received[0]
+        assert item == 'sell'
+        assert waited < 0.02
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
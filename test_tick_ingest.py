@@ -0,0 +1,140 @@
+"""
+Unit tests for batched tick ingestion (runs against the conftest FakeMT5)
+"""
+
+import pytest
+import numpy as np
+from mt5_sim import TICK_DTYPE
+from tick_ingest import BatchTickFetcher
+
+
+@pytest.fixture
+def fake(fake_mt5):
+    fake_mt5.add_tick(1_000_000, 2600.0)
+    return fake_mt5
+
+
+class TestBatchTickFetcher:
+    """copy_ticks_from reader: de-duplication and adaptive polling"""
+
+    def test_seed_from_current_tick(self, fake):
+        fetcher = BatchTickFetcher('XAUUSD', mt5_api=fake)
+        first = fetcher.fetch()
+        assert len(first) == 1
+        assert fetcher.last_msc == 1_000_000
+        assert len(fetcher.fetch()) == 0
+
+    def test_only_new_ticks_returned(self, fake):
+        fetcher = BatchTickFetcher('XAUUSD', mt5_api=fake)
+        fetcher.fetch()
+        for i in range(1, 6):
+            fake.add_tick(1_000_000 + i * 10, 2600.0 + i)
+        batch = fetcher.fetch()
+        assert batch['time_msc'].tolist() == [1_000_010, 1_000_020, 1_000_030, 1_000_040, 1_000_050]
+        assert len(fetcher.fetch()) == 0
+        assert fetcher.duplicates_dropped > 0
+
+    def test_same_millisecond_ticks_not_lost(self, fake):
+        fetcher = BatchTickFetcher('XAUUSD', mt5_api=fake)
+        fetcher.fetch()
+        fake.add_tick(1_000_005, 2601.0)
+        assert len(fetcher.fetch()) == 1
+
+        # Two more ticks land in the same millisecond after our read
+        fake.add_tick(1_000_005, 2601.5)
+        fake.add_tick(1_000_005, 2602.0)
+        batch = fetcher.fetch()
+        assert batch['bid'].tolist() == [2601.5, 2602.0]
+        assert len(fetcher.fetch()) == 0
+
+    def test_api_failure_returns_none(self, fake):
+        fetcher = BatchTickFetcher('XAUUSD', mt5_api=fake)
+        fetcher.fetch()
+        fake.failing.add('copy_ticks_from')
+        assert fetcher.fetch() is None
+
+    def test_fallback_polls_current_tick(self, fake):
+        fetcher = BatchTickFetcher('XAUUSD', mt5_api=fake)
+        fetcher.fetch()
+        fake.failing.add('copy_ticks_from')
+        assert len(fetcher.poll_latest()) == 0  # nothing new yet
+
+        fake.add_tick(1_000_010, 2601.0)
+        fake.add_tick(1_000_020, 2602.0)
+        tick = fetcher.poll_latest()
+        assert tick['time_msc'].tolist() == [1_000_020]
+        assert fetcher.fallback_polls == 2
+
+        # Batch path resumes after the fallback tick
+        fake.failing.clear()
+        fake.add_tick(1_000_030, 2603.0)
+        assert fetcher.fetch()['time_msc'].tolist() == [1_000_030]
+
+    def test_quiet_symbol_backs_off(self, fake):
+        fetcher = BatchTickFetcher('XAUUSD', mt5_api=fake, min_interval=0.001, max_interval=0.05)
+        fetcher.fetch()
+        for _ in range(30):
+            fetcher.fetch()
+        assert fetcher.next_interval == pytest.approx(0.05)
+
+    def test_busy_second_does_not_stall(self, fake):
+        fetcher = BatchTickFetcher('XAUUSD', mt5_api=fake, batch_size=10)
+        fetcher.fetch()
+        for i in range(1, 36):
+            fake.add_tick(1_000_000 + i, 2600.0)  # all inside the same second
+
+        batches = []
+        for _ in range(10):
+            batch = fetcher.fetch()
+            if len(batch) == 0:
+                break
+            batches.append(batch)
+        assert np.concatenate(batches)['time_msc'].tolist() == list(range(1_000_001, 1_000_036))
+
+    def test_full_batch_polls_immediately(self, fake):
+        fetcher = BatchTickFetcher('XAUUSD', mt5_api=fake, batch_size=10)
+        fetcher.fetch()
+        fetcher.next_interval = 0.05
+        for i in range(1, 40):
+            fake.add_tick(1_000_000 + i, 2600.0)
+        fetcher.fetch()
+        assert fetcher.next_interval == fetcher.min_interval
+
+
+class TestEngineBatchIngest:
+    """Batch path must produce the same buffers as the per-tick path"""
+
+    def test_order_flow_matches_per_tick(self, fake_core):
+        core = fake_core
+        rng = np.random.default_rng(3)
+        n = 200
+        ticks = np.zeros(n, dtype=TICK_DTYPE)
+        ticks['time_msc'] = 1_000_000 + np.arange(n) * 7
+        ticks['bid'] = 2600.0 + np.round(np.cumsum(rng.normal(0, 0.05, n)), 2)
+        ticks['ask'] = ticks['bid'] + 0.12
+        ticks['last'] = ticks['bid'] + rng.choice([0.0, 0.12], n)
+        ticks['volume'] = rng.integers(0, 5, n)
+
+        batch_engine = core.UltraLowLatencyEngine('XAUUSD', {})
+        batch_engine._ingest_tick_batch(ticks[:50])
+        batch_engine._ingest_tick_batch(ticks[50:])
+
+        tick_engine = core.UltraLowLatencyEngine('XAUUSD', {'tick_ingest_mode': 'poll'})
+        assert tick_engine.tick_fetcher is None
+        for t in ticks:
+            tick_engine._ingest_tick(core.TickData(
+                timestamp=t['time_msc'] / 1000.0, bid=float(t['bid']), ask=float(t['ask']),
+                last=float(t['last']), volume=int(t['volume']), spread=float(t['ask'] - t['bid'])
+            ))
+
+        assert len(batch_engine.tick_buffer) == len(tick_engine.tick_buffer) == n
+        np.testing.assert_allclose(batch_engine.tick_buffer.column('mid'), tick_engine.tick_buffer.column('mid'))
+        for field in core.OrderFlowRingBuffer.FIELDS:
+            np.testing.assert_allclose(batch_engine.orderflow_buffer.column(field),
+                                       tick_engine.orderflow_buffer.column(field))
+        assert batch_engine.cumulative_delta == pytest.approx(tick_engine.cumulative_delta)
+        assert batch_engine.indicators.current == pytest.approx(tick_engine.indicators.current, nan_ok=True)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,104 @@
+"""
+Unit tests for the memory-mapped tick recorder
+"""
+
+import os
+import types
+import pytest
+import numpy as np
+from tick_recorder import TickRecorder, SegmentWriter, open_segment, list_segments, MS_PER_DAY
+
+DAY0 = 20000 * MS_PER_DAY  # 2024-10-04 00:00 UTC
+
+
+def tick(time_msc, bid):
+    return types.SimpleNamespace(timestamp=time_msc / 1000.0, bid=bid, ask=bid + 0.1, last=bid, volume=2)
+
+
+class TestTickRecorder:
+    """Append, rotate and read back segments"""
+
+    def test_batch_and_row_round_trip(self, tmp_path):
+        recorder = TickRecorder(str(tmp_path), 'XAUUSD', chunk_records=4)
+        msc = DAY0 + np.arange(10, dtype=np.int64)
+        price = 2600.0 + np.arange(10) * 0.01
+        recorder.record_ticks(msc, price, price + 0.1, price, np.ones(10))
+        recorder.record_tick(tick(DAY0 + 10, 2601.0))
+        recorder.close()
+
+        [path] = list_segments(str(tmp_path), 'XAUUSD')
+        assert path.endswith('XAUUSD_20241004.ticks.bin')
+        seg = open_segment(path)
+        assert isinstance(seg, np.memmap)
+        assert seg['time_msc'].tolist() == list(range(DAY0, DAY0 + 11))
+        assert seg['bid'][-1] == 2601.0
+        assert seg['volume'][-1] == 2.0
+
+    def test_rotates_at_midnight(self, tmp_path):
+        recorder = TickRecorder(str(tmp_path), 'XAUUSD', tag=7)
+        msc = np.array([DAY0 + MS_PER_DAY - 2, DAY0 + MS_PER_DAY - 1, DAY0 + MS_PER_DAY, DAY0 + MS_PER_DAY + 1])
+        recorder.record_ticks(msc, np.ones(4), np.ones(4), np.ones(4), np.ones(4))
+        recorder.close()
+
+        paths = list_segments(str(tmp_path), 'XAUUSD', tag=7)
+        assert [os.path.basename(p) for p in paths] == ['XAUUSD_20241004.ticks.bin', 'XAUUSD_20241005.ticks.bin']
+        assert [len(open_segment(p)) for p in paths] == [2, 2]
+
+    def test_reopen_appends(self, tmp_path):
+        for start in (0, 5):
+            recorder = TickRecorder(str(tmp_path), 'XAUUSD')
+            msc = DAY0 + np.arange(start, start + 5, dtype=np.int64)
+            recorder.record_ticks(msc, np.ones(5), np.ones(5), np.ones(5), np.ones(5))
+            recorder.close()
+
+        [path] = list_segments(str(tmp_path), 'XAUUSD')
+        assert open_segment(path)['time_msc'].tolist() == list(range(DAY0, DAY0 + 10))
+
+    def test_reader_sees_only_published_records(self, tmp_path):
+        path = str(tmp_path / 'live.ticks.bin')
+        writer = SegmentWriter(path, 'ticks', chunk_records=1000)
+        writer.append_row(DAY0, 1.0, 1.1, 1.0, 1.0)
+
+        assert len(open_segment(path)) == 1  # file is preallocated to 1000 records
+        writer.append_row(DAY0 + 1, 1.0, 1.1, 1.0, 1.0)
+        assert len(open_segment(path)) == 2
+        writer.close()
+
+    def test_orderflow_and_kind_check(self, tmp_path):
+        recorder = TickRecorder(str(tmp_path), 'XAUUSD')
+        ts = DAY0 / 1000.0 + np.arange(3)
+        recorder.record_orderflow(ts, np.ones(3), np.zeros(3), np.ones(3), np.arange(1.0, 4.0), np.ones(3))
+        recorder.record_orderflow_row(types.SimpleNamespace(timestamp=ts[-1] + 1, buy_volume=0.0, sell_volume=1.0,
+                                                            delta=-1.0, cumulative_delta=2.0, imbalance_ratio=-1.0))
+        recorder.close()
+
+        [path] = list_segments(str(tmp_path), 'XAUUSD', kind='orderflow')
+        assert open_segment(path)['cumulative_delta'].tolist() == [1.0, 2.0, 3.0, 2.0]
+        with pytest.raises(ValueError):
+            SegmentWriter(path, 'ticks')
+
+
+class TestEngineRecording:
+    """The engine records what it ingests when tick_recording is on"""
+
+    @pytest.fixture
+    def engine(self, tmp_path, fake_core):
+        engine = fake_core.UltraLowLatencyEngine('XAUUSD', {'magic_number': 11, 'tick_recording': True,
+                                                       'tick_record_dir': str(tmp_path)})
+        yield engine
+        engine.tick_recorder.close()
+
+    def test_batch_ingest_recorded(self, engine, tmp_path):
+        ticks = np.zeros(5, dtype=[('time_msc', 'i8'), ('bid', 'f8'), ('ask', 'f8'), ('last', 'f8'), ('volume', 'f8')])
+        ticks['time_msc'] = DAY0 + np.arange(5) * 10
+        ticks['bid'] = 2600.0 + np.arange(5)
+        ticks['ask'] = ticks['bid'] + 0.1
+        ticks['last'] = ticks['bid']
+        ticks['volume'] = 1.0
+        engine._ingest_tick_batch(ticks)
+        engine.tick_recorder.close()
+
+        [tick_path] = list_segments(str(tmp_path), 'XAUUSD', tag=11)
+        [flow_path] = list_segments(str(tmp_path), 'XAUUSD', kind='orderflow', tag=11)
+        assert open_segment(tick_path)['bid'].tolist() == ticks['bid'].tolist()
+        assert len(open_segment(flow_path)) == 4  # first tick only seeds the aggressor reference
@@ -0,0 +1,126 @@
+"""
+Unit tests for the deterministic tick-replay harness
+"""
+
+import sys
+import pytest
+import numpy as np
+from tick_recorder import TickRecorder
+from tick_replay import VirtualClock, ReplayMT5, TickReplayHarness, synthetic_ticks, load_recorded_ticks
+
+CONFIG = {
+    'max_spread': 0.5,
+    'min_delta_threshold': 20,
+    'min_velocity_threshold': 0.001,
+    'max_volatility': 1.0,
+    'max_positions': 3,
+    'min_trade_interval': 1.0,
+    'max_floating_profit': 5.0,
+}
+
+
+def flat_ticks(prices, start_msc=1728032400000, spread=0.1):
+    ticks = synthetic_ticks(len(prices), start_msc=start_msc)
+    ticks['time_msc'] = start_msc + np.arange(len(prices)) * 100
+    ticks['bid'] = prices
+    ticks['ask'] = np.asarray(prices) + spread
+    ticks['last'] = prices
+    return ticks
+
+
+class TestReplayMT5:
+    """Fake order book: fills, marking to market and SL/TP"""
+
+    def test_buy_then_close(self):
+        mt5 = ReplayMT5('XAUUSD', flat_ticks([2600.0, 2601.0, 2602.0]))
+        mt5.advance(0)
+        result = mt5.order_send({'symbol': 'XAUUSD', 'type': mt5.ORDER_TYPE_BUY, 'volume': 0.1,
+                                 'sl': 2590.0, 'tp': 2610.0, 'magic': 7})
+        assert result.retcode == mt5.TRADE_RETCODE_DONE
+        assert result.price == 2600.1
+
+        mt5.advance(2)
+        [position] = mt5.positions_get(symbol='XAUUSD')
+        assert position.profit == pytest.approx((2602.0 - 2600.1) * 0.1 * 100)
+        assert mt5.account_info().equity == pytest.approx(10000.0 + position.profit)
+
+        mt5.order_send({'position': position.ticket, 'volume': 0.1, 'type': mt5.ORDER_TYPE_SELL})
+        assert mt5.positions_get() == ()
+        assert [d.entry for d in mt5.deals] == [mt5.DEAL_ENTRY_IN, mt5.DEAL_ENTRY_OUT]
+        assert mt5.account_info().balance == pytest.approx(10000.0 + position.profit)
+
+    def test_sl_and_tp_trigger_on_advance(self):
+        mt5 = ReplayMT5('XAUUSD', flat_ticks([2600.0, 2599.0, 2594.0, 2605.0]))
+        mt5.advance(0)
+        mt5.order_send({'symbol': 'XAUUSD', 'type': mt5.ORDER_TYPE_BUY, 'volume': 0.01, 'sl': 2595.0, 'tp': 2610.0})
+        mt5.order_send({'symbol': 'XAUUSD', 'type': mt5.ORDER_TYPE_SELL, 'volume': 0.01, 'sl': 2604.0,
+                        'tp': 2590.0})
+
+        mt5.advance(2)
+        assert (mt5.sl_hits, len(mt5.positions)) == (1, 1)
+        assert mt5.deals[-1].comment.startswith('[sl')
+        mt5.advance(3)
+        assert (mt5.sl_hits, len(mt5.positions)) == (2, 0)
+
+    def test_invalid_stops_rejected(self):
+        mt5 = ReplayMT5('XAUUSD', flat_ticks([2600.0]))
+        mt5.advance(0)
+        result = mt5.order_send({'symbol': 'XAUUSD', 'type': mt5.ORDER_TYPE_BUY, 'volume': 0.01,
+                                 'sl': 2601.0, 'tp': 2610.0})
+        assert result.retcode == mt5.TRADE_RETCODE_INVALID_STOPS
+        assert not mt5.positions
+
+    def test_no_look_ahead(self):
+        ticks = flat_ticks([2600.0, 2601.0, 2602.0])
+        mt5 = ReplayMT5('XAUUSD', ticks)
+        mt5.advance(1)
+        assert len(mt5.copy_ticks_from('XAUUSD', 0, 100, mt5.COPY_TICKS_ALL)) == 2
+        assert mt5.symbol_info_tick('XAUUSD').bid == 2601.0
+
+
+class TestVirtualClock:
+    def test_sleep_advances_virtual_time_only(self):
+        clock = VirtualClock(100.0)
+        clock.sleep(5)
+        assert clock.time() == 105.0
+        assert clock.perf_counter() > 0  # real clock passes through
+
+
+class TestTickReplayHarness:
+    """End-to-end replay through UltraLowLatencyEngine"""
+
+    @pytest.fixture(autouse=True)
+    def fake_mt5_module(self, monkeypatch):
+        if 'MetaTrader5' not in sys.modules:
+            monkeypatch.setitem(sys.modules, 'MetaTrader5', ReplayMT5('XAUUSD', flat_ticks([0.0])))
+        pytest.importorskip('aventa_hft_core')
+
+    def test_deterministic(self):
+        ticks = synthetic_ticks(3000, seed=3)
+        first = TickReplayHarness('XAUUSD', CONFIG, ticks).run()
+        second = TickReplayHarness('XAUUSD', CONFIG, ticks).run()
+
+        assert first['executed'] > 0
+        keys = ('signals', 'executed', 'deals', 'closed_trades', 'realized_pnl', 'balance', 'equity')
+        assert {k: first[k] for k in keys} == {k: second[k] for k in keys}
+
+    def test_engine_clock_and_mt5_restored(self):
+        import aventa_hft_core as core
+        original_mt5, original_time = core.mt5, core.time
+        harness = TickReplayHarness('XAUUSD', CONFIG, synthetic_ticks(500, seed=1))
+        report = harness.run()
+
+        assert core.mt5 is original_mt5 and core.time is original_time
+        assert report['ticks'] == 500
+        assert harness.clock.now == harness.ticks['time_msc'][-1] / 1000.0
+        assert report['stage_latency']['order_flow']['count'] == 500
+
+    def test_replays_recorded_segments(self, tmp_path):
+        ticks = synthetic_ticks(400, seed=5)
+        recorder = TickRecorder(str(tmp_path), 'XAUUSD')
+        recorder.record_ticks(ticks['time_msc'], ticks['bid'], ticks['ask'], ticks['last'], ticks['volume'])
+        recorder.close()
+
+        loaded = load_recorded_ticks(str(tmp_path), 'XAUUSD')
+        assert np.array_equal(loaded, ticks)
+        assert TickReplayHarness('XAUUSD', CONFIG, loaded).run(max_ticks=300)['ticks'] == 300
@@ -0,0 +1,112 @@
+"""
+Unit tests for the volume-at-price profile
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from volume_profile import VolumeProfile
+
+
+def filled(trades, bins=64, tick_size=0.1):
+    profile = VolumeProfile(tick_size=tick_size, bins=bins)
+    for price, buy, sell in trades:
+        profile.update(price, buy, sell)
+    return profile
+
+
+class TestVolumeProfile:
+    def test_poc_and_level_delta(self):
+        profile = filled([(2600.0, 1, 0), (2600.1, 2, 1), (2600.1, 0, 2), (2600.2, 1, 0)])
+        assert profile.poc == pytest.approx(2600.1)
+        assert profile.level_delta(2600.1) == -1.0
+        assert profile.level_delta(2600.12) == -1.0  # same bin
+        assert profile.level_delta(2650.0) == 0.0
+        levels = profile.levels()
+        assert levels['price'].tolist() == [2600.0, 2600.1, 2600.2]
+        assert levels['delta'].tolist() == [1.0, -1.0, 1.0]
+
+    def test_value_area_expands_towards_larger_side(self):
+        # volumes by level: 1 2 5 10 4 1 -> 70% of 23 = 16.1 -> 10 + 5 + 4 (ties/up first)
+        trades = [(2600.0 + i * 0.1, v, 0) for i, v in enumerate([1, 2, 5, 10, 4, 1])]
+        profile = filled(trades)
+        assert profile.poc == pytest.approx(2600.3)
+        assert profile.value_area() == pytest.approx((2600.2, 2600.4))
+        assert profile.snapshot(2600.3)['value_area_high'] == pytest.approx(2600.4)
+
+    def test_value_area_cached_until_volume_grows(self):
+        profile = filled([(2600.0, 10, 0), (2600.1, 5, 0), (2600.2, 5, 0)])
+        first = profile.value_area()
+        profile.update(2600.2, 0.1, 0)  # < 1% growth: cached
+        assert profile.value_area() == first
+        profile.update(2600.2, 10, 0)  # POC moves: recomputed
+        assert profile.poc == pytest.approx(2600.2)
+        assert profile.value_area() != first
+
+    def test_recenters_on_drift_and_drops_far_levels(self):
+        profile = filled([(2600.0, 3, 0)], bins=16)
+        profile.update(2600.5, 1, 0)        # inside the window
+        profile.update(2601.0, 2, 0)        # outside -> window shifts, 2600.0 falls off
+        assert profile.recenters == 1
+        assert profile.dropped_volume == 3
+        assert profile.poc == pytest.approx(2601.0)
+        assert profile.level_delta(2600.5) == 1.0
+        assert profile.total_volume == 3
+
+    def test_batch_matches_per_tick(self):
+        rng = np.random.default_rng(3)
+        prices = 2600.0 + np.cumsum(rng.normal(0, 0.3, 500))
+        buy = (rng.random(500) < 0.5).astype(float)
+        sell = 1.0 - buy
+        single = filled(zip(prices, buy, sell), bins=4096)
+        batch = VolumeProfile(tick_size=0.1, bins=4096)
+        for i in range(0, 500, 50):
+            batch.update_batch(prices[i:i + 50], buy[i:i + 50], sell[i:i + 50])
+        assert np.array_equal(single.levels()['buy'], batch.levels()['buy'])
+        assert np.array_equal(single.levels()['price'], batch.levels()['price'])
+        assert batch.poc == single.poc
+        assert batch.value_area() == single.value_area()
+
+    def test_without_tick_size_updates_are_ignored(self):
+        profile = VolumeProfile()
+        profile.update(2600.0, 1, 0)
+        assert np.isnan(profile.poc) and profile.total_volume == 0
+        assert VolumeProfile.from_config({}, point=0.01).tick_size == pytest.approx(0.1)
+
+    def test_snapshot_concurrent_with_updates(self):
+        # Analysis thread reads while the collector re-centers a small window
+        profile = VolumeProfile(tick_size=0.1, bins=64)
+        rng = np.random.default_rng(11)
+        prices = 2600.0 + np.cumsum(rng.normal(0, 1.0, 20000))
+        done = threading.Event()
+        errors = []
+
+        def collect():
+            try:
+                for i in range(0, len(prices), 10):
+                    profile.update(prices[i], 1.0, 0.0)
+                    profile.update_batch(prices[i:i + 10], np.ones(10), np.zeros(10))
+            finally:
+                done.set()
+
+        def analyse():
+            while not done.is_set():
+                try:
+                    snap = profile.snapshot(prices[0])
+                    levels = profile.levels()
+                    if not np.isnan(snap['poc']):
+                        assert snap['value_area_low'] <= snap['value_area_high']
+                    assert len(levels['price']) == len(levels['buy'])
+                except Exception as e:  # IndexError from a half-shifted window
+                    errors.append(e)
+                    return
+
+        threads = [threading.Thread(target=collect), threading.Thread(target=analyse)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=30)
+        assert errors == []
+        assert profile.recenters > 100
@@ -5,7 +5,7 @@ Ensures safe GUI updates from background threads
 
 import threading
 from functools import wraps
-from time import time
+from time import time, perf_counter
 from collections import defaultdict
 import logging
 
@@ -142,6 +142,120 @@ class ObjectPool:
             self.pool.append(obj)
 
 
+class SequenceEvent:
+    """
+    New-data notification between a producer and one consumer thread
+
+    The producer calls ``publish()`` after writing data; the consumer blocks in
+    ``wait()`` until the sequence number moves past the last one it handled.
+    ``consume()`` also returns when the oldest unconsumed publish happened, so
+    end-to-end latency can be measured from data arrival.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self.sequence = 0
+        self._pending_since = None
+    
+    def publish(self):
+        """Signal that new data is available"""
+        with self._cond:
+            self.sequence += 1
+            if self._pending_since is None:
+                self._pending_since = perf_counter()
+            self._cond.notify_all()
+    
+    def wait(self, last_seen: int, timeout: float = None) -> int:
+        """Block until sequence != last_seen or timeout; returns the current sequence"""
+        with self._cond:
+            if self.sequence == last_seen:
+                self._cond.wait_for(lambda: self.sequence != last_seen, timeout)
+            return self.sequence
+    
+    def consume(self):
+        """
+        Mark all published data as handled
+        
+        Returns:
+            (sequence, perf_counter time of the oldest unconsumed publish or None)
+        """
+        with self._cond:
+            pending_since = self._pending_since
+            self._pending_since = None
+            return self.sequence, pending_since
+
+
+class CoalescingMailbox:
+    """
+    Blocking hand-off that keeps only the freshest item per key
+    
+    ``put()`` replaces any pending item with the same key, ``get()`` blocks on a
+    condition variable (no polling) and returns the pending item with the
+    lowest (priority, arrival) order. Items older than ``ttl`` seconds are
+    dropped instead of delivered.
+    """
+    
+    def __init__(self, ttl: float = None):
+        self._cond = threading.Condition(threading.Lock())
+        self._pending = {}  # key -> (priority, sequence, enqueued_at, item)
+        self._sequence = 0
+        self.ttl = ttl
+        
+        # Stats
+        self.delivered = 0
+        self.coalesced = 0
+        self.expired = 0
+    
+    def __len__(self):
+        return len(self._pending)
+    
+    def put(self, key, item, priority: int = 0):
+        """Post an item, replacing a pending item with the same key"""
+        with self._cond:
+            if key in self._pending:
+                self.coalesced += 1
+            self._sequence += 1
+            self._pending[key] = (priority, self._sequence, perf_counter(), item)
+            self._cond.notify()
+    
+    def get(self, timeout: float = None):
+        """
+        Wait for the next item
+        
+        Returns:
+            (item, seconds it waited in the mailbox) or (None, 0.0) on timeout
+        """
+        deadline = None if timeout is None else perf_counter() + timeout
+        with self._cond:
+            while True:
+                if self._pending:
+                    now = perf_counter()
+                    if self.ttl is not None:
+                        stale = [k for k, v in self._pending.items() if now - v[2] > self.ttl]
+                        for key in stale:
+                            del self._pending[key]
+                        self.expired += len(stale)
+                    
+                    if self._pending:
+                        key = min(self._pending, key=lambda k: self._pending[k][:2])
+                        _, _, enqueued_at, item = self._pending.pop(key)
+                        self.delivered += 1
+                        return item, now - enqueued_at
+                
+                if deadline is None:
+                    self._cond.wait()
+                else:
+                    remaining = deadline - perf_counter()
+                    if remaining <= 0:
+                        return None, 0.0
+                    self._cond.wait(remaining)
+    
+    def clear(self):
+        """Drop all pending items"""
+        with self._cond:
+            self._pending.clear()
+
+
 # Global rate limiter instance
 rate_limiter = RateLimiter()
 
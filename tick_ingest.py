@@ -0,0 +1,181 @@
+"""
+Batched Tick Ingestion for Aventa HFT Pro 2026
+Pulls every tick since the last seen time_msc with one copy_ticks_from call
+"""
+
+import time
+import logging
+import numpy as np
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Batch layout for ticks read with symbol_info_tick (seed / fallback)
+SINGLE_TICK_DTYPE = np.dtype([('time_msc', 'i8'), ('bid', 'f8'), ('ask', 'f8'), ('last', 'f8'), ('volume', 'f8')])
+
+
+class BatchTickFetcher:
+    """
+    Incremental tick reader built on ``mt5.copy_ticks_from``
+
+    Each ``fetch()`` returns only ticks not returned before (de-duplicated on
+    ``time_msc``, including several ticks sharing the same millisecond), and
+    ``next_interval`` adapts the polling sleep to the observed tick rate.
+    """
+
+    def __init__(self, symbol: str, mt5_api=None, batch_size: int = 5000,
+                 min_interval: float = 0.001, max_interval: float = 0.05,
+                 ticks_per_poll: float = 1.0):
+        """
+        Args:
+            symbol: Symbol to read
+            mt5_api: MetaTrader5 module (or a compatible fake); imported lazily if None
+            batch_size: Max ticks per copy_ticks_from call
+            min_interval / max_interval: Bounds for the adaptive poll sleep (seconds)
+            ticks_per_poll: Target number of new ticks per poll when sizing the interval
+        """
+        if mt5_api is None:
+            import MetaTrader5 as mt5_api
+        self.mt5 = mt5_api
+        self.symbol = symbol
+        self.batch_size = int(batch_size)
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max_interval)
+        self.ticks_per_poll = float(ticks_per_poll)
+
+        # High-water mark
+        self.last_msc: Optional[int] = None
+        self.seen_at_last_msc = 0
+        # copy_ticks_from starts at a whole second; ticks of that second already returned
+        self.seen_in_second = 0
+
+        # Rate tracking
+        self.tick_rate = 0.0  # EWMA, ticks/second
+        self.next_interval = self.min_interval
+        self._last_poll_time: Optional[float] = None
+
+        # Stats
+        self.api_calls = 0
+        self.ticks_fetched = 0
+        self.duplicates_dropped = 0
+        self.fallback_polls = 0
+
+    def _seed(self) -> Optional[np.ndarray]:
+        """Start from the current tick so history before start-up is not replayed"""
+        self.api_calls += 1
+        tick = self.mt5.symbol_info_tick(self.symbol)
+        if tick is None:
+            return None
+        return self._resume_at(tick)
+
+    def _resume_at(self, tick) -> np.ndarray:
+        """Move the high-water mark to a symbol_info_tick() tick and return it as a one-row batch"""
+        self.last_msc = int(tick.time_msc)
+        self.seen_at_last_msc = 1
+        # Earlier ticks of this second are unknown; over-request by a full batch
+        self.seen_in_second = self.batch_size
+        self.ticks_fetched += 1
+        return np.array([(tick.time_msc, tick.bid, tick.ask, tick.last, tick.volume)], dtype=SINGLE_TICK_DTYPE)
+
+    def fetch(self) -> Optional[np.ndarray]:
+        """
+        Return new ticks as a structured array (fields include time_msc, bid, ask, last, volume)
+
+        Returns None on API failure; ``poll_latest()`` is the single-tick fallback.
+        """
+        now = time.perf_counter()
+        if self.last_msc is None:
+            ticks = self._seed()
+            self._last_poll_time = now
+            return ticks
+
+        self.api_calls += 1
+        request = self.seen_in_second + self.batch_size
+        raw = self.mt5.copy_ticks_from(
+            self.symbol, self.last_msc // 1000, request, self.mt5.COPY_TICKS_ALL
+        )
+        if raw is None:
+            self._update_rate(0, now)
+            return None
+
+        new = self._deduplicate(raw)
+        self._update_rate(len(new), now)
+
+        # A full batch means we are behind - poll again straight away
+        if len(raw) >= request:
+            self.next_interval = self.min_interval
+
+        return new
+
+    def poll_latest(self) -> Optional[np.ndarray]:
+        """
+        Single-tick fallback for when ``fetch()`` fails
+
+        Reads ``symbol_info_tick`` and returns it as a one-row batch if it is
+        newer than anything returned so far (empty batch otherwise). The batch
+        path resumes after that tick; ticks in between are not recovered.
+        Returns None if the tick read fails too.
+        """
+        if self.last_msc is None:
+            return self._seed()
+
+        self.api_calls += 1
+        self.fallback_polls += 1
+        tick = self.mt5.symbol_info_tick(self.symbol)
+        if tick is None:
+            return None
+        if int(tick.time_msc) <= self.last_msc:
+            return np.zeros(0, dtype=SINGLE_TICK_DTYPE)
+        return self._resume_at(tick)
+
+    def _deduplicate(self, raw: np.ndarray) -> np.ndarray:
+        if len(raw) == 0:
+            return raw
+
+        msc = raw['time_msc']
+        newer = msc > self.last_msc
+        same = np.flatnonzero(msc == self.last_msc)
+        if len(same) > self.seen_at_last_msc:
+            # Extra ticks inside the last millisecond arrived after our previous read
+            newer[same[self.seen_at_last_msc:]] = True
+
+        new = raw[newer]
+        self.duplicates_dropped += len(raw) - len(new)
+
+        if len(new):
+            top = int(new['time_msc'][-1])
+            if top == self.last_msc:
+                self.seen_at_last_msc += len(new)
+            else:
+                self.last_msc = top
+                self.seen_at_last_msc = int(np.count_nonzero(raw['time_msc'] == top))
+            # raw is contiguous from the start of the requested second
+            self.seen_in_second = int(np.count_nonzero(msc // 1000 == top // 1000))
+            self.ticks_fetched += len(new)
+
+        return new
+
+    def _update_rate(self, count: int, now: float):
+        if self._last_poll_time is not None:
+            elapsed = max(now - self._last_poll_time, 1e-6)
+            instant = count / elapsed
+            self.tick_rate = instant if self.tick_rate == 0.0 else 0.8 * self.tick_rate + 0.2 * instant
+        self._last_poll_time = now
+
+        if self.tick_rate > 0:
+            interval = self.ticks_per_poll / self.tick_rate
+        else:
+            interval = self.next_interval * 1.5  # quiet symbol - back off
+        self.next_interval = min(self.max_interval, max(self.min_interval, interval))
+
+    def get_stats(self) -> dict:
+        """Get ingestion statistics"""
+        return {
+            'api_calls': self.api_calls,
+            'ticks_fetched': self.ticks_fetched,
+            'duplicates_dropped': self.duplicates_dropped,
+            'fallback_polls': self.fallback_polls,
+            'tick_rate': self.tick_rate,
+            'poll_interval_ms': self.next_interval * 1000,
+            'ticks_per_call': self.ticks_fetched / self.api_calls if self.api_calls else 0.0,
+        }
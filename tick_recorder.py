@@ -0,0 +1,321 @@
+"""
+Tick Recorder for Aventa HFT Pro 2026
+Append-only memory-mapped segment files of the ticks and order flow an engine saw
+"""
+
+import os
+import mmap
+import glob
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TICK_RECORD_DTYPE = np.dtype([
+    ('time_msc', 'i8'), ('bid', 'f8'), ('ask', 'f8'), ('last', 'f8'), ('volume', 'f8'),
+])
+ORDERFLOW_RECORD_DTYPE = np.dtype([
+    ('timestamp', 'f8'), ('buy_volume', 'f8'), ('sell_volume', 'f8'),
+    ('delta', 'f8'), ('cumulative_delta', 'f8'), ('imbalance_ratio', 'f8'),
+])
+RECORD_DTYPES = {'ticks': TICK_RECORD_DTYPE, 'orderflow': ORDERFLOW_RECORD_DTYPE}
+
+# Header: magic (8) | kind (16) | record size (8) | record count (8) | reserved
+SEGMENT_MAGIC = b'AVTREC01'
+HEADER_SIZE = 64
+_COUNT_OFFSET = 32
+
+MS_PER_DAY = 86400 * 1000
+
+
+def _read_header(f) -> Tuple[str, int, int]:
+    header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:8] != SEGMENT_MAGIC:
+        raise ValueError(f"Not a tick segment: {getattr(f, 'name', f)}")
+    kind = header[8:24].rstrip(b'\0').decode('ascii')
+    itemsize = int.from_bytes(header[24:32], 'little')
+    count = int.from_bytes(header[32:40], 'little', signed=True)
+    return kind, itemsize, count
+
+
+class SegmentWriter:
+    """
+    Append-only writer for one segment file
+
+    The file is grown in chunks and memory mapped, so an append is a NumPy
+    assignment into the page cache (no write syscall). The record count in
+    the header is updated after the rows, so a concurrent reader never sees
+    a partial record. Reopening an existing segment continues after its
+    last record. Not thread-safe: one writer per file.
+    """
+
+    def __init__(self, path: str, kind: str, chunk_records: int = 65536):
+        self.path = path
+        self.kind = kind
+        self.dtype = RECORD_DTYPES[kind]
+        self.chunk_records = int(chunk_records)
+        self._mm: Optional[mmap.mmap] = None
+        self._records = None
+        self._header_count = None
+
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            self._file = open(path, 'r+b')
+            kind_on_disk, itemsize, count = _read_header(self._file)
+            if kind_on_disk != kind or itemsize != self.dtype.itemsize:
+                self._file.close()
+                raise ValueError(f"Segment {path} holds {kind_on_disk} records, not {kind}")
+            self.count = count
+        else:
+            self._file = open(path, 'w+b')
+            header = bytearray(HEADER_SIZE)
+            header[:8] = SEGMENT_MAGIC
+            header[8:24] = kind.encode('ascii').ljust(16, b'\0')
+            header[24:32] = self.dtype.itemsize.to_bytes(8, 'little')
+            self._file.write(header)
+            self._file.flush()
+            self.count = 0
+
+        self.capacity = 0
+        self._remap(self.count + self.chunk_records)
+
+    def _remap(self, capacity: int):
+        # Views must be released before the old map can be closed
+        self._records = None
+        self._header_count = None
+        if self._mm is not None:
+            self._mm.close()
+        self._file.truncate(HEADER_SIZE + capacity * self.dtype.itemsize)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self._header_count = np.ndarray((1,), dtype='<i8', buffer=self._mm, offset=_COUNT_OFFSET)
+        self._records = np.ndarray((capacity,), dtype=self.dtype, buffer=self._mm, offset=HEADER_SIZE)
+        self.capacity = capacity
+
+    def _reserve(self, n: int):
+        if self.count + n > self.capacity:
+            grow = max(self.chunk_records, n)
+            self._remap(self.count + grow)
+
+    def append_row(self, *values):
+        """Append one record given positionally in dtype field order"""
+        self._reserve(1)
+        self._records[self.count] = values
+        self.count += 1
+        self._header_count[0] = self.count
+
+    def append_columns(self, columns: Dict[str, np.ndarray]):
+        """Append equal-length column arrays (one per dtype field)"""
+        n = len(next(iter(columns.values())))
+        if n == 0:
+            return
+        self._reserve(n)
+        start = self.count
+        for name, values in columns.items():
+            self._records[name][start:start + n] = values
+        self.count += n
+        self._header_count[0] = self.count
+
+    def flush(self):
+        if self._mm is not None:
+            self._mm.flush()
+
+    def close(self):
+        """Flush and trim the preallocated tail"""
+        if self._mm is None:
+            return
+        self._mm.flush()
+        self._records = None
+        self._header_count = None
+        self._mm.close()
+        self._mm = None
+        self._file.truncate(HEADER_SIZE + self.count * self.dtype.itemsize)
+        self._file.close()
+
+
+class TickRecorder:
+    """
+    Records one engine's ticks and derived order flow
+
+    Layout: ``{root}/{symbol}[/{tag}]/{symbol}_{YYYYMMDD}.{kind}.bin`` where
+    the day is the UTC day of the tick time (MT5 server time), so segments
+    rotate at the broker's midnight. ``tag`` (e.g. the magic number) keeps
+    bots trading the same symbol from sharing a writer.
+    """
+
+    def __init__(self, root: str, symbol: str, tag=None, chunk_records: int = 65536):
+        self.symbol = symbol
+        self.directory = os.path.join(root, symbol, str(tag)) if tag is not None else os.path.join(root, symbol)
+        self.chunk_records = chunk_records
+        self._writers: Dict[str, Tuple[int, SegmentWriter]] = {}
+
+        # Stats
+        self.ticks_recorded = 0
+        self.orderflow_recorded = 0
+        self.segments_opened = 0
+        self.errors = 0
+
+    def segment_path(self, kind: str, day: int) -> str:
+        date = datetime.fromtimestamp(day * 86400, tz=timezone.utc).strftime('%Y%m%d')
+        return os.path.join(self.directory, f"{self.symbol}_{date}.{kind}.bin")
+
+    def _writer(self, kind: str, day: int) -> SegmentWriter:
+        entry = self._writers.get(kind)
+        if entry is not None and entry[0] == day:
+            return entry[1]
+        if entry is not None:
+            entry[1].close()
+        os.makedirs(self.directory, exist_ok=True)
+        writer = SegmentWriter(self.segment_path(kind, day), kind, self.chunk_records)
+        self._writers[kind] = (day, writer)
+        self.segments_opened += 1
+        logger.info(f"Tick recorder: {writer.path} ({writer.count} records)")
+        return writer
+
+    def _append(self, kind: str, days: np.ndarray, columns: Dict[str, np.ndarray]):
+        # Split the (rare) batch that straddles midnight
+        first, last = int(days[0]), int(days[-1])
+        if first == last:
+            self._writer(kind, first).append_columns(columns)
+            return
+        bounds = np.flatnonzero(np.diff(days)) + 1
+        for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(days)]):
+            self._writer(kind, int(days[start])).append_columns(
+                {name: values[start:end] for name, values in columns.items()})
+
+    def record_ticks(self, time_msc, bid, ask, last, volume):
+        """Append a batch of ticks (equal-length arrays)"""
+        if len(time_msc) == 0:
+            return
+        try:
+            time_msc = np.asarray(time_msc, dtype=np.int64)
+            self._append('ticks', time_msc // MS_PER_DAY, {
+                'time_msc': time_msc, 'bid': bid, 'ask': ask, 'last': last, 'volume': volume,
+            })
+            self.ticks_recorded += len(time_msc)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Tick recorder error: {e}")
+
+    def record_tick(self, tick):
+        """Append one TickData"""
+        try:
+            time_msc = int(round(tick.timestamp * 1000))
+            self._writer('ticks', time_msc // MS_PER_DAY).append_row(
+                time_msc, tick.bid, tick.ask, tick.last, tick.volume)
+            self.ticks_recorded += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Tick recorder error: {e}")
+
+    def record_orderflow(self, timestamp, buy_volume, sell_volume, delta, cumulative_delta, imbalance_ratio):
+        """Append a batch of order flow rows (timestamps in seconds)"""
+        if len(timestamp) == 0:
+            return
+        try:
+            self._append('orderflow', (np.asarray(timestamp) // 86400).astype(np.int64), {
+                'timestamp': timestamp, 'buy_volume': buy_volume, 'sell_volume': sell_volume,
+                'delta': delta, 'cumulative_delta': cumulative_delta, 'imbalance_ratio': imbalance_ratio,
+            })
+            self.orderflow_recorded += len(timestamp)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Tick recorder error: {e}")
+
+    def record_orderflow_row(self, flow):
+        """Append one OrderFlowData"""
+        try:
+            self._writer('orderflow', int(flow.timestamp // 86400)).append_row(
+                flow.timestamp, flow.buy_volume, flow.sell_volume,
+                flow.delta, flow.cumulative_delta, flow.imbalance_ratio)
+            self.orderflow_recorded += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Tick recorder error: {e}")
+
+    def flush(self):
+        for _, writer in self._writers.values():
+            writer.flush()
+
+    def close(self):
+        for _, writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def get_stats(self) -> dict:
+        return {
+            'ticks_recorded': self.ticks_recorded,
+            'orderflow_recorded': self.orderflow_recorded,
+            'segments_opened': self.segments_opened,
+            'errors': self.errors,
+            'directory': self.directory,
+        }
+
+
+def open_segment(path: str) -> np.ndarray:
+    """
+    Map a segment read-only as a structured array (no copy)
+
+    Columns are strided views, e.g. ``seg['bid']``. Only records published
+    by the writer at open time are included.
+    """
+    with open(path, 'rb') as f:
+        kind, itemsize, count = _read_header(f)
+    dtype = RECORD_DTYPES[kind]
+    if itemsize != dtype.itemsize:
+        raise ValueError(f"Segment {path}: record size {itemsize} != {dtype.itemsize}")
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+
+def list_segments(root: str, symbol: str, kind: str = 'ticks', tag=None) -> List[str]:
+    """Segment paths for a symbol, oldest day first"""
+    directory = os.path.join(root, symbol, str(tag)) if tag is not None else os.path.join(root, symbol)
+    return sorted(glob.glob(os.path.join(directory, f"{symbol}_*.{kind}.bin")))
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    import tempfile
+    from types import SimpleNamespace
+
+    print("=" * 60)
+    print("TICK RECORDER - PERFORMANCE TEST")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        recorder = TickRecorder(root, "XAUUSD")
+        t0 = int(time.time() * 1000)
+
+        n = 200000
+        ticks = [SimpleNamespace(timestamp=(t0 + i) / 1000.0, bid=2600.0, ask=2600.1, last=2600.0, volume=1)
+                 for i in range(n)]
+        start = time.perf_counter()
+        for tick in ticks:
+            recorder.record_tick(tick)
+        per_tick = (time.perf_counter() - start) / n * 1e6
+
+        batch = 50
+        msc = t0 + n + np.arange(n, dtype=np.int64)
+        price = np.full(n, 2600.0)
+        start = time.perf_counter()
+        for i in range(0, n, batch):
+            recorder.record_ticks(msc[i:i + batch], price[i:i + batch], price[i:i + batch],
+                                  price[i:i + batch], price[i:i + batch])
+        per_batched = (time.perf_counter() - start) / n * 1e6
+        recorder.close()
+
+        path = list_segments(root, "XAUUSD")[0]
+        start = time.perf_counter()
+        seg = open_segment(path)
+        mean_bid = seg['bid'].mean()
+        read_ms = (time.perf_counter() - start) * 1000
+
+        print(f"record_tick():              {per_tick:.2f} us/tick")
+        print(f"record_ticks() batch of {batch}: {per_batched:.3f} us/tick")
+        print(f"open_segment + mean of {len(seg)} ticks: {read_ms:.1f} ms ({os.path.getsize(path) / 1e6:.1f} MB)")
+        del seg
+    print("=" * 60)
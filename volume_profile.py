@@ -0,0 +1,320 @@
+"""
+Volume Profile for Aventa HFT Pro 2026
+Volume-at-price histogram with buy/sell split, POC and value area, updated per tick
+"""
+
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class VolumeProfile:
+    """
+    Fixed-width price bins in a preallocated window that re-centers on drift
+
+    Bin ``i`` covers price level ``(origin + i) * tick_size``. When a trade
+    prints outside the window it is shifted so the new price sits in the
+    middle; volume on levels that fall off the far edge is dropped (and
+    counted in ``dropped_volume``).
+
+    ``update()`` and ``poc`` are O(1). The value area is the usual market
+    profile expansion from the POC (take the larger neighbouring level until
+    ``value_area`` of the volume is covered), O(levels in the area); it is
+    cached and only recomputed when the POC moves or the total volume has
+    grown by ``value_area_refresh`` since the last computation.
+
+    A profile with ``tick_size == 0`` ignores updates until ``reset()`` gives
+    it one (the engine rebuilds its profile once the symbol point is known).
+
+    Updates come from the data collection thread and queries from the
+    analysis thread. Both hold ``_lock`` only while touching the arrays and
+    bin range; the value area is expanded on a copy of the occupied span
+    outside the lock and cached in absolute price levels, so a re-center
+    does not move it.
+    """
+
+    def __init__(self, tick_size: float = 0.0, bins: int = 1024, value_area: float = 0.70,
+                 value_area_refresh: float = 0.01):
+        if bins < 3:
+            raise ValueError("Volume profile needs at least 3 bins")
+        self.bins = int(bins)
+        self.value_area_pct = value_area
+        self.value_area_refresh = value_area_refresh
+        self.buy = np.zeros(self.bins, dtype=np.float64)
+        self.sell = np.zeros(self.bins, dtype=np.float64)
+        self._lock = threading.Lock()
+        self._epoch = 0  # bumped by reset() so a value area computed before it is not cached
+        self.reset(tick_size)
+
+    @classmethod
+    def from_config(cls, config: Dict, point: float = 0.0) -> 'VolumeProfile':
+        tick_size = config.get('volume_profile_tick_size', 0.0) or point * config.get('volume_profile_bin_points', 10)
+        return cls(tick_size, bins=config.get('volume_profile_bins', 1024),
+                   value_area=config.get('volume_profile_value_area', 0.70))
+
+    def reset(self, tick_size: Optional[float] = None):
+        """Clear all levels (new session); optionally change the bin width"""
+        with self._lock:
+            if tick_size is not None:
+                self.tick_size = float(tick_size)
+                self._inv_tick = 1.0 / self.tick_size if self.tick_size > 0 else 0.0
+            self.buy[:] = 0.0
+            self.sell[:] = 0.0
+            self.origin: Optional[int] = None
+            self.total_volume = 0.0
+            self.dropped_volume = 0.0
+            self.recenters = 0
+            self._poc = -1
+            self._poc_volume = 0.0
+            self._low = self.bins   # occupied bin range [_low, _high]
+            self._high = -1
+            self._va: Optional[Tuple[int, int]] = None  # absolute price levels
+            self._va_poc = None
+            self._va_total = 0.0
+            self._epoch += 1
+
+    # ------------------------------------------------------------------ updates
+
+    def _recenter(self, level: int):
+        """Shift the window so ``level`` lands in the middle bin"""
+        if self.origin is None:
+            self.origin = level - self.bins // 2
+            return
+        shift = (level - self.bins // 2) - self.origin
+        if shift == 0:
+            return
+        self.origin += shift
+        self.recenters += 1
+        if abs(shift) >= self.bins:
+            self.dropped_volume += self.buy.sum() + self.sell.sum()
+            self.buy[:] = 0.0
+            self.sell[:] = 0.0
+        else:
+            for side in (self.buy, self.sell):
+                if shift > 0:
+                    self.dropped_volume += side[:shift].sum()
+                    side[:-shift] = side[shift:]
+                    side[-shift:] = 0.0
+                else:
+                    self.dropped_volume += side[shift:].sum()
+                    side[-shift:] = side[:shift]
+                    side[:-shift] = 0.0
+        self.total_volume = float(self.buy.sum() + self.sell.sum())
+        self._low, self._high = max(self._low - shift, 0), min(self._high - shift, self.bins - 1)
+        self._poc -= shift
+        self._va = None
+        if not 0 <= self._poc < self.bins or self._low > self._high:
+            self._rescan()
+
+    def _rescan(self):
+        total = self.buy + self.sell
+        occupied = np.flatnonzero(total)
+        if len(occupied) == 0:
+            self._poc, self._poc_volume, self._low, self._high = -1, 0.0, self.bins, -1
+            return
+        self._low, self._high = int(occupied[0]), int(occupied[-1])
+        self._poc = int(np.argmax(total))
+        self._poc_volume = float(total[self._poc])
+
+    def update(self, price: float, buy_volume: float, sell_volume: float):
+        """Add one trade's buy/sell volume at ``price`` - O(1) unless the window re-centers"""
+        if not self._inv_tick:
+            return
+        level = int(round(price * self._inv_tick))
+        with self._lock:
+            if self.origin is None:
+                self._recenter(level)
+            i = level - self.origin
+            if not 0 <= i < self.bins:
+                self._recenter(level)
+                i = level - self.origin
+            buy = self.buy[i] + buy_volume
+            sell = self.sell[i] + sell_volume
+            self.buy[i] = buy
+            self.sell[i] = sell
+            self.total_volume += buy_volume + sell_volume
+            if buy + sell > self._poc_volume:
+                self._poc, self._poc_volume = i, buy + sell
+            if i < self._low:
+                self._low = i
+            if i > self._high:
+                self._high = i
+
+    def update_batch(self, prices: np.ndarray, buy_volume: np.ndarray, sell_volume: np.ndarray):
+        """Vectorised update() for a batch of trades"""
+        if not self._inv_tick or len(prices) == 0:
+            return
+        levels = np.rint(np.asarray(prices, dtype=np.float64) * self._inv_tick).astype(np.int64)
+        lo, hi = int(levels.min()), int(levels.max())
+        with self._lock:
+            if self.origin is None or lo < self.origin or hi >= self.origin + self.bins:
+                # Center on the batch range (or its end if the range is wider than the window)
+                self._recenter((lo + hi) // 2 if hi - lo < self.bins else int(levels[-1]))
+            idx = levels - self.origin
+            inside = (idx >= 0) & (idx < self.bins)
+            if not inside.all():
+                self.dropped_volume += float(buy_volume[~inside].sum() + sell_volume[~inside].sum())
+                idx, buy_volume, sell_volume = idx[inside], buy_volume[inside], sell_volume[inside]
+                if len(idx) == 0:
+                    return
+            self.buy += np.bincount(idx, weights=buy_volume, minlength=self.bins)
+            self.sell += np.bincount(idx, weights=sell_volume, minlength=self.bins)
+            self.total_volume += float(buy_volume.sum() + sell_volume.sum())
+            self._low = min(self._low, int(idx.min()))
+            self._high = max(self._high, int(idx.max()))
+            span = slice(self._low, self._high + 1)
+            poc = self._low + int(np.argmax(self.buy[span] + self.sell[span]))
+            self._poc, self._poc_volume = poc, float(self.buy[poc] + self.sell[poc])
+
+    # ------------------------------------------------------------------ queries
+
+    def price_of(self, i: int) -> float:
+        return self._level_price(self.origin + i)
+
+    def _level_price(self, level: int) -> float:
+        return round(level * self.tick_size, 10)
+
+    @property
+    def poc(self) -> float:
+        """Point of control (price level with the most volume); NaN while empty"""
+        with self._lock:
+            if self._poc < 0:
+                return float('nan')
+            level = self.origin + self._poc
+        return self._level_price(level)
+
+    def level_delta(self, price: float) -> float:
+        """Buy minus sell volume at ``price``'s level (0 outside the window)"""
+        if not self._inv_tick:
+            return 0.0
+        level = int(round(price * self._inv_tick))
+        with self._lock:
+            if self.origin is None:
+                return 0.0
+            i = level - self.origin
+            return float(self.buy[i] - self.sell[i]) if 0 <= i < self.bins else 0.0
+
+    def value_area(self) -> Tuple[float, float]:
+        """(value area low, value area high) prices; NaNs while empty"""
+        with self._lock:
+            if self._poc < 0:
+                return float('nan'), float('nan')
+            poc, low = self.origin + self._poc, self.origin + self._low
+            total, epoch = self.total_volume, self._epoch
+            va = self._va
+            if (va is None or self._va_poc != poc
+                    or total > self._va_total * (1.0 + self.value_area_refresh)):
+                va = None
+                span = (self.buy[self._low:self._high + 1] + self.sell[self._low:self._high + 1]).tolist()
+        if va is None:
+            lo, hi = self._compute_value_area(span, poc - low)
+            va = (low + lo, low + hi)
+            with self._lock:
+                if self._epoch == epoch:
+                    self._va, self._va_poc, self._va_total = va, poc, total
+        return self._level_price(va[0]), self._level_price(va[1])
+
+    def _compute_value_area(self, span: list, poc: int) -> Tuple[int, int]:
+        """Expand from index ``poc`` of the occupied ``span`` volumes; returns (low, high) indices"""
+        target = sum(span) * self.value_area_pct
+        lo = hi = poc
+        acc = span[lo]
+        last = len(span) - 1
+        while acc < target and (lo > 0 or hi < last):
+            up = span[hi + 1] if hi < last else -1.0
+            down = span[lo - 1] if lo > 0 else -1.0
+            if up >= down:
+                hi += 1
+                acc += up
+            else:
+                lo -= 1
+                acc += down
+        return lo, hi
+
+    def levels(self) -> Dict[str, np.ndarray]:
+        """Occupied levels: price, buy, sell and delta arrays (copies) - O(bins)"""
+        with self._lock:
+            low, high = self._low, self._high
+            if high < low:
+                empty = np.zeros(0)
+                return {'price': empty, 'buy': empty, 'sell': empty, 'delta': empty}
+            origin = self.origin
+            buy, sell = self.buy[low:high + 1].copy(), self.sell[low:high + 1].copy()
+        return {
+            'price': np.round((origin + np.arange(low, high + 1)) * self.tick_size, 10),
+            'buy': buy,
+            'sell': sell,
+            'delta': buy - sell,
+        }
+
+    def snapshot(self, price: float) -> Dict[str, float]:
+        """Values merged into analyze_microstructure()"""
+        val, vah = self.value_area()
+        return {
+            'poc': self.poc,
+            'value_area_low': val,
+            'value_area_high': vah,
+            'level_delta': self.level_delta(price),
+        }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'tick_size': self.tick_size,
+                'levels': max(self._high - self._low + 1, 0),
+                'total_volume': float(self.total_volume),
+                'dropped_volume': float(self.dropped_volume),
+                'recenters': self.recenters,
+            }
+
+
+# === PERFORMANCE TEST ===
+if __name__ == "__main__":
+    import time
+
+    print("=" * 60)
+    print("VOLUME PROFILE - PERFORMANCE TEST")
+    print("=" * 60)
+
+    rng = np.random.default_rng(7)
+    n = 200000
+    prices = (2600.0 + np.cumsum(rng.normal(0, 0.05, n))).tolist()
+    is_buy = (rng.random(n) < 0.5).tolist()
+
+    profile = VolumeProfile(tick_size=0.1, bins=1024)
+    start = time.perf_counter()
+    for p, b in zip(prices, is_buy):
+        profile.update(p, 1.0 if b else 0.0, 0.0 if b else 1.0)
+    update_us = (time.perf_counter() - start) / n * 1e6
+
+    start = time.perf_counter()
+    for p in prices[:20000]:
+        profile.update(p, 1.0, 0.0)
+        profile.snapshot(p)
+    cycle_us = (time.perf_counter() - start) / 20000 * 1e6
+
+    profile._va = None
+    start = time.perf_counter()
+    for _ in range(200):
+        profile._va = None
+        profile.value_area()
+    va_us = (time.perf_counter() - start) / 200 * 1e6
+
+    batch = VolumeProfile(tick_size=0.1, bins=1024)
+    arr, buys = np.array(prices), np.array(is_buy, dtype=np.float64)
+    start = time.perf_counter()
+    for i in range(0, n, 100):
+        batch.update_batch(arr[i:i + 100], buys[i:i + 100], 1.0 - buys[i:i + 100])
+    batch_us = (time.perf_counter() - start) / n * 1e6
+
+    val, vah = profile.value_area()
+    print(f"update():                    {update_us:6.2f} us/tick")
+    print(f"update() + snapshot():       {cycle_us:6.2f} us/cycle")
+    print(f"value area (uncached):       {va_us:6.1f} us")
+    print(f"update_batch() (100 ticks):  {batch_us:6.2f} us/tick")
+    print(f"POC {profile.poc:.2f} | VA {val:.2f}-{vah:.2f} | {profile.get_stats()}")
+    print("=" * 60)